@@ -0,0 +1,294 @@
+"""
+beta.py — Beta API Endpoints
+
+Purpose:
+- Expose natively calculated beta statistics (OLS beta, adjusted beta, R²,
+  standard error) for a ticker against the benchmark indexes
+- Prices come from the local price cache / store (see services/modeling/beta.py)
+
+Endpoints:
+- GET /beta/{ticker}?benchmark={INDEX}&years={1|3|5} → Beta statistics per benchmark
+- GET /beta/{ticker}/rolling?benchmark={INDEX}&windows=1,3,5&frequencies=daily,weekly,monthly
+  → Rolling beta series per window and return frequency
+"""
+
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
+
+from app.core.executors import run_io
+from app.core.logging import get_logger
+from app.services.modeling.beta import (
+    BENCHMARK_OPTIONS,
+    DEFAULT_LOOKBACK_YEARS,
+    DEFAULT_BENCHMARK,
+    YEAR_OPTIONS,
+    calculate_betas,
+    calculate_rolling_betas,
+)
+from app.services.modeling.beta_engine import PERIODS_PER_YEAR, RETURN_FREQUENCIES
+
+logger = get_logger(__name__)
+
+router = APIRouter(
+    prefix="/beta",
+    tags=["beta"]
+)
+
+# -----------------------------------------------------------------------------
+# Schemas
+# -----------------------------------------------------------------------------
+
+class BenchmarkBeta(BaseModel):
+    """Beta statistics against one benchmark index."""
+    benchmark: str
+    benchmarkName: str
+    beta: Optional[float] = None
+    adjustedBeta: Optional[float] = None
+    alpha: Optional[float] = None
+    rSquared: Optional[float] = None
+    standardError: Optional[float] = None
+    observations: int
+
+
+class BetaResponse(BaseModel):
+    """Response schema for GET /beta/{ticker}."""
+    ticker: str
+    lookbackYears: int
+    betas: List[BenchmarkBeta]
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "ticker": "F",
+                "lookbackYears": 5,
+                "betas": [
+                    {
+                        "benchmark": "^GSPC",
+                        "benchmarkName": "S&P 500",
+                        "beta": 1.52,
+                        "adjustedBeta": 1.35,
+                        "alpha": 0.0001,
+                        "rSquared": 0.38,
+                        "standardError": 0.05,
+                        "observations": 1255
+                    }
+                ]
+            }
+        }
+
+
+class RollingBetaSeries(BaseModel):
+    """Rolling beta series for one window length and return frequency (parallel arrays)."""
+    frequency: str
+    windowYears: int
+    windowPeriods: int
+    dates: List[str]
+    beta: List[Optional[float]]
+    adjustedBeta: List[Optional[float]]
+    rSquared: List[Optional[float]]
+    observations: List[int]
+
+
+class RollingBetaResponse(BaseModel):
+    """Response schema for GET /beta/{ticker}/rolling."""
+    ticker: str
+    benchmark: str
+    benchmarkName: str
+    series: List[RollingBetaSeries]
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "ticker": "F",
+                "benchmark": "^GSPC",
+                "benchmarkName": "S&P 500",
+                "series": [
+                    {
+                        "frequency": "monthly",
+                        "windowYears": 3,
+                        "windowPeriods": 36,
+                        "dates": ["2024-01-31", "2024-02-29"],
+                        "beta": [1.48, 1.51],
+                        "adjustedBeta": [1.32, 1.34],
+                        "rSquared": [0.41, 0.42],
+                        "observations": [36, 36]
+                    }
+                ]
+            }
+        }
+
+
+def _split_param(value: Optional[str]) -> List[str]:
+    """Comma-separated query parameter -> list of non-empty values."""
+    return [part.strip() for part in (value or "").split(",") if part.strip()]
+
+
+def _optional(value) -> Optional[float]:
+    """NaN -> None for JSON."""
+    return None if value != value else float(value)
+
+
+# -----------------------------------------------------------------------------
+# Routes
+# -----------------------------------------------------------------------------
+
+@router.get("/{ticker}", response_model=BetaResponse)
+async def get_beta(
+    ticker: str,
+    benchmark: Optional[str] = Query(None, description="Benchmark index (e.g., ^GSPC); omit for all benchmarks"),
+    years: int = Query(DEFAULT_LOOKBACK_YEARS, description="Lookback window in years (1, 3, or 5)"),
+):
+    """
+    GET /beta/{ticker}?benchmark={INDEX}&years={1|3|5}
+    
+    Calculate daily-return beta statistics for a ticker against one benchmark
+    index (or all of BENCHMARK_OPTIONS in one pass).
+    
+    Args:
+        ticker: Stock ticker symbol
+        benchmark: Optional benchmark index symbol
+        years: Lookback window in years
+        
+    Returns:
+        BetaResponse with beta, adjusted (Blume) beta, alpha, R², standard
+        error and observation count per benchmark
+        
+    Raises:
+        400: If the benchmark or lookback is invalid
+        404: If no price history is available for the ticker
+    """
+    normalized_ticker = ticker.upper().strip()
+    if benchmark is not None and benchmark not in BENCHMARK_OPTIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"benchmark must be one of {list(BENCHMARK_OPTIONS.keys())}"
+        )
+    if years not in YEAR_OPTIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"years must be one of {list(YEAR_OPTIONS.keys())}"
+        )
+    
+    benchmarks = [benchmark] if benchmark else list(BENCHMARK_OPTIONS)
+    logger.info(f"Calculating {years}y beta for {normalized_ticker} vs {', '.join(benchmarks)}")
+    stats = await run_io(calculate_betas, [normalized_ticker], benchmarks, lookback_years=years)
+    
+    if stats.empty or stats["beta"].isna().all():
+        raise HTTPException(
+            status_code=404,
+            detail=f"Not enough price history to calculate beta for ticker: {normalized_ticker}"
+        )
+    
+    return BetaResponse(
+        ticker=normalized_ticker,
+        lookbackYears=years,
+        betas=[
+            BenchmarkBeta(
+                benchmark=index_symbol,
+                benchmarkName=BENCHMARK_OPTIONS[index_symbol],
+                beta=_optional(row["beta"]),
+                adjustedBeta=_optional(row["adjusted_beta"]),
+                alpha=_optional(row["alpha"]),
+                rSquared=_optional(row["r_squared"]),
+                standardError=_optional(row["standard_error"]),
+                observations=int(row["observations"]),
+            )
+            for (_, index_symbol), row in stats.iterrows()
+        ],
+    )
+
+
+@router.get("/{ticker}/rolling", response_model=RollingBetaResponse)
+async def get_rolling_beta(
+    ticker: str,
+    benchmark: str = Query(DEFAULT_BENCHMARK, description="Benchmark index (e.g., ^GSPC)"),
+    windows: Optional[str] = Query(None, description="Comma-separated window lengths in years (1, 3, 5); default all"),
+    frequencies: Optional[str] = Query(None, description="Comma-separated return frequencies (daily, weekly, monthly); default all"),
+):
+    """
+    GET /beta/{ticker}/rolling?benchmark={INDEX}&windows=1,3,5&frequencies=daily,weekly,monthly
+    
+    Rolling beta of a ticker against a benchmark for every requested window
+    length and return frequency, computed in one vectorized pass over the
+    cached price history.
+    
+    Args:
+        ticker: Stock ticker symbol
+        benchmark: Benchmark index symbol
+        windows: Window lengths in years
+        frequencies: Return frequencies
+        
+    Returns:
+        RollingBetaResponse with one series per (frequency, window); series
+        start once a window has enough paired returns
+        
+    Raises:
+        400: If the benchmark, a window or a frequency is invalid
+        404: If there is not enough price history for any window
+    """
+    normalized_ticker = ticker.upper().strip()
+    if benchmark not in BENCHMARK_OPTIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"benchmark must be one of {list(BENCHMARK_OPTIONS.keys())}"
+        )
+    try:
+        horizons = [int(value) for value in _split_param(windows)] or list(YEAR_OPTIONS)
+    except ValueError:
+        horizons = [0]
+    if any(years not in YEAR_OPTIONS for years in horizons):
+        raise HTTPException(
+            status_code=400,
+            detail=f"windows must be among {list(YEAR_OPTIONS.keys())}"
+        )
+    frequency_list = _split_param(frequencies) or list(RETURN_FREQUENCIES)
+    if any(frequency not in RETURN_FREQUENCIES for frequency in frequency_list):
+        raise HTTPException(
+            status_code=400,
+            detail=f"frequencies must be among {list(RETURN_FREQUENCIES.keys())}"
+        )
+    
+    logger.info(f"Calculating rolling beta for {normalized_ticker} vs {benchmark}")
+    stats = await run_io(
+        calculate_rolling_betas,
+        [normalized_ticker],
+        benchmark,
+        horizons=horizons,
+        frequencies=frequency_list,
+    )
+    
+    if stats.empty:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Not enough price history to calculate rolling beta for ticker: {normalized_ticker}"
+        )
+    
+    grouped = {key: rows.droplevel(["frequency", "horizon_years", "ticker"])
+               for key, rows in stats.groupby(level=["frequency", "horizon_years", "ticker"])}
+    series = []
+    for frequency in frequency_list:
+        for years in horizons:
+            rows = grouped.get((frequency, years, normalized_ticker))
+            if rows is None:
+                continue
+            series.append(
+                RollingBetaSeries(
+                    frequency=frequency,
+                    windowYears=years,
+                    windowPeriods=years * PERIODS_PER_YEAR[frequency],
+                    dates=[d.strftime("%Y-%m-%d") for d in rows.index],
+                    beta=[_optional(v) for v in rows["beta"]],
+                    adjustedBeta=[_optional(v) for v in rows["adjusted_beta"]],
+                    rSquared=[_optional(v) for v in rows["r_squared"]],
+                    observations=rows["observations"].astype(int).tolist(),
+                )
+            )
+    
+    return RollingBetaResponse(
+        ticker=normalized_ticker,
+        benchmark=benchmark,
+        benchmarkName=BENCHMARK_OPTIONS[benchmark],
+        series=series,
+    )
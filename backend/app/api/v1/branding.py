@@ -7,19 +7,31 @@ Purpose:
 
 Endpoints:
 - GET /branding?ticker={TICKER} → Returns company branding data
+- GET /branding/batch?tickers={T1,T2,...} → Returns branding for many tickers at once
+- GET /branding/logo/{TICKER}?size={PX} → Serves the logo image from the local logo cache
 """
 
-from fastapi import APIRouter, HTTPException, Query
+import os
+from typing import Dict, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from pydantic import BaseModel
 
+from app.core.etags import etag_matches
+from app.core.executors import run_io
 from app.core.logging import get_logger
 from app.services.branding.fmp_branding_service import (
     get_company_branding,
+    get_company_branding_batch,
     BrandingNotFoundError,
 )
+from app.services.branding.logo_cache import LogoNotFoundError, get_logo_cache
 
 logger = get_logger(__name__)
 
+# Browsers may reuse a logo this long without revalidating (ETag handles changes)
+LOGO_MAX_AGE_SECONDS = int(os.getenv("LOGO_MAX_AGE_SECONDS", str(7 * 24 * 3600)))
+
 router = APIRouter(
     prefix="/branding",
     tags=["branding"]
@@ -47,10 +59,126 @@ class CompanyBrandingResponse(BaseModel):
         }
 
 
+class BrandingBatchResponse(BaseModel):
+    """Response schema for batch branding lookups."""
+    results: Dict[str, CompanyBrandingResponse]
+    errors: Dict[str, str]
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "results": {
+                    "F": {
+                        "ticker": "F",
+                        "companyName": "Ford Motor Company",
+                        "website": "https://www.ford.com",
+                        "logoUrl": "https://financialmodelingprep.com/image-stock/F.png"
+                    }
+                },
+                "errors": {
+                    "ZZZZ": "Could not retrieve company profile for ZZZZ: ..."
+                }
+            }
+        }
+
+
 # -----------------------------------------------------------------------------
 # Routes
 # -----------------------------------------------------------------------------
 
+@router.get("/batch", response_model=BrandingBatchResponse)
+async def get_branding_batch(
+    tickers: str = Query(..., description="Comma-separated ticker symbols (e.g., F,AAPL,MSFT)"),
+):
+    """
+    GET /branding/batch?tickers={T1,T2,...}
+    
+    Retrieve branding for up to 200 tickers in one round trip (e.g., all logos
+    on a screener page).
+    
+    Args:
+        tickers: Comma-separated ticker symbols (required)
+        
+    Returns:
+        BrandingBatchResponse with branding per ticker and an error message for
+        each ticker that could not be resolved
+        
+    Raises:
+        400: If no tickers are given or more than 200 are requested
+    """
+    ticker_list = [t for t in tickers.split(",") if t.strip()]
+    if not ticker_list:
+        raise HTTPException(
+            status_code=400,
+            detail="Tickers parameter is required and cannot be empty"
+        )
+    
+    try:
+        logger.info(f"Fetching branding for {len(ticker_list)} tickers")
+        results, errors = await get_company_branding_batch(ticker_list)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        )
+    
+    return BrandingBatchResponse(
+        results={ticker: CompanyBrandingResponse(**branding) for ticker, branding in results.items()},
+        errors=errors,
+    )
+
+
+@router.get("/logo/{ticker}")
+async def get_logo(
+    request: Request,
+    ticker: str,
+    size: Optional[int] = Query(None, description="Thumbnail size in px (32, 64 or 128); omit for the original"),
+):
+    """
+    GET /branding/logo/{TICKER}?size={PX}
+    
+    Serve a company logo from the local logo cache. The image is fetched from
+    its source once and then served from disk with a long-lived Cache-Control
+    header and an ETag (304 when the client's copy is current).
+    
+    Args:
+        ticker: Stock ticker symbol
+        size: Optional thumbnail size (32, 64 or 128 px)
+        
+    Returns:
+        The image bytes
+        
+    Raises:
+        400: If the ticker or size is invalid
+        404: If no logo is available for the ticker
+    """
+    cache = get_logo_cache()
+    try:
+        logo = await run_io(cache.get, ticker, size)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        )
+    except LogoNotFoundError as e:
+        logger.debug(f"Logo not found for {ticker}: {e}")
+        raise HTTPException(
+            status_code=404,
+            detail=f"Logo not found for ticker: {ticker.upper().strip()}"
+        )
+    
+    headers = {
+        "ETag": logo.etag,
+        "Cache-Control": f"public, max-age={LOGO_MAX_AGE_SECONDS}",
+        # Logos are third-party bytes: never let a browser run them as a document
+        "Content-Security-Policy": "default-src 'none'",
+        "X-Content-Type-Options": "nosniff",
+    }
+    if etag_matches(request.headers.get("if-none-match"), logo.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=logo.body, media_type=logo.content_type, headers=headers)
+
+
 @router.get("", response_model=CompanyBrandingResponse)
 async def get_branding(ticker: str = Query(..., description="Stock ticker symbol (e.g., F, AAPL, MSFT)")):
     """
@@ -23,18 +23,22 @@ Client → FastAPI Router → (this file) → ingest_orchestrator / data access
 """
 
 #Imports 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from typing import Optional, List
 
 from app.core.database import get_db
+from app.core.executors import run_io
 from app.models.company import Company  # ORM model
 from app.services.ingestion.ingest_orchestrator import prepare_company_data  # Orchestration entrypoint
 from app.services.market_data.yfinance_market_data import (
+    fetch_prices_and_shares_bulk,
     get_company_price_and_shares,
     get_ford_price_and_shares,
 )
 
+MARKET_DATA_BULK_MAX_TICKERS = 200  # Largest screener page
+
 router = APIRouter(
     prefix="/companies",
     tags=["companies"]
@@ -135,10 +139,41 @@ async def read_ford_market_data():
         - shares_outstanding: Shares outstanding
         - market_cap: Market capitalization (if both price and shares available)
     """
-    data = get_ford_price_and_shares()
+    data = await run_io(get_ford_price_and_shares)
     return data
 
 
+@router.get("/market-data/bulk")
+async def read_market_data_bulk(
+    tickers: str = Query(..., description="Comma-separated ticker symbols (e.g., F,GM,TSLA)"),
+):
+    """
+    GET /companies/market-data/bulk?tickers={T1,T2,...}
+    
+    Return latest price and shares outstanding for many tickers at once
+    (one batched price download; share counts fetched concurrently).
+    
+    Args:
+        tickers: Comma-separated ticker symbols (up to 200)
+        
+    Returns:
+        Dictionary of ticker -> {last_price, shares_outstanding, market_cap}
+        (None where unavailable)
+    """
+    ticker_list = [t.strip() for t in tickers.split(",") if t.strip()]
+    if not ticker_list:
+        raise HTTPException(status_code=400, detail="Tickers parameter is required and cannot be empty")
+    if len(ticker_list) > MARKET_DATA_BULK_MAX_TICKERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many tickers: {len(ticker_list)} (maximum {MARKET_DATA_BULK_MAX_TICKERS})",
+        )
+    
+    frame = await run_io(fetch_prices_and_shares_bulk, ticker_list)
+    frame = frame.astype(object).where(frame.notna(), None)
+    return frame.to_dict(orient="index")
+
+
 @router.get("/market-data/{ticker}")
 async def read_market_data_by_ticker(ticker: str):
     """
@@ -157,7 +192,7 @@ async def read_market_data_by_ticker(ticker: str):
         - market_cap: Market capitalization (if both price and shares available)
     """
     from app.services.market_data.yfinance_market_data import fetch_price_and_shares_from_yfinance
-    data = fetch_price_and_shares_from_yfinance(ticker)
+    data = await run_io(fetch_price_and_shares_from_yfinance, ticker)
     return data
 
 
@@ -179,5 +214,5 @@ async def read_market_data_by_name(company_name: str, db=Depends(get_db)):
         - shares_outstanding: Shares outstanding
         - market_cap: Market capitalization (if both price and shares available)
     """
-    data = get_company_price_and_shares(company_name=company_name, session=db)
+    data = await run_io(get_company_price_and_shares, company_name=company_name, session=db)
     return data
\ No newline at end of file
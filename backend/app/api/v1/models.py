@@ -10,24 +10,44 @@ Endpoints:
 - POST /api/v1/models/search - Search company by ticker
 - POST /api/v1/models/fetch-financials - Fetch and parse financial data
 - POST /api/v1/models/generate - Generate complete model (3-statement, DCF, comps)
+- POST /api/v1/models/linked-statements - Linked 3-statement model (full balance sheet, debt schedule)
+- POST /api/v1/models/sensitivity - Computed N x M DCF sensitivity grid over any two inputs
+- POST /api/v1/models/monte-carlo - Monte Carlo distribution of implied share price
+- POST /api/v1/models/reverse-dcf - Implied growth / margin / WACC for current or target prices
+- POST /api/v1/models/scenarios - Value any number of named scenarios (or a generated grid)
 """
 
+import asyncio
+import math
+from dataclasses import asdict
+
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import Dict, Any, Optional, List
+from pydantic import BaseModel, Field
+from typing import Annotated, Dict, Any, Optional, List
 
+from app.core.executors import run_cpu, run_io
+from app.data.fmp_async_client import AsyncFmpClient
 from app.services.ingestion.live_fetcher import fetch_company_live, search_company_by_ticker
-from app.services.modeling.three_statement import run_three_statement
-from app.services.modeling.dcf import run_dcf
-from app.services.modeling.comps import run_comps
-from app.services.modeling.types import (
-    build_company_model_input_from_normalized_facts,
-    CompanyModelInput,
+from app.services.modeling.monte_carlo import (
+    DEFAULT_HISTOGRAM_BINS,
+    DEFAULT_PERCENTILES,
+    MONTE_CARLO_MAX_PATHS,
+    build_simulation_config,
+    chunk_plan,
+    simulate_chunk,
+    summarize_simulation,
 )
+from app.services.modeling.pipeline import run_linked_pipeline, run_model_pipeline
+from app.services.modeling.scenario_engine import run_scenarios, scenario_grid, scenario_records
+from app.services.modeling.reverse_dcf import DEFAULT_INPUTS as REVERSE_DCF_DEFAULTS, solve_implied
+from app.services.modeling.sensitivity_engine import DEFAULT_GRID_SIZE, MAX_GRID_SIZE, compute_sensitivity
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+MAX_SCENARIOS = 100_000  # Named + generated scenarios per /scenarios request
+MAX_SCENARIO_AXIS_VALUES = 1_000  # Values per /scenarios grid axis
+
 router = APIRouter(
     prefix="/models",
     tags=["models"]
@@ -81,6 +101,119 @@ class GenerateModelResponse(BaseModel):
     comps: Dict[str, Any]
 
 
+class LinkedStatementsRequest(BaseModel):
+    ticker: str
+    frequency: str = "annual"  # "annual" or "quarterly"
+    historical_periods: int = 5
+    forecast_periods: int = Field(5, ge=1, le=50)
+    assumptions: Dict[str, Any] = {}  # run_three_statement keys plus financing assumptions
+    average_balances: bool = True  # Interest on average balances (circular) or opening balances
+
+
+class LinkedStatementsResponse(BaseModel):
+    company_info: Dict[str, Any]
+    historical_financials: Dict[str, Dict[str, Dict[str, float]]]
+    statements: Dict[str, Any]  # Periods, one list per line, balance_check, converged, iterations
+
+
+class SensitivityAxis(BaseModel):
+    input: str  # "wacc", "terminal_growth_rate", "revenue_growth", "operating_margin_target", "exit_multiple"
+    values: Optional[List[float]] = None  # Explicit axis values; otherwise centered on the base value
+    step: Optional[float] = None
+    size: int = Field(DEFAULT_GRID_SIZE, ge=1, le=MAX_GRID_SIZE)
+
+
+class SensitivityRequest(BaseModel):
+    inputs: Dict[str, Any] = {}  # Base case (revenue, cogs, operating_expense, assumptions, wacc, shares_outstanding, ...)
+    rows: SensitivityAxis = SensitivityAxis(input="wacc")
+    columns: SensitivityAxis = SensitivityAxis(input="terminal_growth_rate")
+
+
+class SensitivityResponse(BaseModel):
+    row_input: str
+    row_values: List[float]
+    column_input: str
+    column_values: List[float]
+    metric: str  # "implied_share_price" or "enterprise_value"
+    values: List[List[Optional[float]]]  # rows x columns; null = invalid combination
+    base_row: Optional[int] = None
+    base_column: Optional[int] = None
+
+
+class MonteCarloCorrelation(BaseModel):
+    a: str
+    b: str
+    rho: float  # Spearman rank correlation
+
+
+class MonteCarloRequest(BaseModel):
+    inputs: Dict[str, Any] = {}  # Base case (revenue, cogs, operating_expense, shares_outstanding, debt, cash, fixed assumptions, ...)
+    distributions: Optional[Dict[str, Dict[str, Any]]] = None  # Input -> distribution spec (None = defaults)
+    correlations: List[MonteCarloCorrelation] = []
+    paths: int = Field(100_000, ge=1, le=MONTE_CARLO_MAX_PATHS)
+    seed: Optional[int] = None
+    percentiles: List[float] = list(DEFAULT_PERCENTILES)
+    bins: int = Field(DEFAULT_HISTOGRAM_BINS, ge=1, le=1000)
+
+
+class MonteCarloResponse(BaseModel):
+    metric: str  # "implied_share_price" or "enterprise_value"
+    paths: int
+    valid_paths: int
+    seed: Optional[int] = None
+    mean: float
+    std: float
+    percentiles: Dict[str, float]
+    histogram_edges: List[float]
+    histogram_counts: List[int]
+    underflow: int
+    overflow: int
+
+
+class ReverseDcfCompany(BaseModel):
+    ticker: str
+    inputs: Dict[str, Any]  # Base case (revenue, cogs, operating_expense, shares_outstanding, assumptions, wacc, debt, cash)
+    target_price: Optional[float] = None  # None = current quote from FMP
+
+
+class ReverseDcfRequest(BaseModel):
+    solve_for: str = "revenue_growth"  # "revenue_growth", "operating_margin_target" or "wacc"
+    companies: List[ReverseDcfCompany] = Field(..., min_length=1, max_length=5000)
+
+
+class ReverseDcfResult(BaseModel):
+    ticker: str
+    target_price: Optional[float] = None
+    implied_value: Optional[float] = None
+    base_value: Optional[float] = None
+    status: str  # "solved", "no_solution", "invalid_input" or "no_quote"
+
+
+class ReverseDcfResponse(BaseModel):
+    solve_for: str
+    iterations: int
+    results: List[ReverseDcfResult]
+
+
+class ScenarioGrid(BaseModel):
+    base: Dict[str, Any] = {}  # Assumptions shared by every generated scenario
+    # Input -> values; every combination becomes a scenario
+    axes: Dict[str, Annotated[List[Any], Field(min_length=1, max_length=MAX_SCENARIO_AXIS_VALUES)]]
+
+
+class ScenariosRequest(BaseModel):
+    latest_historical: Dict[str, float]  # revenue (required), cogs, operating_expense
+    scenarios: Dict[str, Dict[str, Any]] = {}  # Scenario name -> assumptions
+    grid: Optional[ScenarioGrid] = None
+    forecast_periods: int = Field(5, ge=1, le=50)
+
+
+class ScenariosResponse(BaseModel):
+    scenarios: List[Dict[str, Any]]  # One row per scenario: inputs + valuation
+    unique_projections: int
+    unique_valuations: int
+
+
 # -----------------------------------------------------------------------------
 # Endpoints
 # -----------------------------------------------------------------------------
@@ -94,7 +227,7 @@ async def search_company(request: SearchRequest):
     Returns basic company information from EDGAR (ticker, CIK, name).
     """
     try:
-        result = search_company_by_ticker(request.ticker)
+        result = await run_io(search_company_by_ticker, request.ticker)
         return SearchResponse(**result)
     except Exception as exc:
         logger.exception("Error searching for company: %s", exc)
@@ -115,7 +248,7 @@ async def fetch_financials(request: FetchFinancialsRequest):
     Returns structured financial data organized by statement type and period.
     """
     try:
-        result = fetch_company_live(request.ticker, years=request.years)
+        result = await run_io(fetch_company_live, request.ticker, years=request.years)
         
         if not result.get("periods"):
             raise HTTPException(
@@ -150,12 +283,16 @@ async def generate_model(request: GenerateModelRequest):
     4. Calculate DCF valuation
     5. Compute comps multiples
     
-    All processing is done live without database persistence.
+    All processing is done live without database persistence. EDGAR I/O runs
+    on the I/O thread pool and the modeling steps on the CPU process pool, so
+    the event loop stays free for other requests.
     """
     try:
         # Step 1: Fetch company financial data
         logger.info("Fetching financial data for %s", request.ticker)
-        company_data = fetch_company_live(request.ticker, years=request.historical_periods)
+        company_data = await run_io(
+            fetch_company_live, request.ticker, years=request.historical_periods
+        )
         
         if not company_data.get("periods"):
             raise HTTPException(
@@ -163,87 +300,15 @@ async def generate_model(request: GenerateModelRequest):
                 detail=f"No financial data found for ticker: {request.ticker}"
             )
         
-        # Step 2: Build CompanyModelInput from normalized facts
-        logger.info("Building CompanyModelInput from normalized facts")
-        model_input = build_company_model_input_from_normalized_facts(
-            ticker=company_data["ticker"],
-            name=company_data["name"],
-            financials_by_statement=company_data["financials"],
-            periods=company_data["periods"],
-        )
-        
-        # Step 3: Generate 3-statement projections
-        logger.info("Generating 3-statement projections")
-        projections = run_three_statement(
-            model_input=model_input,
-            assumptions=request.assumptions,
-            forecast_periods=request.forecast_periods,
-            frequency=request.frequency,
+        # Steps 2-5: Build model input, 3-statement, DCF and comps (CPU-bound)
+        model = await run_cpu(
+            run_model_pipeline,
+            company_data,
+            request.assumptions,
+            request.forecast_periods,
+            request.frequency,
         )
         
-        # Step 4: Calculate DCF
-        logger.info("Calculating DCF valuation")
-        dcf_assumptions = {
-            "wacc": request.assumptions.get("wacc", 0.10),
-            "terminal_growth_rate": request.assumptions.get("terminal_growth_rate", 0.025),
-            "shares_outstanding": request.assumptions.get("shares_outstanding"),
-            "debt": request.assumptions.get("debt", 0.0),
-            "cash": request.assumptions.get("cash", 0.0),
-        }
-        dcf_result = run_dcf(projections, dcf_assumptions)
-        
-        # Step 5: Calculate comps (simplified - no peers in MVP)
-        logger.info("Calculating comps multiples")
-        comps_result = run_comps(model_input=model_input, comparables=None)
-        
-        # Convert dataclass outputs to dicts for response
-        projections_dict = {
-            "periods": projections.periods,
-            "revenue": projections.revenue,
-            "cogs": projections.cogs,
-            "gross_profit": projections.gross_profit,
-            "operating_expense": projections.operating_expense,
-            "operating_income": projections.operating_income,
-            "net_income": projections.net_income,
-            "capex": projections.capex,
-            "depreciation": projections.depreciation,
-            "free_cash_flow": projections.free_cash_flow,
-        }
-        
-        dcf_dict = {
-            "yearly_results": [
-                {
-                    "year": r.year,
-                    "ufcf": r.ufcf,
-                    "discount_factor": r.discount_factor,
-                    "pv_ufcf": r.pv_ufcf,
-                }
-                for r in dcf_result.yearly_results
-            ],
-            "terminal_value": dcf_result.terminal_value,
-            "pv_terminal_value": dcf_result.pv_terminal_value,
-            "enterprise_value": dcf_result.enterprise_value,
-            "equity_value": dcf_result.equity_value,
-            "implied_share_price": dcf_result.implied_share_price,
-            "wacc": dcf_result.wacc,
-            "terminal_growth_rate": dcf_result.terminal_growth_rate,
-        }
-        
-        comps_dict = {
-            "subject_company": comps_result.subject_company,
-            "subject_metrics": comps_result.subject_metrics,
-            "comparables": [
-                {
-                    "name": c.name,
-                    "ev_ebitda": c.ev_ebitda,
-                    "pe": c.pe,
-                    "ev_sales": c.ev_sales,
-                }
-                for c in comps_result.comparables
-            ],
-            "implied_values": comps_result.implied_values,
-        }
-        
         return GenerateModelResponse(
             company_info={
                 "ticker": company_data["ticker"],
@@ -252,9 +317,9 @@ async def generate_model(request: GenerateModelRequest):
                 "taxonomy": company_data["taxonomy"],
             },
             historical_financials=company_data["financials"],
-            projections=projections_dict,
-            dcf=dcf_dict,
-            comps=comps_dict,
+            projections=model["projections"],
+            dcf=model["dcf"],
+            comps=model["comps"],
         )
         
     except HTTPException:
@@ -263,3 +328,208 @@ async def generate_model(request: GenerateModelRequest):
         logger.exception("Error generating model: %s", exc)
         raise HTTPException(status_code=500, detail=f"Error generating model: {str(exc)}")
 
+
+@router.post("/linked-statements", response_model=LinkedStatementsResponse)
+async def linked_statements(request: LinkedStatementsRequest):
+    """
+    Generate a linked 3-statement model on-the-fly.
+
+    Same operating projections as /generate, plus a balance sheet linked
+    through the cash flow statement: working capital from days, PP&E
+    roll-forward, debt schedule (amortization, cash sweep, revolver) and
+    equity roll-forward, with interest on average balances solved for the
+    circularity. EDGAR I/O runs on the I/O thread pool and the model on the
+    CPU process pool.
+    """
+    try:
+        logger.info("Fetching financial data for %s", request.ticker)
+        company_data = await run_io(
+            fetch_company_live, request.ticker, years=request.historical_periods
+        )
+
+        if not company_data.get("periods"):
+            raise HTTPException(
+                status_code=404,
+                detail=f"No financial data found for ticker: {request.ticker}"
+            )
+
+        statements = await run_cpu(
+            run_linked_pipeline,
+            company_data,
+            request.assumptions,
+            request.forecast_periods,
+            request.frequency,
+            request.average_balances,
+        )
+
+        return LinkedStatementsResponse(
+            company_info={
+                "ticker": company_data["ticker"],
+                "cik": company_data["cik"],
+                "name": company_data["name"],
+                "taxonomy": company_data["taxonomy"],
+            },
+            historical_financials=company_data["financials"],
+            statements=statements,
+        )
+
+    except HTTPException:
+        raise
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except Exception as exc:
+        logger.exception("Error generating linked statements: %s", exc)
+        raise HTTPException(status_code=500, detail=f"Error generating linked statements: {str(exc)}")
+
+
+@router.post("/sensitivity", response_model=SensitivityResponse)
+async def sensitivity_grid(request: SensitivityRequest):
+    """
+    Compute a DCF sensitivity grid of any size over any two inputs.
+
+    Each axis is WACC, terminal growth, revenue growth, operating margin
+    target or exit multiple, given as explicit values or as step/size around the base case.
+    Every cell is valued in one vectorized batch on the CPU process pool, and
+    the response matrix is the same data the Excel grid sheet writes.
+    """
+    try:
+        result = await run_cpu(
+            compute_sensitivity,
+            request.inputs,
+            request.rows.model_dump(),
+            request.columns.model_dump(),
+        )
+        return SensitivityResponse(**result)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except Exception as exc:
+        logger.exception("Error computing sensitivity grid: %s", exc)
+        raise HTTPException(status_code=500, detail=f"Error computing sensitivity grid: {str(exc)}")
+
+
+@router.post("/monte-carlo", response_model=MonteCarloResponse)
+async def monte_carlo(request: MonteCarloRequest):
+    """
+    Simulate a distribution of implied share price.
+
+    Revenue growth, operating margin target, capex %, WACC, terminal growth
+    (or any other run_three_statement assumption) are sampled from the
+    requested distributions, with optional rank correlations. Paths run in
+    fixed-size chunks spread over the CPU process pool; chunk seeds derive
+    from `seed`, so the same request always returns the same result.
+    """
+    try:
+        config = build_simulation_config(
+            request.inputs,
+            request.distributions,
+            [(c.a, c.b, c.rho) for c in request.correlations],
+        )
+        chunks = await asyncio.gather(*(
+            run_cpu(simulate_chunk, config, seed_sequence, size)
+            for seed_sequence, size in chunk_plan(request.paths, request.seed)
+        ))
+        result = summarize_simulation(
+            chunks, config["metric"], request.seed, request.percentiles, request.bins
+        )
+        return MonteCarloResponse(**asdict(result))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except Exception as exc:
+        logger.exception("Error running Monte Carlo valuation: %s", exc)
+        raise HTTPException(status_code=500, detail=f"Error running Monte Carlo valuation: {str(exc)}")
+
+
+@router.post("/reverse-dcf", response_model=ReverseDcfResponse)
+async def reverse_dcf(request: ReverseDcfRequest):
+    """
+    Solve for the revenue growth, operating margin target or WACC implied by a share price.
+
+    Companies without a target_price are priced at their current FMP quote
+    (fetched concurrently). The whole peer set is solved in one vectorized
+    pass: closed form for the margin, bracketed Newton for growth and WACC.
+    """
+    try:
+        targets: List[Optional[float]] = [c.target_price for c in request.companies]
+        missing = [i for i, price in enumerate(targets) if price is None]
+        no_quote = set()
+        if missing:
+            async with AsyncFmpClient() as client:
+                quotes = await asyncio.gather(
+                    *(client.fetch_quote(request.companies[i].ticker.upper()) for i in missing),
+                    return_exceptions=True,
+                )
+            for i, quote in zip(missing, quotes):
+                if isinstance(quote, BaseException) or not quote.get("price"):
+                    logger.warning("No quote for %s: %s", request.companies[i].ticker, quote)
+                    no_quote.add(i)
+                else:
+                    targets[i] = float(quote["price"])
+
+        result = await run_cpu(
+            solve_implied,
+            [c.inputs for c in request.companies],
+            targets,
+            request.solve_for,
+        )
+        return ReverseDcfResponse(
+            solve_for=result.solve_for,
+            iterations=result.iterations,
+            results=[
+                ReverseDcfResult(
+                    ticker=company.ticker.upper(),
+                    target_price=targets[i],
+                    implied_value=None if result.implied_value[i] != result.implied_value[i] else float(result.implied_value[i]),
+                    base_value=company.inputs.get(request.solve_for, REVERSE_DCF_DEFAULTS.get(request.solve_for)),
+                    status="no_quote" if i in no_quote else result.status[i],
+                )
+                for i, company in enumerate(request.companies)
+            ],
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except Exception as exc:
+        logger.exception("Error solving reverse DCF: %s", exc)
+        raise HTTPException(status_code=500, detail=f"Error solving reverse DCF: {str(exc)}")
+
+
+@router.post("/scenarios", response_model=ScenariosResponse)
+async def scenarios(request: ScenariosRequest):
+    """
+    Value any number of named scenarios, plus an optional generated grid.
+
+    Scenarios that share operating assumptions share one projection and
+    identical scenarios share one valuation; everything is valued in one
+    batched pass on the CPU process pool.
+    """
+    try:
+        # Count the grid before building it: the product of the axes can be huge
+        total = len(request.scenarios)
+        if request.grid is not None:
+            total += math.prod(len(values) for values in request.grid.axes.values())
+        if total > MAX_SCENARIOS:
+            raise HTTPException(status_code=400, detail=f"At most {MAX_SCENARIOS} scenarios per request")
+
+        named = dict(request.scenarios)
+        if request.grid is not None:
+            generated = scenario_grid(request.grid.base, request.grid.axes)
+            clashes = sorted(named.keys() & generated.keys())
+            if clashes:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Scenario names clash with generated grid scenarios: {', '.join(clashes[:5])}",
+                )
+            named.update(generated)
+
+        table = await run_cpu(run_scenarios, request.latest_historical, named, request.forecast_periods)
+        return ScenariosResponse(
+            scenarios=scenario_records(table),
+            unique_projections=table.attrs["unique_projections"],
+            unique_valuations=table.attrs["unique_valuations"],
+        )
+    except HTTPException:
+        raise
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except Exception as exc:
+        logger.exception("Error running scenarios: %s", exc)
+        raise HTTPException(status_code=500, detail=f"Error running scenarios: {str(exc)}")
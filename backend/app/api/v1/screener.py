@@ -10,18 +10,32 @@ Endpoints:
 - GET /meta/sectors → Returns list of available sectors
 - GET /meta/industries → Returns list of available industries
 - GET /industry-screener → Returns filtered list of companies
+
+Sector, industry and ticker lists are served from a warm, pre-serialized
+cache (app.services.screener.meta_cache) with ETag / If-None-Match support.
+
+The screener is served from a periodically refreshed local universe
+(app.services.screener.screener_universe); FMP is only called per request
+when the local universe is disabled or unavailable.
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel, ConfigDict
 from typing import List, Optional, Dict, Any
 
+from app.core.etags import etag_matches
+from app.core.executors import run_io
 from app.core.logging import get_logger
-from app.data.fmp_client import (
-    fetch_available_sectors,
-    fetch_available_industries,
-    fetch_company_screener,
-    fetch_available_tickers,
+from app.data.fmp_client import fetch_company_screener
+from app.services.screener.meta_cache import META_CACHE_MAX_AGE_SECONDS, get_meta_cache
+from app.services.screener.screener_universe import (
+    DEFAULT_SORT,
+    SORT_FIELDS,
+    InvalidCursorError,
+    columns_to_rows,
+    get_screener_universe_manager,
+    normalize_screener_payload,
 )
 
 logger = get_logger(__name__)
@@ -94,29 +108,45 @@ class ScreenerResponse(BaseModel):
     page: int
     pageSize: int
     results: List[CompanyResult]
+    total: Optional[int] = None
+    nextCursor: Optional[str] = None
 
 
 # -----------------------------------------------------------------------------
 # Routes
 # -----------------------------------------------------------------------------
 
+async def _meta_response(request: Request, name: str) -> Response:
+    """Serve a cached meta list as pre-serialized JSON, or 304 if the client's copy is current."""
+    cache = get_meta_cache()
+    # Warm cache: answer on the event loop; cold cache: load on the I/O pool
+    entry = cache.peek(name) or await run_io(cache.get, name)
+    headers = {
+        "ETag": entry.etag,
+        "Cache-Control": f"public, max-age={META_CACHE_MAX_AGE_SECONDS}",
+    }
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
 @router.get("/sectors", response_model=List[str])
-async def get_sectors():
+async def get_sectors(request: Request):
     """
     GET /meta/sectors
     
-    Retrieve list of available sectors from FMP.
+    Retrieve list of available sectors from FMP (served from the warm meta cache).
     
     Returns:
-        JSON array of sector name strings
+        JSON array of sector name strings, with an ETag header; 304 Not Modified
+        when If-None-Match matches
         
     Raises:
         500: If FMP API call fails
     """
     try:
         logger.info("Fetching available sectors")
-        sectors = fetch_available_sectors()
-        return sectors
+        return await _meta_response(request, "sectors")
     except Exception as e:
         logger.error(f"Error fetching sectors: {e}")
         raise HTTPException(
@@ -126,22 +156,22 @@ async def get_sectors():
 
 
 @router.get("/industries", response_model=List[str])
-async def get_industries():
+async def get_industries(request: Request):
     """
     GET /meta/industries
     
-    Retrieve list of available industries from FMP.
+    Retrieve list of available industries from FMP (served from the warm meta cache).
     
     Returns:
-        JSON array of industry name strings
+        JSON array of industry name strings, with an ETag header; 304 Not Modified
+        when If-None-Match matches
         
     Raises:
         500: If FMP API call fails
     """
     try:
         logger.info("Fetching available industries")
-        industries = fetch_available_industries()
-        return industries
+        return await _meta_response(request, "industries")
     except Exception as e:
         logger.error(f"Error fetching industries: {e}")
         raise HTTPException(
@@ -151,14 +181,16 @@ async def get_industries():
 
 
 @router.get("/tickers", response_model=List[Dict[str, Any]])
-async def get_tickers():
+async def get_tickers(request: Request):
     """
     GET /meta/tickers
     
-    Retrieve list of all available ticker symbols from FMP.
+    Retrieve list of all available ticker symbols from FMP (served from the
+    warm meta cache).
     
     Returns:
-        JSON array of ticker objects. Each object contains:
+        JSON array of ticker objects, with an ETag header; 304 Not Modified
+        when If-None-Match matches. Each object contains:
         - symbol: str (ticker symbol, e.g., "AAPL")
         - name: str (company name)
         - exchange: str (exchange code, e.g., "NASDAQ", "NYSE")
@@ -169,8 +201,7 @@ async def get_tickers():
     """
     try:
         logger.info("Fetching available tickers")
-        tickers = fetch_available_tickers()
-        return tickers
+        return await _meta_response(request, "tickers")
     except Exception as e:
         logger.error(f"Error fetching tickers: {e}")
         raise HTTPException(
@@ -193,7 +224,10 @@ async def get_industry_screener(
     minCap: Optional[int] = Query(None, description="Minimum market cap in dollars"),
     maxCap: Optional[int] = Query(None, description="Maximum market cap in dollars"),
     page: int = Query(0, ge=0, description="Page number (0-indexed)"),
-    pageSize: int = Query(50, gt=0, le=200, description="Number of results per page (max 200)")
+    pageSize: int = Query(50, gt=0, le=200, description="Number of results per page (max 200)"),
+    sort: str = Query(DEFAULT_SORT, description=f"Sort field ({', '.join(SORT_FIELDS)})"),
+    order: str = Query("desc", pattern="^(asc|desc)$", description="Sort order (asc or desc)"),
+    cursor: Optional[str] = Query(None, description="Page cursor from a previous response's nextCursor"),
 ):
     """
     GET /industry-screener
@@ -207,9 +241,18 @@ async def get_industry_screener(
         maxCap: Optional maximum market cap in dollars
         page: Page number (default: 0)
         pageSize: Results per page (default: 50, max: 200)
+        sort: Sort field (default: marketCap)
+        order: Sort order (default: desc)
+        cursor: Stable page cursor; takes precedence over page. Cursors keep
+                paging consistent even if the universe is refreshed in between.
         
     Returns:
-        ScreenerResponse with paginated company results
+        ScreenerResponse (documented via response_model; rows are normalized in
+        bulk and serialized directly, without per-row model validation) with
+        paginated company results, the total number of
+        matches and nextCursor (null on the last page). When the local universe
+        is unavailable, results come straight from FMP (no total/nextCursor and
+        sort/cursor are ignored).
         
     Raises:
         400: If validation fails
@@ -226,8 +269,41 @@ async def get_industry_screener(
             f"page={page}, pageSize={pageSize}"
         )
         
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"Invalid sort '{sort}'. Must be one of: {', '.join(SORT_FIELDS)}")
+        
+        # Serve from the local universe when available
+        manager = get_screener_universe_manager()
+        universe = None
+        if manager is not None:
+            try:
+                universe = manager.peek() or await run_io(manager.get)
+            except Exception as e:
+                logger.warning(f"Screener universe unavailable, falling back to FMP: {e}")
+        
+        if universe is not None:
+            local = universe.query(
+                sector=normalized_sector,
+                industry=normalized_industry,
+                market_cap_min=minCap,
+                market_cap_max=maxCap,
+                sort=sort,
+                descending=(order == "desc"),
+                page=page,
+                page_size=pageSize,
+                cursor=cursor,
+            )
+            return JSONResponse({
+                "page": page,
+                "pageSize": pageSize,
+                "results": local["results"],
+                "total": local["total"],
+                "nextCursor": local["next_cursor"],
+            })
+        
         # Call FMP screener
-        raw_results = fetch_company_screener(
+        raw_results = await run_io(
+            fetch_company_screener,
             sector=normalized_sector,
             industry=normalized_industry,
             market_cap_min=minCap,
@@ -236,60 +312,23 @@ async def get_industry_screener(
             page=page,
         )
         
-        # Transform FMP response to normalized format
-        results = []
-        for company in raw_results:
-            # Map FMP fields to our schema
-            # Handle various possible field names from FMP
-            symbol = company.get("symbol") or company.get("Symbol") or ""
-            name = company.get("companyName") or company.get("name") or company.get("company_name") or ""
-            sector_val = company.get("sector") or company.get("Sector") or ""
-            industry_val = company.get("industry") or company.get("Industry") or ""
-            market_cap = company.get("marketCap") or company.get("market_cap") or company.get("MarketCap") or 0
-            website = company.get("website") or company.get("Website") or None
-            logo_url = company.get("image") or company.get("logo") or company.get("logoUrl") or company.get("Image") or None
-            description = company.get("description") or company.get("Description") or company.get("about") or None
-            ceo = company.get("ceo") or company.get("CEO") or company.get("ceoName") or None
-            employees = company.get("fullTimeEmployees") or company.get("employees") or company.get("Employees") or company.get("full_time_employees") or None
-            
-            # Convert market cap to int if it's a float or string
-            if isinstance(market_cap, float):
-                market_cap = int(market_cap)
-            elif isinstance(market_cap, str):
-                try:
-                    market_cap = int(float(market_cap))
-                except (ValueError, TypeError):
-                    market_cap = 0
-            
-            # Convert employees to int if it's a float or string
-            if employees is not None:
-                if isinstance(employees, float):
-                    employees = int(employees)
-                elif isinstance(employees, str):
-                    try:
-                        employees = int(float(employees))
-                    except (ValueError, TypeError):
-                        employees = None
-            
-            results.append(CompanyResult(
-                symbol=symbol,
-                name=name,
-                sector=sector_val,
-                industry=industry_val,
-                marketCap=market_cap,
-                website=website,
-                logoUrl=logo_url,
-                description=description,
-                ceo=ceo,
-                employees=employees,
-            ))
+        # Transform FMP response to normalized format (whole payload at once)
+        results = columns_to_rows(normalize_screener_payload(raw_results))
         
-        return ScreenerResponse(
-            page=page,
-            pageSize=pageSize,
-            results=results
-        )
+        return JSONResponse({
+            "page": page,
+            "pageSize": pageSize,
+            "results": results,
+            "total": None,
+            "nextCursor": None,
+        })
         
+    except InvalidCursorError as e:
+        logger.error(f"Cursor error in screener: {e}")
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        )
     except ValueError as e:
         logger.error(f"Validation error in screener: {e}")
         raise HTTPException(
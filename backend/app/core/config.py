@@ -141,7 +141,6 @@ class Settings(BaseSettings):
         description="Maximum retry attempts for LLM API calls",
     )
 
-<<<<<<< HEAD
     # Financial Modeling Prep API - For company profile data
     FMP_API_KEY: str = Field(
         "",
@@ -155,7 +154,7 @@ class Settings(BaseSettings):
         if isinstance(v, str):
             return v.strip()
         return v or ""
-=======
+
     # Database Configuration (Supabase)
     SUPABASE_DB_URL: str = Field(
         "",
@@ -175,7 +174,6 @@ class Settings(BaseSettings):
         "",
         description="Path or URL to S&P 500 ticker list (CSV or JSON)",
     )
->>>>>>> 0251f9db5f18529bdb0bfc587a03702c55279b35
 
     model_config = SettingsConfigDict(
         env_file=_ENV_FILE_PATH,
@@ -0,0 +1,108 @@
+"""
+executors.py — Managed executors for blocking work called from async endpoints.
+
+Async routes must never call blocking code directly: one slow FMP / EDGAR /
+yfinance call would stall every other request on the worker. Instead they
+await one of two process-wide pools:
+    * run_io()  - ThreadPoolExecutor for blocking network / disk / DB calls
+    * run_cpu() - ProcessPoolExecutor for CPU-heavy modeling (bypasses the GIL)
+
+Configuration via environment variables:
+    IO_EXECUTOR_WORKERS  - I/O threads (default: 32)
+    CPU_EXECUTOR_WORKERS - Modeling processes (default: CPU count; 0 runs
+                           CPU work on the I/O pool instead of processes)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, TypeVar
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+IO_EXECUTOR_WORKERS = int(os.getenv("IO_EXECUTOR_WORKERS", "32"))
+CPU_EXECUTOR_WORKERS = int(os.getenv("CPU_EXECUTOR_WORKERS", str(os.cpu_count() or 1)))
+
+_io_executor: ThreadPoolExecutor | None = None
+_cpu_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_io_executor() -> ThreadPoolExecutor:
+    """Return the shared I/O thread pool, creating it on first use."""
+    global _io_executor
+    if _io_executor is None:
+        with _executor_lock:
+            if _io_executor is None:
+                _io_executor = ThreadPoolExecutor(
+                    max_workers=IO_EXECUTOR_WORKERS,
+                    thread_name_prefix="io",
+                )
+                logger.info(f"Started I/O executor with {IO_EXECUTOR_WORKERS} threads")
+    return _io_executor
+
+
+def get_cpu_executor() -> Executor:
+    """
+    Return the shared CPU process pool, creating it on first use.
+
+    Falls back to the I/O thread pool when CPU_EXECUTOR_WORKERS is 0.
+    """
+    global _cpu_executor
+    if CPU_EXECUTOR_WORKERS <= 0:
+        return get_io_executor()
+    if _cpu_executor is None:
+        with _executor_lock:
+            if _cpu_executor is None:
+                _cpu_executor = ProcessPoolExecutor(max_workers=CPU_EXECUTOR_WORKERS)
+                logger.info(f"Started CPU executor with {CPU_EXECUTOR_WORKERS} processes")
+    return _cpu_executor
+
+
+async def run_io(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking I/O function on the shared thread pool and await its result.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_io_executor(), partial(func, *args, **kwargs))
+
+
+async def run_cpu(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a CPU-heavy function on the shared process pool and await its result.
+
+    func must be a module-level function and its arguments / result must be
+    picklable.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_cpu_executor(), partial(func, *args, **kwargs))
+
+
+def shutdown_executors(wait: bool = True) -> None:
+    """Shut down both pools (called on application shutdown)."""
+    global _io_executor, _cpu_executor
+    with _executor_lock:
+        io_executor, cpu_executor = _io_executor, _cpu_executor
+        _io_executor = _cpu_executor = None
+    if cpu_executor is not None:
+        cpu_executor.shutdown(wait=wait, cancel_futures=True)
+    if io_executor is not None:
+        io_executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def executor_stats() -> Dict[str, Any]:
+    """Return configured sizes and whether each pool has been started."""
+    return {
+        "io_workers": IO_EXECUTOR_WORKERS,
+        "io_started": _io_executor is not None,
+        "cpu_workers": CPU_EXECUTOR_WORKERS,
+        "cpu_started": _cpu_executor is not None,
+    }
@@ -0,0 +1,239 @@
+"""
+lru_ttl_cache.py — Size-bounded in-process LRU cache with per-entry TTL.
+
+Entries expire ttl_seconds after they are stored and the least recently used
+entry is evicted once max_entries is reached, so memory stays bounded no
+matter how many distinct keys are requested.
+
+An optional shared backend (SqliteCacheBackend) lets several worker processes
+share one cache: misses in the in-process LRU fall through to the backend, and
+stores are written to both.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Sentinel for cache misses (None is a valid cached value)
+MISSING = object()
+
+
+class SqliteCacheBackend:
+    """
+    Shared key/value cache in a local SQLite file (JSON values, per-row timestamps).
+
+    Safe to use from several threads and processes; each thread gets its own
+    connection and SQLite serializes writers.
+    """
+
+    def __init__(self, path: Path, table: str = "cache") -> None:
+        """
+        Args:
+            path: SQLite database file (created if missing)
+            table: Table name, so several caches can share one file
+        """
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table!r}")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.table = table
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str, ttl_seconds: float) -> Tuple[Any, float] | None:
+        """Return (value, stored_at) if present and younger than ttl_seconds."""
+        row = self._connection().execute(
+            f"SELECT value, stored_at FROM {self.table} WHERE key = ? AND stored_at > ?",
+            (key, time.time() - ttl_seconds),
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def set(self, key: str, value: Any, stored_at: float) -> None:
+        with self._connection() as conn:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, stored_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), stored_at),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._connection() as conn:
+            conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def prune(self, ttl_seconds: float) -> int:
+        """Delete expired rows; return how many were removed."""
+        with self._connection() as conn:
+            cursor = conn.execute(
+                f"DELETE FROM {self.table} WHERE stored_at <= ?",
+                (time.time() - ttl_seconds,),
+            )
+            return cursor.rowcount
+
+    def clear(self) -> None:
+        with self._connection() as conn:
+            conn.execute(f"DELETE FROM {self.table}")
+
+
+class LruTtlCache:
+    """
+    Thread-safe LRU cache with a fixed TTL and hit/miss counters.
+
+    Example:
+        cache = LruTtlCache(max_entries=1000, ttl_seconds=3600)
+        value = cache.get("AAPL")
+        if value is MISSING:
+            value = fetch(...)
+            cache.set("AAPL", value)
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        name: str = "cache",
+        backend: Optional[SqliteCacheBackend] = None,
+    ) -> None:
+        """
+        Args:
+            max_entries: Maximum number of entries kept in process
+            ttl_seconds: Entry lifetime
+            name: Label used in log messages and stats
+            backend: Optional shared backend (keys must be strings, values JSON-able)
+        """
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be at least 1, got {max_entries}")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.name = name
+        self.backend = backend
+
+        self._lock = threading.Lock()
+        # key -> (value, stored_at), ordered least -> most recently used
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+
+        self.hits = 0
+        self.backend_hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self._sets = 0
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Return the cached value, or MISSING if absent or expired.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, stored_at = entry
+                if now - stored_at < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+                self.expirations += 1
+
+        if self.backend is not None:
+            try:
+                shared = self.backend.get(str(key), self.ttl_seconds)
+            except sqlite3.Error as e:
+                logger.warning(f"{self.name}: shared cache read failed: {e}")
+                shared = None
+            if shared is not None:
+                value, stored_at = shared
+                with self._lock:
+                    self.backend_hits += 1
+                    self._store_locked(key, value, stored_at)
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return MISSING
+
+    def _store_locked(self, key: Hashable, value: Any, stored_at: float) -> None:
+        self._entries[key] = (value, stored_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value (in process and, if configured, in the shared backend)."""
+        stored_at = time.time()
+        with self._lock:
+            self._store_locked(key, value, stored_at)
+            self._sets += 1
+            prune = self.backend is not None and self._sets % 500 == 0
+
+        if self.backend is not None:
+            try:
+                self.backend.set(str(key), value, stored_at)
+                if prune:
+                    self.backend.prune(self.ttl_seconds)
+            except sqlite3.Error as e:
+                logger.warning(f"{self.name}: shared cache write failed: {e}")
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove one entry."""
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.backend is not None:
+            self.backend.delete(str(key))
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+        if self.backend is not None:
+            self.backend.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return cache counters.
+
+        Returns:
+            Dictionary with entries, max_entries, ttl_seconds, hits, backend_hits,
+            misses, expirations, evictions and hit_rate
+        """
+        with self._lock:
+            lookups = self.hits + self.backend_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "shared_backend": str(self.backend.path) if self.backend else None,
+                "hits": self.hits,
+                "backend_hits": self.backend_hits,
+                "misses": self.misses,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits + self.backend_hits) / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,180 @@
+"""
+single_flight.py — Request coalescing for concurrent identical upstream calls.
+
+When several callers ask for the same thing at the same moment (e.g., many
+users opening the same ticker, or a cache TTL expiring under load), only the
+first caller performs the upstream fetch; the others wait for it and share
+its result (or its exception). Nothing is cached once the call completes —
+this only collapses calls that overlap in time.
+
+The caller that ran the call gets its result; every coalesced caller gets a
+deep copy, so one caller mutating its result (e.g., normalizing a list of
+statement dicts in place) cannot corrupt another's.
+
+Works from threads (do) and from asyncio code (do_async); async callers and
+threaded callers for the same key share one in-flight call.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import threading
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Hashable, Tuple, TypeVar
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class _InFlightCall:
+    """A single in-flight call and the outcome shared with its waiters."""
+
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one execution.
+
+    Example:
+        flight = SingleFlight("profile")
+        profile = flight.do(("profile", "AAPL"), lambda: fetch_company_profile("AAPL"))
+    """
+
+    def __init__(self, name: str = "single-flight", copy_results: bool = True) -> None:
+        """
+        Args:
+            name: Label used in log messages and stats
+            copy_results: Give coalesced callers a deep copy of the result;
+                disable only for immutable results (bytes, tuples, frozen objects)
+        """
+        self.name = name
+        self.copy_results = copy_results
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _InFlightCall] = {}
+        # (loop id, key) -> [future, number of coalesced coroutines]
+        self._async_calls: Dict[Tuple[int, Hashable], list] = {}
+
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        Run fn() unless a call with the same key is already in flight.
+
+        Args:
+            key: Normalized request key (must be hashable)
+            fn: Zero-argument callable performing the upstream fetch
+
+        Returns:
+            Result of fn() (coalesced callers get a deep copy, see copy_results)
+
+        Raises:
+            Whatever fn() raised, re-raised in every waiting caller
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _InFlightCall()
+                self._calls[key] = call
+                self.executions += 1
+                leader = True
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return self._shared(call.result)
+
+        try:
+            result = fn()
+            return result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            if call.error is None and call.waiters:
+                # Waiters copy a snapshot taken before this caller can mutate its result
+                call.result = self._shared(result)
+            call.done.set()
+            if call.waiters:
+                logger.debug(f"{self.name}: shared one call for {key!r} with {call.waiters} waiter(s)")
+
+    async def do_async(
+        self,
+        key: Hashable,
+        fn: Callable[[], T],
+        executor: Executor | None = None,
+    ) -> T:
+        """
+        Async variant of do(): runs the blocking fn() on an executor.
+
+        Concurrent coroutines on the same event loop await one executor job;
+        that job goes through do(), so it also coalesces with threaded callers.
+
+        Args:
+            key: Normalized request key (must be hashable)
+            fn: Zero-argument blocking callable performing the upstream fetch
+            executor: Executor to run fn() on (default: the loop's default executor)
+
+        Returns:
+            Result of fn()
+        """
+        loop = asyncio.get_running_loop()
+        loop_key = (id(loop), key)
+
+        entry = self._async_calls.get(loop_key)
+        leader = entry is None
+        if leader:
+            entry = [loop.run_in_executor(executor, self.do, key, fn), 0]
+            self._async_calls[loop_key] = entry
+            entry[0].add_done_callback(lambda _: self._async_calls.pop(loop_key, None))
+        else:
+            entry[1] += 1
+            with self._lock:
+                self.coalesced += 1
+
+        # shield() so one cancelled waiter does not cancel the shared call
+        result = await asyncio.shield(entry[0])
+        # Every coroutine awaiting the future receives the same object
+        return result if leader and not entry[1] else self._shared(result)
+
+    def _shared(self, result: T) -> T:
+        """The result as handed to a coalesced caller."""
+        return copy.deepcopy(result) if self.copy_results else result
+
+    def in_flight(self) -> int:
+        """Return the number of keys currently being fetched."""
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return coalescing counters.
+
+        Returns:
+            Dictionary with executions (upstream calls made), coalesced (callers
+            that shared another caller's call) and in_flight
+        """
+        with self._lock:
+            return {
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls),
+            }
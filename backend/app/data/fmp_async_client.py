@@ -0,0 +1,291 @@
+"""
+fmp_async_client.py — asyncio counterpart to fmp_client.
+
+This module exposes the same fetch_* surface as app.data.fmp_client as
+coroutines, so callers can fan out many FMP calls at once:
+    * All statements for one ticker concurrently (fetch_financial_statements)
+    * Many tickers at once (fetch_financial_statements_many)
+
+Every call runs the existing synchronous fetch_* function on a worker thread,
+so parsing, validation and retry behaviour stay identical and all calls share
+the pooled keep-alive session from fmp_client. A global semaphore caps the
+number of in-flight requests across the whole client.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, TypeVar
+
+from app.core.logging import get_logger
+from app.data import fmp_client
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# Global cap on in-flight FMP requests (defaults to the connection pool size)
+FMP_ASYNC_MAX_CONCURRENCY = int(
+    os.getenv("FMP_ASYNC_MAX_CONCURRENCY", str(fmp_client.FMP_POOL_SIZE))
+)
+
+
+class AsyncFmpClient:
+    """
+    Async FMP client with bounded concurrency.
+
+    Example:
+        client = AsyncFmpClient(max_concurrency=10)
+        results = await client.fetch_financial_statements_many(["AAPL", "MSFT"])
+        client.close()
+    """
+
+    def __init__(self, max_concurrency: int = FMP_ASYNC_MAX_CONCURRENCY) -> None:
+        """
+        Args:
+            max_concurrency: Maximum number of FMP requests in flight at once
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, got {max_concurrency}")
+
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency,
+            thread_name_prefix="fmp-async",
+        )
+        self._semaphore: asyncio.Semaphore | None = None
+
+    async def __aenter__(self) -> "AsyncFmpClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the worker threads."""
+        self._executor.shutdown(wait=False)
+
+    async def _call(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a synchronous fmp_client function under the concurrency cap."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    # ------------------------------------------------------------------ #
+    # fetch_* surface (mirrors app.data.fmp_client)
+    # ------------------------------------------------------------------ #
+    async def fetch_income_statement(self, symbol: str, limit: int = 10) -> List[Dict[str, Any]]:
+        return await self._call(fmp_client.fetch_income_statement, symbol, limit=limit)
+
+    async def fetch_balance_sheet(self, symbol: str, limit: int = 10) -> List[Dict[str, Any]]:
+        return await self._call(fmp_client.fetch_balance_sheet, symbol, limit=limit)
+
+    async def fetch_cash_flow(self, symbol: str, limit: int = 10) -> List[Dict[str, Any]]:
+        return await self._call(fmp_client.fetch_cash_flow, symbol, limit=limit)
+
+    async def fetch_financial_report_json(self, symbol: str, year: int, period: str = "FY") -> Any:
+        return await self._call(fmp_client.fetch_financial_report_json, symbol, year, period=period)
+
+    async def fetch_quote(self, symbol: str) -> Dict[str, Any]:
+        return await self._call(fmp_client.fetch_quote, symbol)
+
+    async def fetch_historical_prices(
+        self,
+        symbol: str,
+        from_date: str | None = None,
+        to_date: str | None = None,
+        limit: int | None = None,
+    ) -> List[Dict[str, Any]]:
+        return await self._call(
+            fmp_client.fetch_historical_prices,
+            symbol,
+            from_date=from_date,
+            to_date=to_date,
+            limit=limit,
+        )
+
+    async def fetch_enterprise_value(self, symbol: str, limit: int = 10) -> List[Dict[str, Any]]:
+        return await self._call(fmp_client.fetch_enterprise_value, symbol, limit=limit)
+
+    async def fetch_company_profile(self, symbol: str) -> Dict[str, Any]:
+        return await self._call(fmp_client.fetch_company_profile, symbol)
+
+    async def fetch_available_sectors(self) -> List[str]:
+        return await self._call(fmp_client.fetch_available_sectors)
+
+    async def fetch_available_industries(self) -> List[str]:
+        return await self._call(fmp_client.fetch_available_industries)
+
+    async def fetch_company_screener(
+        self,
+        sector: str | None = None,
+        industry: str | None = None,
+        market_cap_min: int | None = None,
+        market_cap_max: int | None = None,
+        limit: int = 100,
+        page: int = 0,
+    ) -> List[Dict[str, Any]]:
+        return await self._call(
+            fmp_client.fetch_company_screener,
+            sector=sector,
+            industry=industry,
+            market_cap_min=market_cap_min,
+            market_cap_max=market_cap_max,
+            limit=limit,
+            page=page,
+        )
+
+    async def fetch_available_tickers(self) -> List[Dict[str, Any]]:
+        return await self._call(fmp_client.fetch_available_tickers)
+
+    # ------------------------------------------------------------------ #
+    # Fan-out helpers
+    # ------------------------------------------------------------------ #
+    async def fetch_financial_statements(
+        self,
+        symbol: str,
+        limit: int = 10,
+        include_quote: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Fetch income statement, balance sheet, cash flow and quote concurrently.
+
+        Args:
+            symbol: Stock ticker symbol (e.g., "F" for Ford)
+            limit: Number of periods to fetch for each statement
+            include_quote: Also fetch the latest quote (default: True)
+
+        Returns:
+            Dictionary with keys "income_statement", "balance_sheet", "cash_flow"
+            and "quote". A failed quote is logged and returned as None; statement
+            failures are raised.
+
+        Raises:
+            RuntimeError: If any statement fetch fails
+        """
+        statement_calls = [
+            self.fetch_income_statement(symbol, limit=limit),
+            self.fetch_balance_sheet(symbol, limit=limit),
+            self.fetch_cash_flow(symbol, limit=limit),
+        ]
+        if include_quote:
+            statement_calls.append(self.fetch_quote(symbol))
+
+        results = await asyncio.gather(*statement_calls, return_exceptions=True)
+
+        for result in results[:3]:
+            if isinstance(result, BaseException):
+                raise result
+
+        quote = None
+        if include_quote:
+            quote = results[3]
+            if isinstance(quote, BaseException):
+                logger.warning(f"Failed to fetch quote data for {symbol}: {quote}")
+                quote = None
+
+        return {
+            "income_statement": results[0],
+            "balance_sheet": results[1],
+            "cash_flow": results[2],
+            "quote": quote,
+        }
+
+    async def fetch_financial_statements_many(
+        self,
+        symbols: Iterable[str],
+        limit: int = 10,
+        include_quote: bool = True,
+    ) -> Dict[str, Dict[str, Any] | BaseException]:
+        """
+        Fetch statements for many tickers at once under the global concurrency cap.
+
+        Args:
+            symbols: Ticker symbols to fetch
+            limit: Number of periods to fetch for each statement
+            include_quote: Also fetch the latest quote for each ticker
+
+        Returns:
+            Dictionary mapping each symbol to its fetch_financial_statements() result,
+            or to the exception raised for that symbol (one failing ticker does not
+            abort the batch)
+        """
+        unique_symbols = list(dict.fromkeys(s.upper() for s in symbols))
+        logger.info(
+            f"Fetching statements for {len(unique_symbols)} tickers "
+            f"(max_concurrency={self.max_concurrency})"
+        )
+
+        results = await asyncio.gather(
+            *(
+                self.fetch_financial_statements(s, limit=limit, include_quote=include_quote)
+                for s in unique_symbols
+            ),
+            return_exceptions=True,
+        )
+
+        failures = sum(1 for r in results if isinstance(r, BaseException))
+        logger.info(f"Fetched {len(unique_symbols) - failures} tickers ({failures} failed)")
+        return dict(zip(unique_symbols, results))
+
+
+def run_async(coro: Awaitable[T]) -> T:
+    """
+    Run a coroutine to completion from synchronous code.
+
+    Uses asyncio.run() normally; if an event loop is already running in this
+    thread (e.g., inside a FastAPI handler), runs it on a helper thread instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    result: Dict[str, Any] = {}
+
+    def _runner() -> None:
+        try:
+            result["value"] = asyncio.run(coro)
+        except BaseException as exc:  # pylint: disable=broad-except
+            result["error"] = exc
+
+    thread = threading.Thread(target=_runner, name="fmp-async-runner")
+    thread.start()
+    thread.join()
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
+
+
+def fetch_financial_statements_bulk(
+    symbols: Iterable[str],
+    limit: int = 10,
+    include_quote: bool = True,
+    max_concurrency: int = FMP_ASYNC_MAX_CONCURRENCY,
+) -> Dict[str, Dict[str, Any] | BaseException]:
+    """
+    Synchronous entry point for bulk statement fetches (scripts, orchestrator).
+
+    Args:
+        symbols: Ticker symbols to fetch
+        limit: Number of periods to fetch for each statement
+        include_quote: Also fetch the latest quote for each ticker
+        max_concurrency: Maximum number of FMP requests in flight at once
+
+    Returns:
+        See AsyncFmpClient.fetch_financial_statements_many()
+    """
+    async def _run() -> Dict[str, Dict[str, Any] | BaseException]:
+        async with AsyncFmpClient(max_concurrency=max_concurrency) as client:
+            return await client.fetch_financial_statements_many(
+                symbols, limit=limit, include_quote=include_quote
+            )
+
+    return run_async(_run())
@@ -0,0 +1,386 @@
+"""
+fmp_cache.py — Persistent on-disk response cache for FMP /stable endpoints.
+
+Responses are stored as JSON files, content-addressed by a SHA-256 hash of the
+endpoint path plus query parameters (the apikey is never part of the key or
+the stored file). Each endpoint has its own freshness TTL and
+stale-while-revalidate window:
+    * fresh            -> served from disk, no API call
+    * stale (in window)-> served from disk, refreshed on a background thread
+    * expired / missing-> fetched synchronously and stored
+
+Error payloads ({"Error Message": ...}) are never stored; empty responses are
+kept for NEGATIVE_CACHE_TTL only, so a transient empty answer does not stick
+for the endpoint's full TTL.
+
+The cache directory is size-bounded; least recently used entries are evicted
+first. Entries written by other processes sharing the directory are picked up
+on first access.
+
+Configuration via environment variables:
+    FMP_CACHE_ENABLED - "0"/"false" disables the cache (default: enabled)
+    FMP_CACHE_DIR     - Cache directory (default: backend/data/fmp_cache)
+    FMP_CACHE_MAX_MB  - Maximum cache size on disk in MB (default: 256)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+# Endpoint path -> (ttl_seconds, stale_while_revalidate_seconds)
+FMP_CACHE_TTLS: Dict[str, Tuple[int, int]] = {
+    # Fundamentals change at most quarterly
+    "income-statement": (7 * DAY, 30 * DAY),
+    "balance-sheet-statement": (7 * DAY, 30 * DAY),
+    "cash-flow-statement": (7 * DAY, 30 * DAY),
+    "financial-reports-json": (30 * DAY, 90 * DAY),
+    "enterprise-value": (DAY, 7 * DAY),
+    "enterprise-values": (DAY, 7 * DAY),
+    "enterprisevalue": (DAY, 7 * DAY),
+    # Company metadata and reference lists
+    "profile": (DAY, 7 * DAY),
+    "available-sectors": (DAY, 7 * DAY),
+    "available-industries": (DAY, 7 * DAY),
+    "financial-statement-symbol-list": (DAY, 7 * DAY),
+    "company-screener": (HOUR, DAY),
+    # Prices
+    "historical-price-full": (6 * HOUR, DAY),
+    "historical-price": (6 * HOUR, DAY),
+    "stock-price": (6 * HOUR, DAY),
+    "quote": (15, 30),
+}
+DEFAULT_CACHE_TTL: Tuple[int, int] = (HOUR, 0)
+# Lifetime of empty responses ([], {}, null); no stale window
+NEGATIVE_CACHE_TTL = 5 * MINUTE
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent.parent / "data" / "fmp_cache"
+DEFAULT_CACHE_MAX_MB = 256
+
+# Query parameters never included in cache keys
+_EXCLUDED_PARAMS = {"apikey"}
+
+
+def cache_key(path: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Build the content-addressed cache key for an FMP request.
+
+    Args:
+        path: API path (leading slash ignored)
+        params: Query parameters (apikey is excluded)
+
+    Returns:
+        Hex SHA-256 digest of the normalized path + sorted params
+    """
+    clean_params = {
+        k: str(v) for k, v in (params or {}).items()
+        if k not in _EXCLUDED_PARAMS and v is not None
+    }
+    canonical = json.dumps(
+        {"path": path.strip("/"), "params": clean_params},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def is_error_payload(data: Any) -> bool:
+    """True for FMP error bodies such as {"Error Message": "..."}."""
+    return isinstance(data, dict) and "Error Message" in data
+
+
+def is_empty_payload(data: Any) -> bool:
+    """True for empty responses ([], {}, null)."""
+    return data is None or (isinstance(data, (list, dict)) and not data)
+
+
+class FmpResponseCache:
+    """
+    Size-bounded, LRU-evicted, on-disk JSON cache with per-endpoint TTLs.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_CACHE_MAX_MB * 1024 * 1024,
+        ttls: Optional[Dict[str, Tuple[int, int]]] = None,
+    ) -> None:
+        """
+        Args:
+            cache_dir: Directory holding cache entries
+            max_bytes: Maximum total size of cache entries on disk
+            ttls: Optional per-endpoint (ttl, stale_while_revalidate) overrides
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttls = dict(FMP_CACHE_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+
+        self._lock = threading.Lock()
+        self._refreshing: set = set()
+        # key -> size in bytes, ordered least -> most recently used
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._load_index()
+
+    def _load_index(self) -> None:
+        """Rebuild the LRU index from files on disk (mtime = last access)."""
+        entries = []
+        for entry_file in self.cache_dir.glob("*.json"):
+            try:
+                stat = entry_file.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, entry_file.stem, stat.st_size))
+
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._total_bytes += size
+
+        logger.debug(
+            f"Loaded FMP cache index: {len(self._index)} entries, "
+            f"{self._total_bytes / (1024 * 1024):.1f} MB"
+        )
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def ttl_for(self, path: str) -> Tuple[int, int]:
+        """Return (ttl_seconds, stale_while_revalidate_seconds) for an endpoint path."""
+        return self.ttls.get(path.strip("/"), DEFAULT_CACHE_TTL)
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        entry_file = self._entry_path(key)
+        try:
+            with entry_file.open("r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            with self._lock:
+                size = self._index.pop(key, None)
+                if size is not None:
+                    self._total_bytes -= size
+            return None
+
+        # Touch for LRU ordering (survives restarts via mtime)
+        try:
+            os.utime(entry_file, None)
+            size = entry_file.stat().st_size
+        except OSError:
+            size = 0
+        evicted = []
+        with self._lock:
+            if key in self._index:
+                self._index.move_to_end(key)
+            else:
+                # Written by another process since the index was loaded
+                self._index[key] = size
+                self._total_bytes += size
+                evicted = self._evict_locked()
+
+        for evicted_key in evicted:
+            self._entry_path(evicted_key).unlink(missing_ok=True)
+        return entry
+
+    def _write(self, key: str, path: str, params: Optional[Dict[str, Any]], data: Any) -> None:
+        entry = {
+            "path": path.strip("/"),
+            "params": {k: v for k, v in (params or {}).items() if k not in _EXCLUDED_PARAMS},
+            "fetched_at": time.time(),
+            "data": data,
+        }
+        payload = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+
+        entry_file = self._entry_path(key)
+        tmp_file = entry_file.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            tmp_file.write_bytes(payload)
+            os.replace(tmp_file, entry_file)
+        except OSError as e:
+            logger.warning(f"Failed to write FMP cache entry {entry_file.name}: {e}")
+            tmp_file.unlink(missing_ok=True)
+            return
+
+        with self._lock:
+            self._total_bytes -= self._index.pop(key, 0)
+            self._index[key] = len(payload)
+            self._total_bytes += len(payload)
+            evicted = self._evict_locked()
+
+        for evicted_key in evicted:
+            self._entry_path(evicted_key).unlink(missing_ok=True)
+
+    def _evict_locked(self) -> list:
+        """Pop least recently used keys until under max_bytes (caller holds lock)."""
+        evicted = []
+        # Always keep the most recent entry, even if it alone exceeds the limit
+        while self._total_bytes > self.max_bytes and len(self._index) > 1:
+            key, size = self._index.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+            evicted.append(key)
+        return evicted
+
+    def _refresh_in_background(
+        self,
+        key: str,
+        path: str,
+        params: Optional[Dict[str, Any]],
+        fetch: Callable[[], Any],
+    ) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def _run() -> None:
+            try:
+                data = fetch()
+                if is_error_payload(data) or is_empty_payload(data):
+                    # Keep serving the last good response until it expires
+                    logger.debug(f"Background revalidation for {path} returned no data; kept cached entry")
+                    return
+                self._write(key, path, params, data)
+                logger.debug(f"Revalidated FMP cache entry for {path}")
+            except Exception as e:  # pylint: disable=broad-except
+                logger.warning(f"Background revalidation failed for {path}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=_run, name="fmp-cache-revalidate", daemon=True).start()
+
+    def get_or_fetch(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]],
+        fetch: Callable[[], Any],
+    ) -> Any:
+        """
+        Return cached JSON for path + params, calling fetch() only when needed.
+
+        Args:
+            path: API path (e.g., "income-statement")
+            params: Query parameters (apikey is ignored)
+            fetch: Zero-argument callable that performs the real API call
+
+        Returns:
+            Parsed JSON response (list or dict)
+        """
+        key = cache_key(path, params)
+        ttl, stale_window = self.ttl_for(path)
+
+        # Always consult disk: the index only knows entries this process has seen
+        entry = self._read(key)
+        if entry is not None:
+            age = time.time() - entry.get("fetched_at", 0)
+            if is_empty_payload(entry.get("data")):
+                ttl, stale_window = min(ttl, NEGATIVE_CACHE_TTL), 0
+            if age < ttl:
+                self.hits += 1
+                return entry["data"]
+            if age < ttl + stale_window:
+                self.stale_hits += 1
+                self._refresh_in_background(key, path, params, fetch)
+                return entry["data"]
+
+        self.misses += 1
+        data = fetch()
+        if is_error_payload(data):
+            logger.debug(f"Not caching FMP error response for {path}")
+        else:
+            self._write(key, path, params, data)
+        return data
+
+    def invalidate(self, path: str, params: Optional[Dict[str, Any]] = None) -> None:
+        """Remove a single cached response."""
+        key = cache_key(path, params)
+        with self._lock:
+            size = self._index.pop(key, None)
+            if size is not None:
+                self._total_bytes -= size
+        self._entry_path(key).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        with self._lock:
+            keys = list(self._index)
+            self._index.clear()
+            self._total_bytes = 0
+        for key in keys:
+            self._entry_path(key).unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache counters and size."""
+        with self._lock:
+            return {
+                "entries": len(self._index),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+def _cache_from_env() -> Optional[FmpResponseCache]:
+    """Build the FMP response cache from FMP_CACHE_* env vars (None if disabled)."""
+    enabled = os.getenv("FMP_CACHE_ENABLED", "1").strip().lower()
+    if enabled in {"0", "false", "no", "off"}:
+        logger.info("FMP response cache disabled (FMP_CACHE_ENABLED)")
+        return None
+
+    cache_dir = Path(os.getenv("FMP_CACHE_DIR") or DEFAULT_CACHE_DIR).expanduser()
+    max_mb = float(os.getenv("FMP_CACHE_MAX_MB", str(DEFAULT_CACHE_MAX_MB)))
+    return FmpResponseCache(cache_dir=cache_dir, max_bytes=int(max_mb * 1024 * 1024))
+
+
+# Process-wide cache (created lazily on first use)
+_fmp_cache: Optional[FmpResponseCache] = None
+_fmp_cache_initialized = False
+_fmp_cache_lock = threading.Lock()
+
+
+def get_fmp_cache() -> Optional[FmpResponseCache]:
+    """
+    Return the process-wide FMP response cache, or None if caching is disabled.
+    """
+    global _fmp_cache, _fmp_cache_initialized
+    if not _fmp_cache_initialized:
+        with _fmp_cache_lock:
+            if not _fmp_cache_initialized:
+                _fmp_cache = _cache_from_env()
+                _fmp_cache_initialized = True
+    return _fmp_cache
+
+
+def configure_fmp_cache(cache: Optional[FmpResponseCache]) -> None:
+    """
+    Replace the process-wide FMP response cache (pass None to disable caching).
+    """
+    global _fmp_cache, _fmp_cache_initialized
+    with _fmp_cache_lock:
+        _fmp_cache = cache
+        _fmp_cache_initialized = True
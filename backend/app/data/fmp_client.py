@@ -6,19 +6,27 @@ from the FMP REST API using the /stable endpoints.
 
 All API calls require an FMP_API_KEY environment variable.
 Designed to work with FMP Starter plan limits and includes retry/backoff logic.
+All requests go through one shared FmpHttpClient (pooled keep-alive session)
+and the on-disk response cache in app.data.fmp_cache.
 """
 
 from __future__ import annotations
 
+import json
 import os
+import threading
 import time
 from pathlib import Path
 from typing import Any, Dict, List
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 
 from app.core.logging import get_logger
+from app.core.single_flight import SingleFlight
+from app.data.fmp_cache import cache_key, get_fmp_cache
+from app.data.rate_limiter import TokenBucketRateLimiter, get_fmp_plan, get_fmp_rate_limiter
 
 # Load .env file if it exists (from project root)
 env_file = Path(__file__).parent.parent.parent / ".env"
@@ -34,6 +42,23 @@ FMP_BASE_URL = "https://financialmodelingprep.com/stable"
 MAX_RETRIES = 3
 RETRY_DELAY_BASE = 1.0  # Base delay in seconds (exponential backoff)
 
+# Connection pool configuration (shared keep-alive session)
+FMP_POOL_SIZE = int(os.getenv("FMP_POOL_SIZE", "10"))
+FMP_REQUEST_TIMEOUT = 30  # Per-request timeout in seconds
+
+# Persisted fallback-endpoint discovery (see FmpEndpointResolver)
+FMP_ENDPOINTS_FILE = Path(
+    os.getenv("FMP_ENDPOINTS_FILE")
+    or Path(__file__).parent.parent.parent / "data" / "fmp_endpoint_discovery.json"
+).expanduser()
+# Endpoints marked dead are re-probed after this long (plans and FMP's catalogue change)
+FMP_DEAD_ENDPOINT_TTL_HOURS = float(os.getenv("FMP_DEAD_ENDPOINT_TTL_HOURS", "168"))
+
+
+class FmpNotFoundError(RuntimeError):
+    """Raised when an FMP endpoint returns 404 Not Found (not retried)."""
+    pass
+
 
 def get_fmp_api_key() -> str:
     """
@@ -97,6 +122,242 @@ def get_fmp_api_key() -> str:
         return api_key_path_or_value.strip()
 
 
+class FmpHttpClient:
+    """
+    Thread-safe FMP HTTP client backed by a pooled, keep-alive requests.Session.
+    
+    One instance is shared by every fetch_* function (see get_fmp_client()), so
+    repeated calls reuse open TCP/TLS connections instead of paying a fresh
+    handshake per request. The API key is resolved once and then reused.
+    
+    Each request acquires a token from the process-wide rate limiter before it
+    is sent, so bulk jobs stay under the plan limit. HTTP 429 and 5xx errors
+    are still retried with exponential backoff as a safety net.
+    """
+    
+    def __init__(
+        self,
+        base_url: str = FMP_BASE_URL,
+        pool_size: int = FMP_POOL_SIZE,
+        api_key: str | None = None,
+        timeout: float = FMP_REQUEST_TIMEOUT,
+        rate_limiter: TokenBucketRateLimiter | None = None,
+    ) -> None:
+        """
+        Args:
+            base_url: API base URL (default: FMP /stable endpoints)
+            pool_size: Maximum number of pooled keep-alive connections per host
+            api_key: Optional API key (default: resolved lazily via get_fmp_api_key())
+            timeout: Per-request timeout in seconds
+            rate_limiter: Optional limiter (default: shared limiter from get_fmp_rate_limiter())
+        """
+        if pool_size < 1:
+            raise ValueError(f"pool_size must be at least 1, got {pool_size}")
+        
+        self.base_url = base_url.rstrip("/")
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._api_key = api_key
+        self._rate_limiter = rate_limiter
+        self._lock = threading.Lock()
+        self.request_count = 0
+        
+        # pool_block=True caps open connections at pool_size; extra threads wait
+        # for a free connection instead of opening (and discarding) new ones.
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            pool_block=True,
+        )
+        self._session = requests.Session()
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+    
+    @property
+    def api_key(self) -> str:
+        """API key, read from the environment once and cached."""
+        if self._api_key is None:
+            with self._lock:
+                if self._api_key is None:
+                    self._api_key = get_fmp_api_key()
+        return self._api_key
+    
+    @property
+    def rate_limiter(self) -> TokenBucketRateLimiter:
+        """Limiter acquired before every request."""
+        return self._rate_limiter or get_fmp_rate_limiter()
+    
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self._session.close()
+    
+    def get_json(
+        self,
+        path: str,
+        params: Dict[str, Any] | None = None,
+    ) -> Any:
+        """
+        Call {base_url}/{path} with params + apikey and return parsed JSON.
+        
+        Args:
+            path: API path (e.g., "income-statement" or "/income-statement")
+            params: Optional query parameters (apikey will be added automatically)
+            
+        Returns:
+            Parsed JSON response (list or dict)
+            
+        Raises:
+            RuntimeError: If API call fails or returns invalid data
+        """
+        # Build full URL - strip leading slash from path if present
+        clean_path = path.lstrip("/")
+        url = f"{self.base_url}/{clean_path}"
+        
+        # Prepare parameters - merge with apikey
+        request_params = params.copy() if params else {}
+        request_params["apikey"] = self.api_key
+        
+        logger.debug(f"Making FMP API request: {url}")
+        
+        # Retry logic for 429 and 5xx errors
+        last_exception = None
+        for attempt in range(MAX_RETRIES):
+            try:
+                self.rate_limiter.acquire()
+                with self._lock:
+                    self.request_count += 1
+                response = self._session.get(url, params=request_params, timeout=self.timeout)
+                
+                # Handle rate limiting (429)
+                if response.status_code == 429:
+                    self.rate_limiter.record_throttled()
+                    if attempt < MAX_RETRIES - 1:
+                        delay = RETRY_DELAY_BASE * (2 ** attempt)  # Exponential backoff
+                        logger.warning(
+                            f"Rate limited (429). Retrying in {delay:.1f}s "
+                            f"(attempt {attempt + 1}/{MAX_RETRIES})"
+                        )
+                        time.sleep(delay)
+                        continue
+                    else:
+                        raise RuntimeError(
+                            f"FMP API rate limit exceeded after {MAX_RETRIES} attempts. "
+                            f"Please wait and try again later."
+                        )
+                
+                # Handle server errors (5xx)
+                if response.status_code in {500, 502, 503, 504}:
+                    if attempt < MAX_RETRIES - 1:
+                        delay = RETRY_DELAY_BASE * (2 ** attempt)
+                        logger.warning(
+                            f"Server error {response.status_code}. Retrying in {delay:.1f}s "
+                            f"(attempt {attempt + 1}/{MAX_RETRIES})"
+                        )
+                        time.sleep(delay)
+                        continue
+                    else:
+                        response.raise_for_status()
+                
+                # Handle other HTTP errors
+                if response.status_code == 404:
+                    # Endpoint does not exist on this plan - retrying will not help
+                    raise FmpNotFoundError(
+                        f"FMP API returned 404 Not Found for endpoint '{clean_path}'."
+                    )
+                elif response.status_code == 401:
+                    raise RuntimeError(
+                        f"FMP API returned 401 Unauthorized. "
+                        f"Your API key may be invalid or expired.\n"
+                        f"Please verify your API key in the FMP dashboard."
+                    )
+                elif response.status_code == 403:
+                    # Try to get error message from response
+                    try:
+                        error_data = response.json()
+                        error_msg = error_data.get("Error Message", "Forbidden")
+                    except:
+                        error_msg = "Forbidden"
+                    
+                    raise RuntimeError(
+                        f"FMP API returned 403 Forbidden.\n"
+                        f"Error: {error_msg}\n"
+                        f"Please check your FMP account status and plan access."
+                    )
+                
+                response.raise_for_status()
+                
+                # Parse JSON
+                data = response.json()
+                
+                logger.debug(f"Successfully fetched data from {url}")
+                return data
+            
+            except requests.exceptions.RequestException as e:
+                last_exception = e
+                if attempt < MAX_RETRIES - 1:
+                    delay = RETRY_DELAY_BASE * (2 ** attempt)
+                    logger.warning(
+                        f"Request failed: {e}. Retrying in {delay:.1f}s "
+                        f"(attempt {attempt + 1}/{MAX_RETRIES})"
+                    )
+                    time.sleep(delay)
+                else:
+                    raise RuntimeError(
+                        f"Failed to fetch data from FMP API after {MAX_RETRIES} attempts: {e}\n"
+                        f"URL: {url}"
+                    ) from e
+        
+        # Should not reach here, but just in case
+        if last_exception:
+            raise RuntimeError(f"Failed after {MAX_RETRIES} attempts: {last_exception}")
+        raise RuntimeError("Unexpected error in retry logic")
+
+
+# Process-wide shared client (created lazily on first use)
+_shared_client: FmpHttpClient | None = None
+_shared_client_lock = threading.Lock()
+
+
+def get_fmp_client() -> FmpHttpClient:
+    """
+    Return the process-wide FmpHttpClient, creating it on first use.
+    
+    Returns:
+        Shared FmpHttpClient instance
+    """
+    global _shared_client
+    if _shared_client is None:
+        with _shared_client_lock:
+            if _shared_client is None:
+                _shared_client = FmpHttpClient()
+    return _shared_client
+
+
+def configure_fmp_client(**kwargs: Any) -> FmpHttpClient:
+    """
+    Replace the process-wide FmpHttpClient (e.g., to change pool size or base URL).
+    
+    The previous client's connections are closed.
+    
+    Args:
+        **kwargs: Keyword arguments passed to FmpHttpClient()
+        
+    Returns:
+        The new shared FmpHttpClient instance
+    """
+    global _shared_client
+    with _shared_client_lock:
+        old_client = _shared_client
+        _shared_client = FmpHttpClient(**kwargs)
+    if old_client is not None:
+        old_client.close()
+    return _shared_client
+
+
+# Coalesces concurrent identical requests (keyed by path + params, see _get_json)
+_request_flight = SingleFlight("fmp")
+
+
 def _get_json(
     path: str,
     params: Dict[str, Any] | None = None,
@@ -104,8 +365,11 @@ def _get_json(
     """
     Call FMP /stable/{path} with params + apikey and return parsed JSON.
     
-    Implements retry/backoff for HTTP 429 and 5xx errors to be
-    friendly to Starter plan limits.
+    Uses the shared pooled client so connections are reused across calls.
+    Responses are served from the on-disk FMP cache (per-endpoint TTLs,
+    stale-while-revalidate) when enabled, so repeat lookups cost no API calls.
+    Concurrent identical requests are coalesced into one upstream call, which
+    also prevents a stampede when a cache entry expires under load.
     
     Args:
         path: API path (e.g., "income-statement" or "/income-statement")
@@ -117,101 +381,190 @@ def _get_json(
     Raises:
         RuntimeError: If API call fails or returns invalid data
     """
-    api_key = get_fmp_api_key()
+    client = get_fmp_client()
+    cache = get_fmp_cache()
     
-    # Build full URL - strip leading slash from path if present
-    clean_path = path.lstrip("/")
-    url = f"{FMP_BASE_URL}/{clean_path}"
+    def _fetch() -> Any:
+        if cache is None:
+            return client.get_json(path, params)
+        return cache.get_or_fetch(path, params, lambda: client.get_json(path, params))
     
-    # Prepare parameters - merge with apikey
-    request_params = params.copy() if params else {}
-    request_params["apikey"] = api_key
+    return _request_flight.do(cache_key(path, params), _fetch)
+
+
+class FmpEndpointResolver:
+    """
+    Remembers which of several candidate endpoint names works on this FMP plan.
+    
+    Some data (historical prices, enterprise value) is served under different
+    /stable endpoint names depending on plan. The first call probes candidates
+    in order; the working endpoint and any 404 endpoints are then remembered
+    per plan, in memory and on disk, so later calls go straight to the working
+    endpoint and skip known-dead ones. Dead marks expire after dead_ttl
+    seconds, and if every candidate is marked dead the full list is retried.
+    """
     
-    logger.debug(f"Making FMP API request: {url}")
+    def __init__(
+        self,
+        path: Path = FMP_ENDPOINTS_FILE,
+        plan: str | None = None,
+        dead_ttl: float = FMP_DEAD_ENDPOINT_TTL_HOURS * 3600,
+    ) -> None:
+        """
+        Args:
+            path: JSON file used to persist discoveries
+            plan: FMP plan name (default: get_fmp_plan())
+            dead_ttl: Seconds before a dead endpoint is probed again
+        """
+        self.path = Path(path)
+        self.plan = plan or get_fmp_plan()
+        self.dead_ttl = dead_ttl
+        self._lock = threading.Lock()
+        self._state: Dict[str, Any] = self._load()
+        
+        self.probes = 0
+        self.discoveries = 0
+        self.skipped_dead = 0
     
-    # Retry logic for 429 and 5xx errors
-    last_exception = None
-    for attempt in range(MAX_RETRIES):
+    def _load(self) -> Dict[str, Any]:
         try:
-            response = requests.get(url, params=request_params, timeout=30)
-            
-            # Handle rate limiting (429)
-            if response.status_code == 429:
-                if attempt < MAX_RETRIES - 1:
-                    delay = RETRY_DELAY_BASE * (2 ** attempt)  # Exponential backoff
-                    logger.warning(
-                        f"Rate limited (429). Retrying in {delay:.1f}s "
-                        f"(attempt {attempt + 1}/{MAX_RETRIES})"
-                    )
-                    time.sleep(delay)
-                    continue
-                else:
-                    raise RuntimeError(
-                        f"FMP API rate limit exceeded after {MAX_RETRIES} attempts. "
-                        f"Please wait and try again later."
-                    )
-            
-            # Handle server errors (5xx)
-            if response.status_code in {500, 502, 503, 504}:
-                if attempt < MAX_RETRIES - 1:
-                    delay = RETRY_DELAY_BASE * (2 ** attempt)
-                    logger.warning(
-                        f"Server error {response.status_code}. Retrying in {delay:.1f}s "
-                        f"(attempt {attempt + 1}/{MAX_RETRIES})"
-                    )
-                    time.sleep(delay)
-                    continue
-                else:
-                    response.raise_for_status()
-            
-            # Handle other HTTP errors
-            if response.status_code == 401:
-                raise RuntimeError(
-                    f"FMP API returned 401 Unauthorized. "
-                    f"Your API key may be invalid or expired.\n"
-                    f"Please verify your API key in the FMP dashboard."
-                )
-            elif response.status_code == 403:
-                # Try to get error message from response
-                try:
-                    error_data = response.json()
-                    error_msg = error_data.get("Error Message", "Forbidden")
-                except:
-                    error_msg = "Forbidden"
-                
-                raise RuntimeError(
-                    f"FMP API returned 403 Forbidden.\n"
-                    f"Error: {error_msg}\n"
-                    f"Please check your FMP account status and plan access."
-                )
-            
-            response.raise_for_status()
-            
-            # Parse JSON
-            data = response.json()
+            with self.path.open("r", encoding="utf-8") as f:
+                state = json.load(f)
+            return state if isinstance(state, dict) else {}
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_locked(self) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with tmp_path.open("w", encoding="utf-8") as f:
+                json.dump(self._state, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to persist FMP endpoint discovery to {self.path}: {e}")
+    
+    def _group_state(self, group: str) -> Dict[str, Any]:
+        plan_state = self._state.setdefault(self.plan, {})
+        group_state = plan_state.setdefault(group, {"working": None, "dead": {}})
+        if isinstance(group_state.get("dead"), list):
+            # Older files stored a bare list without timestamps: re-probe them
+            group_state["dead"] = {endpoint: 0.0 for endpoint in group_state["dead"]}
+        return group_state
+    
+    def candidates(self, group: str, endpoints: List[str]) -> List[str]:
+        """
+        Return endpoints to try: known-working first, known-dead removed.
+        
+        Dead marks older than dead_ttl are dropped. If every candidate is
+        still marked dead, all of them are returned so the group can recover.
+        """
+        now = time.time()
+        with self._lock:
+            group_state = self._group_state(group)
+            working = group_state["working"]
+            expired = [e for e, dead_at in group_state["dead"].items() if now - dead_at >= self.dead_ttl]
+            for endpoint in expired:
+                del group_state["dead"][endpoint]
+            if expired:
+                self._save_locked()
+            dead = set(group_state["dead"])
+        
+        ordered = [working] if working in endpoints else []
+        ordered += [e for e in endpoints if e != working and e not in dead]
+        if not ordered:
+            logger.info(f"FMP endpoint discovery ({self.plan}/{group}): all candidates marked dead, retrying all")
+            return list(endpoints)
+        skipped = len([e for e in endpoints if e in dead and e != working])
+        if skipped:
+            self.skipped_dead += skipped
+        return ordered
+    
+    def mark_dead(self, group: str, endpoint: str) -> None:
+        with self._lock:
+            group_state = self._group_state(group)
+            if group_state["working"] == endpoint:
+                group_state["working"] = None
+            group_state["dead"][endpoint] = time.time()
+            self._save_locked()
+        logger.info(f"FMP endpoint discovery ({self.plan}/{group}): '{endpoint}' is unavailable")
+    
+    def mark_working(self, group: str, endpoint: str) -> None:
+        with self._lock:
+            group_state = self._group_state(group)
+            if group_state["working"] == endpoint:
+                return
+            group_state["working"] = endpoint
+            group_state["dead"].pop(endpoint, None)
+            group_state["discovered_at"] = time.time()
+            self.discoveries += 1
+            self._save_locked()
+        logger.info(f"FMP endpoint discovery ({self.plan}/{group}): using '{endpoint}'")
+    
+    def resolve(self, group: str, endpoints: List[str], call: Any) -> Any:
+        """
+        Call the working endpoint for a group, discovering it if necessary.
+        
+        Args:
+            group: Logical data name (e.g., "historical_prices")
+            endpoints: Candidate endpoint paths in preference order
+            call: Callable taking an endpoint path and returning parsed data;
+                  FmpNotFoundError marks the endpoint dead and moves on
+                  
+        Returns:
+            Result of call() for the first endpoint that works
             
-            logger.debug(f"Successfully fetched data from {url}")
-            return data
+        Raises:
+            FmpNotFoundError: If every candidate is (known to be) unavailable
+        """
+        for endpoint in self.candidates(group, endpoints):
+            self.probes += 1
+            try:
+                result = call(endpoint)
+            except FmpNotFoundError:
+                self.mark_dead(group, endpoint)
+                continue
+            self.mark_working(group, endpoint)
+            return result
         
-        except requests.exceptions.RequestException as e:
-            last_exception = e
-            if attempt < MAX_RETRIES - 1:
-                delay = RETRY_DELAY_BASE * (2 ** attempt)
-                logger.warning(
-                    f"Request failed: {e}. Retrying in {delay:.1f}s "
-                    f"(attempt {attempt + 1}/{MAX_RETRIES})"
-                )
-                time.sleep(delay)
-            else:
-                raise RuntimeError(
-                    f"Failed to fetch data from FMP API after {MAX_RETRIES} attempts: {e}\n"
-                    f"URL: {url}"
-                ) from e
+        raise FmpNotFoundError(
+            f"No available FMP endpoint for '{group}' on plan '{self.plan}' "
+            f"(candidates: {', '.join(endpoints)})"
+        )
     
-    # Should not reach here, but just in case
-    if last_exception:
-        raise RuntimeError(f"Failed after {MAX_RETRIES} attempts: {last_exception}")
-    raise RuntimeError("Unexpected error in retry logic")
+    def reset(self) -> None:
+        """Forget all discoveries for this plan (e.g., after a plan upgrade)."""
+        with self._lock:
+            self._state.pop(self.plan, None)
+            self._save_locked()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return discovery counters and the current state for this plan."""
+        with self._lock:
+            return {
+                "plan": self.plan,
+                "probes": self.probes,
+                "discoveries": self.discoveries,
+                "skipped_dead": self.skipped_dead,
+                "endpoints": json.loads(json.dumps(self._state.get(self.plan, {}))),
+            }
+
+
+# Process-wide endpoint resolver (created lazily on first use)
+_endpoint_resolver: FmpEndpointResolver | None = None
+_endpoint_resolver_lock = threading.Lock()
+
+
+def get_endpoint_resolver() -> FmpEndpointResolver:
+    """
+    Return the process-wide FmpEndpointResolver, creating it on first use.
+    """
+    global _endpoint_resolver
+    if _endpoint_resolver is None:
+        with _endpoint_resolver_lock:
+            if _endpoint_resolver is None:
+                _endpoint_resolver = FmpEndpointResolver()
+    return _endpoint_resolver
 
 
 def fetch_income_statement(
@@ -470,53 +823,43 @@ def fetch_historical_prices(
     if limit:
         logger.info(f"  Limit: {limit} days")
     
-    last_error = None
-    for endpoint_path in endpoints_to_try:
-        try:
-            data = _get_json(endpoint_path, params)
-            
-            # FMP returns historical data in a nested structure: {"historical": [...]}
-            if isinstance(data, dict):
-                if "historical" in data:
-                    historical = data["historical"]
-                    if isinstance(historical, list):
-                        logger.info(f"Successfully fetched {len(historical)} historical price records for {symbol}")
-                        return historical
-                elif "prices" in data:
-                    prices = data["prices"]
-                    if isinstance(prices, list):
-                        logger.info(f"Successfully fetched {len(prices)} historical price records for {symbol}")
-                        return prices
-                else:
-                    # Try to extract any list-like data that looks like price data
-                    for key, value in data.items():
-                        if isinstance(value, list) and len(value) > 0:
-                            first_item = value[0]
-                            if isinstance(first_item, dict) and "date" in first_item:
-                                logger.info(f"Successfully fetched {len(value)} historical price records for {symbol}")
-                                return value
-            elif isinstance(data, list):
-                logger.info(f"Successfully fetched {len(data)} historical price records for {symbol}")
-                return data
-            
-            raise RuntimeError(
-                f"FMP API returned unexpected data structure for historical prices. "
-                f"Expected dict with 'historical' key or list."
-            )
+    def _fetch(endpoint_path: str) -> List[Dict[str, Any]]:
+        data = _get_json(endpoint_path, params)
         
-        except RuntimeError as e:
-            last_error = e
-            # If it's a 404, try next endpoint
-            if "404" in str(e) or "Not Found" in str(e):
-                logger.debug(f"Endpoint {endpoint_path} returned 404, trying next...")
-                continue
+        # FMP returns historical data in a nested structure: {"historical": [...]}
+        if isinstance(data, dict):
+            if "historical" in data:
+                historical = data["historical"]
+                if isinstance(historical, list):
+                    logger.info(f"Successfully fetched {len(historical)} historical price records for {symbol}")
+                    return historical
+            elif "prices" in data:
+                prices = data["prices"]
+                if isinstance(prices, list):
+                    logger.info(f"Successfully fetched {len(prices)} historical price records for {symbol}")
+                    return prices
             else:
-                # Other errors, re-raise
-                raise
-    
-    # If all endpoints failed with 404, provide helpful error
-    if last_error and ("404" in str(last_error) or "Not Found" in str(last_error)):
+                # Try to extract any list-like data that looks like price data
+                for key, value in data.items():
+                    if isinstance(value, list) and len(value) > 0:
+                        first_item = value[0]
+                        if isinstance(first_item, dict) and "date" in first_item:
+                            logger.info(f"Successfully fetched {len(value)} historical price records for {symbol}")
+                            return value
+        elif isinstance(data, list):
+            logger.info(f"Successfully fetched {len(data)} historical price records for {symbol}")
+            return data
+        
         raise RuntimeError(
+            f"FMP API returned unexpected data structure for historical prices. "
+            f"Expected dict with 'historical' key or list."
+        )
+    
+    # The working endpoint is discovered once per plan; known-404 endpoints are skipped
+    try:
+        return get_endpoint_resolver().resolve("historical_prices", endpoints_to_try, _fetch)
+    except FmpNotFoundError as e:
+        raise FmpNotFoundError(
             f"Historical price endpoints are not available in FMP /stable API for {symbol}.\n"
             f"Tried endpoints: {', '.join(endpoints_to_try)}\n"
             f"\nPossible reasons:\n"
@@ -524,11 +867,7 @@ def fetch_historical_prices(
             f"  - Historical prices may require a higher subscription tier\n"
             f"  - The endpoint name may be different in your plan\n"
             f"\nCurrent quote data is available via fetch_quote()."
-        )
-    elif last_error:
-        raise last_error
-    else:
-        raise RuntimeError(f"Failed to fetch historical prices for {symbol}")
+        ) from e
 
 
 def fetch_enterprise_value(
@@ -567,37 +906,27 @@ def fetch_enterprise_value(
     
     logger.info(f"Fetching enterprise value for {symbol} (limit={limit})")
     
-    last_error = None
-    for endpoint_path in endpoints_to_try:
-        try:
-            data = _get_json(endpoint_path, params)
-            
-            if isinstance(data, list):
-                logger.info(f"Successfully fetched {len(data)} enterprise value record(s) for {symbol}")
-                return data
-            elif isinstance(data, dict):
-                # Some endpoints might return a single dict
-                logger.info(f"Successfully fetched enterprise value for {symbol}")
-                return [data]
-            else:
-                raise RuntimeError(
-                    f"FMP API returned unexpected data type for enterprise value: {type(data)}. "
-                    f"Expected list or dict."
-                )
+    def _fetch(endpoint_path: str) -> List[Dict[str, Any]]:
+        data = _get_json(endpoint_path, params)
         
-        except RuntimeError as e:
-            last_error = e
-            # If it's a 404, try next endpoint
-            if "404" in str(e) or "Not Found" in str(e):
-                logger.debug(f"Endpoint {endpoint_path} returned 404, trying next...")
-                continue
-            else:
-                # Other errors, re-raise
-                raise
+        if isinstance(data, list):
+            logger.info(f"Successfully fetched {len(data)} enterprise value record(s) for {symbol}")
+            return data
+        elif isinstance(data, dict):
+            # Some endpoints might return a single dict
+            logger.info(f"Successfully fetched enterprise value for {symbol}")
+            return [data]
+        else:
+            raise RuntimeError(
+                f"FMP API returned unexpected data type for enterprise value: {type(data)}. "
+                f"Expected list or dict."
+            )
     
-    # If all endpoints failed, provide helpful error message
-    if last_error and ("404" in str(last_error) or "Not Found" in str(last_error)):
-        raise RuntimeError(
+    # The working endpoint is discovered once per plan; known-404 endpoints are skipped
+    try:
+        return get_endpoint_resolver().resolve("enterprise_value", endpoints_to_try, _fetch)
+    except FmpNotFoundError as e:
+        raise FmpNotFoundError(
             f"Enterprise value endpoints are not available in FMP /stable API for {symbol}.\n"
             f"Tried endpoints: {', '.join(endpoints_to_try)}\n"
             f"\nPossible reasons:\n"
@@ -605,11 +934,7 @@ def fetch_enterprise_value(
             f"  - Enterprise value may require a higher subscription tier\n"
             f"  - The endpoint name may be different in your plan\n"
             f"\nYou can calculate enterprise value manually: EV = Market Cap + Total Debt - Cash"
-        )
-    elif last_error:
-        raise last_error
-    else:
-        raise RuntimeError(f"Failed to fetch enterprise value for {symbol}")
+        ) from e
 
 
 def fetch_company_profile(symbol: str) -> Dict[str, Any]:
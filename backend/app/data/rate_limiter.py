@@ -0,0 +1,233 @@
+"""
+rate_limiter.py — Process-wide token-bucket rate limiter for FMP API calls.
+
+Every FmpHttpClient request acquires a token before it is sent, so bulk jobs
+run at the maximum throughput the FMP plan allows instead of tripping 429s
+and relying on retry/backoff.
+
+Limits are configured per plan via environment variables:
+    FMP_PLAN              - "starter" (default), "premium" or "ultimate"
+    FMP_CALLS_PER_MINUTE  - Override the plan's calls/minute (0 disables limiting)
+    FMP_BURST             - Override the bucket size (max calls sent back-to-back)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# FMP plan limits: plan name -> (calls per minute, burst)
+FMP_PLAN_LIMITS: Dict[str, tuple] = {
+    "starter": (300, 10),
+    "premium": (750, 25),
+    "ultimate": (3000, 50),
+}
+DEFAULT_FMP_PLAN = "starter"
+
+
+class TokenBucketRateLimiter:
+    """
+    Thread-safe token bucket with sync and async acquire.
+
+    Tokens refill continuously at calls_per_minute / 60 per second up to burst.
+    Callers reserve a token under the lock and then sleep outside it, so waiters
+    are served in arrival order and the lock is never held while sleeping.
+    """
+
+    def __init__(
+        self,
+        calls_per_minute: float,
+        burst: Optional[int] = None,
+        name: str = "fmp",
+    ) -> None:
+        """
+        Args:
+            calls_per_minute: Sustained rate limit (0 or less disables limiting)
+            burst: Bucket size (default: 1 second worth of calls, at least 1)
+            name: Label used in log messages
+        """
+        self.name = name
+        self.calls_per_minute = calls_per_minute
+        self.enabled = calls_per_minute > 0
+        self.rate_per_second = calls_per_minute / 60.0 if self.enabled else 0.0
+        if burst is None:
+            burst = max(1, int(self.rate_per_second))
+        if burst < 1:
+            raise ValueError(f"burst must be at least 1, got {burst}")
+        self.burst = burst
+
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+
+        # Instrumentation counters
+        self._acquired = 0
+        self._waited = 0
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+        self._throttled_responses = 0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._last_refill
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate_per_second)
+            self._last_refill = now
+
+    def _reserve(self, tokens: int) -> float:
+        """Reserve tokens and return how long the caller must wait before sending."""
+        if not self.enabled:
+            with self._lock:
+                self._acquired += tokens
+            return 0.0
+
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= tokens
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate_per_second
+
+            self._acquired += tokens
+            if wait > 0:
+                self._waited += 1
+                self._total_wait_seconds += wait
+                self._max_wait_seconds = max(self._max_wait_seconds, wait)
+            return wait
+
+    def acquire(self, tokens: int = 1) -> float:
+        """
+        Block until tokens are available.
+
+        Args:
+            tokens: Number of tokens (API calls) to acquire
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            logger.debug(f"Rate limiter '{self.name}' waiting {wait:.3f}s")
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: int = 1) -> float:
+        """
+        Await until tokens are available without blocking the event loop.
+
+        Args:
+            tokens: Number of tokens (API calls) to acquire
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            logger.debug(f"Rate limiter '{self.name}' waiting {wait:.3f}s")
+            await asyncio.sleep(wait)
+        return wait
+
+    def record_throttled(self) -> None:
+        """
+        Record a 429 response and drain the bucket so all callers back off together.
+        """
+        with self._lock:
+            self._throttled_responses += 1
+            if self.enabled:
+                self._refill(time.monotonic())
+                self._tokens = min(self._tokens, 0.0)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Return limiter counters.
+
+        Returns:
+            Dictionary with calls_per_minute, burst, acquired, waited (number of
+            acquires that had to wait), total_wait_seconds, max_wait_seconds and
+            throttled_responses (429s seen despite limiting)
+        """
+        with self._lock:
+            return {
+                "calls_per_minute": self.calls_per_minute,
+                "burst": self.burst,
+                "acquired": self._acquired,
+                "waited": self._waited,
+                "total_wait_seconds": self._total_wait_seconds,
+                "max_wait_seconds": self._max_wait_seconds,
+                "throttled_responses": self._throttled_responses,
+            }
+
+
+def get_fmp_plan() -> str:
+    """
+    Return the configured FMP plan name (FMP_PLAN), falling back to the default.
+    """
+    plan = os.getenv("FMP_PLAN", DEFAULT_FMP_PLAN).strip().lower()
+    if plan not in FMP_PLAN_LIMITS:
+        logger.warning(
+            f"Unknown FMP_PLAN '{plan}', using '{DEFAULT_FMP_PLAN}' limits. "
+            f"Valid plans: {', '.join(FMP_PLAN_LIMITS)}"
+        )
+        plan = DEFAULT_FMP_PLAN
+    return plan
+
+
+def _limiter_from_env() -> TokenBucketRateLimiter:
+    """Build the FMP limiter from FMP_PLAN / FMP_CALLS_PER_MINUTE / FMP_BURST."""
+    plan = get_fmp_plan()
+    calls_per_minute, burst = FMP_PLAN_LIMITS[plan]
+    if os.getenv("FMP_CALLS_PER_MINUTE"):
+        calls_per_minute = float(os.getenv("FMP_CALLS_PER_MINUTE"))
+    if os.getenv("FMP_BURST"):
+        burst = int(os.getenv("FMP_BURST"))
+
+    logger.info(f"FMP rate limiter: plan={plan}, calls_per_minute={calls_per_minute}, burst={burst}")
+    return TokenBucketRateLimiter(calls_per_minute=calls_per_minute, burst=burst, name="fmp")
+
+
+# Process-wide FMP limiter (created lazily on first use)
+_fmp_limiter: Optional[TokenBucketRateLimiter] = None
+_fmp_limiter_lock = threading.Lock()
+
+
+def get_fmp_rate_limiter() -> TokenBucketRateLimiter:
+    """
+    Return the process-wide FMP rate limiter, creating it from env on first use.
+
+    Returns:
+        Shared TokenBucketRateLimiter instance
+    """
+    global _fmp_limiter
+    if _fmp_limiter is None:
+        with _fmp_limiter_lock:
+            if _fmp_limiter is None:
+                _fmp_limiter = _limiter_from_env()
+    return _fmp_limiter
+
+
+def configure_fmp_rate_limiter(
+    calls_per_minute: float,
+    burst: Optional[int] = None,
+) -> TokenBucketRateLimiter:
+    """
+    Replace the process-wide FMP rate limiter (e.g., after a plan upgrade).
+
+    Args:
+        calls_per_minute: Sustained rate limit (0 or less disables limiting)
+        burst: Bucket size (default: 1 second worth of calls)
+
+    Returns:
+        The new shared TokenBucketRateLimiter instance
+    """
+    global _fmp_limiter
+    with _fmp_limiter_lock:
+        _fmp_limiter = TokenBucketRateLimiter(
+            calls_per_minute=calls_per_minute,
+            burst=burst,
+            name="fmp",
+        )
+    return _fmp_limiter
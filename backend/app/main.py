@@ -10,11 +10,15 @@ Purpose:
 This file should stay clean — no business logic here.
 """
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.core.executors import shutdown_executors
 from app.core.logging import configure_logging
-from app.api.v1 import companies, filings, financials, models, structured, branding, screener
+from app.api.v1 import companies, filings, financials, models, structured, branding, screener, beta
+from app.services.screener.meta_cache import get_meta_cache
 
 # -----------------------------------------------------------------------------
 # App Initialization
@@ -22,10 +26,21 @@ from app.api.v1 import companies, filings, financials, models, structured, brand
 
 configure_logging()  # Set logging defaults at startup
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm sector / industry / ticker lists in the background (does not block startup)
+    get_meta_cache().start()
+    yield
+    get_meta_cache().stop()
+    shutdown_executors()
+
+
 app = FastAPI(
     title="Denari Valuation Backend",
     description="Financial modeling + ingestion backend for Denari",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # -----------------------------------------------------------------------------
@@ -52,6 +67,7 @@ app.include_router(structured.router)
 app.include_router(branding.router)
 app.include_router(screener.router)
 app.include_router(screener.screener_router)
+app.include_router(beta.router)
 
 # -----------------------------------------------------------------------------
 # Health Check
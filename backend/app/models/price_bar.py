@@ -32,7 +32,8 @@ class PriceBar(Base):
     company_id = Column(Integer, ForeignKey("company.id"), nullable=False)
     date = Column(Date, nullable=False)
 
-    # Price fields (store raw actuals — no unit scaling, no adjustments)
+    # Price fields (no unit scaling; the price store writes split/dividend-adjusted
+    # bars and re-backfills when the provider restates history)
     open = Column(Float, nullable=True)
     high = Column(Float, nullable=True)
     low = Column(Float, nullable=True)
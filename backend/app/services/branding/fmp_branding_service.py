@@ -4,21 +4,56 @@ fmp_branding_service.py — Company branding service using FMP profile data.
 This module provides functionality to:
 1. Fetch company profile data from FMP (including logo URL)
 2. Return structured branding data (logo URL, company info)
+3. Resolve branding for many tickers at once (e.g., a screener page)
+
+Branding is cached in a size-bounded LRU with a TTL. Set BRANDING_CACHE_DB to
+a SQLite file path to share the cache between worker processes.
+
+Configuration via environment variables:
+    BRANDING_CACHE_MAX_ENTRIES - Maximum tickers cached per process (default: 5000)
+    BRANDING_CACHE_DB          - Optional shared SQLite cache file (default: none)
 """
 
 from __future__ import annotations
 
-from typing import Dict
+import asyncio
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
 
+from app.core.executors import get_io_executor
 from app.core.logging import get_logger
+from app.core.lru_ttl_cache import MISSING, LruTtlCache, SqliteCacheBackend
+from app.core.single_flight import SingleFlight
 from app.data.fmp_client import fetch_company_profile
 
 logger = get_logger(__name__)
 
-# Simple in-memory cache with TTL simulation
-# Key: normalized ticker, Value: (branding_data, timestamp)
-_branding_cache: Dict[str, tuple] = {}
 CACHE_TTL_SECONDS = 3600  # 1 hour
+BRANDING_CACHE_MAX_ENTRIES = int(os.getenv("BRANDING_CACHE_MAX_ENTRIES", "5000"))
+BRANDING_BATCH_MAX_TICKERS = 200  # Largest screener page
+
+
+def _build_branding_cache() -> LruTtlCache:
+    """Build the branding cache (with the shared SQLite backend if BRANDING_CACHE_DB is set)."""
+    backend = None
+    db_path = os.getenv("BRANDING_CACHE_DB")
+    if db_path:
+        backend = SqliteCacheBackend(Path(db_path).expanduser(), table="branding")
+        logger.info(f"Branding cache shared via {db_path}")
+    return LruTtlCache(
+        max_entries=BRANDING_CACHE_MAX_ENTRIES,
+        ttl_seconds=CACHE_TTL_SECONDS,
+        name="branding",
+        backend=backend,
+    )
+
+
+# Key: normalized ticker, Value: branding dict
+_branding_cache = _build_branding_cache()
+
+# Coalesces concurrent profile lookups for the same ticker (e.g., on cache expiry)
+_profile_flight = SingleFlight("branding")
 
 
 class BrandingNotFoundError(Exception):
@@ -53,23 +88,21 @@ async def get_company_branding(ticker: str) -> Dict[str, any]:
     # Normalize ticker
     normalized_ticker = ticker.upper().strip()
     
-    # Check cache (simple TTL check)
-    if normalized_ticker in _branding_cache:
-        cached_data, timestamp = _branding_cache[normalized_ticker]
-        import time
-        if time.time() - timestamp < CACHE_TTL_SECONDS:
-            logger.debug(f"Returning cached branding for {normalized_ticker}")
-            return cached_data
-        else:
-            # Cache expired, remove it
-            del _branding_cache[normalized_ticker]
+    # Check cache (LRU with TTL)
+    cached_data = _branding_cache.get(normalized_ticker)
+    if cached_data is not MISSING:
+        logger.debug(f"Returning cached branding for {normalized_ticker}")
+        return cached_data
     
     try:
-        # Fetch company profile from FMP (synchronous call, but in async context)
+        # Fetch company profile from FMP on a worker thread so the event loop
+        # is not blocked; concurrent requests for the same ticker share one call
         logger.info(f"Fetching company profile for {normalized_ticker}")
-        # Note: fetch_company_profile is synchronous, but we're in an async function
-        # This is fine as it's I/O bound and FastAPI will handle it appropriately
-        profile = fetch_company_profile(normalized_ticker)
+        profile = await _profile_flight.do_async(
+            normalized_ticker,
+            lambda: fetch_company_profile(normalized_ticker),
+            executor=get_io_executor(),
+        )
         
         # Extract required fields
         symbol = profile.get("symbol", normalized_ticker)
@@ -86,8 +119,7 @@ async def get_company_branding(ticker: str) -> Dict[str, any]:
         }
         
         # Cache the result
-        import time
-        _branding_cache[normalized_ticker] = (branding, time.time())
+        _branding_cache.set(normalized_ticker, branding)
         
         logger.info(f"Successfully retrieved branding for {normalized_ticker}")
         return branding
@@ -102,3 +134,58 @@ async def get_company_branding(ticker: str) -> Dict[str, any]:
         logger.error(f"Unexpected error retrieving branding for {normalized_ticker}: {e}")
         raise BrandingNotFoundError(f"Failed to retrieve branding for {normalized_ticker}: {e}")
 
+
+async def get_company_branding_batch(
+    tickers: Iterable[str],
+) -> Tuple[Dict[str, Dict[str, any]], Dict[str, str]]:
+    """
+    Get branding for many tickers in one call (e.g., a whole screener page).
+    
+    Cached tickers are answered immediately; the rest are fetched concurrently
+    (bounded by the shared FMP connection pool and rate limiter).
+    
+    Args:
+        tickers: Stock ticker symbols (duplicates and blanks are ignored)
+        
+    Returns:
+        Tuple of (results, errors):
+        - results: normalized ticker -> branding dict (see get_company_branding)
+        - errors: normalized ticker -> error message for tickers that failed
+        
+    Raises:
+        ValueError: If more than BRANDING_BATCH_MAX_TICKERS tickers are requested
+    """
+    normalized: List[str] = list(dict.fromkeys(t.upper().strip() for t in tickers if t and t.strip()))
+    if len(normalized) > BRANDING_BATCH_MAX_TICKERS:
+        raise ValueError(
+            f"Too many tickers: {len(normalized)} (maximum {BRANDING_BATCH_MAX_TICKERS})"
+        )
+    
+    outcomes = await asyncio.gather(
+        *(get_company_branding(ticker) for ticker in normalized),
+        return_exceptions=True,
+    )
+    
+    results: Dict[str, Dict[str, any]] = {}
+    errors: Dict[str, str] = {}
+    for ticker, outcome in zip(normalized, outcomes):
+        if isinstance(outcome, BaseException):
+            errors[ticker] = str(outcome)
+        else:
+            results[ticker] = outcome
+    
+    logger.info(f"Resolved branding for {len(results)}/{len(normalized)} tickers ({len(errors)} failed)")
+    return results, errors
+
+
+def get_branding_cache_stats() -> Dict[str, any]:
+    """Return hit/miss/eviction metrics for the branding cache."""
+    return _branding_cache.stats()
+
+
+def get_cached_logo_url(ticker: str) -> str | None:
+    """Return the logo URL from already cached branding, without calling FMP."""
+    cached_data = _branding_cache.get(ticker.upper().strip())
+    if cached_data is MISSING:
+        return None
+    return cached_data.get("logoUrl") or None
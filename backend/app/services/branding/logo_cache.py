@@ -0,0 +1,364 @@
+"""
+logo_cache.py — Local proxy cache for company logo images.
+
+Screener pages render up to 200 logos at once; loading each one from the FMP
+image host costs one remote request per row per visitor. This module fetches
+each logo once, keeps it on disk keyed by ticker and serves it with a strong
+ETag so browsers can cache it for a long time:
+    * {TICKER}.img + {TICKER}.json   - original bytes and metadata
+    * {TICKER}.{size}.png            - optional downscaled thumbnail (needs Pillow)
+    * Logos the image host does not have are remembered for a shorter period
+    * Only raster formats are accepted (SVG can carry script, so it is treated
+      as missing) and downloads stop at LOGO_MAX_BYTES
+    * If a refresh fails, the previous copy keeps being served
+
+The source URL is the logoUrl from the branding cache when known, otherwise
+LOGO_SOURCE_URL_TEMPLATE. The FMP API key is never sent to the image host.
+
+Configuration via environment variables:
+    LOGO_CACHE_DIR           - Cache directory (default: backend/data/logo_cache)
+    LOGO_CACHE_TTL_SECONDS   - How long a stored logo is used before re-fetching (default: 604800 = 7 days)
+    LOGO_SOURCE_URL_TEMPLATE - Fallback image URL, "{ticker}" is substituted
+                               (default: https://images.financialmodelingprep.com/symbol/{ticker}.png)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.core.logging import get_logger
+from app.core.lru_ttl_cache import MISSING, LruTtlCache
+from app.core.single_flight import SingleFlight
+from app.services.branding.fmp_branding_service import get_cached_logo_url
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+logger = get_logger(__name__)
+
+DEFAULT_LOGO_CACHE_DIR = Path(__file__).parent.parent.parent.parent / "data" / "logo_cache"
+LOGO_CACHE_TTL_SECONDS = int(os.getenv("LOGO_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+LOGO_NEGATIVE_TTL_SECONDS = 24 * 3600  # Retry logos the host did not have once a day
+LOGO_SOURCE_URL_TEMPLATE = os.getenv(
+    "LOGO_SOURCE_URL_TEMPLATE",
+    "https://images.financialmodelingprep.com/symbol/{ticker}.png",
+)
+LOGO_THUMBNAIL_SIZES = (32, 64, 128)  # Allowed ?size= values (square bounding box, px)
+LOGO_MEMORY_ENTRIES = 1000  # Hot logos kept in process (originals and thumbnails)
+LOGO_REQUEST_TIMEOUT = 10
+LOGO_MAX_BYTES = 2 * 1024 * 1024  # Refuse anything larger than a plausible logo
+LOGO_DOWNLOAD_CHUNK_BYTES = 64 * 1024
+# Raster formats served as-is; anything else (notably image/svg+xml) is treated as missing
+LOGO_CONTENT_TYPES = frozenset({
+    "image/png",
+    "image/jpeg",
+    "image/gif",
+    "image/webp",
+    "image/avif",
+    "image/x-icon",
+    "image/vnd.microsoft.icon",
+})
+
+# Tickers become file names, so only allow symbol characters (e.g., BRK.B, BF-B, ^GSPC)
+_TICKER_PATTERN = re.compile(r"^[A-Z0-9.\-^=]{1,20}$")
+
+
+class LogoNotFoundError(Exception):
+    """Raised when no logo image is available for a ticker."""
+    pass
+
+
+@dataclass(frozen=True)
+class LogoImage:
+    """Logo bytes ready to send."""
+    body: bytes
+    content_type: str
+    etag: str
+    fetched_at: float
+
+
+def _read_limited(response: requests.Response, ticker: str) -> bytes:
+    """Read a streamed response body, giving up once it exceeds LOGO_MAX_BYTES."""
+    declared = response.headers.get("Content-Length", "")
+    if declared.isdigit() and int(declared) > LOGO_MAX_BYTES:
+        raise LogoNotFoundError(f"Logo for {ticker} is too large ({declared} bytes)")
+
+    chunks = []
+    received = 0
+    for chunk in response.iter_content(LOGO_DOWNLOAD_CHUNK_BYTES):
+        received += len(chunk)
+        if received > LOGO_MAX_BYTES:
+            raise LogoNotFoundError(f"Logo for {ticker} is larger than {LOGO_MAX_BYTES} bytes")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def normalize_logo_ticker(ticker: str) -> str:
+    """
+    Normalize a ticker for use as a cache key / file name.
+
+    Raises:
+        ValueError: If the ticker is empty or contains characters that are not
+            valid in a symbol
+    """
+    normalized = (ticker or "").upper().strip()
+    if not _TICKER_PATTERN.match(normalized):
+        raise ValueError(f"Invalid ticker: {ticker!r}")
+    return normalized
+
+
+class LogoCache:
+    """
+    Disk-backed logo cache with an in-process LRU for the hottest images.
+
+    Example:
+        cache = LogoCache(Path("data/logo_cache"))
+        logo = cache.get("AAPL", size=64)
+        response = Response(logo.body, media_type=logo.content_type, headers={"ETag": logo.etag})
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path = DEFAULT_LOGO_CACHE_DIR,
+        ttl_seconds: float = LOGO_CACHE_TTL_SECONDS,
+        negative_ttl_seconds: float = LOGO_NEGATIVE_TTL_SECONDS,
+        url_template: str = LOGO_SOURCE_URL_TEMPLATE,
+        source_url_lookup: Optional[Callable[[str], Optional[str]]] = None,
+    ) -> None:
+        """
+        Args:
+            cache_dir: Directory for stored logos (created if missing)
+            ttl_seconds: Age after which a stored logo is re-fetched
+            negative_ttl_seconds: How long a missing logo is remembered
+            url_template: Fallback source URL, "{ticker}" is substituted
+            source_url_lookup: Optional ticker -> known logo URL (e.g., from branding)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.url_template = url_template
+        self.source_url_lookup = source_url_lookup
+
+        # Key: (ticker, size or None), Value: LogoImage
+        self._memory = LruTtlCache(LOGO_MEMORY_ENTRIES, min(ttl_seconds, 3600), name="logos")
+        self._flight = SingleFlight("logos", copy_results=False)  # LogoImage is frozen
+
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self._session = requests.Session()
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+        self.downloads = 0
+        self.not_found = 0
+
+    # -- paths ----------------------------------------------------------------
+
+    def _image_path(self, ticker: str) -> Path:
+        return self.cache_dir / f"{ticker}.img"
+
+    def _meta_path(self, ticker: str) -> Path:
+        return self.cache_dir / f"{ticker}.json"
+
+    def _thumbnail_path(self, ticker: str, size: int) -> Path:
+        return self.cache_dir / f"{ticker}.{size}.png"
+
+    # -- disk -----------------------------------------------------------------
+
+    def _read_meta(self, ticker: str) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(self._meta_path(ticker).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+    def _write_meta(self, ticker: str, meta: Dict[str, Any]) -> None:
+        self._write_atomic(self._meta_path(ticker), json.dumps(meta).encode("utf-8"))
+
+    def _load_original(self, ticker: str, meta: Dict[str, Any]) -> Optional[LogoImage]:
+        if meta.get("content_type") not in LOGO_CONTENT_TYPES:
+            return None  # e.g., an SVG stored before only raster formats were accepted
+        try:
+            body = self._image_path(ticker).read_bytes()
+        except OSError:
+            return None
+        return LogoImage(body, meta["content_type"], meta["etag"], meta["fetched_at"])
+
+    # -- fetching -------------------------------------------------------------
+
+    def _source_url(self, ticker: str) -> str:
+        if self.source_url_lookup is not None:
+            url = self.source_url_lookup(ticker)
+            if url:
+                return url
+        return self.url_template.format(ticker=ticker)
+
+    def _download(self, ticker: str, previous: Optional[Dict[str, Any]]) -> LogoImage:
+        """Fetch the logo from its source and store it (or record that it is missing)."""
+        url = self._source_url(ticker)
+        self.downloads += 1
+        with self._session.get(url, timeout=LOGO_REQUEST_TIMEOUT, stream=True) as response:
+            content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+
+            if response.status_code in (403, 404, 410) or (
+                response.ok and content_type not in LOGO_CONTENT_TYPES
+            ):
+                self.not_found += 1
+                self._write_meta(ticker, {"missing": True, "fetched_at": time.time(), "source_url": url})
+                raise LogoNotFoundError(f"No logo available for {ticker}")
+            response.raise_for_status()
+            body = _read_limited(response, ticker)
+
+        etag = _make_etag(body)
+        if previous is None or previous.get("etag") != etag:
+            self._write_atomic(self._image_path(ticker), body)
+            # Thumbnails were made from the old image
+            for size in LOGO_THUMBNAIL_SIZES:
+                self._thumbnail_path(ticker, size).unlink(missing_ok=True)
+
+        fetched_at = time.time()
+        self._write_meta(ticker, {
+            "content_type": content_type,
+            "etag": etag,
+            "fetched_at": fetched_at,
+            "source_url": url,
+            "bytes": len(body),
+        })
+        logger.info(f"Cached logo for {ticker} ({len(body) / 1024:.1f} KB) from {url}")
+        return LogoImage(body, content_type, etag, fetched_at)
+
+    def _original(self, ticker: str) -> LogoImage:
+        meta = self._read_meta(ticker)
+        now = time.time()
+        if meta is not None:
+            age = now - meta.get("fetched_at", 0)
+            if meta.get("missing"):
+                if age < self.negative_ttl_seconds:
+                    raise LogoNotFoundError(f"No logo available for {ticker}")
+            elif age < self.ttl_seconds:
+                stored = self._load_original(ticker, meta)
+                if stored is not None:
+                    return stored
+
+        try:
+            return self._download(ticker, None if meta is None or meta.get("missing") else meta)
+        except requests.RequestException as e:
+            # Keep serving the previous copy if the image host is unavailable
+            stored = self._load_original(ticker, meta) if meta and not meta.get("missing") else None
+            if stored is None:
+                raise LogoNotFoundError(f"Could not fetch logo for {ticker}: {e}") from e
+            logger.warning(f"Logo refresh for {ticker} failed, serving stored copy: {e}")
+            return stored
+
+    def _thumbnail(self, ticker: str, size: int) -> LogoImage:
+        original = self._original(ticker)
+        path = self._thumbnail_path(ticker, size)
+        try:
+            body = path.read_bytes()
+        except OSError:
+            try:
+                with Image.open(io.BytesIO(original.body)) as image:
+                    image = image.convert("RGBA")
+                    image.thumbnail((size, size), Image.LANCZOS)
+                    buffer = io.BytesIO()
+                    image.save(buffer, format="PNG", optimize=True)
+            except (OSError, ValueError, Image.DecompressionBombError) as e:
+                # Not an image Pillow can read: serve the original
+                logger.debug(f"Cannot downscale logo for {ticker}, serving original: {e}")
+                return original
+            body = buffer.getvalue()
+            self._write_atomic(path, body)
+        return LogoImage(body, "image/png", _make_etag(body), original.fetched_at)
+
+    # -- public ---------------------------------------------------------------
+
+    def get(self, ticker: str, size: Optional[int] = None) -> LogoImage:
+        """
+        Return the logo for a ticker, fetching it on first use.
+
+        Args:
+            ticker: Stock ticker symbol
+            size: Optional thumbnail size (one of LOGO_THUMBNAIL_SIZES); ignored
+                (original served) when Pillow is not installed
+
+        Returns:
+            LogoImage with body, content type and ETag
+
+        Raises:
+            ValueError: If the ticker or size is invalid
+            LogoNotFoundError: If no logo is available
+        """
+        ticker = normalize_logo_ticker(ticker)
+        if size is not None and size not in LOGO_THUMBNAIL_SIZES:
+            raise ValueError(f"Unsupported logo size {size} (allowed: {', '.join(map(str, LOGO_THUMBNAIL_SIZES))})")
+        if not PIL_AVAILABLE:
+            size = None
+
+        key = (ticker, size)
+        logo = self._memory.get(key)
+        if logo is not MISSING:
+            return logo
+
+        fetch = self._original if size is None else lambda t: self._thumbnail(t, size)
+        logo = self._flight.do(key, lambda: fetch(ticker))
+        self._memory.set(key, logo)
+        return logo
+
+    def invalidate(self, ticker: str) -> None:
+        """Forget a ticker's stored logo and thumbnails."""
+        ticker = normalize_logo_ticker(ticker)
+        for size in (None, *LOGO_THUMBNAIL_SIZES):
+            self._memory.invalidate((ticker, size))
+        for path in (self._image_path(ticker), self._meta_path(ticker)):
+            path.unlink(missing_ok=True)
+        for size in LOGO_THUMBNAIL_SIZES:
+            self._thumbnail_path(ticker, size).unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return download counters and in-process hit rates."""
+        return {
+            "cache_dir": str(self.cache_dir),
+            "thumbnails": PIL_AVAILABLE,
+            "downloads": self.downloads,
+            "not_found": self.not_found,
+            "memory": self._memory.stats(),
+        }
+
+
+# Process-wide cache (created lazily on first use)
+_logo_cache: LogoCache | None = None
+_logo_cache_lock = threading.Lock()
+
+
+def get_logo_cache() -> LogoCache:
+    """Return the process-wide LogoCache (source URLs come from the branding cache)."""
+    global _logo_cache
+    if _logo_cache is None:
+        with _logo_cache_lock:
+            if _logo_cache is None:
+                cache_dir = Path(os.getenv("LOGO_CACHE_DIR") or DEFAULT_LOGO_CACHE_DIR).expanduser()
+                _logo_cache = LogoCache(cache_dir, source_url_lookup=get_cached_logo_url)
+    return _logo_cache
@@ -10,16 +10,14 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from sqlalchemy.orm import Session
 
 from app.core.logging import get_logger
-from app.data.fmp_client import (
-    fetch_balance_sheet,
-    fetch_cash_flow,
-    fetch_income_statement,
-    fetch_quote,
+from app.data.fmp_async_client import (
+    FMP_ASYNC_MAX_CONCURRENCY,
+    fetch_financial_statements_bulk,
 )
 from app.models.company import Company
 from app.services.ingestion.pipelines import SP500IngestionPipeline
@@ -91,8 +89,9 @@ class IngestOrchestrator:
         """
         Fetch FMP stable raw data for all three financial statements and save to JSON files.
         
-        This method fetches income statement, balance sheet, and cash flow data
-        from the FMP /stable API and saves them to JSON files in the output directory.
+        This method fetches income statement, balance sheet, cash flow and quote data
+        concurrently from the FMP /stable API and saves them to JSON files in the
+        output directory.
         
         Args:
             ticker: Company ticker symbol (e.g., "MSFT")
@@ -107,116 +106,176 @@ class IngestOrchestrator:
             - summary: Dict with counts and most recent period info
             - error: Optional[str] if an error occurred
         """
-        ticker_upper = ticker.upper()
-        
-        # Default output directory
-        if output_dir is None:
-            # Default to backend/downloads relative to this file
-            backend_dir = Path(__file__).parent.parent.parent.parent
-            output_dir = backend_dir / "downloads"
+        return self.fetch_fmp_stable_raw_many([ticker], limit=limit, output_dir=output_dir)[0]
+
+    def fetch_fmp_stable_raw_many(
+        self,
+        tickers: List[str],
+        limit: int = 3,
+        output_dir: Optional[Path] = None,
+        max_concurrency: int = FMP_ASYNC_MAX_CONCURRENCY,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch FMP stable raw data for many tickers at once and save to JSON files.
         
-        output_dir = Path(output_dir)
-        output_dir.mkdir(parents=True, exist_ok=True)
+        All four calls per ticker (income statement, balance sheet, cash flow, quote)
+        and all tickers are fanned out concurrently under a global concurrency cap.
         
-        try:
-            logger.info(f"=== Fetching FMP Stable Raw Data for {ticker_upper} ===\n")
-            
-            # Fetch income statement
-            logger.info(f"Fetching income statement for {ticker_upper}...")
-            income_data = fetch_income_statement(ticker_upper, limit=limit)
-            income_file = output_dir / f"{ticker_upper}_income_statement_stable_raw.json"
-            with income_file.open("w", encoding="utf-8") as f:
-                json.dump(income_data, f, indent=2, ensure_ascii=False)
-            logger.info(f"✓ Wrote {len(income_data)} income statement(s) to {income_file.name}")
-            
-            # Fetch balance sheet
-            logger.info(f"Fetching balance sheet for {ticker_upper}...")
-            balance_data = fetch_balance_sheet(ticker_upper, limit=limit)
-            balance_file = output_dir / f"{ticker_upper}_balance_sheet_stable_raw.json"
-            with balance_file.open("w", encoding="utf-8") as f:
-                json.dump(balance_data, f, indent=2, ensure_ascii=False)
-            logger.info(f"✓ Wrote {len(balance_data)} balance sheet(s) to {balance_file.name}")
-            
-            # Fetch cash flow
-            logger.info(f"Fetching cash flow for {ticker_upper}...")
-            cash_flow_data = fetch_cash_flow(ticker_upper, limit=limit)
-            cash_flow_file = output_dir / f"{ticker_upper}_cash_flow_stable_raw.json"
-            with cash_flow_file.open("w", encoding="utf-8") as f:
-                json.dump(cash_flow_data, f, indent=2, ensure_ascii=False)
-            logger.info(f"✓ Wrote {len(cash_flow_data)} cash flow statement(s) to {cash_flow_file.name}")
-            
-            # Fetch quote/price data
-            quote_data = None
-            quote_file = None
-            try:
-                logger.info(f"Fetching quote/price data for {ticker_upper}...")
-                quote_data = fetch_quote(ticker_upper)
-                quote_file = output_dir / f"{ticker_upper}_quote_stable_raw.json"
-                with quote_file.open("w", encoding="utf-8") as f:
-                    json.dump(quote_data, f, indent=2, ensure_ascii=False)
-                logger.info(f"✓ Wrote quote data to {quote_file.name}")
-                if quote_data.get("price"):
-                    logger.info(f"  Current Price: ${quote_data.get('price', 0):.2f}")
-            except Exception as quote_error:
-                logger.warning(f"Failed to fetch quote data for {ticker_upper}: {quote_error}")
-                quote_data = None
-            
-            # Build summary
-            summary = {
-                "income_statements": len(income_data),
-                "balance_sheets": len(balance_data),
-                "cash_flows": len(cash_flow_data),
-            }
-            
-            # Add quote data to summary if available
-            if quote_data:
-                summary["quote"] = {
-                    "price": quote_data.get("price"),
-                    "market_cap": quote_data.get("marketCap"),
-                    "volume": quote_data.get("volume"),
-                    "change": quote_data.get("change"),
-                    "change_percent": quote_data.get("changesPercentage"),
-                }
-            
-            # Add most recent period info if available
-            if income_data:
-                latest = income_data[0]
-                summary["most_recent_period"] = {
-                    "date": latest.get("date", "N/A"),
-                    "fiscal_year": latest.get("fiscalYear", "N/A"),
-                    "period": latest.get("period", "N/A"),
-                }
-                if latest.get("revenue"):
-                    summary["most_recent_period"]["revenue"] = latest.get("revenue")
-                if latest.get("netIncome"):
-                    summary["most_recent_period"]["net_income"] = latest.get("netIncome")
-            
-            logger.info("\n=== Fetch Complete ===")
-            logger.info(f"✓ Successfully fetched and cached FMP /stable data for {ticker_upper}")
-            
-            files_dict = {
-                "income_statement": str(income_file),
-                "balance_sheet": str(balance_file),
-                "cash_flow": str(cash_flow_file),
-            }
-            
-            if quote_file:
-                files_dict["quote"] = str(quote_file)
+        Args:
+            tickers: Company ticker symbols (e.g., ["MSFT", "AAPL"])
+            limit: Number of periods to fetch (default: 3)
+            output_dir: Directory to save JSON files (default: backend/downloads)
+            max_concurrency: Maximum number of FMP requests in flight at once
             
-            return {
+        Returns:
+            List of per-ticker result dictionaries (see fetch_fmp_stable_raw), in the
+            same order as the unique input tickers
+        """
+        return _fetch_fmp_stable_raw_many(tickers, limit, output_dir, max_concurrency)
+
+
+def _fetch_fmp_stable_raw_many(
+    tickers: List[str],
+    limit: int,
+    output_dir: Optional[Path],
+    max_concurrency: int,
+) -> List[Dict[str, Any]]:
+    """Shared implementation of IngestOrchestrator.fetch_fmp_stable_raw_many and fetch_fmp_stable_raw_data."""
+    # Default output directory
+    if output_dir is None:
+        # Default to backend/downloads relative to this file
+        backend_dir = Path(__file__).parent.parent.parent.parent
+        output_dir = backend_dir / "downloads"
+    
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    tickers_upper = list(dict.fromkeys(t.upper() for t in tickers))
+    logger.info(f"=== Fetching FMP Stable Raw Data for {len(tickers_upper)} ticker(s) ===\n")
+    
+    fetched = fetch_financial_statements_bulk(
+        tickers_upper,
+        limit=limit,
+        max_concurrency=max_concurrency,
+    )
+    
+    results = []
+    for ticker_upper in tickers_upper:
+        data = fetched[ticker_upper]
+        if isinstance(data, BaseException):
+            logger.error(f"Error fetching FMP stable raw data for {ticker_upper}: {data}")
+            results.append({
                 "ticker": ticker_upper,
-                "status": "success",
-                "files": files_dict,
-                "summary": summary,
-            }
-            
+                "status": "error",
+                "error": str(data),
+            })
+            continue
+        
+        try:
+            results.append(_write_fmp_stable_raw(ticker_upper, data, output_dir))
         except Exception as exc:  # pylint: disable=broad-except
-            logger.exception(f"Error fetching FMP stable raw data for {ticker_upper}: {exc}")
-            return {
+            logger.exception(f"Error writing FMP stable raw data for {ticker_upper}: {exc}")
+            results.append({
                 "ticker": ticker_upper,
                 "status": "error",
                 "error": str(exc),
-            }
+            })
+    
+    return results
+
+
+def _write_fmp_stable_raw(
+    ticker_upper: str,
+    data: Dict[str, Any],
+    output_dir: Path,
+) -> Dict[str, Any]:
+    """
+    Save fetched FMP statements/quote for one ticker to JSON and build the summary.
+    
+    Args:
+        ticker_upper: Upper-cased ticker symbol
+        data: Output of AsyncFmpClient.fetch_financial_statements()
+        output_dir: Directory to save JSON files
+        
+    Returns:
+        Per-ticker result dictionary (see IngestOrchestrator.fetch_fmp_stable_raw)
+    """
+    income_data = data["income_statement"]
+    income_file = output_dir / f"{ticker_upper}_income_statement_stable_raw.json"
+    with income_file.open("w", encoding="utf-8") as f:
+        json.dump(income_data, f, indent=2, ensure_ascii=False)
+    logger.info(f"✓ Wrote {len(income_data)} income statement(s) to {income_file.name}")
+    
+    balance_data = data["balance_sheet"]
+    balance_file = output_dir / f"{ticker_upper}_balance_sheet_stable_raw.json"
+    with balance_file.open("w", encoding="utf-8") as f:
+        json.dump(balance_data, f, indent=2, ensure_ascii=False)
+    logger.info(f"✓ Wrote {len(balance_data)} balance sheet(s) to {balance_file.name}")
+    
+    cash_flow_data = data["cash_flow"]
+    cash_flow_file = output_dir / f"{ticker_upper}_cash_flow_stable_raw.json"
+    with cash_flow_file.open("w", encoding="utf-8") as f:
+        json.dump(cash_flow_data, f, indent=2, ensure_ascii=False)
+    logger.info(f"✓ Wrote {len(cash_flow_data)} cash flow statement(s) to {cash_flow_file.name}")
+    
+    # Quote is optional (fetch failures are logged and returned as None)
+    quote_data = data.get("quote")
+    quote_file = None
+    if quote_data:
+        quote_file = output_dir / f"{ticker_upper}_quote_stable_raw.json"
+        with quote_file.open("w", encoding="utf-8") as f:
+            json.dump(quote_data, f, indent=2, ensure_ascii=False)
+        logger.info(f"✓ Wrote quote data to {quote_file.name}")
+        if quote_data.get("price"):
+            logger.info(f"  Current Price: ${quote_data.get('price', 0):.2f}")
+    
+    # Build summary
+    summary = {
+        "income_statements": len(income_data),
+        "balance_sheets": len(balance_data),
+        "cash_flows": len(cash_flow_data),
+    }
+    
+    # Add quote data to summary if available
+    if quote_data:
+        summary["quote"] = {
+            "price": quote_data.get("price"),
+            "market_cap": quote_data.get("marketCap"),
+            "volume": quote_data.get("volume"),
+            "change": quote_data.get("change"),
+            "change_percent": quote_data.get("changesPercentage"),
+        }
+    
+    # Add most recent period info if available
+    if income_data:
+        latest = income_data[0]
+        summary["most_recent_period"] = {
+            "date": latest.get("date", "N/A"),
+            "fiscal_year": latest.get("fiscalYear", "N/A"),
+            "period": latest.get("period", "N/A"),
+        }
+        if latest.get("revenue"):
+            summary["most_recent_period"]["revenue"] = latest.get("revenue")
+        if latest.get("netIncome"):
+            summary["most_recent_period"]["net_income"] = latest.get("netIncome")
+    
+    logger.info(f"✓ Successfully fetched and cached FMP /stable data for {ticker_upper}")
+    
+    files_dict = {
+        "income_statement": str(income_file),
+        "balance_sheet": str(balance_file),
+        "cash_flow": str(cash_flow_file),
+    }
+    
+    if quote_file:
+        files_dict["quote"] = str(quote_file)
+    
+    return {
+        "ticker": ticker_upper,
+        "status": "success",
+        "files": files_dict,
+        "summary": summary,
+    }
 
 
 # Backwards-compatible function -------------------------------------------------------------- #
@@ -234,7 +293,7 @@ def fetch_fmp_stable_raw_data(
     Standalone function to fetch FMP stable raw data.
     
     This function can be called without creating an IngestOrchestrator instance.
-    It directly fetches and saves FMP stable raw data to JSON files.
+    It fetches the four FMP calls concurrently and saves them to JSON files.
     
     Args:
         ticker: Company ticker symbol (e.g., "MSFT")
@@ -244,113 +303,4 @@ def fetch_fmp_stable_raw_data(
     Returns:
         Dictionary with fetch results (see fetch_fmp_stable_raw for details)
     """
-    ticker_upper = ticker.upper()
-    
-    # Default output directory
-    if output_dir is None:
-        # Default to backend/downloads relative to this file
-        backend_dir = Path(__file__).parent.parent.parent.parent
-        output_dir = backend_dir / "downloads"
-    
-    output_dir = Path(output_dir)
-    output_dir.mkdir(parents=True, exist_ok=True)
-    
-    try:
-        logger.info(f"=== Fetching FMP Stable Raw Data for {ticker_upper} ===\n")
-        
-        # Fetch income statement
-        logger.info(f"Fetching income statement for {ticker_upper}...")
-        income_data = fetch_income_statement(ticker_upper, limit=limit)
-        income_file = output_dir / f"{ticker_upper}_income_statement_stable_raw.json"
-        with income_file.open("w", encoding="utf-8") as f:
-            json.dump(income_data, f, indent=2, ensure_ascii=False)
-        logger.info(f"✓ Wrote {len(income_data)} income statement(s) to {income_file.name}")
-        
-        # Fetch balance sheet
-        logger.info(f"Fetching balance sheet for {ticker_upper}...")
-        balance_data = fetch_balance_sheet(ticker_upper, limit=limit)
-        balance_file = output_dir / f"{ticker_upper}_balance_sheet_stable_raw.json"
-        with balance_file.open("w", encoding="utf-8") as f:
-            json.dump(balance_data, f, indent=2, ensure_ascii=False)
-        logger.info(f"✓ Wrote {len(balance_data)} balance sheet(s) to {balance_file.name}")
-        
-        # Fetch cash flow
-        logger.info(f"Fetching cash flow for {ticker_upper}...")
-        cash_flow_data = fetch_cash_flow(ticker_upper, limit=limit)
-        cash_flow_file = output_dir / f"{ticker_upper}_cash_flow_stable_raw.json"
-        with cash_flow_file.open("w", encoding="utf-8") as f:
-            json.dump(cash_flow_data, f, indent=2, ensure_ascii=False)
-        logger.info(f"✓ Wrote {len(cash_flow_data)} cash flow statement(s) to {cash_flow_file.name}")
-        
-        # Fetch quote/price data
-        quote_data = None
-        quote_file = None
-        try:
-            logger.info(f"Fetching quote/price data for {ticker_upper}...")
-            quote_data = fetch_quote(ticker_upper)
-            quote_file = output_dir / f"{ticker_upper}_quote_stable_raw.json"
-            with quote_file.open("w", encoding="utf-8") as f:
-                json.dump(quote_data, f, indent=2, ensure_ascii=False)
-            logger.info(f"✓ Wrote quote data to {quote_file.name}")
-            if quote_data.get("price"):
-                logger.info(f"  Current Price: ${quote_data.get('price', 0):.2f}")
-        except Exception as quote_error:
-            logger.warning(f"Failed to fetch quote data for {ticker_upper}: {quote_error}")
-            quote_data = None
-        
-        # Build summary
-        summary = {
-            "income_statements": len(income_data),
-            "balance_sheets": len(balance_data),
-            "cash_flows": len(cash_flow_data),
-        }
-        
-        # Add quote data to summary if available
-        if quote_data:
-            summary["quote"] = {
-                "price": quote_data.get("price"),
-                "market_cap": quote_data.get("marketCap"),
-                "volume": quote_data.get("volume"),
-                "change": quote_data.get("change"),
-                "change_percent": quote_data.get("changesPercentage"),
-            }
-        
-        # Add most recent period info if available
-        if income_data:
-            latest = income_data[0]
-            summary["most_recent_period"] = {
-                "date": latest.get("date", "N/A"),
-                "fiscal_year": latest.get("fiscalYear", "N/A"),
-                "period": latest.get("period", "N/A"),
-            }
-            if latest.get("revenue"):
-                summary["most_recent_period"]["revenue"] = latest.get("revenue")
-            if latest.get("netIncome"):
-                summary["most_recent_period"]["net_income"] = latest.get("netIncome")
-        
-        logger.info("\n=== Fetch Complete ===")
-        logger.info(f"✓ Successfully fetched and cached FMP /stable data for {ticker_upper}")
-        
-        files_dict = {
-            "income_statement": str(income_file),
-            "balance_sheet": str(balance_file),
-            "cash_flow": str(cash_flow_file),
-        }
-        
-        if quote_file:
-            files_dict["quote"] = str(quote_file)
-        
-        return {
-            "ticker": ticker_upper,
-            "status": "success",
-            "files": files_dict,
-            "summary": summary,
-        }
-        
-    except Exception as exc:  # pylint: disable=broad-except
-        logger.exception(f"Error fetching FMP stable raw data for {ticker_upper}: {exc}")
-        return {
-            "ticker": ticker_upper,
-            "status": "error",
-            "error": str(exc),
-        }
+    return _fetch_fmp_stable_raw_many([ticker], limit, output_dir, FMP_ASYNC_MAX_CONCURRENCY)[0]
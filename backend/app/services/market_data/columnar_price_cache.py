@@ -0,0 +1,406 @@
+"""
+columnar_price_cache.py — File-based columnar cache of daily price bars (Arrow IPC).
+
+One dataset directory per ticker / benchmark, made of uncompressed Arrow IPC
+segments that are memory-mapped on read (zero-copy), so beta exports and
+offline jobs can scan thousands of histories without a network call or a
+database:
+    {PRICE_CACHE_DIR}/{TICKER}/base-000001.arrow   - compacted history
+    {PRICE_CACHE_DIR}/{TICKER}/part-000002.arrow   - appended bars (newer sequence numbers)
+
+A reader uses the newest base segment plus every part with a higher sequence
+number. Appends write a new part; once a ticker has PRICE_CACHE_MAX_SEGMENTS
+parts they are compacted into a new base. Files are never rewritten in place,
+so concurrent readers (and memory maps held open on Windows) are safe;
+superseded segments are deleted when possible.
+
+Bars are yfinance auto-adjusted OHLC (same as the price_bar store) and are
+synced incrementally with the same overlap / restatement check.
+
+Requires pyarrow (the optional "price-cache" extra: poetry install --extras
+price-cache); without it get_columnar_price_cache() returns None and callers
+use the database store or yfinance instead.
+
+Configuration via environment variables:
+    PRICE_CACHE_ENABLED - "0"/"false" disables the cache (default: enabled)
+    PRICE_CACHE_DIR     - Cache directory (default: backend/data/price_cache)
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.core.logging import get_logger
+from app.core.lru_ttl_cache import MISSING, LruTtlCache
+from app.services.market_data.price_store import (
+    BAR_FIELDS,
+    PRICE_STORE_BACKFILL_YEARS,
+    PRICE_STORE_OVERLAP_DAYS,
+    PRICE_STORE_SYNC_INTERVAL_SECONDS,
+    download_bars,
+    is_restated,
+    last_completed_trading_day,
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+logger = get_logger(__name__)
+
+DEFAULT_PRICE_CACHE_DIR = Path(__file__).parent.parent.parent.parent / "data" / "price_cache"
+PRICE_CACHE_MAX_SEGMENTS = 8  # Appended parts per ticker before compaction
+
+# Tickers become directory names, so only allow symbol characters (e.g., BRK.B, ^GSPC)
+_TICKER_PATTERN = re.compile(r"^[A-Z0-9.\-^=]{1,20}$")
+_SEGMENT_PATTERN = re.compile(r"^(base|part)-(\d{6})\.arrow$")
+
+if PYARROW_AVAILABLE:
+    PRICE_SCHEMA = pa.schema(
+        [("date", pa.date32())] + [(field, pa.float64()) for field in BAR_FIELDS]
+    )
+
+
+def _normalize_ticker(ticker: str) -> str:
+    normalized = (ticker or "").upper().strip()
+    if not _TICKER_PATTERN.match(normalized):
+        raise ValueError(f"Invalid ticker: {ticker!r}")
+    return normalized
+
+
+def bars_to_table(frame: pd.DataFrame) -> "pa.Table":
+    """Convert a yfinance bar frame (Open/High/Low/Close/Volume) into a PRICE_SCHEMA table."""
+    arrays = [pa.array(pd.DatetimeIndex(frame.index).date, type=pa.date32())]
+    for field in BAR_FIELDS:
+        column = field.capitalize()
+        values = frame[column].to_numpy(dtype=float, na_value=np.nan) if column in frame else np.full(len(frame), np.nan)
+        arrays.append(pa.array(values, type=pa.float64(), from_pandas=True))
+    return pa.Table.from_arrays(arrays, schema=PRICE_SCHEMA)
+
+
+class ColumnarPriceCache:
+    """
+    Per-ticker Arrow IPC datasets with incremental appends and zero-copy reads.
+
+    Example:
+        cache = ColumnarPriceCache(Path("data/price_cache"))
+        cache.sync(["AAPL", "^GSPC"])
+        closes = cache.close_matrix(["AAPL", "^GSPC"], start=date(2020, 1, 1))
+    """
+
+    def __init__(self, root: Path = DEFAULT_PRICE_CACHE_DIR) -> None:
+        """
+        Args:
+            root: Cache directory (created if missing)
+        """
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("pyarrow is required for the columnar price cache (poetry install --extras price-cache)")
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()  # Serializes writers within the process
+        # Key: ticker, Value: True while a sync of that ticker is recent
+        self._recent_syncs = LruTtlCache(50000, PRICE_STORE_SYNC_INTERVAL_SECONDS, name="price-cache-syncs")
+
+    # -- segments -------------------------------------------------------------
+
+    def _dir(self, ticker: str) -> Path:
+        return self.root / _normalize_ticker(ticker)
+
+    def _segments(self, ticker: str) -> Tuple[List[Path], int]:
+        """
+        Return (live segments in read order, highest sequence number in use).
+        """
+        directory = self._dir(ticker)
+        if not directory.is_dir():
+            return [], 0
+        found = []
+        for path in directory.iterdir():
+            match = _SEGMENT_PATTERN.match(path.name)
+            if match:
+                found.append((int(match.group(2)), match.group(1), path))
+        if not found:
+            return [], 0
+        found.sort()
+        bases = [seq for seq, kind, _ in found if kind == "base"]
+        base_seq = bases[-1] if bases else 0
+        live = [
+            path for seq, kind, path in found
+            if (kind == "base" and seq == base_seq) or (kind == "part" and seq > base_seq)
+        ]
+        return live, found[-1][0]
+
+    def _write_segment(self, ticker: str, kind: str, seq: int, table: "pa.Table") -> Path:
+        directory = self._dir(ticker)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{kind}-{seq:06d}.arrow"
+        tmp_path = directory / f".{path.name}.{threading.get_ident()}.tmp"
+        with pa.OSFile(str(tmp_path), "wb") as sink:
+            with pa.ipc.new_file(sink, PRICE_SCHEMA) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+        return path
+
+    def _remove_superseded(self, ticker: str) -> None:
+        live, _ = self._segments(ticker)
+        for path in self._dir(ticker).glob("*.arrow"):
+            if path not in live:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass  # Still memory-mapped by a reader (Windows); removed next time
+
+    # -- reads ----------------------------------------------------------------
+
+    def read(
+        self,
+        ticker: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> "pa.Table":
+        """
+        Read a ticker's bars (memory-mapped, zero-copy) sorted by date.
+
+        Args:
+            ticker: Ticker symbol
+            start: First date (inclusive, optional)
+            end: Last date (inclusive, optional)
+
+        Returns:
+            PRICE_SCHEMA table (empty if the ticker is not cached)
+        """
+        for attempt in range(3):
+            live, _ = self._segments(ticker)
+            try:
+                tables = []
+                for path in live:
+                    with pa.memory_map(str(path), "r") as source:
+                        tables.append(pa.ipc.open_file(source).read_all())
+                break
+            except FileNotFoundError:
+                # A concurrent compaction superseded a segment; list again
+                if attempt == 2:
+                    raise
+        if not tables:
+            return PRICE_SCHEMA.empty_table()
+        table = pa.concat_tables(tables) if len(tables) > 1 else tables[0]
+        if start is not None or end is not None:
+            mask = None
+            if start is not None:
+                mask = pc.greater_equal(table["date"], pa.scalar(start, pa.date32()))
+            if end is not None:
+                upper = pc.less_equal(table["date"], pa.scalar(end, pa.date32()))
+                mask = upper if mask is None else pc.and_(mask, upper)
+            table = table.filter(mask)
+        return table
+
+    def read_frame(
+        self,
+        ticker: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> pd.DataFrame:
+        """read() as a DataFrame indexed by date (DatetimeIndex named "date")."""
+        frame = self.read(ticker, start, end).to_pandas()
+        frame["date"] = pd.to_datetime(frame["date"])
+        return frame.set_index("date")
+
+    def latest_date(self, ticker: str) -> Optional[date]:
+        """Return the latest cached bar date (None if the ticker is not cached)."""
+        live, _ = self._segments(ticker)
+        if not live:
+            return None
+        # Segments are appended in date order, so the newest one holds the latest bar
+        with pa.memory_map(str(live[-1]), "r") as source:
+            dates = pa.ipc.open_file(source).read_all()["date"]
+        return pc.max(dates).as_py()
+
+    def close_matrix(
+        self,
+        tickers: Iterable[str],
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> pd.DataFrame:
+        """
+        Closes for many tickers as a wide frame (date index, one column per cached ticker).
+        """
+        columns: Dict[str, pd.Series] = {}
+        for ticker in dict.fromkeys(_normalize_ticker(t) for t in tickers):
+            table = self.read(ticker, start, end)
+            if table.num_rows:
+                columns[ticker] = pd.Series(
+                    table["close"].to_numpy(),
+                    index=pd.DatetimeIndex(table["date"].to_numpy(), name="date"),
+                )
+        if not columns:
+            return pd.DataFrame(index=pd.DatetimeIndex([], name="date"))
+        return pd.DataFrame(columns).sort_index()
+
+    def tickers(self) -> List[str]:
+        """Return every cached ticker."""
+        return sorted(path.name for path in self.root.iterdir() if path.is_dir() and _TICKER_PATTERN.match(path.name))
+
+    # -- writes ---------------------------------------------------------------
+
+    def append(self, ticker: str, table: "pa.Table") -> int:
+        """
+        Append bars newer than the latest cached date as a new segment.
+
+        Args:
+            ticker: Ticker symbol
+            table: PRICE_SCHEMA table (rows at or before the latest cached date are ignored)
+
+        Returns:
+            Number of rows appended
+        """
+        with self._lock:
+            latest = self.latest_date(ticker)
+            if latest is not None:
+                table = table.filter(pc.greater(table["date"], pa.scalar(latest, pa.date32())))
+            if table.num_rows == 0:
+                return 0
+            table = table.sort_by("date")
+            live, seq = self._segments(ticker)
+            kind = "base" if not live else "part"
+            self._write_segment(ticker, kind, seq + 1, table)
+            if len(live) + 1 > PRICE_CACHE_MAX_SEGMENTS:
+                self._compact_locked(ticker)
+            return table.num_rows
+
+    def replace(self, ticker: str, table: "pa.Table") -> int:
+        """Replace a ticker's whole history (e.g., after a restatement)."""
+        with self._lock:
+            _, seq = self._segments(ticker)
+            self._write_segment(ticker, "base", seq + 1, table.sort_by("date"))
+            self._remove_superseded(ticker)
+            return table.num_rows
+
+    def _compact_locked(self, ticker: str) -> None:
+        table = self.read(ticker)
+        _, seq = self._segments(ticker)
+        self._write_segment(ticker, "base", seq + 1, table.combine_chunks())
+        del table
+        self._remove_superseded(ticker)
+
+    def compact(self, ticker: str) -> None:
+        """Merge a ticker's segments into one base segment."""
+        with self._lock:
+            self._compact_locked(ticker)
+
+    # -- sync -----------------------------------------------------------------
+
+    def sync(
+        self,
+        tickers: Iterable[str],
+        backfill_years: int = PRICE_STORE_BACKFILL_YEARS,
+        force: bool = False,
+    ) -> Dict[str, int]:
+        """
+        Bring cached bars up to date (one batched download per group of tickers).
+
+        New tickers are backfilled backfill_years; cached tickers download only
+        bars after their latest cached date (plus the overlap window, which is
+        also used to detect restated history).
+
+        Args:
+            tickers: Ticker symbols
+            backfill_years: History downloaded for tickers that are not cached
+            force: Sync even if the ticker was synced within the sync interval
+
+        Returns:
+            Dictionary of ticker -> bars written (tickers that needed no sync are omitted)
+        """
+        normalized = list(dict.fromkeys(_normalize_ticker(t) for t in tickers))
+        if not force:
+            normalized = [t for t in normalized if self._recent_syncs.get(t) is MISSING]
+        if not normalized:
+            return {}
+
+        today = date.today()
+        fresh_after = last_completed_trading_day(today)
+        latest = {ticker: self.latest_date(ticker) for ticker in normalized}
+        backfill = [t for t in normalized if latest[t] is None]
+        incremental = [t for t in normalized if latest[t] is not None and (force or latest[t] < fresh_after)]
+        synced = [t for t in normalized if latest[t] is not None and t not in incremental]
+        written: Dict[str, int] = {}
+
+        if incremental:
+            overlap_start = min(latest[t] for t in incremental) - timedelta(days=PRICE_STORE_OVERLAP_DAYS)
+            bars = download_bars(incremental, overlap_start)
+            for ticker in incremental:
+                frame = bars.get(ticker)
+                if frame is None:
+                    continue
+                overlap = self.read(ticker, start=overlap_start)
+                stored = pd.Series(overlap["close"].to_numpy(), index=overlap["date"].to_pylist())
+                if is_restated(stored, frame):
+                    logger.info(f"Cached price history for {ticker} was restated; re-backfilling")
+                    backfill.append(ticker)
+                    continue
+                written[ticker] = self.append(ticker, bars_to_table(frame))
+                synced.append(ticker)
+
+        if backfill:
+            bars = download_bars(backfill, today - timedelta(days=365 * backfill_years))
+            for ticker in backfill:
+                frame = bars.get(ticker)
+                if frame is not None:
+                    written[ticker] = self.replace(ticker, bars_to_table(frame))
+                    synced.append(ticker)
+
+        # Tickers whose download failed are retried on the next call
+        for ticker in synced:
+            self._recent_syncs.set(ticker, True)
+        if written:
+            logger.info(
+                f"Columnar price cache sync: {sum(written.values())} bars for {len(written)} tickers "
+                f"({len(backfill)} backfilled, {len(incremental)} incremental)"
+            )
+        return written
+
+    def stats(self) -> Dict[str, object]:
+        """Return ticker count and on-disk size."""
+        files = list(self.root.glob("*/*.arrow"))
+        return {
+            "root": str(self.root),
+            "tickers": len(self.tickers()),
+            "segments": len(files),
+            "bytes": sum(path.stat().st_size for path in files),
+        }
+
+
+# Process-wide cache (created lazily on first use)
+_price_cache: Optional[ColumnarPriceCache] = None
+_price_cache_initialized = False
+_price_cache_lock = threading.Lock()
+
+
+def get_columnar_price_cache() -> Optional[ColumnarPriceCache]:
+    """
+    Return the process-wide columnar price cache, or None if it is disabled or
+    pyarrow is not installed.
+    """
+    global _price_cache, _price_cache_initialized
+    if not _price_cache_initialized:
+        with _price_cache_lock:
+            if not _price_cache_initialized:
+                enabled = os.getenv("PRICE_CACHE_ENABLED", "1").strip().lower()
+                if enabled in {"0", "false", "no", "off"}:
+                    logger.info("Columnar price cache disabled (PRICE_CACHE_ENABLED)")
+                elif not PYARROW_AVAILABLE:
+                    logger.info("Columnar price cache unavailable (pyarrow not installed)")
+                else:
+                    root = Path(os.getenv("PRICE_CACHE_DIR") or DEFAULT_PRICE_CACHE_DIR).expanduser()
+                    _price_cache = ColumnarPriceCache(root)
+                _price_cache_initialized = True
+    return _price_cache
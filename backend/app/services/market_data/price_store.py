@@ -0,0 +1,453 @@
+"""
+price_store.py — Incremental EOD price store backed by the price_bar table.
+
+Daily bars are downloaded from yfinance once and kept in price_bar; after the
+initial backfill only the bars after the latest stored date are fetched:
+    * One batched yf.download per sync for every ticker that needs bars
+    * Bulk upserts on the unique (company_id, date) index
+    * A short overlap window is re-downloaded on each sync; if the provider has
+      restated those bars (split / dividend adjustment) the company is re-backfilled
+    * Tickers synced recently are not checked again within the sync interval
+
+Bars are stored as yfinance auto-adjusted OHLC, so close is the adjusted close
+(what beta has always used) and the latest close equals the traded price.
+
+Only tickers present in the company table are stored. Benchmark indexes
+("^GSPC", ...) are registered in the company table on first use
+(sector "Index").
+
+Configuration via environment variables:
+    PRICE_STORE_BACKFILL_YEARS        - History downloaded for a new ticker (default: 5)
+    PRICE_STORE_SYNC_INTERVAL_SECONDS - Minimum time between syncs of one ticker (default: 21600 = 6 hours)
+"""
+
+from __future__ import annotations
+
+import os
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import yfinance as yf
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.core.logging import get_logger
+from app.core.lru_ttl_cache import MISSING, LruTtlCache
+from app.models.company import Company
+from app.models.price_bar import PriceBar
+
+logger = get_logger(__name__)
+
+PRICE_STORE_BACKFILL_YEARS = int(os.getenv("PRICE_STORE_BACKFILL_YEARS", "5"))
+PRICE_STORE_SYNC_INTERVAL_SECONDS = int(os.getenv("PRICE_STORE_SYNC_INTERVAL_SECONDS", str(6 * 3600)))
+PRICE_STORE_OVERLAP_DAYS = 7  # Calendar days re-downloaded to detect restated history
+RESTATEMENT_TOLERANCE = 1e-4  # Relative close difference treated as a restatement
+UPSERT_BATCH_SIZE = 5000
+
+BENCHMARK_SECTOR = "Index"
+BENCHMARK_INDUSTRY = "Benchmark Index"
+
+BAR_FIELDS = ("open", "high", "low", "close", "volume")
+
+# The ORM models live on separate declarative bases, so the store works on the
+# tables directly (Core statements) instead of mapping relationships
+_price_bar = PriceBar.__table__
+_company = Company.__table__
+
+# Key: ticker, Value: True while a sync of that ticker is recent
+_recent_syncs = LruTtlCache(50000, PRICE_STORE_SYNC_INTERVAL_SECONDS, name="price-store-syncs")
+
+
+def _is_benchmark(ticker: str) -> bool:
+    return ticker.startswith("^")
+
+
+def _normalize(tickers: Iterable[str]) -> List[str]:
+    return list(dict.fromkeys(t.upper().strip() for t in tickers if t and t.strip()))
+
+
+def last_completed_trading_day(today: date) -> date:
+    """Previous weekday (exchange holidays are absorbed by the sync interval)."""
+    return (pd.Timestamp(today) - pd.offsets.BDay(1)).date()
+
+
+# -----------------------------------------------------------------------------
+# Company lookup
+# -----------------------------------------------------------------------------
+
+def get_company_ids(session: Session, tickers: Iterable[str]) -> Dict[str, int]:
+    """
+    Map tickers to company ids, registering benchmark indexes that are missing.
+
+    Args:
+        session: SQLAlchemy database session
+        tickers: Ticker symbols (normalized to upper case)
+
+    Returns:
+        Dictionary of ticker -> company id (tickers not in the company table,
+        other than benchmarks, are omitted)
+    """
+    normalized = _normalize(tickers)
+    if not normalized:
+        return {}
+    rows = session.execute(
+        select(_company.c.ticker, _company.c.id).where(_company.c.ticker.in_(normalized))
+    ).all()
+    ids = {ticker: company_id for ticker, company_id in rows}
+
+    new_benchmarks = [t for t in normalized if t not in ids and _is_benchmark(t)]
+    for ticker in new_benchmarks:
+        ids[ticker] = session.execute(
+            insert(_company)
+            .values(ticker=ticker, name=ticker, sector=BENCHMARK_SECTOR, industry=BENCHMARK_INDUSTRY)
+            .returning(_company.c.id)
+        ).scalar_one()
+        logger.info(f"Registered benchmark {ticker} in company table for price storage")
+    return ids
+
+
+# -----------------------------------------------------------------------------
+# Download + upsert
+# -----------------------------------------------------------------------------
+
+def download_bars(tickers: List[str], start: date) -> Dict[str, pd.DataFrame]:
+    """
+    Download daily auto-adjusted bars for all tickers in one batched request.
+
+    Returns:
+        Dictionary of ticker -> DataFrame (DatetimeIndex, columns Open/High/Low/Close/Volume);
+        tickers without data are omitted
+    """
+    try:
+        data = yf.download(
+            tickers,
+            start=start,
+            auto_adjust=True,
+            actions=False,
+            group_by="ticker",
+            threads=True,
+            progress=False,
+        )
+    except Exception as e:
+        logger.warning(f"Batched yfinance bar download failed for {len(tickers)} tickers: {e}")
+        return {}
+    if data is None or data.empty:
+        return {}
+
+    bars: Dict[str, pd.DataFrame] = {}
+    for ticker in tickers:
+        if isinstance(data.columns, pd.MultiIndex):
+            if ticker not in data.columns.get_level_values(0):
+                continue
+            frame = data[ticker]
+        else:
+            frame = data
+        frame = frame.dropna(subset=["Close"])
+        if not frame.empty:
+            bars[ticker] = frame
+    return bars
+
+
+def _bar_rows(company_id: int, frame: pd.DataFrame) -> List[Dict[str, object]]:
+    """Convert a yfinance bar frame into price_bar rows (NaN -> NULL)."""
+    dates = pd.DatetimeIndex(frame.index).date
+    columns = {
+        field: frame[field.capitalize()].to_numpy(dtype=float, na_value=np.nan)
+        if field.capitalize() in frame else np.full(len(frame), np.nan)
+        for field in BAR_FIELDS
+    }
+    rows = []
+    for i, bar_date in enumerate(dates):
+        row: Dict[str, object] = {"company_id": company_id, "date": bar_date}
+        for field in BAR_FIELDS:
+            value = columns[field][i]
+            row[field] = None if np.isnan(value) else float(value)
+        rows.append(row)
+    return rows
+
+
+def upsert_price_bars(session: Session, company_id: int, frame: pd.DataFrame) -> int:
+    """
+    Insert or update bars for one company on the unique (company_id, date) index.
+
+    Args:
+        session: SQLAlchemy database session
+        company_id: Company id
+        frame: yfinance bar frame (see download_bars)
+
+    Returns:
+        Number of rows written
+    """
+    rows = _bar_rows(company_id, frame)
+    if not rows:
+        return 0
+
+    dialect = session.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        statement = dialect_insert(_price_bar)
+        statement = statement.on_conflict_do_update(
+            index_elements=[_price_bar.c.company_id, _price_bar.c.date],
+            set_={field: statement.excluded[field] for field in BAR_FIELDS},
+        )
+    else:
+        # No native upsert: replace the affected dates
+        session.execute(
+            delete(_price_bar).where(
+                _price_bar.c.company_id == company_id,
+                _price_bar.c.date.in_([row["date"] for row in rows]),
+            )
+        )
+        statement = insert(_price_bar)
+
+    for offset in range(0, len(rows), UPSERT_BATCH_SIZE):
+        session.execute(statement, rows[offset:offset + UPSERT_BATCH_SIZE])
+    return len(rows)
+
+
+def _latest_dates(session: Session, company_ids: Iterable[int]) -> Dict[int, date]:
+    ids = list(company_ids)
+    if not ids:
+        return {}
+    rows = session.execute(
+        select(_price_bar.c.company_id, func.max(_price_bar.c.date))
+        .where(_price_bar.c.company_id.in_(ids))
+        .group_by(_price_bar.c.company_id)
+    ).all()
+    return {company_id: latest for company_id, latest in rows}
+
+
+def _stored_closes(session: Session, company_ids: List[int], start: date) -> Dict[int, pd.Series]:
+    rows = session.execute(
+        select(_price_bar.c.company_id, _price_bar.c.date, _price_bar.c.close)
+        .where(_price_bar.c.company_id.in_(company_ids), _price_bar.c.date >= start)
+    ).all()
+    closes: Dict[int, Dict[date, float]] = {}
+    for company_id, bar_date, close in rows:
+        closes.setdefault(company_id, {})[bar_date] = close
+    return {company_id: pd.Series(values) for company_id, values in closes.items()}
+
+
+def is_restated(stored: Optional[pd.Series], frame: pd.DataFrame) -> bool:
+    """True if downloaded closes disagree with stored closes on overlapping dates."""
+    if stored is None or stored.empty:
+        return False
+    fresh = pd.Series(frame["Close"].to_numpy(dtype=float), index=pd.DatetimeIndex(frame.index).date)
+    common = stored.index.intersection(fresh.index)
+    if common.empty:
+        return False
+    old = stored.loc[common].to_numpy(dtype=float)
+    new = fresh.loc[common].to_numpy(dtype=float)
+    return bool(np.any(np.abs(new - old) > RESTATEMENT_TOLERANCE * np.abs(old)))
+
+
+def sync_prices(
+    session: Session,
+    tickers: Iterable[str],
+    backfill_years: int = PRICE_STORE_BACKFILL_YEARS,
+    force: bool = False,
+) -> Dict[str, int]:
+    """
+    Bring stored bars up to date for the given tickers.
+
+    New tickers are backfilled backfill_years; stored tickers only download
+    bars after their latest stored date (plus the overlap window). A ticker
+    whose history was restated keeps its stored bars until the replacement
+    backfill has downloaded; they are then deleted and rewritten in the same
+    transaction. Commits the session.
+
+    Only tickers whose bars were written (or that were already up to date)
+    count as synced; a failed download is retried on the next call.
+
+    Args:
+        session: SQLAlchemy database session
+        tickers: Ticker symbols
+        backfill_years: History downloaded for tickers with no stored bars
+        force: Sync even if the ticker was synced within the sync interval
+
+    Returns:
+        Dictionary of ticker -> bars written (tickers that needed no sync are omitted)
+    """
+    company_ids = get_company_ids(session, tickers)
+    if not force:
+        company_ids = {t: cid for t, cid in company_ids.items() if _recent_syncs.get(t) is MISSING}
+    if not company_ids:
+        return {}
+
+    today = date.today()
+    backfill_start = today - timedelta(days=365 * backfill_years)
+    latest = _latest_dates(session, company_ids.values())
+    fresh_after = last_completed_trading_day(today)
+
+    backfill = [t for t, cid in company_ids.items() if cid not in latest]
+    incremental = [
+        t for t, cid in company_ids.items()
+        if cid in latest and (force or latest[cid] < fresh_after)
+    ]
+    synced = [t for t, cid in company_ids.items() if cid in latest and t not in incremental]
+    restated: List[str] = []
+    written: Dict[str, int] = {}
+
+    if incremental:
+        overlap_start = min(latest[company_ids[t]] for t in incremental) - timedelta(days=PRICE_STORE_OVERLAP_DAYS)
+        bars = download_bars(incremental, overlap_start)
+        stored = _stored_closes(session, [company_ids[t] for t in incremental], overlap_start)
+        for ticker in incremental:
+            frame = bars.get(ticker)
+            if frame is None:
+                continue
+            company_id = company_ids[ticker]
+            if is_restated(stored.get(company_id), frame):
+                # Adjusted history changed (split or dividend): reload it all below
+                logger.info(f"Price history for {ticker} was restated; re-backfilling")
+                restated.append(ticker)
+                continue
+            own_start = pd.Timestamp(latest[company_id] - timedelta(days=PRICE_STORE_OVERLAP_DAYS))
+            written[ticker] = upsert_price_bars(session, company_id, frame[frame.index >= own_start])
+            synced.append(ticker)
+
+    if backfill or restated:
+        bars = download_bars(backfill + restated, backfill_start)
+        for ticker in backfill + restated:
+            frame = bars.get(ticker)
+            if frame is None:
+                continue
+            if ticker in restated:
+                session.execute(delete(_price_bar).where(_price_bar.c.company_id == company_ids[ticker]))
+            written[ticker] = upsert_price_bars(session, company_ids[ticker], frame)
+            synced.append(ticker)
+
+    session.commit()
+    for ticker in synced:
+        _recent_syncs.set(ticker, True)
+
+    if written:
+        logger.info(
+            f"Price store sync: {sum(written.values())} bars for {len(written)} tickers "
+            f"({len(backfill)} backfilled, {len(restated)} re-backfilled, {len(incremental)} incremental)"
+        )
+    return written
+
+
+# -----------------------------------------------------------------------------
+# Reads
+# -----------------------------------------------------------------------------
+
+def load_close_history(
+    session: Session,
+    tickers: Iterable[str],
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> pd.DataFrame:
+    """
+    Read stored closes as a wide frame.
+
+    Args:
+        session: SQLAlchemy database session
+        tickers: Ticker symbols
+        start: First date (inclusive, optional)
+        end: Last date (inclusive, optional)
+
+    Returns:
+        DataFrame indexed by date (DatetimeIndex named "date") with one column
+        per ticker that has stored bars
+    """
+    normalized = _normalize(tickers)
+    rows = session.execute(
+        select(_company.c.id, _company.c.ticker).where(_company.c.ticker.in_(normalized))
+    ).all() if normalized else []
+    ticker_by_id = {company_id: ticker for company_id, ticker in rows}
+    if not ticker_by_id:
+        return pd.DataFrame(index=pd.DatetimeIndex([], name="date"))
+
+    query = select(_price_bar.c.company_id, _price_bar.c.date, _price_bar.c.close).where(
+        _price_bar.c.company_id.in_(list(ticker_by_id))
+    )
+    if start is not None:
+        query = query.where(_price_bar.c.date >= start)
+    if end is not None:
+        query = query.where(_price_bar.c.date <= end)
+
+    long = pd.DataFrame(session.execute(query).all(), columns=["company_id", "date", "close"])
+    if long.empty:
+        return pd.DataFrame(index=pd.DatetimeIndex([], name="date"))
+    long["ticker"] = long["company_id"].map(ticker_by_id)
+    long["date"] = pd.to_datetime(long["date"])
+    wide = long.pivot(index="date", columns="ticker", values="close").sort_index()
+    wide.columns.name = None
+    return wide[[t for t in normalized if t in wide.columns]]
+
+
+def latest_stored_closes(session: Session, tickers: Iterable[str]) -> Dict[str, Tuple[date, float]]:
+    """
+    Return the latest stored (date, close) per ticker (tickers without bars are omitted).
+    """
+    company_ids = {}
+    normalized = _normalize(tickers)
+    if normalized:
+        company_ids = dict(session.execute(
+            select(_company.c.ticker, _company.c.id).where(_company.c.ticker.in_(normalized))
+        ).all())
+    latest = _latest_dates(session, company_ids.values())
+    if not latest:
+        return {}
+    ticker_by_id = {cid: t for t, cid in company_ids.items()}
+    rows = session.execute(
+        select(_price_bar.c.company_id, _price_bar.c.date, _price_bar.c.close).where(
+            _price_bar.c.company_id.in_(list(latest)),
+            _price_bar.c.date >= min(latest.values()),
+        )
+    ).all()
+    return {
+        ticker_by_id[company_id]: (bar_date, close)
+        for company_id, bar_date, close in rows
+        if latest[company_id] == bar_date
+    }
+
+
+def get_close_history(
+    tickers: Iterable[str],
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    sync: bool = True,
+) -> Optional[pd.DataFrame]:
+    """
+    Convenience wrapper that manages its own session: sync (optional), then read.
+
+    Returns:
+        Wide close frame (see load_close_history), or None if the database is
+        not configured
+    """
+    if SessionLocal is None:
+        return None
+    tickers = _normalize(tickers)
+    db = SessionLocal()
+    try:
+        if sync:
+            sync_prices(db, tickers)
+        return load_close_history(db, tickers, start=start, end=end)
+    finally:
+        db.close()
+
+
+def get_latest_stored_closes(tickers: Iterable[str]) -> Dict[str, Tuple[date, float]]:
+    """
+    Latest stored (date, close) per ticker without syncing, using its own
+    session (empty if the database is not configured or unavailable).
+    """
+    if SessionLocal is None:
+        return {}
+    db = SessionLocal()
+    try:
+        return latest_stored_closes(db, tickers)
+    except Exception as e:
+        logger.warning(f"Could not read stored closes: {e}")
+        return {}
+    finally:
+        db.close()
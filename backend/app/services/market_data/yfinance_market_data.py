@@ -4,23 +4,53 @@ yfinance_market_data.py — Market data fetching using yfinance library.
 This module provides functions to:
 - Look up company tickers from the Denari database
 - Fetch latest stock prices and shares outstanding from yfinance
+- Fetch prices and shares for many tickers at once (one batched price download)
 - Expose clean, reusable functions for market data access
+
+Prices and share counts are cached per field: prices change during the trading
+day, share counts only with filings.
+
+Configuration via environment variables:
+    YFINANCE_PRICE_TTL_SECONDS  - How long a fetched price is reused (default: 300)
+    YFINANCE_SHARES_TTL_SECONDS - How long a fetched share count is reused (default: 259200 = 3 days)
+    YFINANCE_BULK_WORKERS       - Concurrent share-count lookups per bulk fetch (default: 8)
 """
 
 from __future__ import annotations
 
-from typing import Optional, Dict, Any
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Iterable, List
 
+import pandas as pd
 import yfinance as yf
 
 from sqlalchemy.orm import Session
 
 from app.core.database import SessionLocal
 from app.core.logging import get_logger
+from app.core.lru_ttl_cache import MISSING, LruTtlCache
+from app.core.single_flight import SingleFlight
 from app.models.company import Company
+from app.services.market_data.price_store import get_latest_stored_closes
 
 logger = get_logger(__name__)
 
+YFINANCE_PRICE_TTL_SECONDS = int(os.getenv("YFINANCE_PRICE_TTL_SECONDS", "300"))
+YFINANCE_SHARES_TTL_SECONDS = int(os.getenv("YFINANCE_SHARES_TTL_SECONDS", str(3 * 24 * 3600)))
+YFINANCE_BULK_WORKERS = int(os.getenv("YFINANCE_BULK_WORKERS", "8"))
+YFINANCE_CACHE_MAX_ENTRIES = 10000
+
+# Coalesces concurrent lookups of the same ticker into one yfinance round-trip
+_yfinance_flight = SingleFlight("yfinance")
+
+# Key: normalized ticker, Value: float (prices may also cache None = no quote)
+_price_cache = LruTtlCache(YFINANCE_CACHE_MAX_ENTRIES, YFINANCE_PRICE_TTL_SECONDS, name="yfinance-prices")
+_shares_cache = LruTtlCache(YFINANCE_CACHE_MAX_ENTRIES, YFINANCE_SHARES_TTL_SECONDS, name="yfinance-shares")
+
+BULK_COLUMNS = ["last_price", "shares_outstanding", "market_cap"]
+
 
 def get_ticker_for_company(session: Session, company_name: str) -> Optional[str]:
     """
@@ -67,7 +97,8 @@ def fetch_price_and_shares_from_yfinance(ticker: str) -> Dict[str, Optional[floa
     This function uses multiple fallback strategies to get reliable data:
     1. Tries to get price from recent market data (history)
     2. Falls back to info.currentPrice if history unavailable
-    3. Gets shares outstanding from info.sharesOutstanding
+    3. Falls back to the latest close in the local price store
+    4. Gets shares outstanding from info.sharesOutstanding
     
     Args:
         ticker: Stock ticker symbol (e.g., "F" for Ford)
@@ -79,6 +110,193 @@ def fetch_price_and_shares_from_yfinance(ticker: str) -> Dict[str, Optional[floa
         - 'shares_outstanding': Shares outstanding (float or None)
         - 'market_cap': Market capitalization (float or None, computed if both price and shares available)
     """
+    normalized_ticker = ticker.upper().strip()
+    last_price = _price_cache.get(normalized_ticker)
+    shares_outstanding = _shares_cache.get(normalized_ticker)
+    if last_price is not MISSING and shares_outstanding is not MISSING:
+        return _price_and_shares_result(ticker, last_price, shares_outstanding)
+    
+    # Callers asking for the same ticker at the same moment share one fetch
+    result = dict(_yfinance_flight.do(
+        ("price_and_shares", normalized_ticker),
+        lambda: _fetch_price_and_shares(ticker),
+    ))
+    _price_cache.set(normalized_ticker, result["last_price"])
+    if result["shares_outstanding"] is not None:
+        _shares_cache.set(normalized_ticker, result["shares_outstanding"])
+    return result
+
+
+def _price_and_shares_result(
+    ticker: str,
+    last_price: Optional[float],
+    shares_outstanding: Optional[float],
+) -> Dict[str, Optional[float]]:
+    """Build the fetch_price_and_shares_from_yfinance() result dict."""
+    market_cap = None
+    if last_price is not None and shares_outstanding is not None:
+        market_cap = last_price * shares_outstanding
+    return {
+        "ticker": ticker,
+        "last_price": last_price,
+        "shares_outstanding": shares_outstanding,
+        "market_cap": market_cap,
+    }
+
+
+def _to_float(value: Any) -> Optional[float]:
+    """Convert a yfinance value to float (None if missing or not a number)."""
+    if value is None:
+        return None
+    try:
+        number = float(value)
+    except (ValueError, TypeError):
+        return None
+    return None if math.isnan(number) else number
+
+
+def _download_last_closes(tickers: List[str]) -> Dict[str, Optional[float]]:
+    """
+    Download recent daily bars for all tickers in one batched request and
+    return the latest close per ticker (None where yfinance had no data).
+    """
+    closes: Dict[str, Optional[float]] = {ticker: None for ticker in tickers}
+    try:
+        # Last 5 days so a holiday or a ticker that did not trade today still has a close
+        data = yf.download(
+            tickers,
+            period="5d",
+            group_by="column",
+            threads=True,
+            progress=False,
+        )
+    except Exception as e:
+        logger.warning(f"Batched yfinance price download failed for {len(tickers)} tickers: {e}")
+        return closes
+    
+    if data is None or data.empty or "Close" not in data:
+        return closes
+    
+    close_frame = data["Close"]
+    if isinstance(close_frame, pd.Series):
+        close_frame = close_frame.to_frame(name=tickers[0])
+    
+    last_valid = close_frame.ffill().iloc[-1]
+    for ticker in tickers:
+        if ticker in last_valid.index:
+            closes[ticker] = _to_float(last_valid[ticker])
+    return closes
+
+
+def _fetch_info_fields(ticker: str) -> Dict[str, Optional[float]]:
+    """Fetch shares outstanding (and fallback prices) from yfinance info for one ticker."""
+    try:
+        info = yf.Ticker(ticker).info or {}
+    except Exception as e:
+        logger.warning(f"Could not fetch yfinance info for {ticker}: {e}")
+        info = {}
+    return {
+        "shares_outstanding": _to_float(info.get("sharesOutstanding")),
+        "last_price": _to_float(info.get("currentPrice")) or _to_float(info.get("regularMarketPrice")),
+    }
+
+
+def fetch_prices_and_shares_bulk(tickers: Iterable[str]) -> pd.DataFrame:
+    """
+    Fetch the latest price and shares outstanding for many tickers at once
+    (e.g., a comps set or a screener page).
+    
+    Cached fields are reused; missing prices come from one batched yfinance
+    download and missing share counts are fetched concurrently. Tickers with no
+    close in the download fall back to info.currentPrice / regularMarketPrice
+    and then to the latest close in the local price store, as in
+    fetch_price_and_shares_from_yfinance().
+    
+    Args:
+        tickers: Stock ticker symbols (duplicates and blanks are ignored)
+        
+    Returns:
+        DataFrame indexed by normalized ticker (in request order) with float
+        columns last_price, shares_outstanding and market_cap (NaN where
+        unavailable)
+    """
+    normalized: List[str] = list(dict.fromkeys(t.upper().strip() for t in tickers if t and t.strip()))
+    if not normalized:
+        return pd.DataFrame(columns=BULK_COLUMNS, index=pd.Index([], name="ticker"), dtype=float)
+    
+    prices: Dict[str, Optional[float]] = {}
+    shares: Dict[str, Optional[float]] = {}
+    for ticker in normalized:
+        cached_price = _price_cache.get(ticker)
+        if cached_price is not MISSING:
+            prices[ticker] = cached_price
+        cached_shares = _shares_cache.get(ticker)
+        if cached_shares is not MISSING:
+            shares[ticker] = cached_shares
+    
+    # Step 1: One batched download for every ticker without a cached price
+    price_misses = [ticker for ticker in normalized if ticker not in prices]
+    if price_misses:
+        prices.update(_download_last_closes(price_misses))
+    
+    # Step 2: Concurrent info lookups for missing share counts (and prices the
+    # download could not provide)
+    info_tickers = [
+        ticker for ticker in normalized
+        if ticker not in shares or (ticker in price_misses and prices.get(ticker) is None)
+    ]
+    if info_tickers:
+        with ThreadPoolExecutor(
+            max_workers=min(YFINANCE_BULK_WORKERS, len(info_tickers)),
+            thread_name_prefix="yfinance-bulk",
+        ) as executor:
+            infos = dict(zip(info_tickers, executor.map(
+                lambda t: _yfinance_flight.do(("info", t), lambda: _fetch_info_fields(t)),
+                info_tickers,
+            )))
+        for ticker, info in infos.items():
+            if ticker not in shares:
+                shares[ticker] = info["shares_outstanding"]
+            if prices.get(ticker) is None and ticker in price_misses:
+                prices[ticker] = info["last_price"]
+    
+    # Step 3: Latest stored close for anything yfinance could not price
+    unpriced = [ticker for ticker in price_misses if prices.get(ticker) is None]
+    if unpriced:
+        for ticker, (_, close) in get_latest_stored_closes(unpriced).items():
+            prices[ticker] = float(close)
+    
+    for ticker in price_misses:
+        _price_cache.set(ticker, prices.get(ticker))
+    for ticker in info_tickers:
+        # A missing share count may be a transient failure; do not pin it for days
+        if shares.get(ticker) is not None:
+            _shares_cache.set(ticker, shares[ticker])
+    
+    frame = pd.DataFrame(
+        {
+            "last_price": [prices.get(ticker) for ticker in normalized],
+            "shares_outstanding": [shares.get(ticker) for ticker in normalized],
+        },
+        index=pd.Index(normalized, name="ticker"),
+        dtype=float,
+    )
+    frame["market_cap"] = frame["last_price"] * frame["shares_outstanding"]
+    
+    logger.info(
+        f"Bulk market data for {len(normalized)} tickers: {len(price_misses)} prices downloaded, "
+        f"{len(info_tickers)} info lookups, {int(frame['last_price'].isna().sum())} without price"
+    )
+    return frame
+
+
+def get_market_data_cache_stats() -> Dict[str, Any]:
+    """Return hit/miss metrics for the price and share-count caches."""
+    return {"prices": _price_cache.stats(), "shares": _shares_cache.stats()}
+
+
+def _fetch_price_and_shares(ticker: str) -> Dict[str, Optional[float]]:
+    """Uncoalesced body of fetch_price_and_shares_from_yfinance()."""
     result: Dict[str, Optional[float]] = {
         "ticker": ticker,
         "last_price": None,
@@ -127,6 +345,13 @@ def fetch_price_and_shares_from_yfinance(ticker: str) -> Dict[str, Optional[floa
                 except (ValueError, TypeError):
                     last_price = None
         
+        # Method 4: Latest close in the local price store
+        if last_price is None:
+            stored = get_latest_stored_closes([ticker]).get(ticker.upper().strip())
+            if stored is not None:
+                last_price = float(stored[1])
+                logger.debug(f"Got price {last_price} from price store ({stored[0]}) for {ticker}")
+        
         result["last_price"] = last_price
         
         # Get shares outstanding
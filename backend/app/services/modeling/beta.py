@@ -5,17 +5,41 @@ Purpose:
 - Pull historical price data for a target ticker and benchmark index
 - Prepare the raw data range used by Excel formulas to calculate beta
 - Provide helpers so Excel export can drop the data onto a worksheet
+- Calculate beta statistics natively (beta_engine) for the API and model defaults
 
-This module does NOT calculate beta numerically; Excel handles that so
-the model stays auditable for analysts.
+Prices are read locally, first from the columnar price cache (Arrow files,
+no database needed) and then from the price store (price_bar table); both
+are synced incrementally. yfinance is downloaded directly only when neither
+is available or tracks the ticker.
+
+The Excel sheet still calculates beta with a SLOPE formula so the model stays
+auditable for analysts; calculate_beta() / calculate_betas() return the same
+OLS beta (plus adjusted beta, R² and standard error) without Excel, and
+calculate_rolling_betas() returns how it evolves per horizon and frequency.
 """
 
 from datetime import datetime, timedelta
-from typing import Dict, Any, Tuple, Optional
+from io import BytesIO
+from typing import Dict, Any, List, Sequence, Tuple, Optional
 
+import numpy as np
 import pandas as pd
 import yfinance as yf
 
+from app.core.logging import get_logger
+from app.services.market_data.columnar_price_cache import get_columnar_price_cache
+from app.services.market_data.price_store import get_close_history
+from app.services.modeling.beta_engine import (
+    BETA_STAT_COLUMNS,
+    RETURN_FREQUENCIES,
+    compute_betas,
+    compute_returns,
+    compute_rolling_betas,
+    regress_returns,
+)
+
+logger = get_logger(__name__)
+
 
 # Benchmark options
 BENCHMARK_OPTIONS = {
@@ -35,6 +59,88 @@ YEAR_OPTIONS = {
 DEFAULT_LOOKBACK_YEARS = 5
 DEFAULT_LOOKBACK_DAYS = YEAR_OPTIONS[DEFAULT_LOOKBACK_YEARS]
 DEFAULT_BENCHMARK = "^GSPC"  # S&P 500
+EXCEL_EPOCH = np.datetime64("1899-12-30")  # Day 0 of Excel's 1900 date system (after its leap-year bug)
+ROLLING_LOOKBACK_YEARS = 10  # Price history read for rolling betas (limited to what is stored)
+
+
+def _lookback_days(lookback_days: Optional[int], lookback_years: Optional[int]) -> int:
+    """Resolve the lookback window (lookback_years wins; must be 1, 3, or 5)."""
+    if lookback_years is not None:
+        if lookback_years not in YEAR_OPTIONS:
+            raise ValueError(f"lookback_years must be 1, 3, or 5, got {lookback_years}")
+        return YEAR_OPTIONS[lookback_years]
+    return lookback_days if lookback_days is not None else DEFAULT_LOOKBACK_DAYS
+
+
+def _download_adj_closes(tickers: List[str], start: datetime, end: datetime) -> pd.DataFrame:
+    """Download adjusted closes from yfinance (one batched request)."""
+    data = yf.download(tickers, start=start, end=end, progress=False, auto_adjust=False)
+    if data is None or data.empty:
+        return pd.DataFrame()
+    adj_close = data["Adj Close"]
+    if isinstance(adj_close, pd.Series):
+        adj_close = adj_close.to_frame(name=tickers[0])
+    adj_close.columns = [str(c).upper() for c in adj_close.columns]
+    return adj_close
+
+
+def load_close_matrix(
+    tickers: Sequence[str],
+    start: datetime,
+    end: datetime,
+) -> pd.DataFrame:
+    """
+    Adjusted closes for several tickers / benchmarks, read locally when possible.
+
+    Sources, in order: the columnar price cache, the price store (price_bar
+    table), then one batched yfinance download for whatever is still missing.
+
+    Args:
+        tickers: Ticker and benchmark symbols
+        start: Window start
+        end: Window end
+
+    Returns:
+        Wide DataFrame (date index named "date", one column per ticker that
+        has data, upper-case symbols)
+    """
+    wanted = list(dict.fromkeys(t.upper().strip() for t in tickers if t and t.strip()))
+    frames: List[pd.DataFrame] = []
+    missing = list(wanted)
+
+    def _take(closes: Optional[pd.DataFrame]) -> None:
+        nonlocal missing
+        if closes is None or closes.empty:
+            return
+        found = [t for t in missing if t in closes.columns and closes[t].notna().any()]
+        if found:
+            closes = closes[found].copy()
+            closes.index = pd.DatetimeIndex(closes.index).tz_localize(None).normalize()
+            frames.append(closes)
+            missing = [t for t in missing if t not in found]
+
+    cache = get_columnar_price_cache()
+    if cache is not None:
+        try:
+            cache.sync(missing)
+            _take(cache.close_matrix(missing, start=start.date(), end=end.date()))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Columnar price cache unavailable: {e}")
+
+    if missing:
+        try:
+            _take(get_close_history(missing, start=start.date(), end=end.date()))
+        except Exception as e:
+            logger.warning(f"Price store unavailable, downloading instead: {e}")
+
+    if missing:
+        _take(_download_adj_closes(missing, start, end))
+
+    if not frames:
+        return pd.DataFrame(index=pd.DatetimeIndex([], name="date"))
+    closes = pd.concat(frames, axis=1).sort_index()
+    closes.index.name = "date"
+    return closes[[t for t in wanted if t in closes.columns]]
 
 
 def fetch_price_history(
@@ -55,48 +161,125 @@ def fetch_price_history(
     Returns:
         (ticker_prices, benchmark_prices) as dataframes indexed by date
     """
-    # Use years if provided, otherwise use days
-    if lookback_years is not None:
-        if lookback_years not in YEAR_OPTIONS:
-            raise ValueError(f"lookback_years must be 1, 3, or 5, got {lookback_years}")
-        lookback_days = YEAR_OPTIONS[lookback_years]
-    
+    lookback_days = _lookback_days(lookback_days, lookback_years)
     end = datetime.utcnow()
     start = end - timedelta(days=lookback_days)
 
-    ticker_data = yf.download(ticker, start=start, end=end, progress=False, auto_adjust=False)
-    benchmark_data = yf.download(benchmark, start=start, end=end, progress=False, auto_adjust=False)
-
-    if ticker_data.empty or benchmark_data.empty:
+    closes = load_close_matrix([ticker, benchmark], start, end)
+    ticker_key, benchmark_key = ticker.upper().strip(), benchmark.upper().strip()
+    if ticker_key not in closes or benchmark_key not in closes:
         raise ValueError("Unable to download price history for beta calc")
 
-    # Handle MultiIndex columns (when multiple tickers) or single-level columns
-    if isinstance(ticker_data.columns, pd.MultiIndex):
-        ticker_adj_close = ticker_data[("Adj Close", ticker)]
-    else:
-        ticker_adj_close = ticker_data["Adj Close"]
-    
-    if isinstance(benchmark_data.columns, pd.MultiIndex):
-        benchmark_adj_close = benchmark_data[("Adj Close", benchmark)]
-    else:
-        benchmark_adj_close = benchmark_data["Adj Close"]
-
-    ticker_prices = (
-        ticker_adj_close
-        .rename("ticker_adj_close")
-        .to_frame()
-        .dropna()
-    )
-    benchmark_prices = (
-        benchmark_adj_close
-        .rename("benchmark_adj_close")
-        .to_frame()
-        .dropna()
-    )
+    ticker_prices = closes[ticker_key].rename("ticker_adj_close").to_frame().dropna()
+    benchmark_prices = closes[benchmark_key].rename("benchmark_adj_close").to_frame().dropna()
 
     return ticker_prices, benchmark_prices
 
 
+def calculate_betas(
+    tickers: Sequence[str],
+    benchmarks: Optional[Sequence[str]] = None,
+    lookback_years: Optional[int] = DEFAULT_LOOKBACK_YEARS,
+    lookback_days: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Beta statistics for many tickers against the benchmark indexes in one pass.
+
+    Args:
+        tickers: Stock ticker symbols
+        benchmarks: Benchmark symbols (default: every BENCHMARK_OPTIONS index)
+        lookback_years: 1, 3, or 5 (overrides lookback_days)
+        lookback_days: Lookback in days when lookback_years is None
+
+    Returns:
+        DataFrame indexed by (ticker, benchmark) with beta, adjusted_beta, alpha,
+        r_squared, standard_error and observations (see beta_engine); tickers
+        without price data are omitted
+    """
+    benchmarks = list(benchmarks) if benchmarks else list(BENCHMARK_OPTIONS)
+    for benchmark in benchmarks:
+        if benchmark not in BENCHMARK_OPTIONS:
+            raise ValueError(f"benchmark must be one of {list(BENCHMARK_OPTIONS.keys())}, got {benchmark}")
+
+    lookback_days = _lookback_days(lookback_days, lookback_years)
+    end = datetime.utcnow()
+    start = end - timedelta(days=lookback_days)
+
+    tickers = [t.upper().strip() for t in tickers if t and t.strip()]
+    closes = load_close_matrix(list(tickers) + benchmarks, start, end)
+    return compute_betas(closes, benchmarks=benchmarks, tickers=tickers)
+
+
+def calculate_beta(
+    ticker: str,
+    benchmark: str = DEFAULT_BENCHMARK,
+    lookback_years: Optional[int] = DEFAULT_LOOKBACK_YEARS,
+) -> Dict[str, Any]:
+    """
+    Beta statistics for one ticker against one benchmark.
+
+    Returns:
+        Dictionary with ticker, benchmark, lookback_years and the beta_engine
+        statistics (beta, adjusted_beta, alpha, r_squared, standard_error, observations)
+
+    Raises:
+        ValueError: If the benchmark or lookback is invalid, or no price data is available
+    """
+    stats = calculate_betas([ticker], [benchmark], lookback_years=lookback_years)
+    key = (ticker.upper().strip(), benchmark)
+    if key not in stats.index or pd.isna(stats.loc[key, "beta"]):
+        raise ValueError(f"Not enough price history to calculate beta for {ticker} vs {benchmark}")
+    row = stats.loc[key]
+    return {
+        "ticker": key[0],
+        "benchmark": benchmark,
+        "lookback_years": lookback_years,
+        **{name: float(row[name]) for name in BETA_STAT_COLUMNS if name != "observations"},
+        "observations": int(row["observations"]),
+    }
+
+
+def calculate_rolling_betas(
+    tickers: Sequence[str],
+    benchmark: str = DEFAULT_BENCHMARK,
+    horizons: Optional[Sequence[int]] = None,
+    frequencies: Optional[Sequence[str]] = None,
+    lookback_years: int = ROLLING_LOOKBACK_YEARS,
+) -> pd.DataFrame:
+    """
+    Rolling beta statistics for many tickers over every horizon and return frequency.
+
+    Args:
+        tickers: Stock ticker symbols
+        benchmark: Benchmark index symbol
+        horizons: Rolling window lengths in years, each 1, 3, or 5 (default: all YEAR_OPTIONS)
+        frequencies: "daily", "weekly" and/or "monthly" (default: all three)
+        lookback_years: Price history to read; the rolling series start once a
+            window is (mostly) filled, so this should exceed the longest horizon
+
+    Returns:
+        DataFrame indexed by (frequency, horizon_years, ticker, date) with the
+        beta_engine statistics (see compute_rolling_betas)
+    """
+    if benchmark not in BENCHMARK_OPTIONS:
+        raise ValueError(f"benchmark must be one of {list(BENCHMARK_OPTIONS.keys())}, got {benchmark}")
+    horizons = list(horizons) if horizons else list(YEAR_OPTIONS)
+    for years in horizons:
+        if years not in YEAR_OPTIONS:
+            raise ValueError(f"horizons must be 1, 3, or 5 years, got {years}")
+    frequencies = list(frequencies) if frequencies else list(RETURN_FREQUENCIES)
+    for frequency in frequencies:
+        if frequency not in RETURN_FREQUENCIES:
+            raise ValueError(f"frequency must be one of {list(RETURN_FREQUENCIES)}, got {frequency}")
+
+    end = datetime.utcnow()
+    start = end - timedelta(days=365 * max(lookback_years, max(horizons)))
+
+    tickers = [t.upper().strip() for t in tickers if t and t.strip()]
+    closes = load_close_matrix(list(tickers) + [benchmark], start, end)
+    return compute_rolling_betas(closes, benchmark, horizons=horizons, frequencies=frequencies, tickers=tickers)
+
+
 def build_beta_export_payload(
     ticker: str,
     benchmark: str = DEFAULT_BENCHMARK,
@@ -117,9 +300,8 @@ def build_beta_export_payload(
     Returns:
         Dictionary with ticker, benchmark, lookback_days, and price_table
     """
-    # Use default if neither is provided
-    if lookback_days is None and lookback_years is None:
-        lookback_days = DEFAULT_LOOKBACK_DAYS
+    # Use default if neither is provided (lookback_years wins if both are)
+    lookback_days = _lookback_days(lookback_days, lookback_years)
     
     # Validate benchmark
     if benchmark not in BENCHMARK_OPTIONS:
@@ -147,6 +329,14 @@ def build_beta_export_payload(
     }
 
 
+def _excel_serial_dates(dates) -> np.ndarray:
+    """Excel (1900 date system) serial day numbers for a column of dates."""
+    values = pd.DatetimeIndex(dates)
+    if values.tz is not None:
+        values = values.tz_localize(None)
+    return (values.to_numpy(dtype="datetime64[ns]") - EXCEL_EPOCH) / np.timedelta64(1, "D")
+
+
 def write_beta_sheet(workbook, beta_payload):
     """
     Helper for excel_export.py to drop the price table and Excel formulas.
@@ -161,9 +351,14 @@ def write_beta_sheet(workbook, beta_payload):
         - Raw price table
         - Array formulas for returns calculation
         - Beta calculation formula
+
+    Every column (dates as Excel serial numbers, prices and the cached return
+    values) is built up front from NumPy arrays and written without per-row
+    pandas access. Cells are written strictly top to bottom, so the sheet
+    also works in a constant_memory workbook (see build_beta_workbook); there
+    the returns are per-row formulas, because a multi-row array formula
+    would have to be written before the rows it spans.
     """
-    import xlsxwriter
-    
     worksheet = workbook.add_worksheet("Beta Data")
     
     # Set column widths (xlsxwriter uses character units, not pixels)
@@ -175,7 +370,22 @@ def write_beta_sheet(workbook, beta_payload):
     number_format = workbook.add_format({'num_format': '0.00'})
     date_format = workbook.add_format({'num_format': 'yyyy-mm-dd'})
     
-    # Write headers (xlsxwriter is 0-indexed)
+    # Columns as arrays (xlsxwriter is 0-indexed, Excel rows start at 1)
+    table = beta_payload["price_table"]
+    start_row = 5  # Row 6 in Excel (0-indexed = 5)
+    first_return_row = start_row + 1  # Excel row 7 (0-indexed = 6)
+    last_row = start_row + len(table) - 1  # 0-indexed
+    last_row_excel = last_row + 1  # Convert to Excel 1-indexed for formulas
+    
+    dates = _excel_serial_dates(table["date"])
+    ticker_prices = table["ticker_adj_close"].to_numpy(dtype=float)
+    benchmark_prices = table["benchmark_adj_close"].to_numpy(dtype=float)
+    # Cached formula results so the sheet shows values before Excel recalculates
+    ticker_returns = compute_returns(ticker_prices)[:, 0] * 100
+    benchmark_returns = compute_returns(benchmark_prices)[:, 0] * 100
+    beta_value = regress_returns(ticker_returns, benchmark_returns)["beta"][0, 0]
+    
+    # Header rows (rows 0-4 are written before any data row)
     worksheet.write(0, 0, "Ticker", header_format)
     worksheet.write(0, 1, beta_payload["ticker"])
     
@@ -191,6 +401,9 @@ def write_beta_sheet(workbook, beta_payload):
     worksheet.write(2, 1, beta_payload["lookback_days"] / 365)  # Convert days to years
     
     worksheet.write(3, 0, "Beta", header_format)
+    # Beta formula - SLOPE of ticker returns (E) on benchmark returns (F)
+    beta_formula = f"=SLOPE(E{first_return_row + 1}:E{last_row_excel},F{first_return_row + 1}:F{last_row_excel})"
+    worksheet.write_formula(3, 1, beta_formula, number_format, _cached_value(beta_value))
     
     # Write column headers
     worksheet.write(4, 0, "Date", header_format)
@@ -199,62 +412,80 @@ def write_beta_sheet(workbook, beta_payload):
     worksheet.write(4, 4, "Ticker Returns", header_format)
     worksheet.write(4, 5, "Benchmark Returns", header_format)
     
-    # Write data (xlsxwriter is 0-indexed, Excel rows start at 1)
-    table = beta_payload["price_table"]
-    start_row = 5  # Row 6 in Excel (0-indexed = 5)
-    
-    for idx, row in table.iterrows():
-        excel_row = start_row + idx  # 0-indexed
-        # Date (convert to datetime if needed)
-        date_val = row["date"]
-        if hasattr(date_val, 'to_pydatetime'):
-            date_val = date_val.to_pydatetime()
-        worksheet.write_datetime(excel_row, 0, date_val, date_format)
-        
-        # Ticker price
-        worksheet.write(excel_row, 1, row["ticker_adj_close"], number_format)
-        
-        # Benchmark price
-        worksheet.write(excel_row, 2, row["benchmark_adj_close"], number_format)
-    
-    # Calculate last row (0-indexed)
-    last_row = start_row + len(table) - 1
-    last_row_excel = last_row + 1  # Convert to Excel 1-indexed for formulas
-    
-    # Write array formulas for returns using write_array_formula()
-    # Formula: ((new/old)-1)*100 starting at row 7 (Excel row 7 = index 6)
-    # We use array formula syntax where each cell calculates its own return
-    
-    first_return_row = 6  # Excel row 7 (0-indexed = 6)
-    last_return_row = last_row  # Last row with data
-    
-    if last_return_row >= first_return_row:
-        # Ticker returns array formula
-        # Formula calculates: (B7:B{last}/B6:B{last-1})-1)*100
-        # This creates an array where each element is the return for that row
-        ticker_returns_formula = f"=((B{first_return_row + 1}:B{last_return_row + 1}/B{first_return_row}:B{last_return_row})-1)*100"
-        worksheet.write_array_formula(
-            first_return_row, 4,  # First row (0-indexed), Column E (4)
-            last_return_row, 4,    # Last row (0-indexed), Column E (4)
-            ticker_returns_formula,
-            number_format
-        )
+    # Data rows: date | ticker price | benchmark price | | ticker return | benchmark return
+    # Returns: ((new/old)-1)*100 starting at Excel row 7, e.g. E7 = ((B7/B6)-1)*100
+    write_number = worksheet.write_number
+    rows = range(start_row, last_row + 1)
+    per_row_returns = workbook.constant_memory
+    if per_row_returns:
+        write_formula = worksheet.write_formula
+        ticker_return_values = [None] + [_cached_value(v) for v in ticker_returns.tolist()]
+        benchmark_return_values = [None] + [_cached_value(v) for v in benchmark_returns.tolist()]
+        for row, date_val, ticker_price, benchmark_price, ticker_return, benchmark_return in zip(
+            rows,
+            dates.tolist(),
+            ticker_prices.tolist(),
+            benchmark_prices.tolist(),
+            ticker_return_values,
+            benchmark_return_values,
+        ):
+            write_number(row, 0, date_val, date_format)
+            write_number(row, 1, ticker_price, number_format)
+            write_number(row, 2, benchmark_price, number_format)
+            if row >= first_return_row:
+                write_formula(row, 4, f"=((B{row + 1}/B{row})-1)*100", number_format, ticker_return)
+                write_formula(row, 5, f"=((C{row + 1}/C{row})-1)*100", number_format, benchmark_return)
+    else:
+        for row, date_val, ticker_price, benchmark_price in zip(
+            rows,
+            dates.tolist(),
+            ticker_prices.tolist(),
+            benchmark_prices.tolist(),
+        ):
+            write_number(row, 0, date_val, date_format)
+            write_number(row, 1, ticker_price, number_format)
+            write_number(row, 2, benchmark_price, number_format)
         
-        # Benchmark returns array formula
-        benchmark_returns_formula = f"=((C{first_return_row + 1}:C{last_return_row + 1}/C{first_return_row}:C{last_return_row})-1)*100"
-        worksheet.write_array_formula(
-            first_return_row, 5,  # First row (0-indexed), Column F (5)
-            last_return_row, 5,    # Last row (0-indexed), Column F (5)
-            benchmark_returns_formula,
-            number_format
-        )
-    
-    # Beta formula - use COVARIANCE.P and VAR.P (they already return single scalar values)
-    # Write as string starting with = (xlsxwriter treats strings starting with = as formulas)
-    covariance_part = f"SLOPE(E{first_return_row + 1}:E{last_row_excel},F{first_return_row + 1}:F{last_row_excel})"
-    variance_part = f"VAR.P(F{first_return_row + 1}:F{last_row_excel})"
-    beta_formula = f"=SLOPE(E{first_return_row + 1}:E{last_row_excel},F{first_return_row + 1}:F{last_row_excel})"
-    worksheet.write(3, 1, beta_formula, number_format)  # Row 4 (0-indexed = 3), Column B (1)
+        if last_row >= first_return_row:
+            # One array formula per column: each cell calculates the return for its row
+            worksheet.write_array_formula(
+                first_return_row, 4,  # First row (0-indexed), Column E (4)
+                last_row, 4,          # Last row (0-indexed), Column E (4)
+                f"=((B{first_return_row + 1}:B{last_row + 1}/B{first_return_row}:B{last_row})-1)*100",
+                number_format,
+                _cached_value(ticker_returns[0]),
+            )
+            worksheet.write_array_formula(
+                first_return_row, 5,  # First row (0-indexed), Column F (5)
+                last_row, 5,          # Last row (0-indexed), Column F (5)
+                f"=((C{first_return_row + 1}:C{last_row + 1}/C{first_return_row}:C{last_row})-1)*100",
+                number_format,
+                _cached_value(benchmark_returns[0]),
+            )
     
     # Freeze panes (freeze row 5, which is index 4)
-    worksheet.freeze_panes(5, 0)  # Freeze rows above row 5 (0-indexed: 5 means freeze first 5 rows)
\ No newline at end of file
+    worksheet.freeze_panes(5, 0)  # Freeze rows above row 5 (0-indexed: 5 means freeze first 5 rows)
+
+
+def _cached_value(value: float):
+    """Formula result to cache in the file (0 for non-finite, xlsxwriter's default)."""
+    return value if np.isfinite(value) else 0
+
+
+def build_beta_workbook(beta_payload: Dict[str, Any]) -> bytes:
+    """
+    Standalone Beta Data workbook written in xlsxwriter constant_memory mode.
+
+    constant_memory flushes each row to a temp file as soon as the next row
+    starts, so memory stays flat however long the lookback is.
+
+    Returns:
+        bytes: Excel file content
+    """
+    import xlsxwriter
+    
+    output = BytesIO()
+    workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+    write_beta_sheet(workbook, beta_payload)
+    workbook.close()
+    return output.getvalue()
@@ -0,0 +1,311 @@
+"""
+beta_engine.py — Vectorized beta statistics (NumPy).
+
+Computes, for every (ticker, benchmark) pair in one pass over a price matrix:
+    * OLS beta (slope of ticker returns on benchmark returns — same as Excel SLOPE)
+    * Adjusted (Blume) beta: 2/3 * beta + 1/3
+    * Alpha (intercept, per return period)
+    * R² and the standard error of beta
+    * Number of observations used
+
+Missing prices are handled pairwise: each pair uses only the periods where
+both series have a return, so tickers with shorter histories do not shrink
+the sample for everyone else. All pairs come from a handful of matrix
+products over masked sums, with no Python loop over tickers.
+
+Rolling betas (compute_rolling_betas) use the same sums, taken over moving
+windows as differences of cumulative sums: every window end for every ticker
+costs O(1), so all horizons (1/3/5 years) and return frequencies
+(daily/weekly/monthly) come from a few cumsums instead of one regression
+per window.
+
+The Excel "Beta Data" sheet (beta.write_beta_sheet) stays the auditable view;
+this module is what the API and the model defaults use.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+BLUME_WEIGHT = 2.0 / 3.0  # Adjusted beta = BLUME_WEIGHT * beta + (1 - BLUME_WEIGHT) * 1.0
+MIN_OBSERVATIONS = 3  # Fewer paired returns than this gives NaN statistics
+
+# Return frequency -> pandas resample rule (None = prices as given) and periods per year
+RETURN_FREQUENCIES = {
+    "daily": None,
+    "weekly": "W-FRI",
+    "monthly": "ME",
+}
+PERIODS_PER_YEAR = {
+    "daily": 252,
+    "weekly": 52,
+    "monthly": 12,
+}
+ROLLING_MIN_COVERAGE = 0.8  # Share of a rolling window that must have paired returns
+
+BETA_STAT_COLUMNS = [
+    "beta",
+    "adjusted_beta",
+    "alpha",
+    "r_squared",
+    "standard_error",
+    "observations",
+]
+
+
+def compute_returns(prices: np.ndarray) -> np.ndarray:
+    """
+    Simple period returns of a (T x N) price matrix.
+
+    Args:
+        prices: Prices, one column per series (NaN where missing)
+
+    Returns:
+        (T-1 x N) array of prices[t] / prices[t-1] - 1 (NaN if either price is missing)
+    """
+    prices = np.asarray(prices, dtype=float)
+    if prices.ndim == 1:
+        prices = prices[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return prices[1:] / prices[:-1] - 1.0
+
+
+def regress_returns(asset_returns: np.ndarray, market_returns: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    OLS of every asset return series on every market return series.
+
+    Args:
+        asset_returns: (T x N) asset returns (NaN where missing)
+        market_returns: (T x M) market returns on the same periods (NaN where missing)
+
+    Returns:
+        Dictionary of BETA_STAT_COLUMNS -> (N x M) arrays (NaN where a pair has
+        fewer than MIN_OBSERVATIONS paired returns or no market variance)
+    """
+    y = np.asarray(asset_returns, dtype=float)
+    x = np.asarray(market_returns, dtype=float)
+    if y.ndim == 1:
+        y = y[:, None]
+    if x.ndim == 1:
+        x = x[:, None]
+    if y.shape[0] != x.shape[0]:
+        raise ValueError(f"Return series must cover the same periods ({y.shape[0]} vs {x.shape[0]})")
+
+    # Masks and zero-filled values: each product below sums only jointly valid periods
+    wy = np.isfinite(y).astype(float)
+    wx = np.isfinite(x).astype(float)
+    y0 = np.where(wy > 0, y, 0.0)
+    x0 = np.where(wx > 0, x, 0.0)
+
+    return _regression_stats(
+        n=wy.T @ wx,
+        sum_x=wy.T @ x0,
+        sum_y=y0.T @ wx,
+        sum_xx=wy.T @ (x0 * x0),
+        sum_yy=(y0 * y0).T @ wx,
+        sum_xy=y0.T @ x0,
+        min_observations=MIN_OBSERVATIONS,
+    )
+
+
+def rolling_regress(
+    asset_returns: np.ndarray,
+    market_returns: np.ndarray,
+    window: int,
+    min_observations: Optional[int] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    OLS of every asset return series on one market series over a moving window.
+
+    Window sums are differences of cumulative sums of the masked terms, so
+    each (period, asset) value costs O(1) regardless of the window length.
+
+    Args:
+        asset_returns: (T x N) asset returns (NaN where missing)
+        market_returns: (T,) market returns on the same periods (NaN where missing)
+        window: Window length in periods (ending at each period, inclusive)
+        min_observations: Paired returns a window needs (default:
+            ROLLING_MIN_COVERAGE of the window)
+
+    Returns:
+        Dictionary of BETA_STAT_COLUMNS -> (T x N) arrays, NaN until a window
+        has enough paired returns
+    """
+    y = np.asarray(asset_returns, dtype=float)
+    x = np.asarray(market_returns, dtype=float).reshape(-1)
+    if y.ndim == 1:
+        y = y[:, None]
+    if y.shape[0] != x.shape[0]:
+        raise ValueError(f"Return series must cover the same periods ({y.shape[0]} vs {x.shape[0]})")
+    if window < MIN_OBSERVATIONS:
+        raise ValueError(f"window must be at least {MIN_OBSERVATIONS} periods, got {window}")
+    if min_observations is None:
+        min_observations = max(MIN_OBSERVATIONS, int(np.ceil(window * ROLLING_MIN_COVERAGE)))
+
+    # Jointly valid periods, zero-filled elsewhere so they drop out of every sum
+    w = np.isfinite(y) & np.isfinite(x)[:, None]
+    y0 = np.where(w, y, 0.0)
+    x0 = np.where(w, x[:, None], 0.0)
+
+    def window_sums(values: np.ndarray) -> np.ndarray:
+        totals = np.zeros((values.shape[0] + 1, values.shape[1]))
+        np.cumsum(values, axis=0, out=totals[1:])
+        starts = np.maximum(np.arange(1, values.shape[0] + 1) - window, 0)
+        return totals[1:] - totals[starts]
+
+    return _regression_stats(
+        n=window_sums(w.astype(float)),
+        sum_x=window_sums(x0),
+        sum_y=window_sums(y0),
+        sum_xx=window_sums(x0 * x0),
+        sum_yy=window_sums(y0 * y0),
+        sum_xy=window_sums(x0 * y0),
+        min_observations=min_observations,
+    )
+
+
+def _regression_stats(
+    n: np.ndarray,
+    sum_x: np.ndarray,
+    sum_y: np.ndarray,
+    sum_xx: np.ndarray,
+    sum_yy: np.ndarray,
+    sum_xy: np.ndarray,
+    min_observations: int,
+) -> Dict[str, np.ndarray]:
+    """Beta statistics from (masked) sums and cross-products of same-shape arrays."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sxx = sum_xx - sum_x * sum_x / n
+        syy = sum_yy - sum_y * sum_y / n
+        sxy = sum_xy - sum_x * sum_y / n
+
+        beta = sxy / sxx
+        alpha = (sum_y - beta * sum_x) / n
+        r_squared = (sxy * sxy) / (sxx * syy)
+        residual_ss = np.maximum(syy - beta * sxy, 0.0)
+        standard_error = np.sqrt(residual_ss / (n - 2) / sxx)
+
+    invalid = (n < min_observations) | ~(sxx > 0)
+    stats = {
+        "beta": beta,
+        "adjusted_beta": BLUME_WEIGHT * beta + (1.0 - BLUME_WEIGHT),
+        "alpha": alpha,
+        "r_squared": r_squared,
+        "standard_error": standard_error,
+    }
+    for values in stats.values():
+        values[invalid] = np.nan
+    stats["observations"] = np.rint(n)
+    return stats
+
+
+def resample_prices(prices: pd.DataFrame, frequency: str) -> pd.DataFrame:
+    """
+    Last price per return period ("daily", "weekly" or "monthly").
+
+    Periods without any price (e.g., a week of market holidays) are dropped.
+    """
+    if frequency not in RETURN_FREQUENCIES:
+        raise ValueError(f"frequency must be one of {list(RETURN_FREQUENCIES)}, got {frequency}")
+    rule = RETURN_FREQUENCIES[frequency]
+    ordered = prices.sort_index()
+    if rule is None:
+        return ordered
+    return ordered.resample(rule).last().dropna(how="all")
+
+
+def compute_betas(
+    prices: pd.DataFrame,
+    benchmarks: Sequence[str],
+    tickers: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """
+    Beta statistics for every ticker against every benchmark from one price frame.
+
+    Args:
+        prices: Wide price frame (date index, one column per ticker and benchmark)
+        benchmarks: Benchmark columns (e.g., list(BENCHMARK_OPTIONS))
+        tickers: Ticker columns (default: every non-benchmark column)
+
+    Returns:
+        DataFrame indexed by (ticker, benchmark) with BETA_STAT_COLUMNS
+    """
+    benchmarks = [b for b in benchmarks if b in prices.columns]
+    if tickers is None:
+        tickers = [c for c in prices.columns if c not in benchmarks]
+    tickers = [t for t in tickers if t in prices.columns]
+
+    index = pd.MultiIndex.from_product([tickers, benchmarks], names=["ticker", "benchmark"])
+    if not tickers or not benchmarks:
+        return pd.DataFrame(columns=BETA_STAT_COLUMNS, index=index, dtype=float)
+
+    ordered = prices.sort_index()
+    stats = regress_returns(
+        compute_returns(ordered[list(tickers)].to_numpy(dtype=float)),
+        compute_returns(ordered[list(benchmarks)].to_numpy(dtype=float)),
+    )
+    frame = pd.DataFrame({name: values.ravel() for name, values in stats.items()}, index=index)
+    frame["observations"] = frame["observations"].astype(int)
+    return frame[BETA_STAT_COLUMNS]
+
+
+def compute_rolling_betas(
+    prices: pd.DataFrame,
+    benchmark: str,
+    horizons: Sequence[int],
+    frequencies: Sequence[str] = tuple(RETURN_FREQUENCIES),
+    tickers: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """
+    Rolling beta statistics for every ticker, horizon and return frequency.
+
+    Args:
+        prices: Wide daily price frame (date index, one column per ticker and the benchmark)
+        benchmark: Benchmark column
+        horizons: Rolling window lengths in years (e.g., list(YEAR_OPTIONS))
+        frequencies: Return frequencies (keys of RETURN_FREQUENCIES)
+        tickers: Ticker columns (default: every non-benchmark column)
+
+    Returns:
+        DataFrame indexed by (frequency, horizon_years, ticker, date) with
+        BETA_STAT_COLUMNS; dates whose window has too few paired returns
+        (see ROLLING_MIN_COVERAGE) are omitted
+    """
+    if tickers is None:
+        tickers = [c for c in prices.columns if c != benchmark]
+    tickers = [t for t in tickers if t in prices.columns and t != benchmark]
+
+    frames: List[pd.DataFrame] = []
+    if tickers and benchmark in prices.columns:
+        for frequency in frequencies:
+            sampled = resample_prices(prices[list(tickers) + [benchmark]], frequency)
+            asset_returns = compute_returns(sampled[list(tickers)].to_numpy(dtype=float))
+            market_returns = compute_returns(sampled[benchmark].to_numpy(dtype=float))[:, 0]
+            dates = sampled.index[1:]
+            for years in horizons:
+                stats = rolling_regress(asset_returns, market_returns, window=years * PERIODS_PER_YEAR[frequency])
+                valid = np.isfinite(stats["beta"])
+                rows, cols = np.nonzero(valid)
+                if not len(rows):
+                    continue
+                frame = pd.DataFrame({name: values[rows, cols] for name, values in stats.items()})
+                frame.index = pd.MultiIndex.from_arrays(
+                    [
+                        np.full(len(rows), frequency),
+                        np.full(len(rows), years),
+                        np.asarray(tickers, dtype=object)[cols],
+                        dates[rows],
+                    ],
+                    names=["frequency", "horizon_years", "ticker", "date"],
+                )
+                frames.append(frame)
+
+    if not frames:
+        index = pd.MultiIndex.from_arrays([[], [], [], []], names=["frequency", "horizon_years", "ticker", "date"])
+        return pd.DataFrame(columns=BETA_STAT_COLUMNS, index=index, dtype=float)
+    result = pd.concat(frames)
+    result["observations"] = result["observations"].astype(int)
+    return result[BETA_STAT_COLUMNS].sort_index()
@@ -0,0 +1,253 @@
+"""
+dcf_engine.py — Vectorized DCF Valuation (NumPy)
+
+Purpose:
+- Value many companies under many (WACC, terminal growth) pairs at once
+- Same math as dcf.run_dcf: end-of-year discounting of each projected FCF,
+  Gordon Growth terminal value on the last FCF, EV = sum of PVs + PV(TV),
+  equity value = EV - debt + cash, implied share price = equity / shares
+- Optional exit-multiple terminal value (EV/EBITDA x final-year EBITDA)
+- Value simulated paths elementwise (run_dcf_paths: path i with WACC i)
+
+Discount factors depend only on WACC, so the sum of PV(FCF) for every
+company and assumption pair is one (companies x years) @ (years x pairs)
+matrix product; terminal values and equity bridges are broadcasts. Nothing
+loops over companies, years or assumptions in Python, so screening-scale
+batches (thousands of companies x hundreds of pairs) take milliseconds.
+
+dcf.run_dcf stays the per-company entrypoint with yearly detail for the
+Excel export; run_dcf_batch is for screens, sensitivity grids and solvers,
+run_dcf_paths for Monte Carlo draws where every path has its own rates.
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+from app.services.modeling.types import THREE_STATEMENT_ROLES, DcfBatchOutput, ThreeStatementOutput
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+
+def fcf_matrix(projections: Union[Sequence[ThreeStatementOutput], np.ndarray]) -> np.ndarray:
+    """
+    Stack the free cash flow projections of several companies.
+
+    Args:
+        projections: ThreeStatementOutput per company (same number of periods),
+            or a (companies x lines x periods) block from
+            three_statement_engine.project_statements
+
+    Returns:
+        (companies x years) float64 array
+    """
+    if isinstance(projections, np.ndarray):
+        if projections.ndim != 3:
+            raise ValueError(f"Expected a (companies x lines x periods) block, got shape {projections.shape}")
+        return projections[:, THREE_STATEMENT_ROLES["free_cash_flow"]]
+    rows = [p.free_cash_flow for p in projections]
+    if not rows:
+        raise ValueError("No free cash flow projections provided")
+    lengths = {len(row) for row in rows}
+    if len(lengths) != 1:
+        raise ValueError(f"All projections must have the same number of periods, got {sorted(lengths)}")
+    return np.asarray(rows, dtype=float)
+
+
+def discount_factors(wacc: ArrayLike, years: int) -> np.ndarray:
+    """
+    End-of-year discount factors 1 / (1 + WACC)^t for t = 1..years.
+
+    Returns:
+        Array of shape wacc.shape + (years,)
+    """
+    wacc = np.asarray(wacc, dtype=float)
+    periods = np.arange(1, years + 1, dtype=float)
+    return (1.0 + wacc[..., None]) ** -periods
+
+
+def run_dcf_batch(
+    fcf: ArrayLike,
+    wacc: ArrayLike = 0.10,
+    terminal_growth_rate: ArrayLike = 0.025,
+    shares_outstanding: Optional[ArrayLike] = None,
+    debt: ArrayLike = 0.0,
+    cash: ArrayLike = 0.0,
+    grid: bool = False,
+    exit_multiple: Optional[ArrayLike] = None,
+    terminal_ebitda: Optional[ArrayLike] = None,
+) -> DcfBatchOutput:
+    """
+    DCF valuation for every company under every assumption pair in one pass.
+
+    Args:
+        fcf: Free cash flow projections, (companies x years) or (years,) for one company
+        wacc: WACC per assumption pair, scalar or (pairs,)
+        terminal_growth_rate: Terminal growth per assumption pair, scalar or (pairs,)
+        shares_outstanding: Shares per company, scalar or (companies,) (optional;
+            equity value and share price are None without it)
+        debt: Debt per company, scalar or (companies,)
+        cash: Cash per company, scalar or (companies,)
+        grid: If True, value every combination of wacc (W,) and
+            terminal_growth_rate (G,) instead of pairing them
+        exit_multiple: EV/EBITDA exit multiple per assumption pair (optional;
+            replaces the Gordon Growth terminal value, paired with wacc)
+        terminal_ebitda: Final-year EBITDA per company, required with exit_multiple
+
+    Returns:
+        DcfBatchOutput with valuation arrays of shape (companies, pairs), or
+        (companies, W, G) when grid=True. Invalid pairs (WACC <= 0 or
+        terminal growth >= WACC; WACC <= 0 with an exit multiple) are NaN
+        rather than raising, so one bad pair does not fail a screen.
+    """
+    fcf = np.asarray(fcf, dtype=float)
+    if fcf.ndim == 1:
+        fcf = fcf[None, :]
+    if fcf.ndim != 2 or fcf.shape[1] == 0:
+        raise ValueError("fcf must be a (companies x years) array with at least one year")
+    companies, years = fcf.shape
+
+    wacc = np.asarray(wacc, dtype=float)
+    growth = np.asarray(terminal_growth_rate, dtype=float)
+    multiple = None if exit_multiple is None else np.asarray(exit_multiple, dtype=float)
+    if grid:
+        if wacc.ndim > 1 or growth.ndim > 1:
+            raise ValueError("grid=True expects 1-D wacc and terminal_growth_rate arrays")
+        if multiple is not None:
+            raise ValueError("grid=True combines wacc with terminal_growth_rate; pass paired arrays with exit_multiple")
+        wacc, growth = np.meshgrid(np.atleast_1d(wacc), np.atleast_1d(growth), indexing="ij")
+    else:
+        arrays = [np.atleast_1d(wacc), np.atleast_1d(growth)]
+        if multiple is not None:
+            arrays.append(np.atleast_1d(multiple))
+        arrays = np.broadcast_arrays(*arrays)
+        wacc, growth = arrays[0], arrays[1]
+        if multiple is not None:
+            multiple = arrays[2].ravel()
+        if wacc.ndim != 1:
+            raise ValueError("wacc and terminal_growth_rate must be scalars or 1-D arrays (use grid=True for grids)")
+    assumption_shape = wacc.shape
+    flat_wacc = wacc.ravel()
+    flat_growth = growth.ravel()
+
+    # Invalid pairs are valued with NaN rates so every output is NaN for them
+    if multiple is None:
+        valid = (flat_wacc > 0) & (flat_growth < flat_wacc)
+    else:
+        valid = flat_wacc > 0
+    rate = np.where(valid, flat_wacc, np.nan)
+
+    # (pairs x years) discount factors; PV(TV) uses the last year's factor
+    factors = discount_factors(rate, years)
+    pv_fcf_sum = fcf @ factors.T  # (companies x pairs)
+    if multiple is None:
+        terminal_value = fcf[:, -1:] * ((1.0 + flat_growth) / (rate - flat_growth))
+    else:
+        if terminal_ebitda is None:
+            raise ValueError("terminal_ebitda is required with exit_multiple")
+        terminal_value = _company_vector(terminal_ebitda, companies, "terminal_ebitda") * multiple
+    pv_terminal_value = terminal_value * factors[:, -1]
+    enterprise_value = pv_fcf_sum + pv_terminal_value
+
+    equity_value = None
+    implied_share_price = None
+    if shares_outstanding is not None:
+        debt = _company_vector(debt, companies, "debt")
+        cash = _company_vector(cash, companies, "cash")
+        shares = _company_vector(shares_outstanding, companies, "shares_outstanding")
+        equity_value = enterprise_value - debt + cash
+        with np.errstate(divide="ignore", invalid="ignore"):
+            implied_share_price = np.where(shares > 0, equity_value / shares, np.nan)
+
+    output_shape = (companies,) + assumption_shape
+    return DcfBatchOutput(
+        wacc=wacc,
+        terminal_growth_rate=growth,
+        discount_factors=factors.reshape(assumption_shape + (years,)),
+        pv_fcf_sum=pv_fcf_sum.reshape(output_shape),
+        terminal_value=terminal_value.reshape(output_shape),
+        pv_terminal_value=pv_terminal_value.reshape(output_shape),
+        enterprise_value=enterprise_value.reshape(output_shape),
+        equity_value=None if equity_value is None else equity_value.reshape(output_shape),
+        implied_share_price=None if implied_share_price is None else implied_share_price.reshape(output_shape),
+    )
+
+
+def run_dcf_paths(
+    fcf: ArrayLike,
+    wacc: ArrayLike,
+    terminal_growth_rate: ArrayLike,
+    shares_outstanding: Optional[ArrayLike] = None,
+    debt: ArrayLike = 0.0,
+    cash: ArrayLike = 0.0,
+) -> DcfBatchOutput:
+    """
+    DCF valuation of each path under its own assumptions (elementwise).
+
+    run_dcf_batch values every company under every pair; here path i is
+    valued only with wacc[i] and terminal_growth_rate[i], so memory and time
+    stay linear in the number of paths.
+
+    Args:
+        fcf: (paths x years) free cash flow projections
+        wacc: WACC per path, scalar or (paths,)
+        terminal_growth_rate: Terminal growth per path, scalar or (paths,)
+        shares_outstanding: Shares outstanding, scalar or (paths,) (optional;
+            equity value and share price are None without it)
+        debt: Total debt, scalar or (paths,)
+        cash: Cash and equivalents, scalar or (paths,)
+
+    Returns:
+        DcfBatchOutput with (paths,) valuation arrays; invalid paths (WACC <= 0
+        or terminal growth >= WACC) are NaN
+    """
+    fcf = np.asarray(fcf, dtype=float)
+    if fcf.ndim != 2 or fcf.shape[1] == 0:
+        raise ValueError("fcf must be a (paths x years) array with at least one year")
+    paths, years = fcf.shape
+    wacc = np.broadcast_to(np.asarray(wacc, dtype=float), (paths,))
+    growth = np.broadcast_to(np.asarray(terminal_growth_rate, dtype=float), (paths,))
+
+    valid = (wacc > 0) & (growth < wacc)
+    rate = np.where(valid, wacc, np.nan)
+    factors = discount_factors(rate, years)  # (paths x years)
+    pv_fcf_sum = np.einsum("ij,ij->i", fcf, factors)
+    terminal_value = fcf[:, -1] * (1.0 + growth) / (rate - growth)
+    pv_terminal_value = terminal_value * factors[:, -1]
+    enterprise_value = pv_fcf_sum + pv_terminal_value
+
+    equity_value = None
+    implied_share_price = None
+    if shares_outstanding is not None:
+        shares = _company_vector(shares_outstanding, paths, "shares_outstanding")[:, 0]
+        equity_value = (
+            enterprise_value
+            - _company_vector(debt, paths, "debt")[:, 0]
+            + _company_vector(cash, paths, "cash")[:, 0]
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            implied_share_price = np.where(shares > 0, equity_value / shares, np.nan)
+
+    return DcfBatchOutput(
+        wacc=wacc,
+        terminal_growth_rate=growth,
+        discount_factors=factors,
+        pv_fcf_sum=pv_fcf_sum,
+        terminal_value=terminal_value,
+        pv_terminal_value=pv_terminal_value,
+        enterprise_value=enterprise_value,
+        equity_value=equity_value,
+        implied_share_price=implied_share_price,
+    )
+
+
+def _company_vector(values: ArrayLike, companies: int, name: str) -> np.ndarray:
+    """Scalar or (companies,) input as a (companies x 1) column for broadcasting."""
+    values = np.asarray(values if values is not None else 0.0, dtype=float)
+    if values.ndim == 0:
+        return np.full((companies, 1), float(values))
+    if values.shape != (companies,):
+        raise ValueError(f"{name} must be a scalar or have one value per company ({companies}), got shape {values.shape}")
+    return values[:, None]
@@ -27,9 +27,6 @@ This module does NOT:
 - Fetch filings or prices.
 """
 
-from io import BytesIO
-from sqlalchemy.orm import Session
-from typing import Optional, Dict, Any
 from __future__ import annotations
 
 from collections import defaultdict
@@ -46,6 +43,9 @@ from app.core.logging import get_logger
 from app.services.modeling.three_statement import run_three_statement
 from app.services.modeling.dcf import run_dcf
 from app.services.modeling.comps import run_comps
+from app.services.modeling.sensitivity import write_sensitivity_grid_sheet
+from app.services.modeling.sensitivity_engine import run_sensitivity_around_base
+from app.services.modeling.three_statement_engine import latest_historicals
 from app.services.modeling.types import (
     CompanyModelInput,
     build_company_model_input,
@@ -73,6 +73,19 @@ except ImportError:
 
 logger = get_logger(__name__)
 
+# Base-case assumptions passed to the exported sensitivity grid
+SENSITIVITY_GRID_INPUTS = (
+    "revenue_growth",
+    "operating_margin_target",
+    "tax_rate",
+    "capex_as_pct_revenue",
+    "depreciation_as_pct_revenue",
+    "wacc",
+    "terminal_growth_rate",
+    "shares_outstanding",
+    "debt",
+)
+
 # Model role to row label mappings for Excel template
 # Maps row labels (from column B) to model_role values
 # Order matters: more specific patterns should come first
@@ -1303,8 +1316,7 @@ def _get_current_stock_price(ticker: str, use_fake_data: bool = False) -> Tuple[
                 current_price = float(hist["Close"].iloc[-1])
                 price_date = hist.index[-1].date() if hasattr(hist.index[-1], 'date') else date.today()
             else:
-                logger.warning(f"Could not fetch price for ticker {ticker}")
-                return None, None
+                return _get_stored_stock_price(ticker)
         else:
             # Use today's date for info-based price
             price_date = date.today()
@@ -1315,7 +1327,43 @@ def _get_current_stock_price(ticker: str, use_fake_data: bool = False) -> Tuple[
         return float(current_price), as_of_date
     except Exception as e:
         logger.warning(f"Error fetching stock price for {ticker}: {e}")
+        return _get_stored_stock_price(ticker)
+
+
+def _estimate_beta(ticker: str) -> Optional[float]:
+    """
+    Adjusted (Blume) 5-year daily beta vs the S&P 500, or None if it cannot be calculated.
+    """
+    from app.services.modeling.beta import calculate_beta
+    
+    try:
+        stats = calculate_beta(ticker)
+    except Exception as e:
+        logger.warning(f"Could not calculate beta for {ticker}, using default: {e}")
+        return None
+    logger.info(
+        f"Calculated beta for {ticker}: {stats['beta']:.3f} (adjusted {stats['adjusted_beta']:.3f}, "
+        f"R² {stats['r_squared']:.2f}, n={stats['observations']})"
+    )
+    return round(stats["adjusted_beta"], 4)
+
+
+def _get_stored_stock_price(ticker: str) -> Tuple[Optional[float], Optional[str]]:
+    """
+    Fallback for _get_current_stock_price(): latest close in the local price store.
+    
+    Returns:
+        Tuple of (price, as_of_date) or (None, None) if nothing is stored
+    """
+    from app.services.market_data.price_store import get_latest_stored_closes
+    
+    stored = get_latest_stored_closes([ticker]).get(ticker.upper().strip())
+    if stored is None:
+        logger.warning(f"Could not fetch price for ticker {ticker}")
         return None, None
+    price_date, close = stored
+    logger.info(f"Using stored close for {ticker} from {price_date}: ${close:.2f}")
+    return float(close), price_date.strftime("%m/%d/%Y")
 
 
 def _extract_income_statement_items(financial_json: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -3813,6 +3861,11 @@ def export_full_model_to_excel(
         "current_price": None,  # Market data, optional
     }
     
+    # WACC beta: calculated from price history when available (default above otherwise)
+    if model_input.ticker.upper() not in ["DUMMY", "TEST", "FAKE"]:
+        estimated_beta = _estimate_beta(model_input.ticker)
+        if estimated_beta is not None:
+            default_assumptions["beta"] = estimated_beta
     logger.info("Running 3-statement model")
     three_stmt_output = run_three_statement(
         model_input=model_input,
@@ -3915,6 +3968,16 @@ def export_full_model_to_excel(
     elif comps_input:
         logger.warning("RV sheet not found in template, skipping comps data")
     
+    # Step 6.5: Computed WACC x terminal growth grid from the same inputs as the DCF above
+    logger.info("Writing sensitivity grid sheet")
+    _, latest = latest_historicals(model_input)
+    sensitivity_grid = run_sensitivity_around_base({
+        **latest,
+        **{name: default_assumptions[name] for name in SENSITIVITY_GRID_INPUTS},
+        "forecast_periods": 5,
+    })
+    write_sensitivity_grid_sheet(workbook, sensitivity_grid, ticker=model_input.ticker)
+    
     # Step 7: Save workbook
     logger.info(f"Saving populated template to {output_path}")
     workbook.save(output_path)
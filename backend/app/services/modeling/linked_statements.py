@@ -0,0 +1,370 @@
+"""
+linked_statements.py — Linked 3-Statement Model with Interest Circularity (NumPy)
+
+Purpose:
+- Extend the run_three_statement projections (income statement and FCF
+  only) into a balance sheet linked through the cash flow statement:
+    * Working capital: receivables, inventory and payables from days
+      (DSO on revenue, DIO and DPO on COGS)
+    * PP&E roll-forward: PP&E_t = PP&E_t-1 + CapEx_t - D&A_t
+    * Debt schedule: mandatory amortization, a cash sweep of excess cash
+      into debt repayment and a revolver draw whenever cash would fall below
+      the minimum
+    * Interest expense / income on average debt / cash balances
+    * Equity roll-forward: Equity_t = Equity_t-1 + NI_t - dividends_t
+- Return balance check diagnostics (assets - liabilities - equity per period)
+
+Operating lines come from three_statement_engine.project_statements; the
+linked lines are projected for many companies (or simulated paths) at once.
+three_statement.run_three_statement_linked is the single-company entry
+point (POST /models/linked-statements).
+
+Circularity: interest on average balances depends on the closing debt and
+cash, which depend on net income, which depends on interest. Each period is
+solved for all companies at once by Newton iteration on net interest income
+(interest income - interest expense), starting from interest on opening
+balances. Within a regime (cash sweep, sweep capped at the debt balance,
+revolver draw) the interest implied by a net interest guess is affine in
+it, so a Newton step with the regime's slope is exact; a solve takes two or
+three vectorized sweeps (the last one confirms convergence to
+CIRCULARITY_TOLERANCE). The only Python loops are over periods and sweeps,
+never over companies, so the kernel can run inside sensitivity grids and
+Monte Carlo chunks (about 2 microseconds per 5-year path).
+
+Memory is lines x periods x companies (exposed as a companies x lines x
+periods view) so each per-period column is contiguous across companies.
+
+Set average_balances=False for interest on opening balances (no
+circularity, one sweep).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from app.services.modeling.three_statement_engine import (
+    DEFAULT_ASSUMPTIONS,
+    ArrayLike,
+    broadcast_assumption,
+    company_column,
+    count_paths,
+    latest_historicals,
+    project_statements,
+    projection_periods,
+)
+from app.services.modeling.types import (
+    LINKED_STATEMENT_LINES,
+    LINKED_STATEMENT_ROLES,
+    CompanyModelInput,
+    LinkedStatementsOutput,
+)
+
+# Opening balance sheet keys and the model_role they are read from
+OPENING_BALANCE_ROLES: Dict[str, str] = {
+    "cash": "BS_CASH",
+    "accounts_receivable": "BS_ACCOUNTS_RECEIVABLE",
+    "inventory": "BS_INVENTORY",
+    "accounts_payable": "BS_ACCOUNTS_PAYABLE",
+    "ppe": "BS_PP_AND_E",
+    "debt": "BS_TOTAL_DEBT",
+    "total_assets": "BS_ASSETS",
+    "total_liabilities": "BS_LIABILITIES",
+}
+
+# Financing assumptions (on top of three_statement_engine.DEFAULT_ASSUMPTIONS)
+FINANCING_ASSUMPTIONS: Dict[str, float] = {
+    "days_sales_outstanding": np.nan,  # NaN = historical days (DEFAULT_DAYS without history)
+    "days_inventory_outstanding": np.nan,
+    "days_payables_outstanding": np.nan,
+    "interest_rate": 0.06,  # Annual rate on debt
+    "interest_rate_on_cash": 0.02,  # Annual rate on cash
+    "debt_amortization_pct": 0.0,  # Mandatory repayment, share of opening debt per period
+    "cash_sweep_pct": 0.0,  # Share of excess cash (above the minimum) used to repay debt
+    "minimum_cash_as_pct_revenue": 0.0,  # Cash floor; shortfalls are funded by the revolver
+    "dividend_payout_ratio": 0.0,  # Share of positive net income paid out
+}
+DEFAULT_DAYS: Dict[str, float] = {
+    "days_sales_outstanding": 45.0,
+    "days_inventory_outstanding": 30.0,
+    "days_payables_outstanding": 30.0,
+}
+DAYS_PER_YEAR = 365.0
+
+MAX_CIRCULARITY_ITERATIONS = 50
+CIRCULARITY_TOLERANCE = 1e-10  # Interest change per sweep, relative to revenue
+
+
+def opening_balances(model_input: CompanyModelInput, year: int) -> Dict[str, float]:
+    """
+    Balance sheet at the end of `year` (NaN where a role has no value).
+
+    Returns:
+        Dictionary of OPENING_BALANCE_ROLES keys -> value
+    """
+    historicals = model_input.historicals.by_role
+    return {
+        name: historicals.get(role, {}).get(year, np.nan)
+        for name, role in OPENING_BALANCE_ROLES.items()
+    }
+
+
+def project_linked_statements(
+    revenue: ArrayLike,
+    cogs: ArrayLike,
+    operating_expense: ArrayLike,
+    opening: Dict[str, ArrayLike],
+    periods: int,
+    assumptions: Optional[Dict[str, ArrayLike]] = None,
+    period_labels: Optional[Sequence[str]] = None,
+    periods_per_year: int = 1,
+    average_balances: bool = True,
+    max_iterations: int = MAX_CIRCULARITY_ITERATIONS,
+    tolerance: float = CIRCULARITY_TOLERANCE,
+) -> LinkedStatementsOutput:
+    """
+    Project linked income statement, cash flow statement and balance sheet.
+
+    Args:
+        revenue, cogs, operating_expense: Latest historical values, scalar or (companies,)
+        opening: Opening balance sheet (OPENING_BALANCE_ROLES keys), each a
+            scalar or (companies,); NaN or missing keys are treated as:
+            - working capital accounts: implied by the days assumptions
+            - cash, PP&E, debt: 0
+            - total_assets / total_liabilities: no other assets / liabilities
+        periods: Number of projected periods
+        assumptions: DEFAULT_ASSUMPTIONS and FINANCING_ASSUMPTIONS keys, each a
+            scalar, (companies,) or (companies x periods) array
+        period_labels: Period end dates (default: "Year1", "Year2", ...)
+        periods_per_year: 1 for annual, 4 for quarterly (scales days and rates)
+        average_balances: Interest on average balances (circular) instead of
+            opening balances
+        max_iterations: Circularity sweeps per period before giving up
+        tolerance: Convergence threshold on the interest change per sweep,
+            relative to revenue
+
+    Returns:
+        LinkedStatementsOutput for every company
+    """
+    if periods < 1:
+        raise ValueError("periods must be at least 1")
+    a = {**DEFAULT_ASSUMPTIONS, **FINANCING_ASSUMPTIONS}
+    a.update({k: v for k, v in (assumptions or {}).items() if v is not None})
+    balances = {name: np.nan if opening.get(name) is None else opening[name] for name in OPENING_BALANCE_ROLES}
+    companies = count_paths(revenue, cogs, operating_expense, *balances.values(), *a.values())
+
+    # Stored lines x periods x companies (see project_statements): per-period
+    # columns of every line are contiguous across companies
+    block = np.empty((len(LINKED_STATEMENT_LINES), periods, companies)).transpose(2, 0, 1)
+    project_statements(
+        revenue, cogs, operating_expense, periods, **{name: a[name] for name in DEFAULT_ASSUMPTIONS}, out=block
+    )
+    line = {name: block[:, row] for name, row in LINKED_STATEMENT_ROLES.items()}  # (companies x periods) views
+    rate = {
+        name: np.broadcast_to(broadcast_assumption(a[name], companies, periods, name), (companies, periods))
+        for name in a
+    }
+
+    opening_values = {name: company_column(values, companies, name) for name, values in balances.items()}
+    base_revenue = company_column(revenue, companies, "revenue")
+    base_cogs = company_column(cogs, companies, "cogs")
+
+    # Working capital from days, defaulting to historical days (annual flows)
+    days_in_period = DAYS_PER_YEAR / periods_per_year
+    for account, days_name, flow, base_flow in (
+        ("accounts_receivable", "days_sales_outstanding", line["revenue"], base_revenue),
+        ("inventory", "days_inventory_outstanding", line["cogs"], base_cogs),
+        ("accounts_payable", "days_payables_outstanding", line["cogs"], base_cogs),
+    ):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            historical_days = np.where(base_flow > 0, opening_values[account] / base_flow * DAYS_PER_YEAR, np.nan)
+        historical_days = np.where(np.isfinite(historical_days), historical_days, DEFAULT_DAYS[days_name])
+        days = np.where(np.isnan(rate[days_name]), historical_days, rate[days_name])
+        np.multiply(flow, days / days_in_period, out=line[account])
+        opening_values[account] = np.where(
+            np.isfinite(opening_values[account]), opening_values[account], base_flow * days[:, :1] / DAYS_PER_YEAR
+        )
+    for name in ("cash", "ppe", "debt"):
+        opening_values[name] = np.nan_to_num(opening_values[name], nan=0.0)
+
+    net_working_capital = line["accounts_receivable"] + line["inventory"] - line["accounts_payable"]
+    opening_nwc = opening_values["accounts_receivable"] + opening_values["inventory"] - opening_values["accounts_payable"]
+    line["working_capital_change"][:, 0] = net_working_capital[:, 0] - opening_nwc[:, 0]
+    np.subtract(net_working_capital[:, 1:], net_working_capital[:, :-1], out=line["working_capital_change"][:, 1:])
+
+    # PP&E roll-forward
+    np.cumsum(line["capex"] - line["depreciation"], axis=1, out=line["ppe"])
+    line["ppe"] += opening_values["ppe"]
+
+    # Unlevered FCF (NOPAT + D&A - CapEx - change in working capital)
+    line["free_cash_flow"][...] = (
+        line["operating_income"] * (1.0 - rate["tax_rate"])
+        + line["depreciation"]
+        - line["capex"]
+        - line["working_capital_change"]
+    )
+
+    # Other assets / liabilities held flat; opening equity balances the opening balance sheet
+    known_assets = opening_values["cash"] + opening_values["accounts_receivable"] + opening_values["inventory"] + opening_values["ppe"]
+    other_assets = np.where(
+        np.isfinite(opening_values["total_assets"]), opening_values["total_assets"] - known_assets, 0.0
+    )
+    other_liabilities = np.where(
+        np.isfinite(opening_values["total_liabilities"]),
+        opening_values["total_liabilities"] - opening_values["accounts_payable"] - opening_values["debt"],
+        0.0,
+    )
+    opening_equity = (
+        known_assets + other_assets - opening_values["accounts_payable"] - opening_values["debt"] - other_liabilities
+    )
+    line["other_assets"][...] = other_assets
+    line["other_liabilities"][...] = other_liabilities
+
+    # Financing: one circular solve per period, vectorized over companies
+    debt_rate = rate["interest_rate"] / periods_per_year
+    cash_rate = rate["interest_rate_on_cash"] / periods_per_year
+    residual = np.zeros((periods, companies)).T  # Company-last like the block
+    cash = np.broadcast_to(opening_values["cash"][:, 0], (companies,)).copy()
+    debt = np.broadcast_to(opening_values["debt"][:, 0], (companies,)).copy()
+    iterations = 0
+    for t in range(periods):
+        operating_income = line["operating_income"][:, t]
+        after_tax = 1.0 - rate["tax_rate"][:, t]
+        payout = rate["dividend_payout_ratio"][:, t]
+        sweep_pct = rate["cash_sweep_pct"][:, t]
+        r_debt, r_cash = debt_rate[:, t], cash_rate[:, t]
+        pre_financing = line["depreciation"][:, t] - line["capex"][:, t] - line["working_capital_change"][:, t]
+        minimum_cash = line["revenue"][:, t] * rate["minimum_cash_as_pct_revenue"][:, t]
+        mandatory = np.clip(debt * rate["debt_amortization_pct"][:, t], 0.0, np.maximum(debt, 0.0))
+        sweep_cap = np.maximum(debt - mandatory, 0.0)
+        scale = tolerance * np.maximum(np.abs(line["revenue"][:, t]), 1.0)
+
+        # Newton on net interest income u = interest income - interest expense:
+        # u -> interest on the closing balances it implies is affine within a
+        # regime (sweep, capped sweep, revolver), so steps are exact once the
+        # regime is right
+        net_interest = r_cash * cash - r_debt * debt
+        for sweep in range(1, max_iterations + 1):
+            net_income = (operating_income + net_interest) * after_tax
+            dividends = np.maximum(net_income, 0.0) * payout
+            cash_flow = net_income + pre_financing
+            excess = cash + cash_flow - dividends - mandatory - minimum_cash
+            cash_sweep = np.clip(excess * sweep_pct, 0.0, sweep_cap)
+            revolver_draw = np.maximum(-excess, 0.0)
+            closing_debt = debt - mandatory - cash_sweep + revolver_draw
+            closing_cash = cash + cash_flow - dividends - mandatory - cash_sweep + revolver_draw
+            if not average_balances:
+                interest_expense = r_debt * debt
+                break
+            interest_expense = r_debt * (debt + closing_debt) / 2.0
+            gap = r_cash * (cash + closing_cash) / 2.0 - interest_expense - net_interest
+            residual[:, t] = np.abs(gap)
+            if sweep == max_iterations or (residual[:, t] <= scale).all():
+                break
+            # d(closing debt, cash)/d(excess) per regime, times d(excess)/du
+            # (mask arithmetic: np.where is several times slower here)
+            surplus = excess > 0
+            swept = surplus & (excess * sweep_pct < sweep_cap)
+            capped = surplus & ~swept
+            d_debt = -(sweep_pct * swept) - ~surplus
+            d_cash = (1.0 - sweep_pct) * swept + capped
+            d_excess = after_tax * (1.0 - payout * (net_income > 0))
+            slope = (r_cash * d_cash - r_debt * d_debt) / 2.0 * d_excess
+            net_interest = net_interest + gap / (1.0 - slope)
+        iterations = max(iterations, sweep)
+
+        pretax_income = operating_income + net_interest
+        line["interest_expense"][:, t] = interest_expense
+        line["interest_income"][:, t] = net_interest + interest_expense
+        line["pretax_income"][:, t] = pretax_income
+        line["tax_expense"][:, t] = pretax_income - net_income
+        line["net_income"][:, t] = net_income
+        line["dividends"][:, t] = dividends
+        line["cash_flow_before_financing"][:, t] = cash_flow
+        line["mandatory_repayment"][:, t] = mandatory
+        line["cash_sweep"][:, t] = cash_sweep
+        line["revolver_draw"][:, t] = revolver_draw
+        line["net_change_in_cash"][:, t] = closing_cash - cash
+        line["cash"][:, t] = closing_cash
+        line["debt"][:, t] = closing_debt
+        cash, debt = closing_cash, closing_debt
+
+    # Equity roll-forward and totals
+    np.cumsum(line["net_income"] - line["dividends"], axis=1, out=line["equity"])
+    line["equity"] += opening_equity
+    line["total_assets"][...] = (
+        line["cash"] + line["accounts_receivable"] + line["inventory"] + line["ppe"] + line["other_assets"]
+    )
+    line["total_liabilities_and_equity"][...] = (
+        line["accounts_payable"] + line["debt"] + line["other_liabilities"] + line["equity"]
+    )
+
+    return LinkedStatementsOutput(
+        periods=list(period_labels) if period_labels is not None else [f"Year{i + 1}" for i in range(periods)],
+        values=block,
+        balance_check=line["total_assets"] - line["total_liabilities_and_equity"],
+        interest_residual=residual,
+        converged=(residual <= tolerance * np.maximum(np.abs(line["revenue"]), 1.0)).all(axis=1),
+        iterations=iterations,
+    )
+
+
+def run_linked_three_statement(
+    model_inputs: Union[CompanyModelInput, Sequence[CompanyModelInput]],
+    assumptions: Union[Dict[str, Any], Sequence[Dict[str, Any]]],
+    forecast_periods: int = 5,
+    frequency: str = "annual",
+    average_balances: bool = True,
+) -> LinkedStatementsOutput:
+    """
+    Linked 3-statement projections for one company or a peer set.
+
+    Args:
+        model_inputs: CompanyModelInput, or one per company
+        assumptions: One assumptions dict for all companies, or one per
+            company, with the run_three_statement keys plus
+            FINANCING_ASSUMPTIONS keys (days_sales_outstanding,
+            days_inventory_outstanding, days_payables_outstanding,
+            interest_rate, interest_rate_on_cash, debt_amortization_pct,
+            cash_sweep_pct, minimum_cash_as_pct_revenue, dividend_payout_ratio)
+        forecast_periods: Number of periods to project forward
+        frequency: "annual" or "quarterly"
+        average_balances: Interest on average (circular) or opening balances
+
+    Returns:
+        LinkedStatementsOutput (period labels are "Year1", ... when the
+        companies' latest historical years differ)
+    """
+    if isinstance(model_inputs, CompanyModelInput):
+        model_inputs = [model_inputs]
+    if not model_inputs:
+        raise ValueError("At least one company is required")
+    if isinstance(assumptions, dict):
+        assumptions = [assumptions] * len(model_inputs)
+    if len(assumptions) != len(model_inputs):
+        raise ValueError(f"Got {len(model_inputs)} companies but {len(assumptions)} assumption sets")
+
+    latest = [latest_historicals(model_input) for model_input in model_inputs]
+    missing = [m.ticker for m, (_, values) in zip(model_inputs, latest) if values["revenue"] <= 0]
+    if missing:
+        raise ValueError(f"Latest period revenue is missing or zero for {', '.join(missing)}")
+    opening: List[Dict[str, float]] = [opening_balances(m, year) for m, (year, _) in zip(model_inputs, latest)]
+
+    names = {**DEFAULT_ASSUMPTIONS, **FINANCING_ASSUMPTIONS}
+    years = {year for year, _ in latest}
+    return project_linked_statements(
+        revenue=np.array([values["revenue"] for _, values in latest]),
+        cogs=np.array([values["cogs"] for _, values in latest]),
+        operating_expense=np.array([values["operating_expense"] for _, values in latest]),
+        opening={name: np.array([o[name] for o in opening], dtype=float) for name in OPENING_BALANCE_ROLES},
+        periods=forecast_periods,
+        assumptions={
+            name: np.array([default if a.get(name) is None else a[name] for a in assumptions], dtype=float)
+            for name, default in names.items()
+        },
+        period_labels=projection_periods(years.pop(), forecast_periods, frequency) if len(years) == 1 else None,
+        periods_per_year=4 if frequency == "quarterly" else 1,
+        average_balances=average_balances,
+    )
+
@@ -0,0 +1,350 @@
+"""
+monte_carlo.py — Monte Carlo DCF Valuation (NumPy)
+
+Purpose:
+- Complement the point estimates of scenario_engine.run_scenarios with a
+  distribution: sample revenue growth, operating margin target, capex %, WACC
+  and terminal growth (and any other run_three_statement assumption) from
+  configurable distributions, optionally correlated, and value every draw
+- Return percentiles and a histogram of implied share price (or enterprise
+  value when shares outstanding are not given)
+
+Each path is one set of assumptions held flat over the forecast. Paths run
+in chunks: a chunk is projected with three_statement_engine.project_statements
+(the run_three_statement kernel behind /models/generate) and valued with
+dcf_engine.run_dcf_paths, so peak memory is bounded by the chunk size
+(MONTE_CARLO_CHUNK_PATHS), not by the number of paths. Only one float per
+path (the valuation) is kept for the summary.
+
+Reproducibility: the seed is expanded into one child SeedSequence per chunk,
+so a given (seed, paths, chunk size) gives identical results whether chunks
+run serially, on an executor passed to run_monte_carlo, or spread over the
+CPU process pool by the API.
+
+Correlation uses the Iman-Conover rank method: marginals are drawn
+independently, then reordered to follow the ranks of correlated normals.
+Marginals are preserved exactly and Spearman rank correlations match the
+request (no inverse CDFs needed, so any distribution can be correlated).
+
+Distribution specs (dicts):
+    {"distribution": "fixed", "value": 0.05}
+    {"distribution": "normal", "mean": 0.05, "std": 0.02}
+    {"distribution": "lognormal", "mean": 10.0, "std": 2.0}  (mean/std of the value)
+    {"distribution": "uniform", "low": 0.03, "high": 0.07}
+    {"distribution": "triangular", "low": 0.01, "mode": 0.025, "high": 0.03}
+Any spec may add "min" / "max" to clip draws (e.g., capex % >= 0).
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.services.modeling.dcf_engine import run_dcf_paths
+from app.services.modeling.three_statement_engine import DEFAULT_ASSUMPTIONS, project_statements
+from app.services.modeling.types import THREE_STATEMENT_ROLES, MonteCarloOutput
+
+MONTE_CARLO_CHUNK_PATHS = int(os.getenv("MONTE_CARLO_CHUNK_PATHS", "25000"))
+MONTE_CARLO_MAX_PATHS = int(os.getenv("MONTE_CARLO_MAX_PATHS", "1000000"))
+
+SAMPLED_INPUTS = tuple(DEFAULT_ASSUMPTIONS) + ("wacc", "terminal_growth_rate")
+DISTRIBUTIONS = ("fixed", "normal", "lognormal", "uniform", "triangular")
+
+# Default spreads; build_simulation_config centers each on the base input value
+DEFAULT_DISTRIBUTIONS: Dict[str, Dict[str, Any]] = {
+    "revenue_growth": {"distribution": "normal", "mean": 0.05, "std": 0.02},
+    "operating_margin_target": {"distribution": "normal", "mean": 0.15, "std": 0.02},
+    "capex_as_pct_revenue": {"distribution": "normal", "mean": 0.05, "std": 0.01, "min": 0.0},
+    "wacc": {"distribution": "normal", "mean": 0.10, "std": 0.01, "min": 0.01},
+    "terminal_growth_rate": {"distribution": "triangular", "low": 0.015, "mode": 0.025, "high": 0.035},
+}
+DEFAULT_PERCENTILES = (5, 10, 25, 50, 75, 90, 95)
+DEFAULT_HISTOGRAM_BINS = 50
+HISTOGRAM_RANGE = (1.0, 99.0)  # Percentiles bounding the histogram (tails go to under/overflow)
+
+
+def run_monte_carlo(
+    inputs: Dict[str, Any],
+    distributions: Optional[Dict[str, Dict[str, Any]]] = None,
+    correlations: Optional[Sequence[Tuple[str, str, float]]] = None,
+    paths: int = 100_000,
+    seed: Optional[int] = None,
+    chunk_size: int = MONTE_CARLO_CHUNK_PATHS,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    bins: int = DEFAULT_HISTOGRAM_BINS,
+    executor: Optional[Executor] = None,
+) -> MonteCarloOutput:
+    """
+    Simulate `paths` valuations and summarize their distribution.
+
+    Args:
+        inputs: Base case, with keys:
+            - revenue: float (latest historical revenue, required)
+            - cogs, operating_expense: float (latest historical values, default 0)
+            - forecast_periods: int (default: 5)
+            - shares_outstanding, debt, cash
+            - any SAMPLED_INPUTS value, used for inputs without a distribution
+        distributions: SAMPLED_INPUTS -> distribution spec (default:
+            DEFAULT_DISTRIBUTIONS centered on the base inputs); inputs
+            without a spec are fixed at their base value
+        correlations: (input_a, input_b, rho) Spearman rank correlations
+            between sampled inputs
+        paths: Number of simulated paths
+        seed: Seed for reproducible results (None = fresh entropy)
+        chunk_size: Paths per chunk (bounds peak memory)
+        percentiles: Percentiles to report
+        bins: Histogram bins
+        executor: Optional executor (e.g., a ProcessPoolExecutor) to run chunks in parallel
+
+    Returns:
+        MonteCarloOutput
+    """
+    config = build_simulation_config(inputs, distributions, correlations)
+    plan = chunk_plan(paths, seed, chunk_size)
+    if executor is None:
+        chunks = [simulate_chunk(config, seed_sequence, size) for seed_sequence, size in plan]
+    else:
+        chunks = list(executor.map(simulate_chunk, [config] * len(plan), *zip(*plan)))
+    return summarize_simulation(chunks, config["metric"], seed, percentiles, bins)
+
+
+def build_simulation_config(
+    inputs: Dict[str, Any],
+    distributions: Optional[Dict[str, Dict[str, Any]]] = None,
+    correlations: Optional[Sequence[Tuple[str, str, float]]] = None,
+) -> Dict[str, Any]:
+    """
+    Validate inputs and specs into a picklable config for simulate_chunk().
+    """
+    if not inputs.get("revenue"):
+        raise ValueError("Base revenue is required for a Monte Carlo valuation")
+    fixed = {**DEFAULT_ASSUMPTIONS, "wacc": 0.10, "terminal_growth_rate": 0.025}
+    fixed.update({k: inputs[k] for k in SAMPLED_INPUTS if inputs.get(k) is not None})
+
+    if distributions is None:
+        distributions = {
+            name: _center_spec(spec, float(fixed[name])) for name, spec in DEFAULT_DISTRIBUTIONS.items()
+        }
+    for name, spec in distributions.items():
+        if name not in SAMPLED_INPUTS:
+            raise ValueError(f"Cannot sample {name}; sampled inputs must be one of {list(SAMPLED_INPUTS)}")
+        _check_spec(name, spec)
+    sampled = [name for name in SAMPLED_INPUTS if name in distributions]
+
+    shares = inputs.get("shares_outstanding")
+    return {
+        "revenue": float(inputs["revenue"]),
+        "cogs": float(inputs.get("cogs") or 0.0),
+        "operating_expense": float(inputs.get("operating_expense") or 0.0),
+        "forecast_periods": int(inputs.get("forecast_periods") or 5),
+        "shares_outstanding": shares,
+        "debt": float(inputs.get("debt") or 0.0),
+        "cash": float(inputs.get("cash") or 0.0),
+        "fixed": {k: float(v) for k, v in fixed.items() if k not in distributions},
+        "distributions": {name: dict(distributions[name]) for name in sampled},
+        "sampled": sampled,
+        "correlation": correlation_matrix(sampled, correlations),
+        "metric": "implied_share_price" if shares is not None else "enterprise_value",
+    }
+
+
+def correlation_matrix(
+    names: Sequence[str],
+    correlations: Optional[Sequence[Tuple[str, str, float]]],
+) -> Optional[np.ndarray]:
+    """
+    Normal-score correlation matrix over `names` from (a, b, rho) Spearman
+    rank correlations (None if no pairs).
+
+    Raises ValueError for unknown inputs, |rho| > 1 or a matrix that is not
+    positive definite.
+    """
+    if not correlations:
+        return None
+    index = {name: i for i, name in enumerate(names)}
+    matrix = np.eye(len(names))
+    for a, b, rho in correlations:
+        for name in (a, b):
+            if name not in index:
+                raise ValueError(f"Correlated input {name} has no distribution")
+        if a == b or not -1.0 < rho < 1.0:
+            raise ValueError(f"Invalid correlation {a} / {b}: {rho} (needs two inputs and -1 < rho < 1)")
+        # Normal-score correlation that gives Spearman rank correlation rho
+        matrix[index[a], index[b]] = matrix[index[b], index[a]] = 2.0 * np.sin(np.pi * rho / 6.0)
+    try:
+        np.linalg.cholesky(matrix)
+    except np.linalg.LinAlgError:
+        raise ValueError("Correlations are inconsistent (matrix is not positive definite)") from None
+    return matrix
+
+
+def chunk_plan(
+    paths: int,
+    seed: Optional[int] = None,
+    chunk_size: int = MONTE_CARLO_CHUNK_PATHS,
+) -> List[Tuple[np.random.SeedSequence, int]]:
+    """
+    Split `paths` into (child seed, chunk paths) pairs.
+
+    Child seeds come from one SeedSequence, so chunk results do not depend on
+    where or in which order chunks run.
+    """
+    if not 1 <= paths <= MONTE_CARLO_MAX_PATHS:
+        raise ValueError(f"paths must be between 1 and {MONTE_CARLO_MAX_PATHS}, got {paths}")
+    chunk_size = max(1, int(chunk_size))
+    sizes = [chunk_size] * (paths // chunk_size)
+    if paths % chunk_size:
+        sizes.append(paths % chunk_size)
+    children = np.random.SeedSequence(seed).spawn(len(sizes))
+    return list(zip(children, sizes))
+
+
+def simulate_chunk(
+    config: Dict[str, Any],
+    seed_sequence: np.random.SeedSequence,
+    paths: int,
+) -> np.ndarray:
+    """
+    Sample, project and value one chunk of paths.
+
+    Module-level and picklable, so it can run on a process pool.
+
+    Returns:
+        (paths,) valuations (config["metric"]); NaN for invalid draws
+    """
+    rng = np.random.default_rng(seed_sequence)
+    draws = sample_inputs(rng, config["distributions"], config["sampled"], paths, config["correlation"])
+    drivers = {**config["fixed"], **draws}
+
+    block = project_statements(
+        revenue=config["revenue"],
+        cogs=config["cogs"],
+        operating_expense=config["operating_expense"],
+        periods=config["forecast_periods"],
+        companies=paths,
+        **{name: drivers[name] for name in DEFAULT_ASSUMPTIONS},
+    )
+    valuation = run_dcf_paths(
+        block[:, THREE_STATEMENT_ROLES["free_cash_flow"]],
+        wacc=drivers["wacc"],
+        terminal_growth_rate=drivers["terminal_growth_rate"],
+        shares_outstanding=config["shares_outstanding"],
+        debt=config["debt"],
+        cash=config["cash"],
+    )
+    return getattr(valuation, config["metric"])
+
+
+def sample_inputs(
+    rng: np.random.Generator,
+    distributions: Dict[str, Dict[str, Any]],
+    names: Sequence[str],
+    paths: int,
+    correlation: Optional[np.ndarray] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Draw `paths` values of each named input, rank-correlated if a correlation
+    matrix is given (Iman-Conover).
+    """
+    samples = np.empty((paths, len(names)))
+    for j, name in enumerate(names):
+        samples[:, j] = _sample(rng, distributions[name], paths)
+
+    if correlation is not None and paths > 1:
+        # Reorder each column to follow the ranks of correlated normal scores
+        scores = rng.standard_normal((paths, len(names))) @ np.linalg.cholesky(correlation).T
+        ranks = np.argsort(np.argsort(scores, axis=0), axis=0)
+        samples = np.take_along_axis(np.sort(samples, axis=0), ranks, axis=0)
+
+    return {name: samples[:, j] for j, name in enumerate(names)}
+
+
+def summarize_simulation(
+    chunks: Sequence[np.ndarray],
+    metric: str,
+    seed: Optional[int] = None,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    bins: int = DEFAULT_HISTOGRAM_BINS,
+) -> MonteCarloOutput:
+    """Percentiles, moments and histogram of simulated valuations."""
+    values = np.concatenate([np.asarray(chunk, dtype=float) for chunk in chunks])
+    valid = values[np.isfinite(values)]
+    if not len(valid):
+        raise ValueError("No valid paths (check that terminal growth stays below WACC)")
+
+    low, high = np.percentile(valid, HISTOGRAM_RANGE)
+    if high <= low:
+        low, high = low - 0.5, high + 0.5  # Degenerate (all paths equal)
+    counts, edges = np.histogram(valid, bins=bins, range=(low, high))
+    return MonteCarloOutput(
+        metric=metric,
+        paths=len(values),
+        valid_paths=len(valid),
+        seed=seed,
+        mean=float(valid.mean()),
+        std=float(valid.std()),
+        percentiles={
+            f"p{q:g}": float(v) for q, v in zip(percentiles, np.percentile(valid, list(percentiles)))
+        },
+        histogram_edges=edges.tolist(),
+        histogram_counts=counts.tolist(),
+        underflow=int((valid < low).sum()),
+        overflow=int((valid > high).sum()),
+    )
+
+
+def _sample(rng: np.random.Generator, spec: Dict[str, Any], paths: int) -> np.ndarray:
+    """Draw from one distribution spec (validated by _check_spec)."""
+    kind = spec.get("distribution", "normal")
+    if kind == "fixed":
+        values = np.full(paths, float(spec["value"]))
+    elif kind == "normal":
+        values = rng.normal(spec["mean"], spec["std"], paths)
+    elif kind == "lognormal":
+        # Parameters of the underlying normal from the value's mean and std
+        sigma2 = np.log1p((spec["std"] / spec["mean"]) ** 2)
+        values = rng.lognormal(np.log(spec["mean"]) - sigma2 / 2.0, np.sqrt(sigma2), paths)
+    elif kind == "uniform":
+        values = rng.uniform(spec["low"], spec["high"], paths)
+    else:  # triangular
+        values = rng.triangular(spec["low"], spec["mode"], spec["high"], paths)
+
+    if spec.get("min") is not None or spec.get("max") is not None:
+        values = np.clip(values, spec.get("min"), spec.get("max"))
+    return values
+
+
+def _center_spec(spec: Dict[str, Any], value: float) -> Dict[str, Any]:
+    """A default spec moved so its mean (normal) or mode (triangular) is the base value, spread unchanged."""
+    if spec["distribution"] == "normal":
+        return {**spec, "mean": value}
+    shift = value - spec["mode"]
+    return {**spec, "low": spec["low"] + shift, "mode": value, "high": spec["high"] + shift}
+
+
+def _check_spec(name: str, spec: Dict[str, Any]) -> None:
+    """Raise ValueError for an unknown distribution or missing / invalid parameters."""
+    kind = spec.get("distribution", "normal")
+    required = {
+        "fixed": ("value",),
+        "normal": ("mean", "std"),
+        "lognormal": ("mean", "std"),
+        "uniform": ("low", "high"),
+        "triangular": ("low", "mode", "high"),
+    }.get(kind)
+    if required is None:
+        raise ValueError(f"{name}: distribution must be one of {list(DISTRIBUTIONS)}, got {kind}")
+    missing = [p for p in required if spec.get(p) is None]
+    if missing:
+        raise ValueError(f"{name}: {kind} distribution needs {', '.join(missing)}")
+    if kind in ("normal", "lognormal") and spec["std"] < 0:
+        raise ValueError(f"{name}: std must be >= 0")
+    if kind == "lognormal" and spec["mean"] <= 0:
+        raise ValueError(f"{name}: lognormal mean must be > 0")
+    if kind == "uniform" and spec["high"] < spec["low"]:
+        raise ValueError(f"{name}: uniform needs low <= high")
+    if kind == "triangular" and not (spec["low"] <= spec["mode"] <= spec["high"] and spec["low"] < spec["high"]):
+        raise ValueError(f"{name}: triangular needs low <= mode <= high and low < high")
@@ -0,0 +1,161 @@
+"""
+pipeline.py — CPU-bound modeling steps behind POST /models/generate and
+POST /models/linked-statements.
+
+Takes the live-fetched company data and runs:
+1. Build CompanyModelInput from normalized facts
+2. 3-statement projections
+3. DCF valuation
+4. Comps multiples
+
+run_linked_pipeline runs step 1 and the linked 3-statement model instead.
+
+Everything here is pure computation on plain dicts, so the API can run it on
+the CPU process pool (app.core.executors.run_cpu) without blocking the event
+loop. Inputs and outputs are plain, picklable Python objects.
+"""
+
+from typing import Any, Dict
+
+from app.core.logging import get_logger
+from app.services.modeling.comps import run_comps
+from app.services.modeling.dcf import run_dcf
+from app.services.modeling.three_statement import run_three_statement, run_three_statement_linked
+from app.services.modeling.types import CompanyModelInput, build_company_model_input_from_normalized_facts
+
+logger = get_logger(__name__)
+
+
+def run_model_pipeline(
+    company_data: Dict[str, Any],
+    assumptions: Dict[str, Any],
+    forecast_periods: int,
+    frequency: str,
+) -> Dict[str, Any]:
+    """
+    Run the modeling pipeline for one company.
+
+    Args:
+        company_data: Result of fetch_company_live() (ticker, name, financials, periods)
+        assumptions: Model assumptions (see GenerateModelRequest.assumptions)
+        forecast_periods: Number of forecast periods
+        frequency: "annual" or "quarterly"
+
+    Returns:
+        Dictionary with "projections", "dcf" and "comps" dicts, shaped like
+        GenerateModelResponse
+    """
+    # Step 1: Build CompanyModelInput from normalized facts
+    model_input = _build_model_input(company_data)
+
+    # Step 2: Generate 3-statement projections
+    logger.info("Generating 3-statement projections")
+    projections = run_three_statement(
+        model_input=model_input,
+        assumptions=assumptions,
+        forecast_periods=forecast_periods,
+        frequency=frequency,
+    )
+
+    # Step 3: Calculate DCF
+    logger.info("Calculating DCF valuation")
+    dcf_assumptions = {
+        "wacc": assumptions.get("wacc", 0.10),
+        "terminal_growth_rate": assumptions.get("terminal_growth_rate", 0.025),
+        "shares_outstanding": assumptions.get("shares_outstanding"),
+        "debt": assumptions.get("debt", 0.0),
+        "cash": assumptions.get("cash", 0.0),
+    }
+    dcf_result = run_dcf(projections, dcf_assumptions)
+
+    # Step 4: Calculate comps (simplified - no peers in MVP)
+    logger.info("Calculating comps multiples")
+    comps_result = run_comps(model_input=model_input, comparables=None)
+
+    # Convert dataclass outputs to dicts for response
+    projections_dict = projections.to_dict()
+
+    dcf_dict = {
+        "yearly_results": [
+            {
+                "year": r.year,
+                "ufcf": r.ufcf,
+                "discount_factor": r.discount_factor,
+                "pv_ufcf": r.pv_ufcf,
+            }
+            for r in dcf_result.yearly_results
+        ],
+        "terminal_value": dcf_result.terminal_value,
+        "pv_terminal_value": dcf_result.pv_terminal_value,
+        "enterprise_value": dcf_result.enterprise_value,
+        "equity_value": dcf_result.equity_value,
+        "implied_share_price": dcf_result.implied_share_price,
+        "wacc": dcf_result.wacc,
+        "terminal_growth_rate": dcf_result.terminal_growth_rate,
+    }
+
+    comps_dict = {
+        "subject_company": comps_result.subject_company,
+        "subject_metrics": comps_result.subject_metrics,
+        "comparables": [
+            {
+                "name": c.name,
+                "ev_ebitda": c.ev_ebitda,
+                "pe": c.pe,
+                "ev_sales": c.ev_sales,
+            }
+            for c in comps_result.comparables
+        ],
+        "implied_values": comps_result.implied_values,
+    }
+
+    return {
+        "projections": projections_dict,
+        "dcf": dcf_dict,
+        "comps": comps_dict,
+    }
+
+
+def run_linked_pipeline(
+    company_data: Dict[str, Any],
+    assumptions: Dict[str, Any],
+    forecast_periods: int,
+    frequency: str,
+    average_balances: bool,
+) -> Dict[str, Any]:
+    """
+    Run the linked 3-statement model for one company.
+
+    Args:
+        company_data: Result of fetch_company_live() (ticker, name, financials, periods)
+        assumptions: run_three_statement_linked assumptions
+        forecast_periods: Number of forecast periods
+        frequency: "annual" or "quarterly"
+        average_balances: Interest on average (circular) or opening balances
+
+    Returns:
+        LinkedStatementsOutput.to_dict() of the company (periods, one list
+        per line, balance_check and convergence diagnostics)
+    """
+    model_input = _build_model_input(company_data)
+
+    logger.info("Generating linked 3-statement projections")
+    statements = run_three_statement_linked(
+        model_input=model_input,
+        assumptions=assumptions,
+        forecast_periods=forecast_periods,
+        frequency=frequency,
+        average_balances=average_balances,
+    )
+    return statements.to_dict()
+
+
+def _build_model_input(company_data: Dict[str, Any]) -> CompanyModelInput:
+    """CompanyModelInput from the normalized facts of fetch_company_live()."""
+    logger.info("Building CompanyModelInput from normalized facts")
+    return build_company_model_input_from_normalized_facts(
+        ticker=company_data["ticker"],
+        name=company_data["name"],
+        financials_by_statement=company_data["financials"],
+        periods=company_data["periods"],
+    )
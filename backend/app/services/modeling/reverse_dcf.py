@@ -0,0 +1,236 @@
+"""
+reverse_dcf.py — Reverse DCF / Goal Seek (NumPy)
+
+Purpose:
+- Find the revenue growth, operating margin target or WACC at which the DCF
+  implied share price equals a target price (typically the current quote from
+  fmp_client.fetch_quote), replacing manual goal-seeking in the workbook
+- Solve a whole peer set at once: every company is one path of the
+  run_three_statement kernel (three_statement_engine.project_statements) and
+  of the vectorized valuation (dcf_engine.run_dcf_paths), so a solved value
+  fed back into run_three_statement + run_dcf reproduces the target price
+
+Methods:
+- Operating margin target: closed form. Up to the gross margin, OpEx blends
+  linearly towards the target, so FCF, the Gordon Growth terminal value and
+  the share price are affine in it; two valuations inside that range (the
+  bracket's low end and its midpoint) give the exact answer. Above the gross
+  margin OpEx stays at its historical margin and the price no longer depends
+  on the target.
+- Revenue growth and WACC: bracketed Newton. Newton steps with a
+  forward-difference derivative, falling back to bisection whenever a step
+  leaves the bracket, so convergence is guaranteed once the target is
+  bracketed. All companies iterate together; each iteration is two
+  vectorized valuations.
+
+Companies whose target lies outside SOLVER_BRACKETS (or that lack revenue,
+shares outstanding or a positive target) get NaN with a status instead of
+failing the batch.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.services.modeling.dcf_engine import run_dcf_paths
+from app.services.modeling.three_statement_engine import DEFAULT_ASSUMPTIONS, project_statements
+from app.services.modeling.types import THREE_STATEMENT_ROLES, ReverseDcfOutput
+
+SOLVABLE_INPUTS = ("revenue_growth", "operating_margin_target", "wacc")
+
+# Search range per solved input; WACC's lower bound is terminal growth + WACC_FLOOR_SPREAD
+SOLVER_BRACKETS: Dict[str, Tuple[float, float]] = {
+    "revenue_growth": (-0.5, 1.0),
+    "operating_margin_target": (-1.0, 1.0),
+    "wacc": (0.0, 1.0),
+}
+WACC_FLOOR_SPREAD = 1e-4
+MAX_ITERATIONS = 60
+VALUE_TOLERANCE = 1e-10  # Bracket width at which a solve stops
+PRICE_TOLERANCE = 1e-9  # Relative price error at which a solve stops
+DERIVATIVE_STEP = 1e-6
+
+DEFAULT_INPUTS: Dict[str, Any] = {
+    **DEFAULT_ASSUMPTIONS,
+    "cogs": 0.0,
+    "operating_expense": 0.0,
+    "wacc": 0.10,
+    "terminal_growth_rate": 0.025,
+    "forecast_periods": 5,
+    "debt": 0.0,
+    "cash": 0.0,
+}
+COMPANY_FIELDS = tuple(DEFAULT_ASSUMPTIONS) + (
+    "revenue", "cogs", "operating_expense", "wacc", "terminal_growth_rate", "shares_outstanding", "debt", "cash",
+)
+
+
+def solve_implied(
+    companies: Sequence[Dict[str, Any]],
+    target_prices: Sequence[Optional[float]],
+    solve_for: str = "revenue_growth",
+) -> ReverseDcfOutput:
+    """
+    Solve for the input that makes each company's implied share price equal its target.
+
+    Args:
+        companies: Base case per company, with keys:
+            - revenue: float (latest historical revenue, required)
+            - cogs, operating_expense: float (latest historical values, default 0)
+            - shares_outstanding: float (required)
+            - revenue_growth, operating_margin_target, tax_rate,
+              capex_as_pct_revenue, depreciation_as_pct_revenue (as in run_three_statement)
+            - wacc, terminal_growth_rate, forecast_periods, debt, cash
+            The solved input's base value is ignored (except as a Newton start).
+        target_prices: Target share price per company (e.g., fetch_quote()["price"])
+        solve_for: One of SOLVABLE_INPUTS
+
+    Returns:
+        ReverseDcfOutput with one implied value and status per company
+    """
+    if solve_for not in SOLVABLE_INPUTS:
+        raise ValueError(f"solve_for must be one of {list(SOLVABLE_INPUTS)}, got {solve_for}")
+    if len(companies) != len(target_prices):
+        raise ValueError(f"Got {len(companies)} companies but {len(target_prices)} target prices")
+
+    n = len(companies)
+    targets = np.array([np.nan if p is None else p for p in target_prices], dtype=float)
+    implied = np.full(n, np.nan)
+    status = ["invalid_input"] * n
+    iterations = 0
+
+    # Each forecast length is one vectorized group (usually there is only one)
+    merged = [{**DEFAULT_INPUTS, **{k: v for k, v in c.items() if v is not None}} for c in companies]
+    groups: Dict[int, List[int]] = {}
+    for i, company in enumerate(merged):
+        if _is_solvable(company, targets[i]):
+            groups.setdefault(int(company["forecast_periods"]), []).append(i)
+
+    for periods, index in groups.items():
+        index = np.asarray(index)
+        params = {name: np.array([float(merged[i][name]) for i in index]) for name in COMPANY_FIELDS}
+        if solve_for == "operating_margin_target":
+            values, solved = _solve_margin(params, periods, targets[index])
+        else:
+            values, solved, used = _solve_bracketed(params, periods, targets[index], solve_for)
+            iterations = max(iterations, used)
+        implied[index] = np.where(solved, values, np.nan)
+        for i, ok in zip(index.tolist(), solved.tolist()):
+            status[i] = "solved" if ok else "no_solution"
+
+    return ReverseDcfOutput(
+        solve_for=solve_for,
+        target_price=targets,
+        implied_value=implied,
+        status=status,
+        iterations=iterations,
+    )
+
+
+def implied_share_prices(params: Dict[str, np.ndarray], periods: int) -> np.ndarray:
+    """
+    Implied share price per company from (companies,) parameter arrays.
+
+    Args:
+        params: COMPANY_FIELDS -> (companies,) arrays
+        periods: Forecast periods
+
+    Returns:
+        (companies,) implied share prices (NaN where terminal growth >= WACC)
+    """
+    block = project_statements(
+        revenue=params["revenue"],
+        cogs=params["cogs"],
+        operating_expense=params["operating_expense"],
+        periods=periods,
+        companies=len(params["revenue"]),
+        **{name: params[name] for name in DEFAULT_ASSUMPTIONS},
+    )
+    return run_dcf_paths(
+        block[:, THREE_STATEMENT_ROLES["free_cash_flow"]],
+        wacc=params["wacc"],
+        terminal_growth_rate=params["terminal_growth_rate"],
+        shares_outstanding=params["shares_outstanding"],
+        debt=params["debt"],
+        cash=params["cash"],
+    ).implied_share_price
+
+
+def _solve_margin(
+    params: Dict[str, np.ndarray],
+    periods: int,
+    targets: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Closed-form operating margin target: the share price is affine in it up to the gross margin."""
+    low, high = SOLVER_BRACKETS["operating_margin_target"]
+    lo = np.full_like(targets, low)
+    hi = np.minimum(high, 1.0 - params["cogs"] / params["revenue"])
+    # Fit the line strictly inside the affine range: at the gross margin itself
+    # the target OpEx is zero up to rounding and may take the historical branch
+    mid = (lo + hi) / 2.0
+    at_lo = implied_share_prices({**params, "operating_margin_target": lo}, periods)
+    at_mid = implied_share_prices({**params, "operating_margin_target": mid}, periods)
+    slope = at_mid - at_lo
+    with np.errstate(divide="ignore", invalid="ignore"):
+        margin = lo + (targets - at_lo) / slope * (mid - lo)
+    return margin, np.isfinite(margin) & (slope != 0) & (hi > lo) & (margin >= lo) & (margin <= hi)
+
+
+def _solve_bracketed(
+    params: Dict[str, np.ndarray],
+    periods: int,
+    targets: np.ndarray,
+    solve_for: str,
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Bracketed Newton on price(x) - target for every company at once."""
+    def error(x: np.ndarray) -> np.ndarray:
+        return implied_share_prices({**params, solve_for: x}, periods) - targets
+
+    low_bound, high_bound = SOLVER_BRACKETS[solve_for]
+    lo = np.full_like(targets, low_bound)
+    hi = np.full_like(targets, high_bound)
+    if solve_for == "wacc":
+        lo = np.maximum(lo, params["terminal_growth_rate"] + WACC_FLOOR_SPREAD)
+    f_lo = error(lo)
+    f_hi = error(hi)
+    bracketed = np.isfinite(f_lo) & np.isfinite(f_hi) & (np.sign(f_lo) != np.sign(f_hi)) & (lo < hi)
+
+    # Start from the base value when it lies inside the bracket
+    x = np.where((params[solve_for] > lo) & (params[solve_for] < hi), params[solve_for], (lo + hi) / 2.0)
+    tolerance = PRICE_TOLERANCE * np.maximum(np.abs(targets), 1.0)
+    done = ~bracketed | (f_lo == 0) | (f_hi == 0)
+    x = np.where(f_lo == 0, lo, np.where(f_hi == 0, hi, x))
+
+    iterations = 0
+    while not done.all() and iterations < MAX_ITERATIONS:
+        iterations += 1
+        f_x = error(x)
+        done |= np.abs(f_x) <= tolerance
+
+        # Shrink the bracket around the root
+        same_side = np.sign(f_x) == np.sign(f_lo)
+        lo, f_lo = np.where(same_side, x, lo), np.where(same_side, f_x, f_lo)
+        hi = np.where(same_side, hi, x)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slope = (error(x + DERIVATIVE_STEP) - f_x) / DERIVATIVE_STEP
+            step = x - f_x / slope
+        outside = ~np.isfinite(step) | (step <= lo) | (step >= hi)
+        step = np.where(outside, (lo + hi) / 2.0, step)
+
+        x = np.where(done, x, step)
+        done |= (hi - lo) <= VALUE_TOLERANCE
+
+    return x, bracketed, iterations
+
+
+def _is_solvable(company: Dict[str, Any], target: float) -> bool:
+    """Whether a company has what a reverse DCF needs."""
+    return (
+        np.isfinite(target)
+        and target > 0
+        and (company.get("revenue") or 0) > 0
+        and (company.get("shares_outstanding") or 0) > 0
+    )
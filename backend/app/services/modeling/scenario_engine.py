@@ -0,0 +1,289 @@
+"""
+scenario_engine.py — N-Scenario Valuation (NumPy)
+
+Purpose:
+- Value any number of named assumption sets (bear/base/bull, other analyst
+  scenarios, or a grid generated by scenario_grid)
+- Return a tidy table: one row per scenario with its inputs and valuation
+
+Same projection and valuation as /models/generate: the run_three_statement
+kernel (three_statement_engine.project_statements: flat revenue growth, OpEx
+blended towards the operating margin target, D&A / CapEx as % of revenue)
+and run_dcf's Gordon Growth DCF, plus optional absolute per-period overrides
+of D&A, CapEx and a working capital change.
+
+Shared work is done once:
+- Scenarios with the same operating assumptions share one projection path
+- Scenarios with identical assumptions share one valuation
+All unique paths are projected in one project_statements call and valued in
+one dcf_engine.run_dcf_paths call, so 50 scenarios cost about the same as
+one. Pass an executor to split very large scenario sets into chunks across
+processes.
+"""
+
+from __future__ import annotations
+
+import itertools
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.services.modeling.dcf_engine import run_dcf_paths
+from app.services.modeling.three_statement_engine import DEFAULT_ASSUMPTIONS, project_statements
+from app.services.modeling.types import THREE_STATEMENT_ROLES
+
+SCENARIO_CHUNK_SIZE = 5000  # Scenarios per executor task
+
+# Absolute per-period overrides of the % of revenue lines
+OVERRIDE_LINES = {
+    "depreciation_amortization": "depreciation",
+    "capex": "capex",
+}
+# Absolute per-period working capital change subtracted from FCF (none by default, as in run_three_statement)
+WORKING_CAPITAL_OVERRIDE = "working_capital_change"
+OPERATING_INPUTS = tuple(DEFAULT_ASSUMPTIONS) + tuple(OVERRIDE_LINES) + (WORKING_CAPITAL_OVERRIDE,)
+VALUATION_INPUTS = ("wacc", "terminal_growth_rate", "shares_outstanding", "debt", "cash")
+DEFAULT_VALUATION_INPUTS: Dict[str, Any] = {
+    "wacc": 0.10,
+    "terminal_growth_rate": 0.025,
+    "shares_outstanding": None,
+    "debt": 0.0,
+    "cash": 0.0,
+}
+# Every key a scenario may set; anything else is rejected rather than silently ignored
+SCENARIO_INPUTS = frozenset(OPERATING_INPUTS) | frozenset(DEFAULT_VALUATION_INPUTS)
+
+RESULT_COLUMNS = [
+    "final_revenue",
+    "final_free_cash_flow",
+    "pv_fcf_sum",
+    "terminal_value",
+    "pv_terminal_value",
+    "enterprise_value",
+    "equity_value",
+    "implied_share_price",
+]
+
+
+def scenario_grid(
+    base: Dict[str, Any],
+    axes: Dict[str, Sequence[Any]],
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Named scenarios for every combination of the axis values.
+
+    Args:
+        base: Assumptions shared by every scenario
+        axes: Input -> values to combine (e.g., {"revenue_growth": [0.03, 0.05], "wacc": [0.08, 0.10]})
+
+    Returns:
+        Dictionary of scenario name (e.g., "revenue_growth=0.03, wacc=0.08") -> assumptions.
+        Floats are named at full precision (repr), so distinct values never share a name.
+
+    Raises:
+        ValueError: If an axis repeats a value (two scenarios would share a name)
+    """
+    names = list(axes)
+    scenarios = {}
+    for values in itertools.product(*(axes[name] for name in names)):
+        label = ", ".join(
+            f"{name}={float(value)!r}" if isinstance(value, float) else f"{name}={value}"
+            for name, value in zip(names, values)
+        )
+        if label in scenarios:
+            raise ValueError(f"Duplicate grid scenario {label!r}; axis values must be distinct")
+        scenarios[label] = {**base, **dict(zip(names, values))}
+    return scenarios
+
+
+def run_scenarios(
+    latest_historical: Dict[str, float],
+    scenarios: Dict[str, Dict[str, Any]],
+    forecast_periods: int = 5,
+    executor: Optional[Executor] = None,
+    chunk_size: int = SCENARIO_CHUNK_SIZE,
+) -> pd.DataFrame:
+    """
+    Project and value every scenario, sharing duplicate work.
+
+    Args:
+        latest_historical: Latest historical data (revenue required; cogs and
+            operating_expense default to 0, as in run_three_statement)
+        scenarios: Scenario name -> assumptions, with keys:
+            - revenue_growth, operating_margin_target, tax_rate,
+              capex_as_pct_revenue, depreciation_as_pct_revenue (as in run_three_statement)
+            - depreciation_amortization, capex, working_capital_change
+              (optional absolute per-period overrides)
+            - wacc, terminal_growth_rate, shares_outstanding, debt, cash
+        forecast_periods: Number of periods to project
+        executor: Optional executor to evaluate chunks of scenarios in parallel
+        chunk_size: Scenarios per executor task
+
+    Returns:
+        DataFrame indexed by scenario name with the resolved OPERATING_INPUTS,
+        VALUATION_INPUTS and RESULT_COLUMNS (NaN where terminal growth >= WACC
+        or shares are not given). attrs["unique_projections"] and
+        attrs["unique_valuations"] report how much work was shared.
+
+    Raises:
+        ValueError: If revenue or scenarios are missing, or a scenario sets a
+            key outside SCENARIO_INPUTS
+    """
+    if not latest_historical.get("revenue"):
+        raise ValueError("Latest historical revenue is required")
+    if not scenarios:
+        raise ValueError("At least one scenario is required")
+    for name, assumptions in scenarios.items():
+        unknown = sorted(set(assumptions) - SCENARIO_INPUTS)
+        if unknown:
+            raise ValueError(
+                f"Scenario {name!r} has unknown inputs {unknown}; expected any of {sorted(SCENARIO_INPUTS)}"
+            )
+
+    names = list(scenarios)
+    rows = [_resolve_assumptions(scenarios[name]) for name in names]
+
+    if executor is None or len(rows) <= chunk_size:
+        results, stats = evaluate_scenarios(latest_historical, rows, forecast_periods)
+    else:
+        chunks = [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+        outputs = list(executor.map(
+            evaluate_scenarios,
+            [latest_historical] * len(chunks),
+            chunks,
+            [forecast_periods] * len(chunks),
+        ))
+        results = {column: np.concatenate([out[0][column] for out in outputs]) for column in RESULT_COLUMNS}
+        stats = tuple(sum(out[1][k] for out in outputs) for k in range(2))
+
+    table = pd.DataFrame(rows, index=pd.Index(names, name="scenario"))
+    for column in RESULT_COLUMNS:
+        table[column] = results[column]
+    table.attrs["unique_projections"], table.attrs["unique_valuations"] = stats
+    return table
+
+
+def evaluate_scenarios(
+    latest_historical: Dict[str, float],
+    rows: List[Dict[str, Any]],
+    forecast_periods: int,
+) -> Tuple[Dict[str, np.ndarray], Tuple[int, int]]:
+    """
+    Value resolved scenario rows in one batched pass (picklable for executors).
+
+    Args:
+        latest_historical: Latest revenue, cogs and operating_expense
+        rows: Resolved scenario assumptions (see run_scenarios)
+        forecast_periods: Number of periods to project
+
+    Returns:
+        (RESULT_COLUMNS -> (scenarios,) arrays, (unique projections, unique valuations))
+    """
+    # Deduplicate: projections by operating inputs, valuations by all inputs
+    path_keys = [tuple(row[k] for k in OPERATING_INPUTS) for row in rows]
+    unique_paths, path_index = _unique(path_keys)
+    valuation_keys = [(path_index[i],) + tuple(row[k] for k in VALUATION_INPUTS) for i, row in enumerate(rows)]
+    unique_valuations, valuation_index = _unique(valuation_keys)
+
+    operating = {name: np.array([key[j] for key in unique_paths], dtype=float) for j, name in enumerate(OPERATING_INPUTS)}
+    block = project_statements(
+        revenue=latest_historical["revenue"],
+        cogs=latest_historical.get("cogs", 0.0),
+        operating_expense=latest_historical.get("operating_expense", 0.0),
+        periods=forecast_periods,
+        companies=len(unique_paths),
+        **{name: operating[name] for name in DEFAULT_ASSUMPTIONS},
+    )
+    projection = {name: block[:, row] for name, row in THREE_STATEMENT_ROLES.items()}
+    _apply_overrides(projection, operating)
+
+    # One valuation per unique (path, valuation inputs) combination
+    paths = np.array([key[0] for key in unique_valuations])
+    valuation_inputs = {
+        name: np.array([np.nan if key[j + 1] is None else key[j + 1] for key in unique_valuations], dtype=float)
+        for j, name in enumerate(VALUATION_INPUTS)
+    }
+    has_shares = np.isfinite(valuation_inputs["shares_outstanding"])
+    valuation = run_dcf_paths(
+        projection["free_cash_flow"][paths],
+        wacc=valuation_inputs["wacc"],
+        terminal_growth_rate=valuation_inputs["terminal_growth_rate"],
+        shares_outstanding=np.where(has_shares, valuation_inputs["shares_outstanding"], 0.0),
+        debt=valuation_inputs["debt"],
+        cash=valuation_inputs["cash"],
+    )
+
+    per_valuation = {
+        "final_revenue": projection["revenue"][paths, -1],
+        "final_free_cash_flow": projection["free_cash_flow"][paths, -1],
+        "pv_fcf_sum": valuation.pv_fcf_sum,
+        "terminal_value": valuation.terminal_value,
+        "pv_terminal_value": valuation.pv_terminal_value,
+        "enterprise_value": valuation.enterprise_value,
+        "equity_value": np.where(has_shares, valuation.equity_value, np.nan),
+        "implied_share_price": valuation.implied_share_price,
+    }
+    gather = np.asarray(valuation_index)
+    results = {column: per_valuation[column][gather] for column in RESULT_COLUMNS}
+    return results, (len(unique_paths), len(unique_valuations))
+
+
+def scenario_records(table: pd.DataFrame) -> List[Dict[str, Any]]:
+    """JSON-ready rows of a run_scenarios table (scenario name included, NaN → None)."""
+    frame = table.reset_index()
+    frame = frame.astype(object).where(frame.notna(), None)
+    return frame.to_dict(orient="records")
+
+
+def _resolve_assumptions(assumptions: Dict[str, Any]) -> Dict[str, Any]:
+    """Scenario assumptions with the run_three_statement / run_dcf defaults filled in."""
+    row: Dict[str, Any] = {}
+    for name, default in DEFAULT_ASSUMPTIONS.items():
+        value = assumptions.get(name)
+        row[name] = default if value is None else value
+    for name in (*OVERRIDE_LINES, WORKING_CAPITAL_OVERRIDE):
+        value = assumptions.get(name)
+        row[name] = np.nan if value is None else float(value)
+    for name, default in DEFAULT_VALUATION_INPUTS.items():
+        value = assumptions.get(name, default)
+        row[name] = default if value is None and name != "shares_outstanding" else value
+    return row
+
+
+def _apply_overrides(projection: Dict[str, np.ndarray], operating: Dict[str, np.ndarray]) -> None:
+    """
+    Replace % of revenue lines by absolute overrides where given, subtract any
+    working capital change, then recompute FCF (projection rows are updated in place).
+    """
+    working_capital = operating[WORKING_CAPITAL_OVERRIDE]
+    overridden = bool(np.isfinite(working_capital).any())
+    for name, line in OVERRIDE_LINES.items():
+        values = operating[name]
+        rows = np.isfinite(values)
+        if rows.any():
+            projection[line][rows] = values[rows, None]
+            overridden = True
+    if overridden:
+        projection["free_cash_flow"][...] = (
+            projection["net_income"]
+            + projection["depreciation"]
+            - projection["capex"]
+            - np.nan_to_num(working_capital)[:, None]
+        )
+
+
+def _unique(keys: List[tuple]) -> Tuple[List[tuple], List[int]]:
+    """Unique keys in first-seen order and the index of each key among them (NaN-safe)."""
+    positions: Dict[tuple, int] = {}
+    unique: List[tuple] = []
+    index: List[int] = []
+    for key in keys:
+        # NaN != NaN, so hash a normalized key
+        normalized = tuple(None if isinstance(v, float) and v != v else v for v in key)
+        if normalized not in positions:
+            positions[normalized] = len(unique)
+            unique.append(key)
+        index.append(positions[normalized])
+    return unique, index
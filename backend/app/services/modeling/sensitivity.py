@@ -11,6 +11,8 @@ This module:
 - Creates Excel formulas that reference DCF sheet cells
 - Builds sensitivity table with color gradient (green=high, yellow=middle, red=low)
 - Makes cell references dynamic to handle row changes in DCF sheet
+- Writes computed grids of any size (write_sensitivity_grid_sheet) from
+  sensitivity_engine results, the same data the API returns
 """
 
 from typing import Dict, Any, Optional
@@ -492,3 +494,154 @@ def write_sensitivity_sheet(
     row += 1
     worksheet.write(row, start_col, "To make cell references dynamic (handle row changes), use INDIRECT() or named ranges in DCF sheet", note_format)
 
+
+
+# Axis labels and header number formats for computed grids (sensitivity_engine)
+GRID_INPUT_LABELS: Dict[str, str] = {
+    "wacc": "WACC",
+    "terminal_growth_rate": "Terminal Growth",
+    "revenue_growth": "Revenue Growth",
+    "operating_margin_target": "Operating Margin",
+    "exit_multiple": "Exit Multiple",
+}
+GRID_INPUT_FORMATS: Dict[str, str] = {
+    "wacc": "0.00%",
+    "terminal_growth_rate": "0.00%",
+    "revenue_growth": "0.00%",
+    "operating_margin_target": "0.00%",
+    "exit_multiple": '0.0"x"',
+}
+GRID_METRIC_FORMATS: Dict[str, str] = {
+    "implied_share_price": "$#,##0.00",
+    "enterprise_value": "$#,##0",
+}
+
+
+def write_sensitivity_grid_sheet(
+    workbook,
+    grid,
+    sheet_name: str = "Sensitivity Grid",
+    ticker: Optional[str] = None,
+    start_row: int = 0,
+    start_col: int = 0,
+):
+    """
+    Write a computed sensitivity grid (any size) to a new worksheet.
+
+    Unlike write_sensitivity_sheet, cells hold values computed by
+    sensitivity_engine.run_sensitivity rather than formulas, so the sheet
+    matches the API response for the same inputs and works for any N x M
+    grid and any pair of inputs. excel_export.export_full_model_to_excel
+    adds it to the populated template.
+
+    Args:
+        workbook: openpyxl Workbook object (an existing sheet_name is replaced)
+        grid: SensitivityGrid from sensitivity_engine.run_sensitivity
+        sheet_name: Worksheet name (default: "Sensitivity Grid")
+        ticker: Optional ticker symbol for header
+        start_row: Starting row for the table (0-indexed, default: 0)
+        start_col: Starting column for the table (0-indexed, default: 0)
+
+    The sheet contains:
+        - Header with ticker (if provided) and the metric shown
+        - N x M table with row/column input values as headers
+        - Color gradient formatting (soft green=high, soft yellow=middle, soft red=low)
+        - Base case (if on both axes) highlighted with a thick border
+        - Invalid combinations (e.g., terminal growth >= WACC) left as "N/A"
+    """
+    from openpyxl.formatting.rule import ColorScaleRule
+    from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+    from openpyxl.utils import get_column_letter
+
+    if sheet_name in workbook.sheetnames:
+        workbook.remove(workbook[sheet_name])
+    worksheet = workbook.create_sheet(sheet_name)
+    n_rows, n_cols = grid.values.shape
+    row_label = GRID_INPUT_LABELS.get(grid.row_input, grid.row_input)
+    column_label = GRID_INPUT_LABELS.get(grid.column_input, grid.column_input)
+    value_num_format = GRID_METRIC_FORMATS.get(grid.metric, "#,##0.00")
+
+    # openpyxl is 1-indexed
+    first_col = start_col + 1
+    worksheet.column_dimensions[get_column_letter(first_col)].width = 24
+    for col in range(first_col + 1, first_col + n_cols + 1):
+        worksheet.column_dimensions[get_column_letter(col)].width = 14
+
+    header_fill = PatternFill("solid", fgColor="D3D3D3")
+    bold = Font(bold=True)
+    thin = Border(*(Side(style="thin"),) * 4)
+    thick = Border(*(Side(style="medium"),) * 4)
+    note_font = Font(italic=True, color="666666")
+
+    def write_header(row, col, value, horizontal="center", num_format=None):
+        cell = worksheet.cell(row=row, column=col, value=value)
+        cell.font = bold
+        cell.fill = header_fill
+        cell.alignment = Alignment(horizontal=horizontal, vertical="center")
+        cell.border = thin
+        if num_format:
+            cell.number_format = num_format
+
+    row = start_row + 1
+    if ticker:
+        write_header(row, first_col, "Ticker")
+        worksheet.cell(row=row, column=first_col + 1, value=ticker)
+        row += 1
+    write_header(row, first_col, "Metric")
+    worksheet.cell(row=row, column=first_col + 1, value=grid.metric.replace("_", " ").title())
+    row += 2  # Skip a row
+
+    # Table header: corner label + column input values
+    write_header(row, first_col, f"{row_label} \\ {column_label}")
+    column_format = GRID_INPUT_FORMATS.get(grid.column_input, "General")
+    for j, column_value in enumerate(grid.column_values.tolist()):
+        write_header(row, first_col + 1 + j, column_value, num_format=column_format)
+    row += 1
+    first_data_row = row
+
+    row_format = GRID_INPUT_FORMATS.get(grid.row_input, "General")
+    for i, row_value in enumerate(grid.row_values.tolist()):
+        write_header(row, first_col, row_value, horizontal="right", num_format=row_format)
+        for j, value in enumerate(grid.values[i].tolist()):
+            cell = worksheet.cell(row=row, column=first_col + 1 + j)
+            if value != value:  # NaN
+                cell.value = "N/A"
+                cell.alignment = Alignment(horizontal="center")
+                cell.font = Font(color="666666")
+                cell.border = thin
+                continue
+            cell.value = value
+            cell.number_format = value_num_format
+            if i == grid.base_row and j == grid.base_column:
+                cell.font = bold
+                cell.border = thick
+            else:
+                cell.border = thin
+        row += 1
+
+    data_range = (
+        f"{get_column_letter(first_col + 1)}{first_data_row}:"
+        f"{get_column_letter(first_col + n_cols)}{first_data_row + n_rows - 1}"
+    )
+    worksheet.conditional_formatting.add(
+        data_range,
+        ColorScaleRule(
+            start_type="min",
+            start_color="F5B7B1",  # Soft red (low)
+            mid_type="percentile",
+            mid_value=50,
+            mid_color="F9E79F",  # Soft yellow (middle)
+            end_type="max",
+            end_color="ABEBC6",  # Soft green (high)
+        ),
+    )
+    worksheet.freeze_panes = f"{get_column_letter(first_col + 1)}{first_data_row}"
+
+    # Add notes
+    row += 1
+    worksheet.cell(row=row, column=first_col, value="Note: Color scale applied (green=high, yellow=middle, red=low)").font = note_font
+    row += 1
+    worksheet.cell(
+        row=row, column=first_col,
+        value=f"Values computed server-side ({n_rows}x{n_cols} grid); N/A = invalid combination",
+    ).font = note_font
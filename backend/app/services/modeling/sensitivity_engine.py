@@ -0,0 +1,308 @@
+"""
+sensitivity_engine.py — Computed DCF Sensitivity Grids (NumPy)
+
+Purpose:
+- Evaluate N x M sensitivity grids of implied share price (or enterprise
+  value) over any two inputs: WACC, terminal growth, revenue growth,
+  operating margin target or exit multiple
+- Feed the API (JSON matrix) and the Excel writer
+  (sensitivity.write_sensitivity_grid_sheet) from the same computed grid
+
+Operating inputs (revenue growth, operating margin target) change the
+projected FCF, so each of their values becomes one projection path of
+three_statement_engine.project_statements (the run_three_statement kernel, so
+the base cell equals run_dcf(run_three_statement(...))); valuation inputs
+(WACC, terminal growth, exit multiple) become assumption pairs of
+run_dcf_batch. The grid is then a single (paths x pairs) batch:
+    valuation x valuation → 1 path,   N*M pairs
+    operating x valuation → N paths,  M pairs
+    operating x operating → N*M paths, 1 pair
+
+sensitivity.write_sensitivity_sheet keeps the formula-driven 5x5 table tied
+to the DCF template; this module is for grids of any size and for the API.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+from app.services.modeling.dcf_engine import run_dcf_batch
+from app.services.modeling.three_statement_engine import DEFAULT_ASSUMPTIONS, project_statements
+from app.services.modeling.types import THREE_STATEMENT_ROLES, SensitivityGrid
+
+OPERATING_INPUTS = ("revenue_growth", "operating_margin_target")
+VALUATION_INPUTS = ("wacc", "terminal_growth_rate", "exit_multiple")
+SENSITIVITY_INPUTS = VALUATION_INPUTS + OPERATING_INPUTS
+
+# Default step between neighbouring grid values per input
+DEFAULT_STEPS: Dict[str, float] = {
+    "wacc": 0.01,
+    "terminal_growth_rate": 0.005,
+    "revenue_growth": 0.01,
+    "operating_margin_target": 0.01,
+    "exit_multiple": 1.0,
+}
+DEFAULT_GRID_SIZE = 5
+MAX_GRID_SIZE = 101  # Per axis
+
+DEFAULT_VALUATION_INPUTS: Dict[str, Any] = {
+    "wacc": 0.10,
+    "terminal_growth_rate": 0.025,
+    "exit_multiple": None,  # None = Gordon Growth terminal value
+    "forecast_periods": 5,
+    "shares_outstanding": None,
+    "debt": 0.0,
+    "cash": 0.0,
+}
+
+
+def axis_values(
+    input_name: str,
+    base_value: float,
+    step: Optional[float] = None,
+    size: int = DEFAULT_GRID_SIZE,
+) -> np.ndarray:
+    """
+    Evenly spaced axis values centered on the base value.
+
+    Args:
+        input_name: One of SENSITIVITY_INPUTS
+        base_value: Center value
+        step: Distance between values (default: DEFAULT_STEPS[input_name])
+        size: Number of values (odd sizes put the base value in the middle)
+
+    Returns:
+        (size,) array of axis values
+    """
+    _check_input(input_name)
+    if not 1 <= size <= MAX_GRID_SIZE:
+        raise ValueError(f"Grid size must be between 1 and {MAX_GRID_SIZE}, got {size}")
+    step = DEFAULT_STEPS[input_name] if step is None else step
+    offsets = np.arange(size, dtype=float) - (size - 1) / 2.0
+    return np.round(base_value + offsets * step, 10)  # Drop float noise (e.g., 0.025 - 0.02)
+
+
+def run_sensitivity(
+    inputs: Dict[str, Any],
+    row_input: str,
+    row_values: Sequence[float],
+    column_input: str,
+    column_values: Sequence[float],
+) -> SensitivityGrid:
+    """
+    Value every (row value, column value) combination in one batched pass.
+
+    Args:
+        inputs: Base case, with keys:
+            - revenue: float (latest historical revenue; required unless
+              free_cash_flow is given and no operating input is varied)
+            - cogs, operating_expense: float (latest historical values, default 0)
+            - free_cash_flow: List[float] (optional projected FCF, e.g. from
+              run_three_statement; used when only valuation inputs are varied)
+            - revenue_growth, operating_margin_target, tax_rate,
+              capex_as_pct_revenue, depreciation_as_pct_revenue (as in run_three_statement)
+            - wacc, terminal_growth_rate, exit_multiple (None = Gordon Growth),
+              forecast_periods, shares_outstanding, debt, cash
+        row_input: Input varied down the rows (one of SENSITIVITY_INPUTS)
+        row_values: Row axis values
+        column_input: Input varied across the columns
+        column_values: Column axis values
+
+    Returns:
+        SensitivityGrid with a (rows x columns) matrix of implied share price
+        (enterprise value if shares_outstanding is not given); NaN where a
+        combination is invalid (e.g., terminal growth >= WACC)
+    """
+    _check_input(row_input)
+    _check_input(column_input)
+    if row_input == column_input:
+        raise ValueError("Row and column inputs must differ")
+    rows = np.asarray(row_values, dtype=float).ravel()
+    columns = np.asarray(column_values, dtype=float).ravel()
+    if not len(rows) or not len(columns):
+        raise ValueError("Both axes need at least one value")
+    if len(rows) > MAX_GRID_SIZE or len(columns) > MAX_GRID_SIZE:
+        raise ValueError(f"Grid axes are limited to {MAX_GRID_SIZE} values")
+
+    base = {**DEFAULT_VALUATION_INPUTS, **DEFAULT_ASSUMPTIONS, **{k: v for k, v in inputs.items() if v is not None}}
+    use_exit_multiple = "exit_multiple" in (row_input, column_input) or base.get("exit_multiple") is not None
+    if use_exit_multiple and "terminal_growth_rate" in (row_input, column_input):
+        raise ValueError("terminal_growth_rate has no effect when the terminal value uses an exit multiple")
+
+    n, m = len(rows), len(columns)
+    row_is_operating = row_input in OPERATING_INPUTS
+    column_is_operating = column_input in OPERATING_INPUTS
+
+    # Projection paths: one per operating-axis value (or combination)
+    if row_is_operating and column_is_operating:
+        path_values = {row_input: np.repeat(rows, m), column_input: np.tile(columns, n)}
+    elif row_is_operating:
+        path_values = {row_input: rows}
+    elif column_is_operating:
+        path_values = {column_input: columns}
+    else:
+        path_values = {}
+
+    # Assumption pairs: one per valuation-axis value (or combination)
+    if not row_is_operating and not column_is_operating:
+        pair_values = {row_input: np.repeat(rows, m), column_input: np.tile(columns, n)}
+    elif not row_is_operating:
+        pair_values = {row_input: rows}
+    elif not column_is_operating:
+        pair_values = {column_input: columns}
+    else:
+        pair_values = {}
+
+    fcf, terminal_ebitda = _project_paths(base, path_values, use_exit_multiple)
+    batch = run_dcf_batch(
+        fcf,
+        wacc=pair_values.get("wacc", base["wacc"]),
+        terminal_growth_rate=pair_values.get("terminal_growth_rate", base["terminal_growth_rate"]),
+        exit_multiple=pair_values.get("exit_multiple", base["exit_multiple"]) if use_exit_multiple else None,
+        terminal_ebitda=terminal_ebitda,
+        shares_outstanding=base["shares_outstanding"],
+        debt=base["debt"],
+        cash=base["cash"],
+    )
+    metric = "implied_share_price" if batch.implied_share_price is not None else "enterprise_value"
+    values = getattr(batch, metric)  # (paths x pairs)
+
+    if row_is_operating and not column_is_operating:
+        matrix = values  # (n paths x m pairs)
+    elif column_is_operating and not row_is_operating:
+        matrix = values.T  # (m paths x n pairs) → (n x m)
+    else:
+        matrix = values.reshape(n, m)  # Flattened row-major combinations
+
+    return SensitivityGrid(
+        row_input=row_input,
+        row_values=rows,
+        column_input=column_input,
+        column_values=columns,
+        metric=metric,
+        values=matrix,
+        base_row=_base_index(rows, base.get(row_input)),
+        base_column=_base_index(columns, base.get(column_input)),
+    )
+
+
+def run_sensitivity_around_base(
+    inputs: Dict[str, Any],
+    row_input: str = "wacc",
+    column_input: str = "terminal_growth_rate",
+    rows: int = DEFAULT_GRID_SIZE,
+    columns: int = DEFAULT_GRID_SIZE,
+    row_step: Optional[float] = None,
+    column_step: Optional[float] = None,
+) -> SensitivityGrid:
+    """
+    run_sensitivity() on axes centered on the base-case values (the classic
+    WACC x terminal growth table by default, at any size).
+    """
+    base = {**DEFAULT_VALUATION_INPUTS, **DEFAULT_ASSUMPTIONS, **{k: v for k, v in inputs.items() if v is not None}}
+    for name in (row_input, column_input):
+        _check_input(name)
+        if base.get(name) is None:
+            raise ValueError(f"A base value for {name} is required to center the grid")
+    return run_sensitivity(
+        inputs,
+        row_input,
+        axis_values(row_input, float(base[row_input]), row_step, rows),
+        column_input,
+        axis_values(column_input, float(base[column_input]), column_step, columns),
+    )
+
+
+def compute_sensitivity(
+    inputs: Dict[str, Any],
+    rows: Dict[str, Any],
+    columns: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Resolve axis specs, run the grid and return it JSON-ready (API / process
+    pool entrypoint).
+
+    Args:
+        inputs: Base case (see run_sensitivity)
+        rows / columns: Axis spec with keys:
+            - input: str (one of SENSITIVITY_INPUTS)
+            - values: List[float] (optional explicit axis values)
+            - step: float (optional; default DEFAULT_STEPS[input])
+            - size: int (optional; default DEFAULT_GRID_SIZE)
+            Without explicit values the axis is centered on the base value.
+
+    Returns:
+        sensitivity_grid_to_dict() of the computed grid
+    """
+    base = {**DEFAULT_VALUATION_INPUTS, **DEFAULT_ASSUMPTIONS, **{k: v for k, v in inputs.items() if v is not None}}
+    axes = []
+    for axis in (rows, columns):
+        name = axis.get("input")
+        _check_input(name)
+        values = axis.get("values")
+        if not values:
+            if base.get(name) is None:
+                raise ValueError(f"Axis values or a base value for {name} are required")
+            values = axis_values(name, float(base[name]), axis.get("step"), axis.get("size") or DEFAULT_GRID_SIZE)
+        axes.append((name, values))
+    grid = run_sensitivity(inputs, axes[0][0], axes[0][1], axes[1][0], axes[1][1])
+    return sensitivity_grid_to_dict(grid)
+
+
+def sensitivity_grid_to_dict(grid: SensitivityGrid) -> Dict[str, Any]:
+    """JSON-ready dict of a SensitivityGrid (NaN → None)."""
+    return {
+        "row_input": grid.row_input,
+        "row_values": grid.row_values.tolist(),
+        "column_input": grid.column_input,
+        "column_values": grid.column_values.tolist(),
+        "metric": grid.metric,
+        "values": [[None if v != v else v for v in row] for row in grid.values.tolist()],
+        "base_row": grid.base_row,
+        "base_column": grid.base_column,
+    }
+
+
+def _project_paths(
+    base: Dict[str, Any],
+    path_values: Dict[str, np.ndarray],
+    use_exit_multiple: bool,
+):
+    """(paths x years) FCF and final-year EBITDA per path (None if not needed)."""
+    fcf = base.get("free_cash_flow")
+    if fcf is not None and not path_values and not use_exit_multiple:
+        return np.asarray(fcf, dtype=float)[None, :], None
+
+    if not base.get("revenue"):
+        raise ValueError("Base revenue is required to project operating inputs")
+    paths = len(next(iter(path_values.values()))) if path_values else 1
+    block = project_statements(
+        revenue=base["revenue"],
+        cogs=base.get("cogs") or 0.0,
+        operating_expense=base.get("operating_expense") or 0.0,
+        periods=int(base["forecast_periods"]),
+        companies=paths,
+        **{name: path_values.get(name, base[name]) for name in DEFAULT_ASSUMPTIONS},
+    )
+    terminal_ebitda = None
+    if use_exit_multiple:
+        terminal_ebitda = (
+            block[:, THREE_STATEMENT_ROLES["operating_income"], -1]
+            + block[:, THREE_STATEMENT_ROLES["depreciation"], -1]
+        )
+    return block[:, THREE_STATEMENT_ROLES["free_cash_flow"]], terminal_ebitda
+
+
+def _base_index(values: np.ndarray, base_value: Any) -> Optional[int]:
+    """Index of the axis value equal to the base case (None if absent)."""
+    if base_value is None:
+        return None
+    matches = np.flatnonzero(np.isclose(values, float(base_value), rtol=0.0, atol=1e-12))
+    return int(matches[0]) if len(matches) else None
+
+
+def _check_input(name: str) -> None:
+    if name not in SENSITIVITY_INPUTS:
+        raise ValueError(f"Sensitivity input must be one of {list(SENSITIVITY_INPUTS)}, got {name}")
@@ -0,0 +1,262 @@
+"""
+three_statement_engine.py — Vectorized 3-Statement Projection Kernel (NumPy)
+
+Purpose:
+- Project the run_three_statement line items for one or many companies in
+  one pass, straight into a compact float64 block of
+  (companies x lines x periods), rows in THREE_STATEMENT_LINES order
+- Back run_three_statement (one company) and run_three_statement_batch
+  (a peer set), whose ThreeStatementOutputs are views into that block
+- Be the one projection kernel: sensitivity grids, Monte Carlo draws,
+  reverse DCF solves and scenarios project with project_statements too, so
+  they value the same FCF stream as /models/generate
+
+Same math as the original per-period loop of run_three_statement:
+    revenue_t   = revenue_0 * prod(1 + growth_1..t)   (cumulative product)
+    COGS_t      = revenue_t * historical COGS margin
+    target_t    = revenue_t * (1 - operating_margin_target) - COGS_t
+    OpEx_t      = revenue_t * historical OpEx margin            if target_t < 0
+                = 0.7 * revenue_t * OpEx margin + 0.3 * target_t  otherwise
+    EBIT_t      = gross profit_t - OpEx_t
+    NI_t        = EBIT_t * (1 - tax_rate)
+    FCF_t       = NI_t + D&A_t - CapEx_t   (D&A, CapEx as % of revenue; no working capital)
+
+Assumptions broadcast: a scalar, one value per company (companies,), or a
+(companies x periods) array for year-by-year assumptions. A "company" is any
+projection path (a peer, a grid cell, a simulated draw). There is no Python
+loop over companies or periods.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from app.services.modeling.types import (
+    THREE_STATEMENT_LINES,
+    THREE_STATEMENT_ROLES,
+    CompanyModelInput,
+    ThreeStatementOutput,
+)
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+DEFAULT_ASSUMPTIONS: Dict[str, float] = {
+    "revenue_growth": 0.05,
+    "operating_margin_target": 0.15,
+    "tax_rate": 0.21,
+    "capex_as_pct_revenue": 0.05,
+    "depreciation_as_pct_revenue": 0.03,
+}
+
+# Weights of the historical OpEx margin and the target margin when blending
+HISTORICAL_OPEX_WEIGHT = 0.7
+TARGET_OPEX_WEIGHT = 0.3
+
+
+def latest_historicals(model_input: CompanyModelInput) -> Tuple[int, Dict[str, float]]:
+    """
+    Latest year and its revenue, COGS and operating expense.
+
+    Returns:
+        (latest year, {"revenue", "cogs", "operating_expense"})
+    """
+    historicals = model_input.historicals.by_role
+    all_years = set()
+    for role_values in historicals.values():
+        all_years.update(role_values.keys())
+    if not all_years:
+        raise ValueError("No historical financial data provided")
+
+    latest_year = max(all_years)
+    return latest_year, {
+        "revenue": historicals.get("IS_REVENUE", {}).get(latest_year, 0.0),
+        "cogs": historicals.get("IS_COGS", {}).get(latest_year, 0.0),
+        "operating_expense": historicals.get("IS_OPERATING_EXPENSE", {}).get(latest_year, 0.0),
+    }
+
+
+def projection_periods(base_year: int, forecast_periods: int, frequency: str = "annual") -> List[str]:
+    """Period end dates following the latest historical year (YYYY-MM-DD)."""
+    if frequency == "annual":
+        return [f"{base_year + i + 1}-12-31" for i in range(forecast_periods)]
+    # Quarterly (simplified: assume Q1, Q2, Q3, Q4)
+    labels = []
+    for i in range(forecast_periods):
+        quarter = (i % 4) + 1
+        year = base_year + (i // 4)
+        labels.append(f"{year}-{quarter*3:02d}-{30 if quarter in [3, 4] else 31}")
+    return labels
+
+
+def project_statements(
+    revenue: ArrayLike,
+    cogs: ArrayLike,
+    operating_expense: ArrayLike,
+    periods: int,
+    revenue_growth: ArrayLike = DEFAULT_ASSUMPTIONS["revenue_growth"],
+    operating_margin_target: ArrayLike = DEFAULT_ASSUMPTIONS["operating_margin_target"],
+    tax_rate: ArrayLike = DEFAULT_ASSUMPTIONS["tax_rate"],
+    capex_as_pct_revenue: ArrayLike = DEFAULT_ASSUMPTIONS["capex_as_pct_revenue"],
+    depreciation_as_pct_revenue: ArrayLike = DEFAULT_ASSUMPTIONS["depreciation_as_pct_revenue"],
+    out: Optional[np.ndarray] = None,
+    companies: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Project every line item of every company into one block.
+
+    Args:
+        revenue, cogs, operating_expense: Latest historical values, scalar or (companies,)
+        periods: Number of projected periods
+        revenue_growth ... depreciation_as_pct_revenue: Assumptions, each a
+            scalar, (companies,) or (companies x periods) array
+        out: Optional (companies x lines x periods) array to write into; its
+            first len(THREE_STATEMENT_LINES) rows are filled (e.g., the
+            linked_statements block)
+        companies: Number of companies (default: inferred from the inputs)
+
+    Returns:
+        (companies x lines x periods) float64 array, rows in THREE_STATEMENT_LINES order
+        (out itself when given; a view of one contiguous lines x periods x
+        companies buffer otherwise)
+    """
+    if periods < 0:
+        raise ValueError("periods must not be negative")
+    assumptions = {
+        "revenue_growth": revenue_growth,
+        "operating_margin_target": operating_margin_target,
+        "tax_rate": tax_rate,
+        "capex_as_pct_revenue": capex_as_pct_revenue,
+        "depreciation_as_pct_revenue": depreciation_as_pct_revenue,
+    }
+    if companies is None:
+        companies = count_paths(revenue, cogs, operating_expense, *assumptions.values())
+    a = {name: broadcast_assumption(values, companies, periods, name) for name, values in assumptions.items()}
+
+    base = company_column(revenue, companies, "revenue")
+    if (base <= 0).any():
+        raise ValueError("Latest period revenue is missing or zero")
+    cogs_margin = company_column(cogs, companies, "cogs") / base
+    opex_margin = company_column(operating_expense, companies, "operating_expense") / base
+
+    if out is None:
+        # Stored lines x periods x companies: every line / period slice is contiguous
+        # across companies, which is where the work is when many are projected
+        out = np.empty((len(THREE_STATEMENT_LINES), periods, companies)).transpose(2, 0, 1)
+    elif out.shape[0] != companies or out.shape[1] < len(THREE_STATEMENT_LINES) or out.shape[2] != periods:
+        raise ValueError(f"out must have shape ({companies}, >= {len(THREE_STATEMENT_LINES)}, {periods}), got {out.shape}")
+    block = out
+    line = {name: block[:, row] for name, row in THREE_STATEMENT_ROLES.items()}  # (companies x periods) views
+
+    # Revenue: running product of [revenue_0, 1 + g_1, 1 + g_2, ...] (same order as the loop)
+    factors = np.empty((periods + 1, companies))
+    factors[:1] = base.T
+    factors[1:] = (1.0 + a["revenue_growth"]).T
+    np.cumprod(factors, axis=0, out=factors)
+    revenue_t = line["revenue"]
+    revenue_t[...] = factors[1:].T
+
+    np.multiply(revenue_t, cogs_margin, out=line["cogs"])
+    np.subtract(revenue_t, line["cogs"], out=line["gross_profit"])
+
+    # OpEx: historical margin if the target margin is out of reach, else a blend
+    target_opex = revenue_t * (1.0 - a["operating_margin_target"]) - line["cogs"]
+    historical_opex = revenue_t * opex_margin
+    line["operating_expense"][...] = np.where(
+        target_opex < 0,
+        historical_opex,
+        historical_opex * HISTORICAL_OPEX_WEIGHT + target_opex * TARGET_OPEX_WEIGHT,
+    )
+
+    np.subtract(line["gross_profit"], line["operating_expense"], out=line["operating_income"])
+    np.multiply(line["operating_income"], 1.0 - a["tax_rate"], out=line["net_income"])
+    np.multiply(revenue_t, a["capex_as_pct_revenue"], out=line["capex"])
+    np.multiply(revenue_t, a["depreciation_as_pct_revenue"], out=line["depreciation"])
+    np.add(line["net_income"], line["depreciation"], out=line["free_cash_flow"])
+    line["free_cash_flow"] -= line["capex"]
+    return block
+
+
+def run_three_statement_batch(
+    model_inputs: Sequence[CompanyModelInput],
+    assumptions: Union[Dict[str, Any], Sequence[Dict[str, Any]]],
+    forecast_periods: int = 5,
+    frequency: str = "annual",
+) -> List[ThreeStatementOutput]:
+    """
+    run_three_statement for many companies in one vectorized pass.
+
+    Args:
+        model_inputs: CompanyModelInput per company
+        assumptions: One assumptions dict for all companies, or one per
+            company (keys as in run_three_statement)
+        forecast_periods: Number of periods to project forward
+        frequency: "annual" or "quarterly"
+
+    Returns:
+        ThreeStatementOutput per company; their values are views into one
+        (companies x lines x periods) block (see project_statements)
+    """
+    if not model_inputs:
+        raise ValueError("At least one company is required")
+    if isinstance(assumptions, dict):
+        assumptions = [assumptions] * len(model_inputs)
+    if len(assumptions) != len(model_inputs):
+        raise ValueError(f"Got {len(model_inputs)} companies but {len(assumptions)} assumption sets")
+
+    latest = [latest_historicals(model_input) for model_input in model_inputs]
+    missing = [m.ticker for m, (_, values) in zip(model_inputs, latest) if values["revenue"] <= 0]
+    if missing:
+        raise ValueError(f"Latest period revenue is missing or zero for {', '.join(missing)}")
+
+    block = project_statements(
+        revenue=np.array([values["revenue"] for _, values in latest]),
+        cogs=np.array([values["cogs"] for _, values in latest]),
+        operating_expense=np.array([values["operating_expense"] for _, values in latest]),
+        periods=forecast_periods,
+        **{
+            name: np.array([a.get(name, default) for a in assumptions], dtype=float)
+            for name, default in DEFAULT_ASSUMPTIONS.items()
+        },
+    )
+    return [
+        ThreeStatementOutput.from_array(projection_periods(year, forecast_periods, frequency), block[i])
+        for i, (year, _) in enumerate(latest)
+    ]
+
+
+def count_paths(*values: ArrayLike) -> int:
+    """Number of companies (paths) implied by the inputs (length of the longest leading axis)."""
+    paths = 1
+    for value in values:
+        shape = np.shape(value)
+        if shape and shape[0] != 1:
+            if paths not in (1, shape[0]):
+                raise ValueError(f"Inputs disagree on the number of paths ({paths} vs {shape[0]})")
+            paths = shape[0]
+    return paths
+
+
+def company_column(values: ArrayLike, companies: int, name: str) -> np.ndarray:
+    """Latest historical values as a (companies or 1, 1) column."""
+    values = np.asarray(values, dtype=float).reshape(-1, 1)
+    if values.shape[0] not in (1, companies):
+        raise ValueError(f"{name} must be a scalar or have one value per company ({companies})")
+    return values
+
+
+def broadcast_assumption(values: ArrayLike, companies: int, periods: int, name: str) -> np.ndarray:
+    """
+    An assumption shaped to broadcast against (companies x periods) without
+    materializing it; 1-D inputs are one value per company.
+    """
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = values[:, None]
+    if values.ndim > 2 or any(n not in (1, size) for n, size in zip(values.shape[::-1], (periods, companies))):
+        raise ValueError(
+            f"{name} must be a scalar, (companies,) or (companies x periods) array for "
+            f"{companies} companies x {periods} periods, got shape {values.shape}"
+        )
+    return values
@@ -12,6 +12,8 @@ from collections import defaultdict
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
+import numpy as np
+
 
 Year = int
 
@@ -268,23 +270,250 @@ class DcfOutput:
 
 
 @dataclass
+class DcfBatchOutput:
+    """
+    Vectorized DCF output for many companies under many assumption pairs.
+
+    Valuation arrays have shape (companies, assumptions), or
+    (companies, waccs, growth rates) for a grid, or (paths,) from
+    run_dcf_paths; pairs with WACC <= 0 or terminal growth >= WACC
+    (Gordon Growth only) are NaN.
+    """
+    wacc: np.ndarray  # Assumption shape
+    terminal_growth_rate: np.ndarray  # Assumption shape
+    discount_factors: np.ndarray  # Assumption shape + (years,)
+    pv_fcf_sum: np.ndarray
+    terminal_value: np.ndarray
+    pv_terminal_value: np.ndarray
+    enterprise_value: np.ndarray
+    equity_value: Optional[np.ndarray]  # None when shares outstanding are not given
+    implied_share_price: Optional[np.ndarray]  # NaN where shares outstanding <= 0
+
+
+@dataclass
+class SensitivityGrid:
+    """
+    Computed N x M sensitivity grid over two inputs.
+
+    values[i, j] is the metric with row_input = row_values[i] and
+    column_input = column_values[j]; NaN where the combination is invalid.
+    """
+    row_input: str
+    row_values: np.ndarray  # (N,)
+    column_input: str
+    column_values: np.ndarray  # (M,)
+    metric: str  # "implied_share_price" or "enterprise_value"
+    values: np.ndarray  # (N x M)
+    base_row: Optional[int] = None  # Index of the base-case row value, if on the axis
+    base_column: Optional[int] = None  # Index of the base-case column value, if on the axis
+
+
+@dataclass
+class MonteCarloOutput:
+    """
+    Distribution of a Monte Carlo valuation (monte_carlo.run_monte_carlo).
+
+    Statistics cover valid paths only (terminal growth < WACC, positive
+    shares). The histogram spans the HISTOGRAM_RANGE percentiles; paths
+    outside it are counted in underflow / overflow.
+    """
+    metric: str  # "implied_share_price" or "enterprise_value"
+    paths: int
+    valid_paths: int
+    seed: Optional[int]
+    mean: float
+    std: float
+    percentiles: Dict[str, float]  # e.g. {"p5": 41.2, "p50": 55.0, ...}
+    histogram_edges: List[float]  # bins + 1 edges
+    histogram_counts: List[int]
+    underflow: int
+    overflow: int
+
+
+@dataclass
+class ReverseDcfOutput:
+    """
+    Implied inputs for target share prices (reverse_dcf.solve_implied).
+
+    Arrays have one entry per company; implied_value is NaN where status is
+    not "solved".
+    """
+    solve_for: str  # "revenue_growth", "operating_margin_target" or "wacc"
+    target_price: np.ndarray
+    implied_value: np.ndarray
+    status: List[str]  # "solved", "no_solution" or "invalid_input"
+    iterations: int  # Solver iterations (0 for the closed-form margin solve)
+
+
+# Line items of a ThreeStatementOutput, in row order of its values array
+THREE_STATEMENT_LINES = (
+    # Income Statement
+    "revenue",
+    "cogs",
+    "gross_profit",
+    "operating_expense",
+    "operating_income",
+    "net_income",
+    # Cash Flow Statement
+    "capex",
+    "depreciation",
+    "free_cash_flow",
+)
+THREE_STATEMENT_ROLES: Dict[str, int] = {name: row for row, name in enumerate(THREE_STATEMENT_LINES)}
+
+
+def _line_item(name: str) -> property:
+    """Row view of one line item (assignment writes into the row)."""
+    row = THREE_STATEMENT_ROLES[name]
+
+    def fget(self: "ThreeStatementOutput") -> np.ndarray:
+        return self.values[row]
+
+    def fset(self: "ThreeStatementOutput", value: Any) -> None:
+        self.values[row] = value
+
+    return property(fget, fset, doc=f"Projected {name} per period (row view)")
+
+
 class ThreeStatementOutput:
-    """3-Statement model output with IS/BS/CF projections."""
-    periods: List[str]  # Period end dates (YYYY-MM-DD)
+    """
+    3-Statement model output with IS/BS/CF projections.
+
+    All line items live in one contiguous float64 array, values
+    (lines x periods, rows in THREE_STATEMENT_LINES order), instead of one
+    Python list of float objects per line. Line attributes (revenue,
+    free_cash_flow, ...) are row views into it, so run_dcf and
+    dcf_engine.fcf_matrix read them without copying.
+
+    Outputs of three_statement_engine.run_three_statement_batch share one
+    block, so their values are (strided) views into it.
+
+    Build from per-line sequences, as before:
+        ThreeStatementOutput(periods=[...], revenue=[...], ..., free_cash_flow=[...])
+    or wrap a kernel result without copying (three_statement_engine):
+        ThreeStatementOutput.from_array(periods, values)
+    """
+    __slots__ = ("periods", "values")
+
+    def __init__(self, periods: List[str], **lines: Any) -> None:
+        missing = [name for name in THREE_STATEMENT_LINES if name not in lines]
+        unknown = [name for name in lines if name not in THREE_STATEMENT_ROLES]
+        if missing or unknown:
+            raise TypeError(f"ThreeStatementOutput got missing lines {missing} / unknown lines {unknown}")
+        self.periods = list(periods)  # Period end dates (YYYY-MM-DD)
+        self.values = np.array([lines[name] for name in THREE_STATEMENT_LINES], dtype=float).reshape(
+            len(THREE_STATEMENT_LINES), len(self.periods)
+        )
+
+    @classmethod
+    def from_array(cls, periods: List[str], values: np.ndarray) -> "ThreeStatementOutput":
+        """Wrap a (lines x periods) float64 array (a view is kept, not copied)."""
+        values = np.asarray(values, dtype=float)
+        if values.shape != (len(THREE_STATEMENT_LINES), len(periods)):
+            raise ValueError(
+                f"Expected values of shape {(len(THREE_STATEMENT_LINES), len(periods))}, got {values.shape}"
+            )
+        output = cls.__new__(cls)
+        output.periods = list(periods)
+        output.values = values
+        return output
+
     # Income Statement
-    revenue: List[float]
-    cogs: List[float]
-    gross_profit: List[float]
-    operating_expense: List[float]
-    operating_income: List[float]
-    net_income: List[float]
+    revenue = _line_item("revenue")
+    cogs = _line_item("cogs")
+    gross_profit = _line_item("gross_profit")
+    operating_expense = _line_item("operating_expense")
+    operating_income = _line_item("operating_income")
+    net_income = _line_item("net_income")
     # Cash Flow Statement
-    capex: List[float]
-    depreciation: List[float]
-    free_cash_flow: List[float]
+    capex = _line_item("capex")
+    depreciation = _line_item("depreciation")
+    free_cash_flow = _line_item("free_cash_flow")
     # Balance Sheet (minimal for MVP)
     # Can be extended later with assets, liabilities, equity
 
+    def to_dict(self) -> Dict[str, List[Any]]:
+        """JSON-ready dict: periods plus one list of floats per line item."""
+        return {"periods": list(self.periods), **dict(zip(THREE_STATEMENT_LINES, self.values.tolist()))}
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ThreeStatementOutput):
+            return NotImplemented
+        return self.periods == other.periods and np.array_equal(self.values, other.values)
+
+    def __repr__(self) -> str:
+        return f"ThreeStatementOutput(periods={self.periods!r}, lines={len(THREE_STATEMENT_LINES)})"
+
+
+# Rows of a LinkedStatementsOutput: the ThreeStatementOutput lines first (so
+# the first rows of a company are a ThreeStatementOutput view), then the
+# financing, cash flow and balance sheet lines of the linked model
+LINKED_STATEMENT_LINES = THREE_STATEMENT_LINES + (
+    # Income Statement (below EBIT)
+    "interest_expense",
+    "interest_income",
+    "pretax_income",
+    "tax_expense",
+    "dividends",
+    # Cash Flow Statement
+    "working_capital_change",
+    "cash_flow_before_financing",
+    "mandatory_repayment",
+    "cash_sweep",
+    "revolver_draw",
+    "net_change_in_cash",
+    # Balance Sheet (end of period)
+    "cash",
+    "accounts_receivable",
+    "inventory",
+    "ppe",
+    "other_assets",
+    "total_assets",
+    "accounts_payable",
+    "debt",
+    "other_liabilities",
+    "equity",
+    "total_liabilities_and_equity",
+)
+LINKED_STATEMENT_ROLES: Dict[str, int] = {name: row for row, name in enumerate(LINKED_STATEMENT_LINES)}
+
+
+@dataclass
+class LinkedStatementsOutput:
+    """
+    Linked 3-statement projections (linked_statements.project_linked_statements).
+
+    values holds every line of every company in one (companies x lines x
+    periods) float64 block, rows in LINKED_STATEMENT_LINES order. net_income
+    is after interest; free_cash_flow is unlevered (NOPAT + D&A - CapEx -
+    change in working capital), so statements(i) can go straight to run_dcf.
+    """
+    periods: List[str]  # Period end dates (YYYY-MM-DD)
+    values: np.ndarray  # (companies x lines x periods)
+    balance_check: np.ndarray  # (companies x periods) total assets - liabilities - equity
+    interest_residual: np.ndarray  # (companies x periods) interest change in the last sweep
+    converged: np.ndarray  # (companies,) interest circularity converged in every period
+    iterations: int  # Most circularity sweeps used in any period
+
+    def line(self, name: str) -> np.ndarray:
+        """(companies x periods) view of one line."""
+        return self.values[:, LINKED_STATEMENT_ROLES[name]]
+
+    def statements(self, company: int = 0) -> ThreeStatementOutput:
+        """ThreeStatementOutput view of one company (no copy)."""
+        return ThreeStatementOutput.from_array(self.periods, self.values[company, :len(THREE_STATEMENT_LINES)])
+
+    def to_dict(self, company: int = 0) -> Dict[str, Any]:
+        """JSON-ready dict of one company: periods, one list per line and diagnostics."""
+        return {
+            "periods": list(self.periods),
+            **dict(zip(LINKED_STATEMENT_LINES, self.values[company].tolist())),
+            "balance_check": self.balance_check[company].tolist(),
+            "interest_residual": self.interest_residual[company].tolist(),
+            "converged": bool(self.converged[company]),
+            "iterations": self.iterations,
+        }
+
 
 @dataclass
 class ComparableCompany:
@@ -0,0 +1,3 @@
+"""
+screener — Local company universe for the industry screener.
+"""
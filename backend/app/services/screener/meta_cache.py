@@ -0,0 +1,171 @@
+"""
+meta_cache.py — Warm, pre-serialized cache for screener reference lists.
+
+The /meta/sectors, /meta/industries and /meta/tickers lists change rarely but
+were fetched from FMP on every request (the ticker list is a large payload).
+This module keeps each list as ready-to-send JSON bytes plus a strong ETag:
+    * Warmed by a background thread at application startup
+    * Refreshed on a schedule (META_CACHE_REFRESH_SECONDS)
+    * A failed refresh keeps serving the previous payload
+    * Requests arriving before the first load fetch once (coalesced)
+
+Configuration via environment variables:
+    META_CACHE_REFRESH_SECONDS - Refresh interval (default: 21600 = 6 hours)
+    META_CACHE_MAX_AGE_SECONDS - Cache-Control max-age sent to clients (default: 300)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict
+
+from app.core.logging import get_logger
+from app.core.single_flight import SingleFlight
+from app.data.fmp_client import (
+    fetch_available_industries,
+    fetch_available_sectors,
+    fetch_available_tickers,
+)
+
+logger = get_logger(__name__)
+
+META_CACHE_REFRESH_SECONDS = int(os.getenv("META_CACHE_REFRESH_SECONDS", str(6 * 3600)))
+META_CACHE_MAX_AGE_SECONDS = int(os.getenv("META_CACHE_MAX_AGE_SECONDS", "300"))
+
+# Cached list name -> loader
+META_LOADERS: Dict[str, Callable[[], Any]] = {
+    "sectors": fetch_available_sectors,
+    "industries": fetch_available_industries,
+    "tickers": fetch_available_tickers,
+}
+
+
+@dataclass(frozen=True)
+class MetaEntry:
+    """A pre-serialized reference list."""
+    body: bytes
+    etag: str
+    loaded_at: float
+    count: int
+
+
+def make_entry(data: Any) -> MetaEntry:
+    """Serialize data once and compute its ETag (content hash)."""
+    body = json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+    return MetaEntry(body=body, etag=etag, loaded_at=time.time(), count=len(data))
+
+
+class MetaCache:
+    """
+    Holds the current MetaEntry per reference list and refreshes them periodically.
+    """
+
+    def __init__(
+        self,
+        loaders: Dict[str, Callable[[], Any]] = META_LOADERS,
+        refresh_seconds: int = META_CACHE_REFRESH_SECONDS,
+    ) -> None:
+        """
+        Args:
+            loaders: Mapping of list name -> zero-argument loader returning JSON-able data
+            refresh_seconds: Background refresh interval (0 or less disables the schedule)
+        """
+        self.loaders = dict(loaders)
+        self.refresh_seconds = refresh_seconds
+        self._entries: Dict[str, MetaEntry] = {}
+        self._flight = SingleFlight("meta-cache", copy_results=False)  # MetaEntry is frozen
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._thread_lock = threading.Lock()
+
+    def _load(self, name: str) -> MetaEntry:
+        start = time.perf_counter()
+        entry = make_entry(self.loaders[name]())
+        previous = self._entries.get(name)
+        self._entries[name] = entry
+        changed = previous is None or previous.etag != entry.etag
+        logger.info(
+            f"Loaded meta list '{name}': {entry.count} items, {len(entry.body) / 1024:.0f} KB "
+            f"in {time.perf_counter() - start:.2f}s ({'changed' if changed else 'unchanged'})"
+        )
+        return entry
+
+    def peek(self, name: str) -> MetaEntry | None:
+        """Return the cached entry without loading (None while the cache is cold)."""
+        return self._entries.get(name)
+
+    def get(self, name: str) -> MetaEntry:
+        """
+        Return the cached entry, loading it now if the cache is still cold.
+
+        Args:
+            name: One of the loader names ("sectors", "industries", "tickers")
+
+        Raises:
+            KeyError: If name is unknown
+            RuntimeError: If the cache is cold and the FMP call fails
+        """
+        if name not in self.loaders:
+            raise KeyError(f"Unknown meta list '{name}'")
+        entry = self._entries.get(name)
+        if entry is not None:
+            return entry
+        return self._flight.do(name, lambda: self._entries.get(name) or self._load(name))
+
+    def refresh(self, name: str | None = None) -> None:
+        """Reload one list (or all); failures keep the previous entry."""
+        for list_name in ([name] if name else list(self.loaders)):
+            try:
+                self._flight.do(list_name, lambda: self._load(list_name))
+            except Exception as e:  # pylint: disable=broad-except
+                logger.warning(f"Meta list '{list_name}' refresh failed, keeping previous payload: {e}")
+
+    def start(self) -> None:
+        """Warm every list and keep refreshing on a daemon thread (idempotent)."""
+        with self._thread_lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+
+            def _run() -> None:
+                self.refresh()
+                if self.refresh_seconds <= 0:
+                    return
+                while not self._stop.wait(self.refresh_seconds):
+                    self.refresh()
+
+            self._thread = threading.Thread(target=_run, name="meta-cache-refresh", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background refresher."""
+        with self._thread_lock:
+            self._stop.set()
+            self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            name: {"count": entry.count, "bytes": len(entry.body), "etag": entry.etag, "loaded_at": entry.loaded_at}
+            for name, entry in self._entries.items()
+        }
+
+
+# Process-wide cache (created lazily on first use)
+_meta_cache: MetaCache | None = None
+_meta_cache_lock = threading.Lock()
+
+
+def get_meta_cache() -> MetaCache:
+    """Return the process-wide MetaCache."""
+    global _meta_cache
+    if _meta_cache is None:
+        with _meta_cache_lock:
+            if _meta_cache is None:
+                _meta_cache = MetaCache()
+    return _meta_cache
@@ -0,0 +1,556 @@
+"""
+screener_universe.py — In-memory columnar company universe for the screener.
+
+Instead of one FMP company-screener call per /industry-screener page, the full
+screener universe is pulled in a few large pages, normalized once, and held as
+NumPy columns. Sector/industry/market-cap filters, sorting and pagination are
+then answered locally.
+
+The universe is rebuilt on a background thread every
+SCREENER_UNIVERSE_REFRESH_SECONDS; readers always see a complete, immutable
+snapshot. Pages can be requested by offset (page/pageSize) or with keyset
+cursors, which stay stable across refreshes because they encode the last row's
+sort key rather than a position.
+
+Configuration via environment variables:
+    SCREENER_UNIVERSE_ENABLED          - "0"/"false" disables the local universe
+    SCREENER_UNIVERSE_REFRESH_SECONDS  - Rebuild interval (default: 3600)
+    SCREENER_UNIVERSE_PAGE_SIZE        - Rows per bulk screener pull (default: 5000)
+    SCREENER_UNIVERSE_MAX_PAGES        - Maximum bulk pulls per build (default: 20)
+    SCREENER_UNIVERSE_RETRY_SECONDS    - Wait after a failed first build before trying again (default: 60)
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import os
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.core.logging import get_logger
+from app.data.fmp_client import fetch_company_screener
+
+logger = get_logger(__name__)
+
+SCREENER_UNIVERSE_REFRESH_SECONDS = int(os.getenv("SCREENER_UNIVERSE_REFRESH_SECONDS", "3600"))
+SCREENER_UNIVERSE_PAGE_SIZE = int(os.getenv("SCREENER_UNIVERSE_PAGE_SIZE", "5000"))
+SCREENER_UNIVERSE_MAX_PAGES = int(os.getenv("SCREENER_UNIVERSE_MAX_PAGES", "20"))
+SCREENER_UNIVERSE_RETRY_SECONDS = int(os.getenv("SCREENER_UNIVERSE_RETRY_SECONDS", "60"))
+
+# Output fields, in CompanyResult order
+RESULT_FIELDS = [
+    "symbol",
+    "name",
+    "sector",
+    "industry",
+    "marketCap",
+    "website",
+    "logoUrl",
+    "description",
+    "ceo",
+    "employees",
+]
+
+# Sort keys accepted by ScreenerUniverse.query()
+SORT_FIELDS = ("marketCap", "symbol", "name")
+DEFAULT_SORT = "marketCap"
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a screener page cursor cannot be decoded or does not match the query."""
+    pass
+
+
+# Output field -> (FMP field aliases in priority order, default for missing/falsy values)
+FIELD_ALIASES: Dict[str, Tuple[Tuple[str, ...], Any]] = {
+    "symbol": (("symbol", "Symbol"), ""),
+    "name": (("companyName", "name", "company_name"), ""),
+    "sector": (("sector", "Sector"), ""),
+    "industry": (("industry", "Industry"), ""),
+    "marketCap": (("marketCap", "market_cap", "MarketCap"), 0),
+    "website": (("website", "Website"), None),
+    "logoUrl": (("image", "logo", "logoUrl", "Image"), None),
+    "description": (("description", "Description", "about"), None),
+    "ceo": (("ceo", "CEO", "ceoName"), None),
+    "employees": (("fullTimeEmployees", "employees", "Employees", "full_time_employees"), None),
+}
+
+# Integer columns and the value used when coercion fails
+_INT_FIELDS: Dict[str, Optional[int]] = {
+    "marketCap": 0,
+    "employees": None,
+}
+
+
+@lru_cache(maxsize=64)
+def _alias_plan(schema: frozenset) -> Tuple[Tuple[str, Tuple[str, ...], Any], ...]:
+    """Aliases actually present in a payload schema, per output field (cached per schema)."""
+    return tuple(
+        (field, tuple(alias for alias in aliases if alias in schema), default)
+        for field, (aliases, default) in FIELD_ALIASES.items()
+    )
+
+
+def _coerce_int_column(values: List[Any], fallback: Optional[int]) -> List[Optional[int]]:
+    """
+    Coerce a column of ints / floats / numeric strings to Python ints in one pass.
+
+    Floats and numeric strings are truncated like int(float(x)); values that
+    cannot be parsed become fallback. Columns that are already all ints (the
+    normal FMP case) are returned unchanged.
+    """
+    if all(type(v) is int for v in values):
+        return values
+
+    try:
+        # Parses ints, floats and numeric strings in C; None becomes NaN
+        numeric = np.array(values, dtype=np.float64)
+    except (ValueError, TypeError):
+        # Some unparseable value: let pandas coerce it to NaN element-wise
+        numeric = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(dtype=np.float64)
+    valid = np.isfinite(numeric)
+    truncated = np.trunc(np.where(valid, numeric, 0.0))
+
+    result: List[Optional[int]] = []
+    for value, ok, whole in zip(values, valid.tolist(), truncated.tolist()):
+        if type(value) is int:
+            result.append(value)  # Keep exact ints (no float round-trip)
+        elif ok:
+            result.append(int(whole))
+        else:
+            result.append(fallback)
+    return result
+
+
+def normalize_screener_payload(companies: List[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """
+    Normalize a whole FMP screener payload into CompanyResult columns.
+
+    Field aliases are resolved once per payload schema (the set of keys seen),
+    not once per row, and numeric columns are coerced column-wise. For each
+    field the first alias with a truthy value wins, as with a per-row
+    `company.get(a) or company.get(b) or ...` chain.
+
+    Args:
+        companies: Raw company dicts from fetch_company_screener()
+
+    Returns:
+        Dictionary mapping each RESULT_FIELDS name to a list of values (one per company)
+    """
+    schema = frozenset().union(*companies) if companies else frozenset()
+    row_count = len(companies)
+
+    columns: Dict[str, List[Any]] = {}
+    for field, aliases, default in _alias_plan(schema):
+        if not aliases:
+            column = [default] * row_count
+        else:
+            first = aliases[0]
+            column = [company.get(first) or default for company in companies]
+            # Rarely more than one alias is present; fill remaining gaps in order
+            for alias in aliases[1:]:
+                column = [
+                    value if value else (company.get(alias) or default)
+                    for value, company in zip(column, companies)
+                ]
+        if field in _INT_FIELDS:
+            column = _coerce_int_column(column, _INT_FIELDS[field])
+        columns[field] = column
+    return columns
+
+
+def columns_to_rows(columns: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """Turn normalized columns into row dicts (RESULT_FIELDS keys, CompanyResult order)."""
+    return [dict(zip(RESULT_FIELDS, values)) for values in zip(*(columns[f] for f in RESULT_FIELDS))]
+
+
+def encode_cursor(sort: str, descending: bool, filters_key: str, last_row: Dict[str, Any]) -> str:
+    """Encode a keyset cursor pointing just after last_row."""
+    payload = {
+        "s": sort,
+        "d": descending,
+        "f": filters_key,
+        "k": last_row[sort],
+        "sym": last_row["symbol"],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a cursor produced by encode_cursor()."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(payload, dict) or not {"s", "d", "f", "k", "sym"} <= payload.keys():
+            raise ValueError("missing cursor fields")
+        return payload
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid screener cursor: {e}")
+
+
+class ScreenerUniverse:
+    """
+    Immutable columnar snapshot of the screener universe.
+
+    Columns are NumPy arrays aligned by row. Sector and industry are stored as
+    integer codes into sorted category tables so filters are array compares.
+    """
+
+    def __init__(self, columns: Dict[str, List[Any]], built_at: float | None = None) -> None:
+        """
+        Args:
+            columns: Normalized columns (see normalize_screener_payload); duplicate
+                     symbols keep the first occurrence, rows without a symbol are dropped
+            built_at: Build timestamp (default: now)
+        """
+        first_seen: Dict[str, int] = {}
+        for i, symbol in enumerate(columns["symbol"]):
+            if symbol and symbol not in first_seen:
+                first_seen[symbol] = i
+        keep = np.fromiter(first_seen.values(), dtype=np.int64, count=len(first_seen))
+
+        self.built_at = built_at or time.time()
+        self.size = len(keep)
+
+        self.columns: Dict[str, np.ndarray] = {}
+        for field in RESULT_FIELDS:
+            column = np.empty(len(columns[field]), dtype=object)
+            column[:] = columns[field]
+            self.columns[field] = column[keep]
+        self.market_cap = self.columns["marketCap"].astype(np.int64)
+        self.columns["marketCap"] = self.market_cap
+
+        self._symbol_sort_key = np.array([s.upper() for s in self.columns["symbol"]], dtype=object)
+        self._name_sort_key = np.array([(n or "").lower() for n in self.columns["name"]], dtype=object)
+
+        # Case-insensitive category codes for sector / industry filters
+        self.sectors, self._sector_codes = np.unique(
+            np.array([(s or "").lower() for s in self.columns["sector"]], dtype=object),
+            return_inverse=True,
+        ) if self.size else (np.array([], dtype=object), np.array([], dtype=np.int64))
+        self.industries, self._industry_codes = np.unique(
+            np.array([(s or "").lower() for s in self.columns["industry"]], dtype=object),
+            return_inverse=True,
+        ) if self.size else (np.array([], dtype=object), np.array([], dtype=np.int64))
+
+        self._orders: Dict[Tuple[str, bool], np.ndarray] = {}
+        self._orders_lock = threading.Lock()
+
+    def _sort_values(self, sort: str) -> np.ndarray:
+        if sort == "marketCap":
+            return self.market_cap
+        if sort == "name":
+            return self._name_sort_key
+        return self._symbol_sort_key
+
+    def _order(self, sort: str, descending: bool) -> np.ndarray:
+        """Row order for a sort key (ties broken by symbol ascending), cached per snapshot."""
+        key = (sort, descending)
+        order = self._orders.get(key)
+        if order is None:
+            values = self._sort_values(sort)
+            if sort == "marketCap" and descending:
+                order = np.lexsort((self._symbol_sort_key, -values))
+            elif descending:
+                # lexsort cannot negate strings: rank them, then negate the rank
+                ranks = np.unique(values, return_inverse=True)[1]
+                order = np.lexsort((self._symbol_sort_key, -ranks))
+            else:
+                order = np.lexsort((self._symbol_sort_key, values))
+            with self._orders_lock:
+                self._orders[key] = order
+        return order
+
+    def _code_for(self, categories: np.ndarray, value: str) -> int:
+        """Return the category code for value, or -1 if it does not occur."""
+        needle = value.strip().lower()
+        position = int(np.searchsorted(categories, needle))
+        if position < len(categories) and categories[position] == needle:
+            return position
+        return -1
+
+    def _mask(
+        self,
+        sector: str | None,
+        industry: str | None,
+        market_cap_min: int | None,
+        market_cap_max: int | None,
+    ) -> np.ndarray:
+        mask = np.ones(self.size, dtype=bool)
+        if sector:
+            mask &= self._sector_codes == self._code_for(self.sectors, sector)
+        if industry:
+            mask &= self._industry_codes == self._code_for(self.industries, industry)
+        if market_cap_min is not None:
+            mask &= self.market_cap >= market_cap_min
+        if market_cap_max is not None:
+            mask &= self.market_cap <= market_cap_max
+        return mask
+
+    def _after_cursor(self, sort: str, descending: bool, cursor: Dict[str, Any]) -> np.ndarray:
+        """Mask of rows strictly after the cursor position in (sort key, symbol) order."""
+        values = self._sort_values(sort)
+        key = cursor["k"]
+        if sort == "symbol":
+            key = str(key).upper()
+        elif sort == "name":
+            key = str(key or "").lower()
+        symbol = str(cursor["sym"]).upper()
+
+        beyond = values < key if descending else values > key
+        tie = (values == key) & (self._symbol_sort_key > symbol)
+        return np.asarray(beyond | tie, dtype=bool)
+
+    def query(
+        self,
+        sector: str | None = None,
+        industry: str | None = None,
+        market_cap_min: int | None = None,
+        market_cap_max: int | None = None,
+        sort: str = DEFAULT_SORT,
+        descending: bool = True,
+        page: int = 0,
+        page_size: int = 50,
+        cursor: str | None = None,
+    ) -> Dict[str, Any]:
+        """
+        Filter, sort and paginate the universe.
+
+        Args:
+            sector: Optional sector filter (case-insensitive exact match)
+            industry: Optional industry filter (case-insensitive exact match)
+            market_cap_min: Optional minimum market cap (inclusive)
+            market_cap_max: Optional maximum market cap (inclusive)
+            sort: One of SORT_FIELDS (default: marketCap)
+            descending: Sort direction (default: descending)
+            page: Page number for offset pagination (ignored when cursor is given)
+            page_size: Rows per page
+            cursor: Opaque cursor from a previous result's next_cursor
+
+        Returns:
+            Dictionary with:
+            - results: List of row dicts (RESULT_FIELDS keys)
+            - total: Number of rows matching the filters
+            - next_cursor: Cursor for the following page, or None on the last page
+
+        Raises:
+            ValueError: If sort is unknown
+            InvalidCursorError: If the cursor is malformed or from a different query
+        """
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"Invalid sort '{sort}'. Must be one of: {', '.join(SORT_FIELDS)}")
+
+        filters_key = json.dumps(
+            [
+                (sector or "").strip().lower(),
+                (industry or "").strip().lower(),
+                market_cap_min,
+                market_cap_max,
+            ],
+            separators=(",", ":"),
+        )
+
+        mask = self._mask(sector, industry, market_cap_min, market_cap_max)
+        total = int(mask.sum())
+
+        if cursor:
+            position = decode_cursor(cursor)
+            if position["s"] != sort or bool(position["d"]) != descending or position["f"] != filters_key:
+                raise InvalidCursorError("Cursor does not match the requested filters or sort order")
+            mask &= self._after_cursor(sort, descending, position)
+            start = 0
+        else:
+            start = page * page_size
+
+        order = self._order(sort, descending)
+        matching = order[mask[order]]
+        page_idx = matching[start:start + page_size]
+
+        results = self.rows(page_idx)
+
+        next_cursor = None
+        if len(matching) > start + page_size and results:
+            next_cursor = encode_cursor(sort, descending, filters_key, results[-1])
+
+        return {
+            "results": results,
+            "total": total,
+            "next_cursor": next_cursor,
+        }
+
+    def rows(self, idx: np.ndarray) -> List[Dict[str, Any]]:
+        """Materialize row dicts for the given row indices (column-wise gather)."""
+        return columns_to_rows({field: self.columns[field][idx].tolist() for field in RESULT_FIELDS})
+
+
+def build_screener_universe(
+    page_size: int = SCREENER_UNIVERSE_PAGE_SIZE,
+    max_pages: int = SCREENER_UNIVERSE_MAX_PAGES,
+) -> ScreenerUniverse:
+    """
+    Pull the full screener universe from FMP in bulk pages and build a snapshot.
+
+    Args:
+        page_size: Rows requested per company-screener call
+        max_pages: Safety cap on the number of calls
+
+    Returns:
+        New ScreenerUniverse
+
+    Raises:
+        RuntimeError: If the first FMP call fails
+    """
+    start = time.perf_counter()
+    raw_rows: List[Dict[str, Any]] = []
+    for page in range(max_pages):
+        try:
+            batch = fetch_company_screener(limit=page_size, page=page)
+        except RuntimeError:
+            if page == 0:
+                raise
+            logger.warning(f"Screener universe pull stopped at page {page}; using {len(raw_rows)} rows")
+            break
+        raw_rows.extend(batch)
+        if len(batch) < page_size:
+            break
+    else:
+        logger.warning(f"Screener universe pull hit max_pages={max_pages}; universe may be truncated")
+
+    universe = ScreenerUniverse(normalize_screener_payload(raw_rows))
+    logger.info(
+        f"Built screener universe: {universe.size} companies, {len(universe.sectors)} sectors, "
+        f"{len(universe.industries)} industries in {time.perf_counter() - start:.2f}s"
+    )
+    return universe
+
+
+class ScreenerUniverseManager:
+    """
+    Holds the current universe snapshot and rebuilds it periodically.
+
+    The first call to get() builds synchronously; afterwards a daemon thread
+    swaps in a fresh snapshot every refresh_seconds. A failed rebuild keeps
+    serving the previous snapshot. If the first build fails, get() fails fast
+    for retry_seconds instead of re-running the bulk pull on every call.
+    """
+
+    def __init__(
+        self,
+        refresh_seconds: int = SCREENER_UNIVERSE_REFRESH_SECONDS,
+        retry_seconds: int = SCREENER_UNIVERSE_RETRY_SECONDS,
+    ) -> None:
+        self.refresh_seconds = refresh_seconds
+        self.retry_seconds = retry_seconds
+        self._universe: ScreenerUniverse | None = None
+        self._failed_at: float | None = None  # time.monotonic() of the last failed first build
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.builds = 0
+        self.failed_builds = 0
+
+    def peek(self) -> ScreenerUniverse | None:
+        """Return the current snapshot without building (None before the first build)."""
+        return self._universe
+
+    def get(self) -> ScreenerUniverse:
+        """
+        Return the current snapshot, building it on first use.
+
+        Raises:
+            RuntimeError: If no snapshot exists and the initial build fails, or
+                          failed less than retry_seconds ago
+        """
+        universe = self._universe
+        if universe is not None:
+            return universe
+
+        self._check_backoff()
+        with self._lock:
+            if self._universe is None:
+                # Callers that queued behind a failed build fail fast too
+                self._check_backoff()
+                try:
+                    self._universe = build_screener_universe()
+                except Exception:
+                    self._failed_at = time.monotonic()
+                    self.failed_builds += 1
+                    raise
+                self._failed_at = None
+                self.builds += 1
+                self._start_refresher()
+            return self._universe
+
+    def _check_backoff(self) -> None:
+        failed_at = self._failed_at
+        if failed_at is not None:
+            wait = self.retry_seconds - (time.monotonic() - failed_at)
+            if wait > 0:
+                raise RuntimeError(f"Screener universe build failed recently; retrying in {wait:.0f}s")
+
+    def refresh(self) -> ScreenerUniverse | None:
+        """Rebuild now; on failure keep the old snapshot and return None."""
+        try:
+            universe = build_screener_universe()
+        except Exception as e:  # pylint: disable=broad-except
+            self.failed_builds += 1
+            logger.warning(f"Screener universe refresh failed, keeping previous snapshot: {e}")
+            return None
+        self._universe = universe
+        self.builds += 1
+        return universe
+
+    def _start_refresher(self) -> None:
+        if self._thread is not None or self.refresh_seconds <= 0:
+            return
+
+        def _run() -> None:
+            while not self._stop.wait(self.refresh_seconds):
+                self.refresh()
+
+        self._thread = threading.Thread(target=_run, name="screener-universe-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background refresher."""
+        self._stop.set()
+
+    def stats(self) -> Dict[str, Any]:
+        universe = self._universe
+        return {
+            "size": universe.size if universe else 0,
+            "built_at": universe.built_at if universe else None,
+            "builds": self.builds,
+            "failed_builds": self.failed_builds,
+        }
+
+
+def _universe_enabled() -> bool:
+    return os.getenv("SCREENER_UNIVERSE_ENABLED", "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+# Process-wide manager (created lazily on first use)
+_manager: ScreenerUniverseManager | None = None
+_manager_lock = threading.Lock()
+
+
+def get_screener_universe_manager() -> ScreenerUniverseManager | None:
+    """
+    Return the process-wide universe manager, or None if disabled
+    (SCREENER_UNIVERSE_ENABLED).
+    """
+    global _manager
+    if not _universe_enabled():
+        return None
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = ScreenerUniverseManager()
+    return _manager
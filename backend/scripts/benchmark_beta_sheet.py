@@ -0,0 +1,224 @@
+"""
+benchmark_beta_sheet.py — Compare iterrows vs array-based Beta Data sheet writes.
+
+Builds synthetic 1-, 3- and 5-year daily beta payloads (same shape as
+build_beta_export_payload) and times writing the "Beta Data" sheet three ways:
+    1. Legacy: table.iterrows() with write_datetime/write per cell and
+       multi-row array formulas for the returns (old write_beta_sheet)
+    2. Array-based write_beta_sheet() into a regular workbook (array formulas)
+    3. Array-based write_beta_sheet() via build_beta_workbook()
+       (xlsxwriter constant_memory mode, per-row return formulas)
+
+Each timing includes closing the workbook (the full export cost). Peak
+Python memory is measured with tracemalloc. The array-based sheet is read
+back with openpyxl and checked against the payload before timing.
+
+No network access is required.
+
+Example (PowerShell):
+    python scripts/benchmark_beta_sheet.py `
+        --years 1 3 5 `
+        --iterations 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import tracemalloc
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import xlsxwriter
+
+# Add backend directory to Python path (same approach as test.py)
+backend_dir = Path(__file__).parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from app.services.modeling.beta import (
+    BENCHMARK_OPTIONS,
+    YEAR_OPTIONS,
+    build_beta_workbook,
+    write_beta_sheet,
+)
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+def make_payload(years: int, seed: int = 7) -> dict:
+    """Build a beta payload with `years` of synthetic daily adjusted closes."""
+    rng = np.random.default_rng(seed)
+    rows = years * TRADING_DAYS_PER_YEAR
+    market = rng.normal(0.0004, 0.01, rows)
+    stock = 1.2 * market + rng.normal(0.0, 0.012, rows)
+    table = pd.DataFrame({
+        "date": pd.bdate_range(end="2025-12-31", periods=rows),
+        "ticker_adj_close": 50 * np.cumprod(1 + stock),
+        "benchmark_adj_close": 4000 * np.cumprod(1 + market),
+    })
+    return {
+        "ticker": "SYN",
+        "benchmark": "^GSPC",
+        "lookback_days": YEAR_OPTIONS.get(years, years * 365),
+        "price_table": table,
+    }
+
+
+def legacy_write_beta_sheet(workbook, beta_payload):
+    """The pre-array write_beta_sheet (iterrows + array formulas)."""
+    worksheet = workbook.add_worksheet("Beta Data")
+    worksheet.set_column('A:A', 14)
+    header_format = workbook.add_format({'bold': True})
+    number_format = workbook.add_format({'num_format': '0.00'})
+    date_format = workbook.add_format({'num_format': 'yyyy-mm-dd'})
+
+    worksheet.write(0, 0, "Ticker", header_format)
+    worksheet.write(0, 1, beta_payload["ticker"])
+    worksheet.write(1, 0, "Benchmark", header_format)
+    worksheet.write(1, 1, BENCHMARK_OPTIONS.get(beta_payload["benchmark"], beta_payload["benchmark"]))
+    worksheet.write(2, 0, "Lookback (years)", header_format)
+    worksheet.write(2, 1, beta_payload["lookback_days"] / 365)
+    worksheet.write(3, 0, "Beta", header_format)
+    worksheet.write(4, 0, "Date", header_format)
+    worksheet.write(4, 1, "Ticker Adj Close", header_format)
+    worksheet.write(4, 2, "Benchmark Adj Close", header_format)
+    worksheet.write(4, 4, "Ticker Returns", header_format)
+    worksheet.write(4, 5, "Benchmark Returns", header_format)
+
+    table = beta_payload["price_table"]
+    start_row = 5
+    for idx, row in table.iterrows():
+        excel_row = start_row + idx
+        date_val = row["date"]
+        if hasattr(date_val, 'to_pydatetime'):
+            date_val = date_val.to_pydatetime()
+        worksheet.write_datetime(excel_row, 0, date_val, date_format)
+        worksheet.write(excel_row, 1, row["ticker_adj_close"], number_format)
+        worksheet.write(excel_row, 2, row["benchmark_adj_close"], number_format)
+
+    last_row = start_row + len(table) - 1
+    last_row_excel = last_row + 1
+    first_return_row = 6
+    if last_row >= first_return_row:
+        worksheet.write_array_formula(
+            first_return_row, 4, last_row, 4,
+            f"=((B{first_return_row + 1}:B{last_row + 1}/B{first_return_row}:B{last_row})-1)*100",
+            number_format,
+        )
+        worksheet.write_array_formula(
+            first_return_row, 5, last_row, 5,
+            f"=((C{first_return_row + 1}:C{last_row + 1}/C{first_return_row}:C{last_row})-1)*100",
+            number_format,
+        )
+    worksheet.write(3, 1, f"=SLOPE(E{first_return_row + 1}:E{last_row_excel},F{first_return_row + 1}:F{last_row_excel})", number_format)
+    worksheet.freeze_panes(5, 0)
+
+
+def legacy_workbook(beta_payload: dict) -> bytes:
+    output = BytesIO()
+    workbook = xlsxwriter.Workbook(output)
+    legacy_write_beta_sheet(workbook, beta_payload)
+    workbook.close()
+    return output.getvalue()
+
+
+def array_workbook(beta_payload: dict) -> bytes:
+    output = BytesIO()
+    workbook = xlsxwriter.Workbook(output)
+    write_beta_sheet(workbook, beta_payload)
+    workbook.close()
+    return output.getvalue()
+
+
+def check_sheet(content: bytes, beta_payload: dict) -> bool:
+    """Read the sheet back with openpyxl and compare it to the payload."""
+    from openpyxl import load_workbook
+
+    worksheet = load_workbook(BytesIO(content))["Beta Data"]
+    table = beta_payload["price_table"]
+    rows = list(worksheet.iter_rows(min_row=6, max_col=6, values_only=True))
+    if len(rows) != len(table):
+        return False
+    dates = [row[0].date() for row in rows]
+    if dates != [d.date() for d in table["date"]]:
+        return False
+    if not np.allclose([row[1] for row in rows], table["ticker_adj_close"]):
+        return False
+    if not np.allclose([row[2] for row in rows], table["benchmark_adj_close"]):
+        return False
+    return rows[0][4] is None and rows[1][4] is not None and rows[-1][5] is not None
+
+
+def time_it(func, iterations: int) -> float:
+    """Return mean seconds per call (best of 3 runs to reduce noise)."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        best = min(best, (time.perf_counter() - start) / iterations)
+    return best
+
+
+def peak_memory(func) -> float:
+    """Return peak traced Python memory (MB) of one call."""
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark array-based Beta Data sheet writes against the iterrows loop"
+    )
+    parser.add_argument(
+        "--years",
+        type=int,
+        nargs="+",
+        default=list(YEAR_OPTIONS),
+        help="Payload lookbacks in years (default: 1 3 5)",
+    )
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=5,
+        help="Timed iterations per implementation (default: 5)",
+    )
+
+    args = parser.parse_args()
+
+    implementations = [
+        ("legacy iterrows", legacy_workbook),
+        ("array-based", array_workbook),
+        ("array + constant_memory", build_beta_workbook),
+    ]
+
+    for years in args.years:
+        payload = make_payload(years)
+        for label, build in implementations[1:]:
+            if not check_sheet(build(payload), payload):
+                print(f"ERROR: {label} sheet does not match the payload")
+                sys.exit(1)
+
+        print(f"{years}y payload: {len(payload['price_table'])} rows ({args.iterations} iterations, output checked)")
+        legacy_seconds = None
+        for label, build in implementations:
+            seconds = time_it(lambda: build(payload), args.iterations)
+            memory = peak_memory(lambda: build(payload))
+            line = f"    {label:<24} {seconds * 1000:8.1f} ms/sheet  peak {memory:6.1f} MB"
+            if legacy_seconds is None:
+                legacy_seconds = seconds
+            elif seconds > 0:
+                line += f"  ({legacy_seconds / seconds:.1f}x)"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
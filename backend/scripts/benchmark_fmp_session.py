@@ -0,0 +1,159 @@
+"""
+benchmark_fmp_session.py — Compare per-call requests.get vs the pooled FmpHttpClient.
+
+Spins up a local stand-in HTTP server that mimics an FMP /stable endpoint and
+simulates connection setup cost (TCP + TLS handshake) with a configurable
+delay per new connection. The same number of calls is then issued:
+    1. One-off requests.get() per call (old _get_json behaviour)
+    2. Through the shared keep-alive FmpHttpClient
+
+No FMP API key or network access is required.
+
+Example (PowerShell):
+    python scripts/benchmark_fmp_session.py `
+        --calls 200 `
+        --handshake-ms 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+# Add backend directory to Python path (same approach as test.py)
+backend_dir = Path(__file__).parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from app.data.fmp_client import FmpHttpClient
+from app.data.rate_limiter import TokenBucketRateLimiter
+
+# Small income-statement-like payload returned by the stand-in server
+PAYLOAD = json.dumps([{"symbol": "BENCH", "date": "2024-12-31", "revenue": 1.0}]).encode("utf-8")
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """Keep-alive capable handler that returns a fixed JSON payload."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # Avoid delayed-ACK stalls on reused connections
+
+    def setup(self):
+        # Called once per new TCP connection: count it and simulate handshake cost
+        super().setup()
+        with self.server.stats_lock:
+            self.server.connections += 1
+        time.sleep(self.server.handshake_seconds)
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output clean
+
+
+def start_stand_in_server(handshake_ms: float) -> ThreadingHTTPServer:
+    """Start the stand-in server on a free local port in a background thread."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+    server.daemon_threads = True
+    server.handshake_seconds = handshake_ms / 1000.0
+    server.connections = 0
+    server.stats_lock = threading.Lock()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_unpooled(base_url: str, calls: int) -> float:
+    """Issue calls with a fresh requests.get() each time; return elapsed seconds."""
+    start = time.perf_counter()
+    for _ in range(calls):
+        response = requests.get(
+            f"{base_url}/income-statement",
+            params={"symbol": "BENCH", "apikey": "bench"},
+            timeout=30,
+        )
+        response.raise_for_status()
+        response.json()
+    return time.perf_counter() - start
+
+
+def run_pooled(base_url: str, calls: int, pool_size: int) -> float:
+    """Issue calls through a pooled FmpHttpClient; return elapsed seconds."""
+    client = FmpHttpClient(
+        base_url=base_url,
+        pool_size=pool_size,
+        api_key="bench",
+        rate_limiter=TokenBucketRateLimiter(calls_per_minute=0),  # Measure the session only
+    )
+    try:
+        start = time.perf_counter()
+        for _ in range(calls):
+            client.get_json("income-statement", {"symbol": "BENCH"})
+        return time.perf_counter() - start
+    finally:
+        client.close()
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark pooled keep-alive FMP client against per-call requests.get"
+    )
+    parser.add_argument(
+        "--calls",
+        type=int,
+        default=200,
+        help="Number of API calls per run (default: 200)",
+    )
+    parser.add_argument(
+        "--handshake-ms",
+        type=float,
+        default=30.0,
+        help="Simulated connection setup cost per new connection in ms (default: 30)",
+    )
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=10,
+        help="Pool size for the pooled client (default: 10)",
+    )
+
+    args = parser.parse_args()
+
+    server = start_stand_in_server(args.handshake_ms)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        unpooled_seconds = run_unpooled(base_url, args.calls)
+        unpooled_connections = server.connections
+
+        server.connections = 0
+        pooled_seconds = run_pooled(base_url, args.calls, args.pool_size)
+        pooled_connections = server.connections
+    finally:
+        server.shutdown()
+
+    print(f"Calls per run: {args.calls} (simulated handshake: {args.handshake_ms:.1f} ms)")
+    print(f"  requests.get per call: {unpooled_seconds:8.3f}s  "
+          f"{unpooled_connections:5d} connections  "
+          f"{unpooled_seconds / args.calls * 1000:7.2f} ms/call")
+    print(f"  pooled FmpHttpClient:  {pooled_seconds:8.3f}s  "
+          f"{pooled_connections:5d} connections  "
+          f"{pooled_seconds / args.calls * 1000:7.2f} ms/call")
+    if pooled_seconds > 0:
+        print(f"  Speedup: {unpooled_seconds / pooled_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
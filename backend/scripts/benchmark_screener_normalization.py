@@ -0,0 +1,202 @@
+"""
+benchmark_screener_normalization.py — Compare per-row vs batch screener normalization.
+
+Builds synthetic FMP company-screener payloads and times two ways of turning
+them into the /industry-screener JSON response:
+    1. Legacy loop: per-row `company.get(a) or company.get(b) ...` alias
+       chains, per-row int coercion, one CompanyResult per row, then
+       FastAPI-style jsonable_encoder + JSON dump (old get_industry_screener)
+    2. Batch: normalize_screener_payload() (aliases resolved once per schema,
+       column-wise coercion) + direct JSON serialization (JSONResponse)
+
+Both outputs are checked for equality before timing. The normalization step
+alone (rows ready to serialize) is timed separately from the full response.
+
+No FMP API key or network access is required.
+
+Example (PowerShell):
+    python scripts/benchmark_screener_normalization.py `
+        --rows 200 `
+        --iterations 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add backend directory to Python path (same approach as test.py)
+backend_dir = Path(__file__).parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from fastapi.encoders import jsonable_encoder
+
+from app.api.v1.screener import CompanyResult, ScreenerResponse
+from app.services.screener.screener_universe import columns_to_rows, normalize_screener_payload
+
+SECTORS = ["Technology", "Energy", "Healthcare", "Financial Services", "Utilities"]
+
+
+def make_payload(rows: int, seed: int = 7) -> list:
+    """Build a realistic company-screener payload (mostly ints, some floats/strings)."""
+    rng = random.Random(seed)
+    payload = []
+    for i in range(rows):
+        market_cap = rng.randint(10**7, 4 * 10**12)
+        employees = rng.randint(10, 500_000)
+        payload.append({
+            "symbol": f"SYM{i}",
+            "companyName": f"Company {i} Inc.",
+            "marketCap": float(market_cap) if i % 10 == 0 else market_cap,
+            "sector": rng.choice(SECTORS),
+            "industry": f"Industry {i % 40}",
+            "beta": rng.random() * 2,
+            "price": rng.random() * 500,
+            "lastAnnualDividend": 0.5,
+            "volume": rng.randint(1000, 10**8),
+            "exchange": "NASDAQ Global Select",
+            "exchangeShortName": "NASDAQ",
+            "country": "US",
+            "isEtf": False,
+            "isFund": False,
+            "isActivelyTrading": True,
+            "website": f"https://www.company{i}.com" if i % 7 else None,
+            "image": f"https://images.financialmodelingprep.com/symbol/SYM{i}.png",
+            "description": "Designs, manufactures, and markets products. " * 4,
+            "ceo": f"CEO {i}",
+            "fullTimeEmployees": str(employees) if i % 3 == 0 else employees,
+        })
+    return payload
+
+
+def legacy_normalize(raw_results: list) -> list:
+    """The pre-batch get_industry_screener transform (one CompanyResult per row)."""
+    results = []
+    for company in raw_results:
+        symbol = company.get("symbol") or company.get("Symbol") or ""
+        name = company.get("companyName") or company.get("name") or company.get("company_name") or ""
+        sector_val = company.get("sector") or company.get("Sector") or ""
+        industry_val = company.get("industry") or company.get("Industry") or ""
+        market_cap = company.get("marketCap") or company.get("market_cap") or company.get("MarketCap") or 0
+        website = company.get("website") or company.get("Website") or None
+        logo_url = company.get("image") or company.get("logo") or company.get("logoUrl") or company.get("Image") or None
+        description = company.get("description") or company.get("Description") or company.get("about") or None
+        ceo = company.get("ceo") or company.get("CEO") or company.get("ceoName") or None
+        employees = company.get("fullTimeEmployees") or company.get("employees") or company.get("Employees") or company.get("full_time_employees") or None
+
+        if isinstance(market_cap, float):
+            market_cap = int(market_cap)
+        elif isinstance(market_cap, str):
+            try:
+                market_cap = int(float(market_cap))
+            except (ValueError, TypeError):
+                market_cap = 0
+
+        if employees is not None:
+            if isinstance(employees, float):
+                employees = int(employees)
+            elif isinstance(employees, str):
+                try:
+                    employees = int(float(employees))
+                except (ValueError, TypeError):
+                    employees = None
+
+        results.append(CompanyResult(
+            symbol=symbol,
+            name=name,
+            sector=sector_val,
+            industry=industry_val,
+            marketCap=market_cap,
+            website=website,
+            logoUrl=logo_url,
+            description=description,
+            ceo=ceo,
+            employees=employees,
+        ))
+    return results
+
+
+def legacy_response(raw_results: list, page: int, page_size: int) -> str:
+    """Legacy transform + response model + FastAPI's jsonable_encoder serialization."""
+    response = ScreenerResponse(page=page, pageSize=page_size, results=legacy_normalize(raw_results))
+    return json.dumps(jsonable_encoder(response))
+
+
+def batch_normalize(raw_results: list) -> list:
+    """Batch normalization into plain row dicts."""
+    return columns_to_rows(normalize_screener_payload(raw_results))
+
+
+def batch_response(raw_results: list, page: int, page_size: int) -> str:
+    """Batch normalization + direct serialization (current get_industry_screener)."""
+    results = batch_normalize(raw_results)
+    return json.dumps({"page": page, "pageSize": page_size, "results": results, "total": None, "nextCursor": None})
+
+
+def time_it(func, iterations: int) -> float:
+    """Return mean seconds per call (best of 3 runs to reduce noise)."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        best = min(best, (time.perf_counter() - start) / iterations)
+    return best
+
+
+def report(label: str, legacy_seconds: float, batch_seconds: float) -> None:
+    print(f"  {label}")
+    print(f"    legacy per-row loop: {legacy_seconds * 1000:8.3f} ms/payload")
+    print(f"    batch normalizer:    {batch_seconds * 1000:8.3f} ms/payload")
+    if batch_seconds > 0:
+        print(f"    Speedup: {legacy_seconds / batch_seconds:.1f}x")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark batch screener normalization against the per-row loop"
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=200,
+        help="Companies per payload (default: 200, the max pageSize)",
+    )
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=500,
+        help="Timed iterations per implementation (default: 500)",
+    )
+
+    args = parser.parse_args()
+
+    payload = make_payload(args.rows)
+
+    legacy = json.loads(legacy_response(payload, 0, args.rows))
+    batch = json.loads(batch_response(payload, 0, args.rows))
+    if legacy != batch:
+        print("ERROR: batch normalization output differs from the legacy loop")
+        sys.exit(1)
+
+    print(f"Rows per payload: {args.rows} ({args.iterations} iterations, outputs identical)")
+    report(
+        "Normalization only:",
+        time_it(lambda: legacy_normalize(payload), args.iterations),
+        time_it(lambda: batch_normalize(payload), args.iterations),
+    )
+    report(
+        "Full response (normalize + serialize):",
+        time_it(lambda: legacy_response(payload, 0, args.rows), args.iterations),
+        time_it(lambda: batch_response(payload, 0, args.rows), args.iterations),
+    )
+
+
+if __name__ == "__main__":
+    main()
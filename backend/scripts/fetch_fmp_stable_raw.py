@@ -3,12 +3,18 @@ fetch_fmp_stable_raw.py — Fetch and cache raw FMP financial data using /stable
 
 This script fetches income statement, balance sheet, and cash flow data
 from the FMP /stable API and caches them to JSON files for any ticker.
+Multiple tickers are fetched concurrently (see app.data.fmp_async_client).
 
 Example (PowerShell):
     python scripts/fetch_fmp_stable_raw.py `
         --symbol F `
         --limit 10 `
         --output-dir data/fmp_stable_raw
+
+    # Several tickers at once
+    python scripts/fetch_fmp_stable_raw.py `
+        --symbol AAPL,MSFT,F `
+        --max-concurrency 8
 """
 
 from __future__ import annotations
@@ -32,10 +38,9 @@ try:
 except ImportError:
     pass  # dotenv not available, rely on environment variables
 
-from app.data.fmp_client import (
-    fetch_balance_sheet,
-    fetch_cash_flow,
-    fetch_income_statement,
+from app.data.fmp_async_client import (
+    FMP_ASYNC_MAX_CONCURRENCY,
+    fetch_financial_statements_bulk,
 )
 from app.core.logging import get_logger
 
@@ -51,7 +56,7 @@ def main():
         "--symbol",
         type=str,
         required=True,
-        help="Stock ticker symbol (e.g., F, AAPL, MSFT)",
+        help="Stock ticker symbol, or comma-separated symbols (e.g., F or AAPL,MSFT,F)",
     )
     parser.add_argument(
         "--limit",
@@ -65,6 +70,12 @@ def main():
         default="data/fmp_stable_raw",
         help="Output directory for cached JSON files (default: data/fmp_stable_raw)",
     )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=FMP_ASYNC_MAX_CONCURRENCY,
+        help=f"Maximum FMP requests in flight at once (default: {FMP_ASYNC_MAX_CONCURRENCY})",
+    )
     
     args = parser.parse_args()
     
@@ -79,48 +90,61 @@ def main():
         output_dir = Path(args.output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        symbol = args.symbol.upper()
-        
-        # Fetch income statement
-        logger.info(f"Fetching income statement for {symbol}...")
-        income_data = fetch_income_statement(symbol, limit=args.limit)
-        income_file = output_dir / f"{symbol}_income_statement_stable_raw.json"
-        with income_file.open("w", encoding="utf-8") as f:
-            json.dump(income_data, f, indent=2, ensure_ascii=False)
-        logger.info(f"Wrote {len(income_data)} income statement(s) to {income_file}")
-        
-        # Fetch balance sheet
-        logger.info(f"Fetching balance sheet for {symbol}...")
-        balance_data = fetch_balance_sheet(symbol, limit=args.limit)
-        balance_file = output_dir / f"{symbol}_balance_sheet_stable_raw.json"
-        with balance_file.open("w", encoding="utf-8") as f:
-            json.dump(balance_data, f, indent=2, ensure_ascii=False)
-        logger.info(f"Wrote {len(balance_data)} balance sheet(s) to {balance_file}")
+        symbols = [s.strip().upper() for s in args.symbol.split(",") if s.strip()]
         
-        # Fetch cash flow
-        logger.info(f"Fetching cash flow for {symbol}...")
-        cash_flow_data = fetch_cash_flow(symbol, limit=args.limit)
-        cash_flow_file = output_dir / f"{symbol}_cash_flow_stable_raw.json"
-        with cash_flow_file.open("w", encoding="utf-8") as f:
-            json.dump(cash_flow_data, f, indent=2, ensure_ascii=False)
-        logger.info(f"Wrote {len(cash_flow_data)} cash flow statement(s) to {cash_flow_file}")
+        # Fetch all statements for all symbols concurrently
+        results = fetch_financial_statements_bulk(
+            symbols,
+            limit=args.limit,
+            include_quote=False,
+            max_concurrency=args.max_concurrency,
+        )
         
-        print(f"\n✓ Successfully fetched and cached FMP /stable data for {symbol}")
-        print(f"  Income Statement: {income_file}")
-        print(f"  Balance Sheet: {balance_file}")
-        print(f"  Cash Flow: {cash_flow_file}")
+        failed = []
+        for symbol, data in results.items():
+            if isinstance(data, BaseException):
+                logger.error(f"Failed to fetch {symbol}: {data}")
+                failed.append(symbol)
+                continue
+            
+            income_data = data["income_statement"]
+            income_file = output_dir / f"{symbol}_income_statement_stable_raw.json"
+            with income_file.open("w", encoding="utf-8") as f:
+                json.dump(income_data, f, indent=2, ensure_ascii=False)
+            logger.info(f"Wrote {len(income_data)} income statement(s) to {income_file}")
+            
+            balance_data = data["balance_sheet"]
+            balance_file = output_dir / f"{symbol}_balance_sheet_stable_raw.json"
+            with balance_file.open("w", encoding="utf-8") as f:
+                json.dump(balance_data, f, indent=2, ensure_ascii=False)
+            logger.info(f"Wrote {len(balance_data)} balance sheet(s) to {balance_file}")
+            
+            cash_flow_data = data["cash_flow"]
+            cash_flow_file = output_dir / f"{symbol}_cash_flow_stable_raw.json"
+            with cash_flow_file.open("w", encoding="utf-8") as f:
+                json.dump(cash_flow_data, f, indent=2, ensure_ascii=False)
+            logger.info(f"Wrote {len(cash_flow_data)} cash flow statement(s) to {cash_flow_file}")
+            
+            print(f"\n✓ Successfully fetched and cached FMP /stable data for {symbol}")
+            print(f"  Income Statement: {income_file}")
+            print(f"  Balance Sheet: {balance_file}")
+            print(f"  Cash Flow: {cash_flow_file}")
+            
+            # Show summary of most recent period
+            if income_data:
+                latest = income_data[0]
+                print(f"\nMost Recent Period:")
+                print(f"  Date: {latest.get('date', 'N/A')}")
+                print(f"  Fiscal Year: {latest.get('fiscalYear', 'N/A')}")
+                print(f"  Period: {latest.get('period', 'N/A')}")
+                if latest.get('revenue'):
+                    print(f"  Revenue: ${latest.get('revenue', 0):,.0f}")
+                if latest.get('netIncome'):
+                    print(f"  Net Income: ${latest.get('netIncome', 0):,.0f}")
         
-        # Show summary of most recent period
-        if income_data:
-            latest = income_data[0]
-            print(f"\nMost Recent Period:")
-            print(f"  Date: {latest.get('date', 'N/A')}")
-            print(f"  Fiscal Year: {latest.get('fiscalYear', 'N/A')}")
-            print(f"  Period: {latest.get('period', 'N/A')}")
-            if latest.get('revenue'):
-                print(f"  Revenue: ${latest.get('revenue', 0):,.0f}")
-            if latest.get('netIncome'):
-                print(f"  Net Income: ${latest.get('netIncome', 0):,.0f}")
+        if failed:
+            print(f"\nERROR: Failed to fetch {len(failed)} symbol(s): {', '.join(failed)}", file=sys.stderr)
+            sys.exit(1)
     
     except RuntimeError as e:
         print(f"ERROR: {e}", file=sys.stderr)
@@ -0,0 +1,294 @@
+"""
+load_test_api.py — Concurrent mixed-traffic load test for the async API routes.
+
+Drives a mix of fast and slow requests concurrently and reports p50/p95/p99
+latency per route:
+    * GET /                      - health check (no I/O)
+    * GET /meta/sectors          - warm pre-serialized cache
+    * GET /industry-screener     - FMP screener call per request (local universe off)
+    * GET /branding?ticker=...   - FMP profile call per request (unique tickers)
+
+By default the app runs in-process (httpx ASGI transport, one event loop —
+the same situation as a single uvicorn worker) against a local stand-in FMP
+server with configurable latency, so no API key or network is needed. With
+--inline-io the I/O executor is replaced by one that runs calls directly on
+the event loop, reproducing the old blocking behaviour for comparison: the
+fast routes' p99 then tracks the slowest FMP call.
+
+Pass --url to load-test a running server instead (real FMP calls).
+
+Example (PowerShell):
+    python scripts/load_test_api.py `
+        --users 50 `
+        --requests 1000 `
+        --fmp-latency-ms 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import Executor, Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+
+# Add backend directory to Python path (same approach as test.py)
+backend_dir = Path(__file__).parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+# Exercise the per-request FMP paths: no response cache, no local screener universe
+os.environ.setdefault("FMP_CACHE_ENABLED", "0")
+os.environ.setdefault("SCREENER_UNIVERSE_ENABLED", "0")
+
+SECTORS = ["Technology", "Energy", "Healthcare", "Utilities"]
+
+
+class _StandInFmpHandler(BaseHTTPRequestHandler):
+    """Minimal FMP /stable stand-in with a fixed per-request latency."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        endpoint = url.path.rsplit("/", 1)[-1]
+        time.sleep(self.server.latency_seconds)
+
+        if endpoint == "available-sectors":
+            body = [{"sector": s} for s in SECTORS]
+        elif endpoint == "profile":
+            symbol = query.get("symbol", ["?"])[0]
+            body = [{
+                "symbol": symbol,
+                "companyName": f"{symbol} Corp",
+                "website": f"https://{symbol.lower()}.example.com",
+                "image": f"https://images.example.com/{symbol}.png",
+            }]
+        elif endpoint == "company-screener":
+            limit = int(query.get("limit", ["50"])[0])
+            body = [
+                {
+                    "symbol": f"S{i}",
+                    "companyName": f"Company {i}",
+                    "sector": query.get("sector", ["Technology"])[0],
+                    "industry": "Software",
+                    "marketCap": 10**9 + i,
+                }
+                for i in range(limit)
+            ]
+        else:
+            body = []
+
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass  # Keep load test output clean
+
+
+def start_stand_in_fmp(latency_ms: float) -> ThreadingHTTPServer:
+    """Start the stand-in FMP server on a free local port in a background thread."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInFmpHandler)
+    server.daemon_threads = True
+    server.latency_seconds = latency_ms / 1000.0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class _InlineExecutor(Executor):
+    """Runs submitted calls immediately on the calling thread (i.e., blocks the loop)."""
+
+    def submit(self, fn, /, *args, **kwargs):
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:  # pylint: disable=broad-except
+            future.set_exception(e)
+        return future
+
+
+def build_local_app(fmp_base_url: str, inline_io: bool):
+    """Build an app with the routers that need neither a database nor EDGAR."""
+    from fastapi import FastAPI
+
+    from app.api.v1 import branding, screener
+    from app.core import executors
+    from app.data.fmp_client import configure_fmp_client
+    from app.data.rate_limiter import TokenBucketRateLimiter
+
+    configure_fmp_client(
+        base_url=fmp_base_url,
+        api_key="load-test",
+        rate_limiter=TokenBucketRateLimiter(calls_per_minute=0),
+    )
+    if inline_io:
+        executors._io_executor = _InlineExecutor()
+
+    app = FastAPI()
+    app.include_router(branding.router)
+    app.include_router(screener.router)
+    app.include_router(screener.screener_router)
+
+    @app.get("/")
+    def root():
+        return {"status": "ok"}
+
+    return app
+
+
+def request_mix(seed: int):
+    """Yield (route label, path) pairs: mostly fast routes, some slow FMP-backed ones."""
+    rng = random.Random(seed)
+    ticker_ids = itertools.count()
+    while True:
+        roll = rng.random()
+        if roll < 0.35:
+            yield "GET /", "/"
+        elif roll < 0.65:
+            yield "GET /meta/sectors", "/meta/sectors"
+        elif roll < 0.85:
+            sector = rng.choice(SECTORS)
+            yield "GET /industry-screener", f"/industry-screener?sector={sector}&page={rng.randint(0, 20)}&pageSize=50"
+        else:
+            yield "GET /branding", f"/branding?ticker=T{next(ticker_ids)}"
+
+
+async def run_load(client: httpx.AsyncClient, users: int, total_requests: int, seed: int):
+    """Run total_requests across `users` concurrent workers; return latencies per route."""
+    mix = request_mix(seed)
+    remaining = itertools.count()
+    latencies = {}
+    errors = {}
+
+    async def worker():
+        while next(remaining) < total_requests:
+            label, path = next(mix)
+            start = time.perf_counter()
+            try:
+                response = await client.get(path)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            elapsed = time.perf_counter() - start
+            latencies.setdefault(label, []).append(elapsed)
+            if not ok:
+                errors[label] = errors.get(label, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(users)))
+    return latencies, errors, time.perf_counter() - start
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[rank]
+
+
+def print_report(latencies, errors, wall_seconds, total_requests):
+    """Print per-route latency percentiles."""
+    print(f"{total_requests} requests in {wall_seconds:.2f}s ({total_requests / wall_seconds:.0f} req/s)")
+    print(f"  {'route':<24}{'count':>7}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for label in sorted(latencies):
+        values = sorted(latencies[label])
+        print(
+            f"  {label:<24}{len(values):>7}{errors.get(label, 0):>8}"
+            f"{percentile(values, 50) * 1000:>10.1f}{percentile(values, 95) * 1000:>10.1f}"
+            f"{percentile(values, 99) * 1000:>10.1f}{values[-1] * 1000:>10.1f}"
+        )
+
+
+async def main_async(args):
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url.rstrip("/") + "/api/v1", timeout=60)
+        fmp_server = None
+        print(f"Target: {args.url}")
+    else:
+        fmp_server = start_stand_in_fmp(args.fmp_latency_ms)
+        fmp_base_url = f"http://127.0.0.1:{fmp_server.server_address[1]}"
+        app = build_local_app(fmp_base_url, args.inline_io)
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://testserver",
+            timeout=60,
+        )
+        mode = "inline I/O (blocking event loop)" if args.inline_io else "managed I/O executor"
+        print(f"Target: in-process app, {mode}, stand-in FMP latency {args.fmp_latency_ms:.0f} ms")
+
+    try:
+        # Warm the meta cache so /meta/sectors measures the cached path
+        await client.get("/meta/sectors")
+        latencies, errors, wall = await run_load(client, args.users, args.requests, args.seed)
+    finally:
+        await client.aclose()
+        if fmp_server is not None:
+            fmp_server.shutdown()
+
+    print_report(latencies, errors, wall, args.requests)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Concurrent mixed-traffic load test reporting p50/p95/p99 per route"
+    )
+    parser.add_argument(
+        "--users",
+        type=int,
+        default=50,
+        help="Concurrent virtual users (default: 50)",
+    )
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=1000,
+        help="Total requests to send (default: 1000)",
+    )
+    parser.add_argument(
+        "--fmp-latency-ms",
+        type=float,
+        default=200.0,
+        help="Stand-in FMP latency per call in ms (default: 200)",
+    )
+    parser.add_argument(
+        "--inline-io",
+        action="store_true",
+        help="Run blocking calls directly on the event loop (old behaviour) for comparison",
+    )
+    parser.add_argument(
+        "--url",
+        type=str,
+        default=None,
+        help="Load-test a running server instead (e.g., http://localhost:8000)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=42,
+        help="Random seed for the request mix (default: 42)",
+    )
+
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
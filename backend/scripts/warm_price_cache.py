@@ -0,0 +1,138 @@
+"""
+warm_price_cache.py — Warm the columnar price cache for the S&P 500 list.
+
+Reads the tickers in app/data/sp500_latest_prices.json (plus the beta
+benchmark indexes), downloads any missing daily history in batches and
+appends only new bars for tickers that are already cached. Finishes with a
+full scan of every cached close series to report read throughput.
+
+Requires pyarrow (poetry install --extras price-cache).
+
+Example (PowerShell):
+    # First run: backfill 5 years for every ticker
+    python scripts/warm_price_cache.py
+
+    # Later runs only append new bars
+    python scripts/warm_price_cache.py `
+        --batch-size 100 `
+        --cache-dir data/price_cache
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add backend directory to Python path (same approach as test.py)
+backend_dir = Path(__file__).parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from app.core.logging import get_logger
+from app.services.market_data.columnar_price_cache import (
+    DEFAULT_PRICE_CACHE_DIR,
+    PYARROW_AVAILABLE,
+    ColumnarPriceCache,
+)
+from app.services.market_data.price_store import PRICE_STORE_BACKFILL_YEARS
+from app.services.modeling.beta import BENCHMARK_OPTIONS
+
+logger = get_logger(__name__)
+
+DEFAULT_TICKERS_FILE = backend_dir / "app" / "data" / "sp500_latest_prices.json"
+
+
+def load_tickers(path: Path) -> list[str]:
+    """Return the ticker symbols (keys) of a {ticker: {...}} JSON file."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return sorted(data)
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Warm the columnar (Arrow) price cache from the S&P 500 ticker list"
+    )
+    parser.add_argument(
+        "--tickers-file",
+        type=str,
+        default=str(DEFAULT_TICKERS_FILE),
+        help="JSON file keyed by ticker (default: app/data/sp500_latest_prices.json)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=str(DEFAULT_PRICE_CACHE_DIR),
+        help="Cache directory (default: data/price_cache)",
+    )
+    parser.add_argument(
+        "--years",
+        type=int,
+        default=PRICE_STORE_BACKFILL_YEARS,
+        help=f"History to backfill for tickers not yet cached (default: {PRICE_STORE_BACKFILL_YEARS})",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=100,
+        help="Tickers per batched download (default: 100)",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Only warm the first N tickers (optional)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Check every ticker for new bars even if it looks up to date",
+    )
+
+    args = parser.parse_args()
+
+    if not PYARROW_AVAILABLE:
+        print("ERROR: pyarrow is not installed (poetry install --extras price-cache)")
+        sys.exit(1)
+
+    tickers = load_tickers(Path(args.tickers_file))
+    if args.limit:
+        tickers = tickers[:args.limit]
+    tickers = list(BENCHMARK_OPTIONS) + [t for t in tickers if t not in BENCHMARK_OPTIONS]
+
+    cache = ColumnarPriceCache(Path(args.cache_dir))
+    print(f"Warming {len(tickers)} tickers into {cache.root}")
+
+    start = time.perf_counter()
+    written = {}
+    for offset in range(0, len(tickers), args.batch_size):
+        batch = tickers[offset:offset + args.batch_size]
+        try:
+            written.update(cache.sync(batch, backfill_years=args.years, force=args.force))
+        except ValueError as e:
+            logger.warning(f"Skipping batch starting at {batch[0]}: {e}")
+        print(f"  {min(offset + args.batch_size, len(tickers))}/{len(tickers)} tickers checked, "
+              f"{sum(written.values())} bars written")
+    sync_seconds = time.perf_counter() - start
+
+    # Full scan of every cached series (what an offline batch job would do)
+    start = time.perf_counter()
+    cached = cache.tickers()
+    rows = sum(cache.read(ticker).num_rows for ticker in cached)
+    scan_seconds = time.perf_counter() - start
+
+    stats = cache.stats()
+    print(f"Synced in {sync_seconds:.1f}s: {sum(written.values())} bars for {len(written)} tickers")
+    print(f"Cache: {stats['tickers']} tickers, {stats['segments']} segments, {stats['bytes'] / 1024 / 1024:.1f} MB")
+    print(f"Scanned {rows} bars across {len(cached)} tickers in {scan_seconds * 1000:.0f} ms")
+    missing = sorted(set(tickers) - set(cached))
+    if missing:
+        print(f"No data for {len(missing)} tickers: {', '.join(missing[:20])}{' ...' if len(missing) > 20 else ''}")
+
+
+if __name__ == "__main__":
+    main()
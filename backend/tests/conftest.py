@@ -0,0 +1,108 @@
+"""Shared fixtures: model inputs built from the raw FMP statements in data/fmp_stable_raw, and the base case the engine tests value them at."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from app.services.modeling.dcf import run_dcf
+from app.services.modeling.three_statement import run_three_statement
+from app.services.modeling.three_statement_engine import latest_historicals
+from app.services.modeling.types import CompanyModelInput, build_historical_series
+
+FMP_STABLE_RAW_DIR = Path(__file__).parent.parent / "data" / "fmp_stable_raw"
+FIXTURE_TICKERS = ("AAPL", "CRWD", "CVNA", "F", "MSFT", "RHP", "VRTX")
+
+# Base case shared by the engine tests: run_three_statement assumptions and DCF inputs
+BASE_ASSUMPTIONS = {"revenue_growth": 0.06, "operating_margin_target": 0.18, "tax_rate": 0.21}
+BASE_VALUATION = {"wacc": 0.09, "terminal_growth_rate": 0.025}
+
+# FMP income statement field -> model_role
+_INCOME_STATEMENT_ROLES = {
+    "revenue": "IS_REVENUE",
+    "costOfRevenue": "IS_COGS",
+    "operatingExpenses": "IS_OPERATING_EXPENSE",
+}
+
+
+def _load(ticker, statement):
+    with (FMP_STABLE_RAW_DIR / f"{ticker}_{statement}_stable_raw.json").open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_fixture_company(ticker):
+    """CompanyModelInput plus latest shares, debt and cash for one fixture ticker."""
+    income = _load(ticker, "income_statement")
+    line_items = [
+        {"model_role": role, "periods": {row["date"]: row.get(field) for row in income}}
+        for field, role in _INCOME_STATEMENT_ROLES.items()
+    ]
+    latest_income = max(income, key=lambda row: row["date"])
+    latest_balance = max(_load(ticker, "balance_sheet"), key=lambda row: row["date"])
+    model_input = CompanyModelInput(
+        ticker=ticker,
+        name=latest_income.get("symbol", ticker),
+        historicals=build_historical_series(line_items),
+    )
+    return {
+        "model_input": model_input,
+        "shares_outstanding": float(latest_income["weightedAverageShsOutDil"]),
+        "debt": float(latest_balance.get("totalDebt") or 0.0),
+        "cash": float(latest_balance.get("cashAndCashEquivalents") or 0.0),
+    }
+
+
+@pytest.fixture(scope="session")
+def fixture_companies():
+    """Every fixture ticker, in FIXTURE_TICKERS order."""
+    return [load_fixture_company(ticker) for ticker in FIXTURE_TICKERS]
+
+
+@pytest.fixture(scope="session")
+def base_assumptions():
+    """run_three_statement assumptions of the shared base case."""
+    return dict(BASE_ASSUMPTIONS)
+
+
+@pytest.fixture(scope="session")
+def base_valuation():
+    """WACC and terminal growth of the shared base case."""
+    return dict(BASE_VALUATION)
+
+
+@pytest.fixture(scope="session")
+def generated_price():
+    """
+    generated_price(company, overrides=None): implied share price of
+    run_dcf(run_three_statement(...)), the /models/generate path, for the base
+    case with any assumption or WACC / terminal growth overridden.
+    """
+    def price(company, overrides=None):
+        merged = {**BASE_ASSUMPTIONS, **BASE_VALUATION, **(overrides or {})}
+        projection = run_three_statement(company["model_input"], {k: merged[k] for k in BASE_ASSUMPTIONS})
+        return run_dcf(projection, {
+            "wacc": merged["wacc"],
+            "terminal_growth_rate": merged["terminal_growth_rate"],
+            "shares_outstanding": company["shares_outstanding"],
+            "debt": company["debt"],
+            "cash": company["cash"],
+        }).implied_share_price
+
+    return price
+
+
+@pytest.fixture(scope="session")
+def company_inputs():
+    """company_inputs(company): flat engine inputs (latest historicals + base case + shares, debt, cash)."""
+    def inputs(company):
+        _, latest = latest_historicals(company["model_input"])
+        return {
+            **latest,
+            **BASE_ASSUMPTIONS,
+            **BASE_VALUATION,
+            "shares_outstanding": company["shares_outstanding"],
+            "debt": company["debt"],
+            "cash": company["cash"],
+        }
+
+    return inputs
@@ -0,0 +1,17 @@
+"""The /beta router and the price loading it depends on import cleanly (no database or network needed)."""
+
+import importlib
+
+
+def test_beta_router_imports_and_registers_routes():
+    beta_api = importlib.import_module("app.api.v1.beta")
+
+    paths = {route.path for route in beta_api.router.routes}
+    assert {"/beta/{ticker}", "/beta/{ticker}/rolling"} <= paths
+
+
+def test_beta_service_imports_price_store():
+    beta = importlib.import_module("app.services.modeling.beta")
+
+    assert callable(beta.load_close_matrix)
+    assert callable(beta.calculate_betas)
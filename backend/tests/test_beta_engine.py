@@ -0,0 +1,122 @@
+"""The vectorized beta engine matches a direct OLS fit (np.polyfit) on each pair's jointly valid returns."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.modeling.beta_engine import (
+    BLUME_WEIGHT,
+    MIN_OBSERVATIONS,
+    PERIODS_PER_YEAR,
+    RETURN_FREQUENCIES,
+    ROLLING_MIN_COVERAGE,
+    compute_betas,
+    compute_rolling_betas,
+    resample_prices,
+    rolling_regress,
+)
+
+BENCHMARKS = ["SPY", "QQQ"]
+TICKERS = ["AAA", "BBB", "CCC"]
+HORIZONS = [1, 3, 5]
+
+
+@pytest.fixture(scope="module")
+def prices():
+    """Seeded daily prices: benchmarks as random walks, tickers driven by SPY plus noise, with gaps."""
+    rng = np.random.default_rng(7)
+    dates = pd.bdate_range("2018-01-01", periods=1600)
+    market = rng.normal(0.0004, 0.01, size=(len(dates), len(BENCHMARKS)))
+    assets = market[:, :1] * np.array([0.6, 1.0, 1.5]) + rng.normal(0.0, 0.01, size=(len(dates), len(TICKERS)))
+    frame = pd.DataFrame(
+        100.0 * np.cumprod(1.0 + np.hstack([assets, market]), axis=0),
+        index=dates,
+        columns=TICKERS + BENCHMARKS,
+    )
+    # Shorter history, scattered missing days and a benchmark gap: pairs use different periods
+    frame.iloc[:300, 0] = np.nan
+    frame.iloc[rng.choice(len(dates), 80, replace=False), 1] = np.nan
+    frame.iloc[500:520, 4] = np.nan
+    return frame
+
+
+def _paired_returns(prices, ticker, benchmark):
+    returns = prices[[ticker, benchmark]].pct_change(fill_method=None).iloc[1:].to_numpy()
+    paired = np.isfinite(returns).all(axis=1)
+    return returns[paired, 1], returns[paired, 0]
+
+
+def test_betas_match_polyfit_on_pairwise_valid_returns(prices):
+    stats = compute_betas(prices, BENCHMARKS)
+
+    assert list(stats.index) == [(t, b) for t in TICKERS for b in BENCHMARKS]
+    for ticker in TICKERS:
+        for benchmark in BENCHMARKS:
+            x, y = _paired_returns(prices, ticker, benchmark)
+            slope, intercept = np.polyfit(x, y, 1)
+            row = stats.loc[(ticker, benchmark)]
+
+            assert row["observations"] == len(x)
+            assert row["beta"] == pytest.approx(slope, rel=1e-9)
+            assert row["alpha"] == pytest.approx(intercept, rel=1e-6, abs=1e-12)
+            assert row["r_squared"] == pytest.approx(np.corrcoef(x, y)[0, 1] ** 2, rel=1e-9)
+
+
+def test_adjusted_beta_is_blume(prices):
+    stats = compute_betas(prices, BENCHMARKS)
+
+    expected = BLUME_WEIGHT * stats["beta"] + (1.0 - BLUME_WEIGHT)
+    np.testing.assert_allclose(stats["adjusted_beta"], expected, rtol=1e-12)
+    np.testing.assert_allclose(stats["adjusted_beta"], 2.0 / 3.0 * stats["beta"] + 1.0 / 3.0, rtol=1e-12)
+
+
+def test_pairs_below_min_observations_are_nan(prices):
+    frame = prices.copy()
+    # Only the last MIN_OBSERVATIONS (SHORT) or MIN_OBSERVATIONS + 1 (ENOUGH) prices: one return fewer each
+    for ticker, count in (("SHORT", MIN_OBSERVATIONS), ("ENOUGH", MIN_OBSERVATIONS + 1)):
+        frame[ticker] = np.nan
+        frame.iloc[-count:, frame.columns.get_loc(ticker)] = 10.0 + np.sin(np.arange(count))
+
+    stats = compute_betas(frame, ["SPY"], tickers=["SHORT", "ENOUGH"])
+
+    short, enough = stats.loc[("SHORT", "SPY")], stats.loc[("ENOUGH", "SPY")]
+    assert short["observations"] == MIN_OBSERVATIONS - 1
+    assert short[["beta", "adjusted_beta", "alpha", "r_squared", "standard_error"]].isna().all()
+    assert enough["observations"] == MIN_OBSERVATIONS
+    assert np.isfinite(enough["beta"])
+
+
+@pytest.mark.parametrize("frequency", list(RETURN_FREQUENCIES))
+def test_last_rolling_window_matches_polyfit_on_its_slice(prices, frequency):
+    rolling = compute_rolling_betas(prices, "SPY", HORIZONS, frequencies=[frequency])
+    sampled = resample_prices(prices[TICKERS + ["SPY"]], frequency)
+
+    for years in HORIZONS:
+        window = years * PERIODS_PER_YEAR[frequency]
+        for ticker in TICKERS:
+            x, y = _paired_returns(sampled.iloc[-window - 1:], ticker, "SPY")
+            slope, intercept = np.polyfit(x, y, 1)
+            series = rolling.loc[(frequency, years, ticker)]
+
+            assert series.index[-1] == sampled.index[-1]
+            last = series.iloc[-1]
+            assert last["observations"] == len(x)
+            assert last["beta"] == pytest.approx(slope, rel=1e-8)
+            assert last["alpha"] == pytest.approx(intercept, rel=1e-5, abs=1e-12)
+
+
+def test_rolling_windows_below_min_coverage_are_nan():
+    window = 10
+    required = int(np.ceil(window * ROLLING_MIN_COVERAGE))
+    rng = np.random.default_rng(3)
+    market = rng.normal(0.0, 0.01, size=40)
+    asset = 1.2 * market + rng.normal(0.0, 0.002, size=40)
+    asset[[15, 17, 19]] = np.nan  # Windows holding all three gaps fall one short of the coverage
+
+    stats = rolling_regress(asset, market, window=window)
+
+    paired = np.isfinite(asset)
+    counts = np.array([paired[max(0, t - window + 1):t + 1].sum() for t in range(len(asset))])
+    assert (counts == required - 1).any() and (counts == required).any()
+    np.testing.assert_array_equal(stats["observations"][:, 0], counts)
+    np.testing.assert_array_equal(np.isfinite(stats["beta"][:, 0]), counts >= required)
@@ -0,0 +1,84 @@
+"""The Beta Data sheet holds the same prices, returns and beta in constant_memory and regular workbooks."""
+
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import pytest
+import xlsxwriter
+from openpyxl import load_workbook
+
+from app.services.modeling.beta import build_beta_workbook, write_beta_sheet
+
+ROWS = 30
+
+
+@pytest.fixture(scope="module")
+def payload():
+    rng = np.random.default_rng(1)
+    benchmark = 100.0 * np.cumprod(1.0 + rng.normal(0.0, 0.01, ROWS))
+    ticker = 50.0 * np.cumprod(1.0 + 1.3 * np.diff(benchmark, prepend=benchmark[0]) / benchmark)
+    return {
+        "ticker": "AAA",
+        "benchmark": "^GSPC",
+        "lookback_days": 730,
+        "price_table": pd.DataFrame({
+            "date": pd.bdate_range("2024-01-01", periods=ROWS),
+            "ticker_adj_close": ticker,
+            "benchmark_adj_close": benchmark,
+        }),
+    }
+
+
+def _regular_workbook(payload):
+    output = BytesIO()
+    workbook = xlsxwriter.Workbook(output)
+    write_beta_sheet(workbook, payload)
+    workbook.close()
+    return output.getvalue()
+
+
+def _sheets(content):
+    """(formulas, cached values) views of the Beta Data sheet."""
+    formulas = load_workbook(BytesIO(content))["Beta Data"]
+    values = load_workbook(BytesIO(content), data_only=True)["Beta Data"]
+    return formulas, values
+
+
+def test_constant_memory_sheet_writes_per_row_return_formulas(payload):
+    formulas, values = _sheets(build_beta_workbook(payload))
+    table = payload["price_table"]
+    last = 5 + ROWS  # Excel row of the last price
+
+    assert [formulas.cell(row=r, column=1).value for r in range(1, 4)] == ["Ticker", "Benchmark", "Lookback (years)"]
+    assert values["B1"].value == "AAA"
+    assert values["B3"].value == pytest.approx(2.0, rel=0.01)
+    assert formulas["A6"].value.date() == table["date"][0].date()
+    prices = [[values.cell(row=r, column=c).value for c in (2, 3)] for r in range(6, last + 1)]
+    np.testing.assert_allclose(prices, table[["ticker_adj_close", "benchmark_adj_close"]].to_numpy(), rtol=1e-12)
+
+    assert formulas["E6"].value is None
+    for row in (7, 8, last):
+        assert formulas.cell(row=row, column=5).value == f"=((B{row}/B{row - 1})-1)*100"
+        assert formulas.cell(row=row, column=6).value == f"=((C{row}/C{row - 1})-1)*100"
+    ticker_returns = (table["ticker_adj_close"].pct_change() * 100).tolist()[1:]
+    cached = [values.cell(row=r, column=5).value for r in range(7, last + 1)]
+    np.testing.assert_allclose(cached, ticker_returns, rtol=1e-12)
+
+    assert formulas["B4"].value == f"=SLOPE(E7:E{last},F7:F{last})"
+    benchmark_returns = (table["benchmark_adj_close"].pct_change() * 100).tolist()[1:]
+    assert values["B4"].value == pytest.approx(np.polyfit(benchmark_returns, ticker_returns, 1)[0], rel=1e-9)
+    assert formulas.freeze_panes == "A6"
+
+
+def test_constant_memory_and_regular_sheets_hold_the_same_values(payload):
+    _, streamed = _sheets(build_beta_workbook(payload))
+    _, regular = _sheets(_regular_workbook(payload))
+
+    def cells(sheet, columns):
+        return [[sheet.cell(row=r, column=c).value for c in columns] for r in range(1, 6 + ROWS)]
+
+    assert cells(streamed, range(1, 4)) == cells(regular, range(1, 4))
+    # Regular workbooks cache only the first element of each array formula; the beta is cached in both
+    assert streamed["E7"].value == pytest.approx(regular["E7"].value)
+    assert streamed["B4"].value == pytest.approx(regular["B4"].value)
@@ -0,0 +1,108 @@
+"""Tests for the Arrow IPC price cache (yfinance stubbed out)."""
+
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from app.core.lru_ttl_cache import MISSING  # noqa: E402
+from app.services.market_data import columnar_price_cache  # noqa: E402
+from app.services.market_data.columnar_price_cache import ColumnarPriceCache, bars_to_table  # noqa: E402
+
+
+def _bars(dates, close):
+    dates = pd.DatetimeIndex(dates)
+    close = np.broadcast_to(np.asarray(close, dtype=float), len(dates))
+    return pd.DataFrame({"Open": close, "High": close, "Low": close, "Close": close, "Volume": 1.0}, index=dates)
+
+
+def _segment_names(cache, ticker):
+    return sorted(path.name for path in (cache.root / ticker).glob("*.arrow"))
+
+
+def _stub_downloads(monkeypatch, *responses):
+    """download_bars returns each response in turn (a dict of frames, {} for a failed download)."""
+    calls = []
+
+    def download(tickers, start):
+        calls.append((list(tickers), start))
+        return responses[len(calls) - 1]
+
+    monkeypatch.setattr(columnar_price_cache, "download_bars", download)
+    return calls
+
+
+def test_append_adds_only_newer_bars_as_a_segment(tmp_path):
+    cache = ColumnarPriceCache(tmp_path)
+    first = pd.bdate_range("2024-01-01", periods=5)
+    second = pd.bdate_range("2024-01-05", periods=5)  # Overlaps the last cached day
+
+    assert cache.append("aapl", bars_to_table(_bars(first, 100.0))) == 5
+    assert cache.append("AAPL", bars_to_table(_bars(second, np.arange(5.0)))) == 4
+
+    assert _segment_names(cache, "AAPL") == ["base-000001.arrow", "part-000002.arrow"]
+    frame = cache.read_frame("AAPL")
+    assert frame.index.equals(first.union(second).rename("date"))
+    assert frame["close"].tolist() == [100.0] * 5 + [1.0, 2.0, 3.0, 4.0]
+    assert cache.latest_date("AAPL") == second[-1].date()
+
+
+def test_parts_are_compacted_into_one_base(tmp_path, monkeypatch):
+    monkeypatch.setattr(columnar_price_cache, "PRICE_CACHE_MAX_SEGMENTS", 3)
+    cache = ColumnarPriceCache(tmp_path)
+    days = pd.bdate_range("2024-01-01", periods=8)
+
+    for i in range(0, 8, 2):
+        cache.append("MSFT", bars_to_table(_bars(days[i:i + 2], float(i))))
+
+    assert _segment_names(cache, "MSFT") == ["base-000005.arrow"]
+    assert cache.read_frame("MSFT")["close"].tolist() == [0.0, 0.0, 2.0, 2.0, 4.0, 4.0, 6.0, 6.0]
+
+
+def test_close_matrix_aligns_tickers_on_dates(tmp_path):
+    cache = ColumnarPriceCache(tmp_path)
+    cache.append("AAA", bars_to_table(_bars(pd.bdate_range("2024-01-01", periods=4), 10.0)))
+    cache.append("^GSPC", bars_to_table(_bars(pd.bdate_range("2024-01-03", periods=4), 20.0)))
+
+    matrix = cache.close_matrix(["aaa", "^GSPC", "MISSING"], start=date(2024, 1, 2), end=date(2024, 1, 8))
+
+    assert list(matrix.columns) == ["AAA", "^GSPC"]
+    assert matrix.index.equals(pd.bdate_range("2024-01-02", "2024-01-08", name="date"))
+    assert matrix["AAA"].isna().tolist() == [False, False, False, True, True]
+    assert matrix["^GSPC"].isna().tolist() == [True, False, False, False, False]
+
+
+def test_sync_backfills_then_appends_and_replaces_restated_history(tmp_path, monkeypatch):
+    cache = ColumnarPriceCache(tmp_path)
+    history = pd.bdate_range(end=date.today() - timedelta(days=30), periods=20)
+    recent = pd.bdate_range(history[-3], date.today() - timedelta(days=1))
+    _stub_downloads(
+        monkeypatch,
+        {"AAA": _bars(history, 100.0)},  # Backfill
+        {"AAA": _bars(recent, 100.0)},  # Overlap agrees: append
+        {"AAA": _bars(recent, 50.0)},  # Overlap restated ...
+        {"AAA": _bars(history.union(recent), 50.0)},  # ... so the history is replaced
+    )
+
+    assert cache.sync(["AAA"]) == {"AAA": len(history)}
+    assert cache.sync(["AAA"]) == {}  # Recently synced
+    assert cache.sync(["AAA"], force=True) == {"AAA": len(recent) - 3}
+    assert cache.read_frame("AAA")["close"].eq(100.0).all()
+
+    assert cache.sync(["AAA"], force=True) == {"AAA": len(history.union(recent))}
+    assert cache.read_frame("AAA")["close"].eq(50.0).all()
+    assert len(_segment_names(cache, "AAA")) == 1
+
+
+def test_failed_download_is_not_marked_as_synced(tmp_path, monkeypatch):
+    cache = ColumnarPriceCache(tmp_path)
+    calls = _stub_downloads(monkeypatch, {}, {"AAA": _bars(pd.bdate_range("2024-01-01", periods=5), 1.0)})
+
+    assert cache.sync(["AAA"]) == {}
+    assert cache._recent_syncs.get("AAA") is MISSING
+
+    assert cache.sync(["AAA"]) == {"AAA": 5}
+    assert len(calls) == 2
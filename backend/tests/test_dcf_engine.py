@@ -0,0 +1,85 @@
+"""Parity of the vectorized DCF (dcf_engine.run_dcf_batch) with dcf.run_dcf."""
+
+import math
+
+import numpy as np
+import pytest
+
+from app.services.modeling.dcf import run_dcf
+from app.services.modeling.dcf_engine import fcf_matrix, run_dcf_batch
+from app.services.modeling.three_statement import run_three_statement
+
+PAIRS = [(0.08, 0.02), (0.10, 0.025), (0.12, 0.03)]
+
+
+@pytest.fixture(scope="module")
+def projections(fixture_companies, base_assumptions):
+    return [run_three_statement(c["model_input"], base_assumptions) for c in fixture_companies]
+
+
+def test_batch_matches_scalar_dcf_per_company(fixture_companies, projections):
+    wacc, growth = map(np.array, zip(*PAIRS))
+    batch = run_dcf_batch(
+        fcf_matrix(projections),
+        wacc=wacc,
+        terminal_growth_rate=growth,
+        shares_outstanding=[c["shares_outstanding"] for c in fixture_companies],
+        debt=[c["debt"] for c in fixture_companies],
+        cash=[c["cash"] for c in fixture_companies],
+    )
+
+    for i, (company, projection) in enumerate(zip(fixture_companies, projections)):
+        for j, (pair_wacc, pair_growth) in enumerate(PAIRS):
+            scalar = run_dcf(projection, {
+                "wacc": pair_wacc,
+                "terminal_growth_rate": pair_growth,
+                "shares_outstanding": company["shares_outstanding"],
+                "debt": company["debt"],
+                "cash": company["cash"],
+            })
+            assert batch.pv_fcf_sum[i, j] == pytest.approx(sum(r.pv_ufcf for r in scalar.yearly_results), rel=1e-12)
+            assert batch.terminal_value[i, j] == pytest.approx(scalar.terminal_value, rel=1e-12)
+            assert batch.pv_terminal_value[i, j] == pytest.approx(scalar.pv_terminal_value, rel=1e-12)
+            assert batch.enterprise_value[i, j] == pytest.approx(scalar.enterprise_value, rel=1e-12)
+            assert batch.equity_value[i, j] == pytest.approx(scalar.equity_value, rel=1e-12)
+            assert batch.implied_share_price[i, j] == pytest.approx(scalar.implied_share_price, rel=1e-12)
+
+
+@pytest.mark.parametrize("wacc, growth", [(0.03, 0.03), (0.03, 0.05), (0.0, 0.01), (-0.02, 0.01)])
+def test_invalid_pair_raises_in_scalar_path_and_is_nan_in_batch(projections, wacc, growth):
+    with pytest.raises(ValueError):
+        run_dcf(projections[0], {"wacc": wacc, "terminal_growth_rate": growth})
+
+    batch = run_dcf_batch(
+        fcf_matrix(projections),
+        wacc=[0.10, wacc],
+        terminal_growth_rate=[0.025, growth],
+        shares_outstanding=1e9,
+    )
+    assert np.isnan(batch.enterprise_value[:, 1]).all()
+    assert np.isnan(batch.implied_share_price[:, 1]).all()
+    # The valid pair next to it is unaffected
+    assert np.isfinite(batch.enterprise_value[:, 0]).all()
+
+
+def test_missing_shares(fixture_companies, projections):
+    assumptions = {"wacc": 0.10, "terminal_growth_rate": 0.025}
+    scalar = run_dcf(projections[0], assumptions)
+    assert scalar.equity_value is None and scalar.implied_share_price is None
+
+    # No shares at all: no equity outputs, like the scalar path
+    batch = run_dcf_batch(fcf_matrix(projections), 0.10, 0.025)
+    assert batch.equity_value is None and batch.implied_share_price is None
+    assert batch.enterprise_value[0, 0] == pytest.approx(scalar.enterprise_value, rel=1e-12)
+
+    # Shares missing for some companies: equity value is kept, the price is NaN
+    shares = [c["shares_outstanding"] for c in fixture_companies]
+    shares[1] = np.nan
+    shares[2] = 0.0
+    batch = run_dcf_batch(fcf_matrix(projections), 0.10, 0.025, shares_outstanding=shares)
+    zero_shares = run_dcf(projections[2], {**assumptions, "shares_outstanding": 0.0})
+    assert zero_shares.implied_share_price is None
+    assert batch.equity_value[2, 0] == pytest.approx(zero_shares.equity_value, rel=1e-12)
+    assert math.isnan(batch.implied_share_price[1, 0])
+    assert math.isnan(batch.implied_share_price[2, 0])
+    assert np.isfinite(np.delete(batch.implied_share_price[:, 0], [1, 2])).all()
@@ -0,0 +1,23 @@
+"""Tests for If-None-Match handling."""
+
+import pytest
+
+from app.core.etags import etag_matches
+
+ETAG = '"abc123"'
+
+
+@pytest.mark.parametrize("header, matches", [
+    (None, False),
+    ("", False),
+    ('"abc123"', True),
+    ('W/"abc123"', True),  # Weak comparison
+    ('"other", "abc123"', True),
+    ('"other",W/"abc123"', True),
+    ("*", True),
+    (" * ", True),
+    ('"other"', False),
+    ("abc123", False),  # Unquoted tag
+])
+def test_if_none_match(header, matches):
+    assert etag_matches(header, ETAG) is matches
@@ -0,0 +1,61 @@
+"""Tests for the shared I/O and CPU executors."""
+
+import asyncio
+import os
+import threading
+
+import pytest
+
+from app.core import executors
+from app.core.executors import executor_stats, get_cpu_executor, get_io_executor, run_cpu, run_io, shutdown_executors
+
+
+@pytest.fixture(autouse=True)
+def fresh_executors(monkeypatch):
+    shutdown_executors()
+    monkeypatch.setattr(executors, "CPU_EXECUTOR_WORKERS", 2)
+    yield
+    shutdown_executors()
+
+
+def _echo(value, *, label):
+    return value, label, threading.current_thread().name
+
+
+def test_run_io_runs_on_the_io_pool_with_args_and_kwargs():
+    value, label, thread = asyncio.run(run_io(_echo, 42, label="AAPL"))
+
+    assert (value, label) == (42, "AAPL")
+    assert thread.startswith("io")
+    assert executor_stats()["io_started"] is True
+
+
+def test_run_cpu_runs_in_a_worker_process():
+    pid = asyncio.run(run_cpu(os.getpid))
+
+    assert pid != os.getpid()
+    assert executor_stats()["cpu_started"] is True
+
+
+def test_zero_cpu_workers_falls_back_to_the_io_pool(monkeypatch):
+    monkeypatch.setattr(executors, "CPU_EXECUTOR_WORKERS", 0)
+
+    assert get_cpu_executor() is get_io_executor()
+    assert asyncio.run(run_cpu(os.getpid)) == os.getpid()
+    assert executor_stats()["cpu_started"] is False
+
+
+def test_shutdown_resets_both_pools():
+    io_executor, cpu_executor = get_io_executor(), get_cpu_executor()
+
+    shutdown_executors()
+
+    assert executor_stats()["io_started"] is False
+    assert executor_stats()["cpu_started"] is False
+    with pytest.raises(RuntimeError):
+        io_executor.submit(os.getpid)
+    with pytest.raises(RuntimeError):
+        cpu_executor.submit(os.getpid)
+    # The next call starts fresh pools
+    assert asyncio.run(run_io(os.getpid)) == os.getpid()
+    assert get_io_executor() is not io_executor
@@ -0,0 +1,69 @@
+"""Tests for batched branding lookups (FMP profile calls stubbed out)."""
+
+import asyncio
+
+import pytest
+
+from app.core.lru_ttl_cache import LruTtlCache
+from app.services.branding import fmp_branding_service
+from app.services.branding.fmp_branding_service import (
+    BRANDING_BATCH_MAX_TICKERS,
+    get_cached_logo_url,
+    get_company_branding_batch,
+)
+
+
+@pytest.fixture
+def profiles(monkeypatch):
+    """Stub fetch_company_profile with a fresh branding cache; returns the list of fetched tickers."""
+    calls = []
+
+    def fetch_company_profile(ticker):
+        calls.append(ticker)
+        if ticker == "ZZZZ":
+            raise RuntimeError("No profile data found for ZZZZ")
+        return {"symbol": ticker, "companyName": f"{ticker} Inc.", "image": f"https://img.test/{ticker}.png"}
+
+    monkeypatch.setattr(fmp_branding_service, "fetch_company_profile", fetch_company_profile)
+    monkeypatch.setattr(fmp_branding_service, "_branding_cache", LruTtlCache(100, 3600, name="branding-test"))
+    return calls
+
+
+def test_batch_normalizes_dedupes_and_separates_errors(profiles):
+    results, errors = asyncio.run(get_company_branding_batch(["aapl", " AAPL ", "", "msft", "zzzz"]))
+
+    assert sorted(profiles) == ["AAPL", "MSFT", "ZZZZ"]
+    assert list(results) == ["AAPL", "MSFT"]
+    assert results["AAPL"] == {
+        "ticker": "AAPL",
+        "companyName": "AAPL Inc.",
+        "website": "",
+        "logoUrl": "https://img.test/AAPL.png",
+    }
+    assert list(errors) == ["ZZZZ"]
+    assert "ZZZZ" in errors["ZZZZ"]
+
+
+def test_batch_serves_cached_tickers_without_fetching(profiles):
+    asyncio.run(get_company_branding_batch(["AAPL"]))
+    profiles.clear()
+
+    results, errors = asyncio.run(get_company_branding_batch(["AAPL", "MSFT"]))
+
+    assert profiles == ["MSFT"]
+    assert set(results) == {"AAPL", "MSFT"} and errors == {}
+    assert get_cached_logo_url("msft") == "https://img.test/MSFT.png"
+    assert get_cached_logo_url("ZZZZ") is None
+
+
+def test_failed_lookups_are_not_cached(profiles):
+    asyncio.run(get_company_branding_batch(["ZZZZ"]))
+    asyncio.run(get_company_branding_batch(["ZZZZ"]))
+
+    assert profiles == ["ZZZZ", "ZZZZ"]
+
+
+def test_batch_rejects_more_than_the_maximum(profiles):
+    with pytest.raises(ValueError):
+        asyncio.run(get_company_branding_batch([f"T{i}" for i in range(BRANDING_BATCH_MAX_TICKERS + 1)]))
+    assert profiles == []
@@ -0,0 +1,59 @@
+"""Tests for the on-disk FMP response cache."""
+
+import time
+
+from app.data.fmp_cache import NEGATIVE_CACHE_TTL, FmpResponseCache, cache_key
+
+
+def _counting_fetch(payload):
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return payload
+
+    return fetch, calls
+
+
+def test_fresh_entry_is_served_from_disk(tmp_path):
+    cache = FmpResponseCache(cache_dir=tmp_path)
+    fetch, calls = _counting_fetch([{"symbol": "AAPL"}])
+
+    assert cache.get_or_fetch("profile", {"symbol": "AAPL"}, fetch) == [{"symbol": "AAPL"}]
+    assert cache.get_or_fetch("profile", {"symbol": "AAPL"}, fetch) == [{"symbol": "AAPL"}]
+    assert len(calls) == 1
+
+
+def test_error_payload_is_not_cached(tmp_path):
+    cache = FmpResponseCache(cache_dir=tmp_path)
+    fetch, calls = _counting_fetch({"Error Message": "Limit Reach"})
+
+    cache.get_or_fetch("profile", {"symbol": "AAPL"}, fetch)
+    cache.get_or_fetch("profile", {"symbol": "AAPL"}, fetch)
+    assert len(calls) == 2
+    assert not (tmp_path / f"{cache_key('profile', {'symbol': 'AAPL'})}.json").exists()
+
+
+def test_empty_payload_expires_after_negative_ttl(tmp_path, monkeypatch):
+    cache = FmpResponseCache(cache_dir=tmp_path)
+    fetch, calls = _counting_fetch([])
+
+    cache.get_or_fetch("income-statement", {"symbol": "XYZ"}, fetch)
+    cache.get_or_fetch("income-statement", {"symbol": "XYZ"}, fetch)
+    assert len(calls) == 1
+
+    now = time.time()
+    monkeypatch.setattr("app.data.fmp_cache.time.time", lambda: now + NEGATIVE_CACHE_TTL + 1)
+    cache.get_or_fetch("income-statement", {"symbol": "XYZ"}, fetch)
+    assert len(calls) == 2
+
+
+def test_entry_written_by_another_process_is_found(tmp_path):
+    writer = FmpResponseCache(cache_dir=tmp_path)
+    reader = FmpResponseCache(cache_dir=tmp_path)  # index loaded before the write
+    writer.get_or_fetch("profile", {"symbol": "MSFT"}, lambda: [{"symbol": "MSFT"}])
+
+    fetch, calls = _counting_fetch([{"symbol": "other"}])
+    assert reader.get_or_fetch("profile", {"symbol": "MSFT"}, fetch) == [{"symbol": "MSFT"}]
+    assert calls == []
+    assert reader.stats()["entries"] == 1
@@ -0,0 +1,52 @@
+"""Tests for FMP fallback-endpoint discovery."""
+
+import json
+
+import pytest
+
+from app.data.fmp_client import FmpEndpointResolver, FmpNotFoundError
+
+
+def _call_recording(available):
+    calls = []
+
+    def call(endpoint):
+        calls.append(endpoint)
+        if endpoint not in available:
+            raise FmpNotFoundError(endpoint)
+        return endpoint
+
+    return call, calls
+
+
+def test_dead_endpoint_is_skipped_until_ttl_expires(tmp_path, monkeypatch):
+    resolver = FmpEndpointResolver(path=tmp_path / "discovery.json", plan="starter", dead_ttl=3600)
+    call, calls = _call_recording({"b"})
+    assert resolver.resolve("prices", ["a", "b"], call) == "b"
+    assert calls == ["a", "b"]
+
+    stored = json.loads((tmp_path / "discovery.json").read_text())
+    dead_at = stored["starter"]["prices"]["dead"]["a"]
+    assert resolver.candidates("prices", ["a", "b"]) == ["b"]
+
+    monkeypatch.setattr("app.data.fmp_client.time.time", lambda: dead_at + 3601)
+    assert resolver.candidates("prices", ["a", "b"]) == ["b", "a"]
+
+
+def test_all_dead_retries_full_list(tmp_path):
+    resolver = FmpEndpointResolver(path=tmp_path / "discovery.json", plan="starter")
+    call, _ = _call_recording(set())
+    with pytest.raises(FmpNotFoundError):
+        resolver.resolve("prices", ["a", "b"], call)
+
+    # The endpoint came back: the next call still probes it
+    call, calls = _call_recording({"b"})
+    assert resolver.resolve("prices", ["a", "b"], call) == "b"
+    assert calls == ["a", "b"]
+
+
+def test_legacy_dead_list_is_reprobed(tmp_path):
+    path = tmp_path / "discovery.json"
+    path.write_text(json.dumps({"starter": {"prices": {"working": None, "dead": ["a"]}}}))
+    resolver = FmpEndpointResolver(path=path, plan="starter")
+    assert resolver.candidates("prices", ["a", "b"]) == ["a", "b"]
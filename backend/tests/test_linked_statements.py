@@ -0,0 +1,123 @@
+"""The linked balance sheet balances and the interest circularity converges in every financing regime."""
+
+import numpy as np
+import pytest
+
+from app.services.modeling.linked_statements import project_linked_statements, run_linked_three_statement
+from app.services.modeling.three_statement import run_three_statement, run_three_statement_linked
+
+BALANCE_TOLERANCE = 1e-6  # Relative to revenue
+REVENUE = 1000.0
+OPENING = {"cash": 50.0, "accounts_receivable": 120.0, "inventory": 60.0, "accounts_payable": 70.0, "ppe": 400.0}
+
+# Name -> (opening debt, cogs, operating expense, assumptions); each drives one regime in every period
+REGIMES = {
+    # Part of the excess cash repays a large debt balance
+    "sweep": (600.0, 550.0, 250.0, {"cash_sweep_pct": 0.5}),
+    # The whole excess would repay more than the debt left, so the sweep is capped at the balance
+    "capped_sweep": (30.0, 550.0, 250.0, {"cash_sweep_pct": 1.0}),
+    # Losses and a cash floor are funded by the revolver
+    "revolver": (100.0, 700.0, 450.0, {"operating_margin_target": -0.2, "minimum_cash_as_pct_revenue": 0.2}),
+}
+
+
+def _project(regime, **kwargs):
+    debt, cogs, operating_expense, assumptions = REGIMES[regime]
+    return project_linked_statements(
+        REVENUE,
+        cogs,
+        operating_expense,
+        {**OPENING, "debt": debt},
+        periods=5,
+        assumptions={"interest_rate": 0.08, "interest_rate_on_cash": 0.03, "debt_amortization_pct": 0.05, **assumptions},
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("regime", list(REGIMES))
+def test_balances_and_converges(regime):
+    output = _project(regime)
+
+    assert output.converged.all()
+    assert (np.abs(output.balance_check) < BALANCE_TOLERANCE * REVENUE).all()
+
+
+def test_each_regime_is_exercised():
+    sweep = _project("sweep")
+    assert (sweep.line("cash_sweep") > 0).all()
+    assert (sweep.line("debt") > 0).all()
+
+    capped = _project("capped_sweep")
+    assert capped.line("cash_sweep")[0, 0] > 0
+    assert (capped.line("debt") == 0).all()
+
+    revolver = _project("revolver")
+    assert (revolver.line("revolver_draw") > 0).all()
+    np.testing.assert_allclose(revolver.line("cash"), 0.2 * revolver.line("revenue"))
+
+
+def test_regimes_balance_in_one_batch():
+    debt, cogs, operating_expense, assumptions = zip(*REGIMES.values())
+    defaults = {"cash_sweep_pct": 0.0, "minimum_cash_as_pct_revenue": 0.0, "operating_margin_target": 0.15}
+    output = project_linked_statements(
+        np.full(len(REGIMES), REVENUE),
+        np.array(cogs),
+        np.array(operating_expense),
+        {**OPENING, "debt": np.array(debt)},
+        periods=5,
+        assumptions={
+            "interest_rate": 0.08,
+            "interest_rate_on_cash": 0.03,
+            "debt_amortization_pct": 0.05,
+            **{name: np.array([a.get(name, default) for a in assumptions]) for name, default in defaults.items()},
+        },
+    )
+
+    assert output.converged.all()
+    assert (np.abs(output.balance_check) < BALANCE_TOLERANCE * REVENUE).all()
+    for i, regime in enumerate(REGIMES):
+        np.testing.assert_allclose(output.values[i], _project(regime).values[0], rtol=1e-12, atol=1e-9)
+
+
+@pytest.mark.parametrize("assumptions", [
+    {"cash_sweep_pct": 0.5},
+    {"cash_sweep_pct": 1.0, "debt_amortization_pct": 0.2},
+    {"operating_margin_target": -0.2, "minimum_cash_as_pct_revenue": 0.3},
+])
+def test_fixture_companies_balance_and_converge(fixture_companies, assumptions):
+    output = run_linked_three_statement([c["model_input"] for c in fixture_companies], assumptions)
+
+    assert output.converged.all()
+    scale = np.maximum(np.abs(output.line("revenue")), 1.0)
+    assert (np.abs(output.balance_check) < BALANCE_TOLERANCE * scale).all()
+
+
+@pytest.mark.parametrize("regime", list(REGIMES))
+def test_single_sweep_is_flagged_as_not_converged(regime):
+    output = _project(regime, max_iterations=1)
+
+    assert not output.converged.any()
+    assert output.iterations == 1
+    assert (output.interest_residual > 0).any()
+
+
+def test_opening_balance_interest_needs_no_iteration():
+    output = _project("sweep", average_balances=False)
+
+    assert output.converged.all()
+    assert output.iterations == 1
+    assert (np.abs(output.balance_check) < BALANCE_TOLERANCE * REVENUE).all()
+
+
+def test_run_three_statement_linked_extends_run_three_statement(fixture_companies):
+    assumptions = {"revenue_growth": 0.06, "operating_margin_target": 0.18, "cash_sweep_pct": 0.5}
+    for company in fixture_companies:
+        plain = run_three_statement(company["model_input"], assumptions)
+        linked = run_three_statement_linked(company["model_input"], assumptions)
+
+        assert linked.periods == plain.periods
+        for name in ("revenue", "cogs", "operating_expense", "operating_income", "capex", "depreciation"):
+            np.testing.assert_allclose(linked.line(name)[0], getattr(plain, name), rtol=1e-12)
+        assert linked.converged.all()
+        scale = np.maximum(np.abs(linked.line("revenue")), 1.0)
+        assert (np.abs(linked.balance_check) < BALANCE_TOLERANCE * scale).all()
@@ -0,0 +1,97 @@
+"""Tests for the logo proxy cache."""
+
+import pytest
+
+from app.services.branding import logo_cache
+from app.services.branding.logo_cache import LogoCache, LogoNotFoundError
+
+
+class FakeResponse:
+    def __init__(self, body, content_type="image/png", status_code=200, headers=None):
+        self.body = body
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.headers = {"Content-Type": content_type, **(headers or {})}
+        self.bytes_read = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), chunk_size):
+            chunk = self.body[start:start + chunk_size]
+            self.bytes_read += len(chunk)
+            yield chunk
+
+
+class FakeSession:
+    def __init__(self, response):
+        self.response = response
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append((url, kwargs))
+        return self.response
+
+
+def _cache(tmp_path, response):
+    cache = LogoCache(cache_dir=tmp_path, url_template="https://img.test/{ticker}.png")
+    cache._session = FakeSession(response)
+    return cache
+
+
+def test_png_logo_is_streamed_and_cached(tmp_path):
+    cache = _cache(tmp_path, FakeResponse(b"\x89PNG fake"))
+    logo = cache.get("AAPL")
+    assert logo.body == b"\x89PNG fake"
+    assert logo.content_type == "image/png"
+    assert cache._session.calls[0][1]["stream"] is True
+
+
+def test_svg_logo_is_treated_as_missing(tmp_path):
+    cache = _cache(tmp_path, FakeResponse(b"<svg onload='alert(1)'/>", content_type="image/svg+xml"))
+    with pytest.raises(LogoNotFoundError):
+        cache.get("EVIL")
+    assert not (tmp_path / "EVIL.img").exists()
+
+
+def test_download_stops_at_max_bytes(tmp_path, monkeypatch):
+    monkeypatch.setattr(logo_cache, "LOGO_MAX_BYTES", 1000)
+    monkeypatch.setattr(logo_cache, "LOGO_DOWNLOAD_CHUNK_BYTES", 100)
+    response = FakeResponse(b"x" * 10_000)
+    cache = _cache(tmp_path, response)
+    with pytest.raises(LogoNotFoundError):
+        cache.get("BIG")
+    assert response.bytes_read <= 1100
+
+
+def test_declared_oversize_is_rejected_before_reading(tmp_path, monkeypatch):
+    monkeypatch.setattr(logo_cache, "LOGO_MAX_BYTES", 1000)
+    response = FakeResponse(b"x" * 10_000, headers={"Content-Length": "10000"})
+    cache = _cache(tmp_path, response)
+    with pytest.raises(LogoNotFoundError):
+        cache.get("BIG")
+    assert response.bytes_read == 0
+
+
+def test_logo_response_forbids_script_execution(tmp_path, monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+
+    from app.api.v1 import branding
+
+    cache = _cache(tmp_path, FakeResponse(b"\x89PNG fake"))
+    monkeypatch.setattr(branding, "get_logo_cache", lambda: cache)
+    app = FastAPI()
+    app.include_router(branding.router)
+
+    response = TestClient(app).get(f"{branding.router.prefix}/logo/AAPL")
+    assert response.status_code == 200
+    assert response.headers["content-security-policy"] == "default-src 'none'"
+    assert response.headers["x-content-type-options"] == "nosniff"
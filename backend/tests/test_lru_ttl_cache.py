@@ -0,0 +1,78 @@
+"""Tests for the bounded LRU/TTL cache and its shared SQLite backend."""
+
+import pytest
+
+from app.core import lru_ttl_cache
+from app.core.lru_ttl_cache import MISSING, LruTtlCache, SqliteCacheBackend
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(lru_ttl_cache.time, "time", lambda: now[0])
+    return now
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LruTtlCache(max_entries=2, ttl_seconds=60)
+    cache.set("A", 1)
+    cache.set("B", 2)
+    assert cache.get("A") == 1  # B is now the least recently used
+
+    cache.set("C", 3)
+
+    assert cache.get("B") is MISSING
+    assert (cache.get("A"), cache.get("C")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+    assert len(cache) == 2
+
+
+def test_entries_expire_after_the_ttl(clock):
+    cache = LruTtlCache(max_entries=10, ttl_seconds=60)
+    cache.set("A", None)  # None is a valid cached value
+
+    clock[0] += 59
+    assert cache.get("A") is None
+    clock[0] += 1
+    assert cache.get("A") is MISSING
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_misses_fall_through_to_the_shared_backend(tmp_path, clock):
+    backend = SqliteCacheBackend(tmp_path / "shared.sqlite", table="branding")
+    writer = LruTtlCache(max_entries=10, ttl_seconds=60, backend=backend)
+    reader = LruTtlCache(max_entries=10, ttl_seconds=60, backend=backend)  # Another worker process
+
+    writer.set("AAPL", {"logoUrl": "https://img.test/AAPL.png"})
+
+    assert reader.get("AAPL") == {"logoUrl": "https://img.test/AAPL.png"}
+    assert reader.get("AAPL") == {"logoUrl": "https://img.test/AAPL.png"}
+    assert (reader.stats()["backend_hits"], reader.stats()["hits"]) == (1, 1)
+
+    # The backend copy keeps its original timestamp, so it expires with the writer's entry
+    clock[0] += 60
+    assert LruTtlCache(max_entries=10, ttl_seconds=60, backend=backend).get("AAPL") is MISSING
+
+
+def test_invalidate_and_clear_reach_the_backend(tmp_path):
+    backend = SqliteCacheBackend(tmp_path / "shared.sqlite")
+    cache = LruTtlCache(max_entries=10, ttl_seconds=60, backend=backend)
+    cache.set("A", 1)
+    cache.set("B", 2)
+
+    cache.invalidate("A")
+    assert cache.get("A") is MISSING
+    assert backend.get("A", 60) is None
+
+    cache.clear()
+    assert backend.get("B", 60) is None
+
+
+def test_invalid_configuration_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        LruTtlCache(max_entries=0, ttl_seconds=60)
+    with pytest.raises(ValueError):
+        SqliteCacheBackend(tmp_path / "shared.sqlite", table="cache; DROP TABLE x")
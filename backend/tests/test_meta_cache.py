@@ -0,0 +1,100 @@
+"""Tests for the pre-serialized screener reference lists."""
+
+import json
+import threading
+
+import pytest
+
+from app.services.screener.meta_cache import MetaCache, make_entry
+
+
+def _loaders(payloads, calls):
+    """Loaders that return the next payload for their list, or raise it if it is an exception."""
+    def loader(name):
+        def load():
+            calls.append(name)
+            value = payloads[name].pop(0) if len(payloads[name]) > 1 else payloads[name][0]
+            if isinstance(value, Exception):
+                raise value
+            return value
+        return load
+
+    return {name: loader(name) for name in payloads}
+
+
+def test_entry_holds_compact_json_and_a_content_etag():
+    entry = make_entry(["Technology", "Énergie"])
+    same = make_entry(["Technology", "Énergie"])
+
+    assert json.loads(entry.body) == ["Technology", "Énergie"]
+    assert b" " not in entry.body and "Énergie".encode("utf-8") in entry.body
+    assert entry.count == 2
+    assert entry.etag == same.etag and entry.etag.startswith('"') and entry.etag.endswith('"')
+    assert make_entry(["Technology"]).etag != entry.etag
+
+
+def test_cold_get_loads_once_then_serves_the_cached_entry():
+    calls = []
+    cache = MetaCache(_loaders({"sectors": [["Technology"]]}, calls), refresh_seconds=0)
+
+    assert cache.peek("sectors") is None
+    first = cache.get("sectors")
+    assert cache.get("sectors") is first
+    assert cache.peek("sectors") is first
+    assert calls == ["sectors"]
+    with pytest.raises(KeyError):
+        cache.get("exchanges")
+
+
+def test_concurrent_cold_gets_are_coalesced():
+    calls, release = [], threading.Event()
+
+    def slow():
+        calls.append(1)
+        release.wait(timeout=5)
+        return ["Technology"]
+
+    cache = MetaCache({"sectors": slow}, refresh_seconds=0)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("sectors"))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert len(calls) == 1
+    assert len(results) == 4 and all(entry is results[0] for entry in results)
+
+
+def test_failed_refresh_keeps_the_previous_entry():
+    calls = []
+    payloads = {"sectors": [["Technology"], RuntimeError("FMP down"), ["Technology", "Energy"]]}
+    cache = MetaCache(_loaders(payloads, calls), refresh_seconds=0)
+
+    first = cache.get("sectors")
+    cache.refresh("sectors")
+    assert cache.get("sectors") is first
+
+    cache.refresh()
+    assert json.loads(cache.get("sectors").body) == ["Technology", "Energy"]
+    assert cache.stats()["sectors"]["count"] == 2
+
+
+def test_cold_get_raises_when_the_loader_fails():
+    cache = MetaCache(_loaders({"tickers": [RuntimeError("FMP down")]}, []), refresh_seconds=0)
+
+    with pytest.raises(RuntimeError):
+        cache.get("tickers")
+    assert cache.peek("tickers") is None
+
+
+def test_start_warms_every_list():
+    calls = []
+    cache = MetaCache(_loaders({"sectors": [["Technology"]], "industries": [["Software"]]}, calls), refresh_seconds=0)
+
+    cache.start()
+    cache._thread.join(timeout=5)
+
+    assert sorted(calls) == ["industries", "sectors"]
+    assert set(cache.stats()) == {"industries", "sectors"}
@@ -0,0 +1,123 @@
+"""Default Monte Carlo distributions follow the base inputs; seeded runs reproduce; correlations and clipping hold."""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from app.services.modeling.monte_carlo import (
+    DEFAULT_DISTRIBUTIONS,
+    build_simulation_config,
+    correlation_matrix,
+    run_monte_carlo,
+    sample_inputs,
+)
+
+BASE = {
+    "revenue": 1e9,
+    "cogs": 5.5e8,
+    "operating_expense": 2.5e8,
+    "shares_outstanding": 5e7,
+    "revenue_growth": 0.08,
+    "operating_margin_target": 0.22,
+    "capex_as_pct_revenue": 0.04,
+    "wacc": 0.09,
+    "terminal_growth_rate": 0.03,
+}
+
+
+def test_default_specs_are_centered_on_base_inputs():
+    specs = build_simulation_config(BASE)["distributions"]
+
+    assert set(specs) == set(DEFAULT_DISTRIBUTIONS)
+    for name, spec in specs.items():
+        default = DEFAULT_DISTRIBUTIONS[name]
+        if spec["distribution"] == "normal":
+            assert spec["mean"] == BASE[name]
+            assert spec["std"] == default["std"]
+            assert spec.get("min") == default.get("min")
+        else:
+            assert spec["mode"] == BASE[name]
+            assert spec["mode"] - spec["low"] == pytest.approx(default["mode"] - default["low"])
+            assert spec["high"] - spec["mode"] == pytest.approx(default["high"] - default["mode"])
+
+
+def test_explicit_distributions_are_used_as_given():
+    spec = {"distribution": "normal", "mean": 0.05, "std": 0.01}
+    config = build_simulation_config(BASE, {"revenue_growth": spec})
+
+    assert config["distributions"] == {"revenue_growth": spec}
+    assert config["fixed"]["wacc"] == BASE["wacc"]
+
+
+@pytest.mark.parametrize("name, value, raises_price", [
+    ("revenue_growth", 0.12, True),
+    ("operating_margin_target", 0.30, True),
+    ("wacc", 0.11, False),
+    ("terminal_growth_rate", 0.02, False),
+])
+def test_median_moves_with_base_input(name, value, raises_price):
+    base = run_monte_carlo(BASE, paths=20_000, seed=7).percentiles["p50"]
+    moved = run_monte_carlo({**BASE, name: value}, paths=20_000, seed=7).percentiles["p50"]
+
+    assert (moved > base) == raises_price
+
+
+def test_fixed_seed_reproduces_the_result():
+    first = run_monte_carlo(BASE, paths=5_000, seed=11, chunk_size=1_000)
+    second = run_monte_carlo(BASE, paths=5_000, seed=11, chunk_size=1_000)
+    other = run_monte_carlo(BASE, paths=5_000, seed=12, chunk_size=1_000)
+
+    assert first == second
+    assert other.percentiles != first.percentiles
+
+
+def test_process_pool_matches_serial_run():
+    serial = run_monte_carlo(BASE, paths=5_000, seed=11, chunk_size=1_000)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        parallel = run_monte_carlo(BASE, paths=5_000, seed=11, chunk_size=1_000, executor=executor)
+
+    assert parallel == serial
+
+
+def test_correlated_draws_keep_marginals_and_hit_the_rank_correlation():
+    names = ["revenue_growth", "operating_margin_target"]
+    specs = {
+        "revenue_growth": {"distribution": "normal", "mean": 0.05, "std": 0.02},
+        "operating_margin_target": {"distribution": "uniform", "low": 0.1, "high": 0.3},
+    }
+    matrix = correlation_matrix(names, [("revenue_growth", "operating_margin_target", 0.6)])
+
+    independent = sample_inputs(np.random.default_rng(3), specs, names, 50_000)
+    correlated = sample_inputs(np.random.default_rng(3), specs, names, 50_000, matrix)
+
+    for name in names:
+        np.testing.assert_array_equal(np.sort(correlated[name]), np.sort(independent[name]))
+    ranks = [np.argsort(np.argsort(correlated[name])) for name in names]
+    assert np.corrcoef(ranks)[0, 1] == pytest.approx(0.6, abs=0.01)
+
+
+def test_correlation_matrix_rejects_inconsistent_and_invalid_pairs():
+    names = ["revenue_growth", "operating_margin_target", "wacc"]
+
+    with pytest.raises(ValueError, match="positive definite"):
+        correlation_matrix(names, [
+            ("revenue_growth", "operating_margin_target", 0.9),
+            ("revenue_growth", "wacc", 0.9),
+            ("operating_margin_target", "wacc", -0.9),
+        ])
+    with pytest.raises(ValueError, match="no distribution"):
+        correlation_matrix(names, [("revenue_growth", "terminal_growth_rate", 0.5)])
+    with pytest.raises(ValueError, match="Invalid correlation"):
+        correlation_matrix(names, [("revenue_growth", "wacc", 1.0)])
+
+
+def test_draws_are_clipped_to_min_and_max():
+    spec = {"distribution": "normal", "mean": 0.05, "std": 0.05, "min": 0.0, "max": 0.08}
+
+    draws = sample_inputs(np.random.default_rng(5), {"revenue_growth": spec}, ["revenue_growth"], 10_000)
+    draws = draws["revenue_growth"]
+
+    assert draws.min() == 0.0
+    assert draws.max() == 0.08
+    assert ((draws > 0.0) & (draws < 0.08)).any()
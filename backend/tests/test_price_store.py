@@ -0,0 +1,88 @@
+"""Tests for the incremental price store's restatement handling (SQLite, yfinance stubbed)."""
+
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+from sqlalchemy import MetaData, create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.core.lru_ttl_cache import MISSING
+from app.services.market_data import price_store
+from app.services.market_data.price_store import _company, _price_bar, sync_prices
+
+
+@pytest.fixture
+def session():
+    # The models live on separate declarative bases: copy both tables into one metadata
+    metadata = MetaData()
+    _company.to_metadata(metadata)
+    _price_bar.to_metadata(metadata)
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    company_id = db.execute(
+        insert(_company)
+        .values(ticker="AAA", name="AAA", sector="Technology", industry="Software")
+        .returning(_company.c.id)
+    ).scalar_one()
+    stored_dates = pd.bdate_range(end=date.today() - timedelta(days=30), periods=10).date
+    db.execute(insert(_price_bar), [{"company_id": company_id, "date": d, "close": 100.0} for d in stored_dates])
+    db.commit()
+    price_store._recent_syncs.clear()
+    yield db
+    price_store._recent_syncs.clear()
+    db.close()
+
+
+def _bars(start, close):
+    dates = pd.bdate_range(start=start, end=date.today() - timedelta(days=1))
+    return pd.DataFrame({"Open": close, "High": close, "Low": close, "Close": close, "Volume": 1.0}, index=dates)
+
+
+def _stub_downloads(monkeypatch, *responses):
+    """download_bars returns each response in turn (a dict of frames, {} for a failed download)."""
+    calls = []
+
+    def download(tickers, start):
+        calls.append((list(tickers), start))
+        return responses[len(calls) - 1]
+
+    monkeypatch.setattr(price_store, "download_bars", download)
+    return calls
+
+
+def _stored_closes(db):
+    return [close for (close,) in db.execute(select(_price_bar.c.close).order_by(_price_bar.c.date)).all()]
+
+
+def test_failed_backfill_after_restatement_keeps_stored_history(session, monkeypatch):
+    restated = _bars(date.today() - timedelta(days=60), 50.0)
+    calls = _stub_downloads(monkeypatch, {"AAA": restated}, {})
+
+    assert sync_prices(session, ["AAA"]) == {}
+
+    assert len(calls) == 2  # Overlap download, then the failed backfill
+    assert _stored_closes(session) == [100.0] * 10
+    assert price_store._recent_syncs.get("AAA") is MISSING
+
+
+def test_restated_history_is_replaced_once_the_backfill_arrives(session, monkeypatch):
+    restated = _bars(date.today() - timedelta(days=60), 50.0)
+    _stub_downloads(monkeypatch, {"AAA": restated}, {"AAA": restated})
+
+    assert sync_prices(session, ["AAA"]) == {"AAA": len(restated)}
+
+    assert _stored_closes(session) == [50.0] * len(restated)
+    assert price_store._recent_syncs.get("AAA") is True
+
+
+def test_failed_incremental_download_is_retried(session, monkeypatch):
+    calls = _stub_downloads(monkeypatch, {}, {"AAA": _bars(date.today() - timedelta(days=40), 100.0)})
+
+    assert sync_prices(session, ["AAA"]) == {}
+    assert price_store._recent_syncs.get("AAA") is MISSING
+
+    assert sync_prices(session, ["AAA"])["AAA"] > 0
+    assert len(calls) == 2
+    assert price_store._recent_syncs.get("AAA") is True
@@ -0,0 +1,49 @@
+"""Reverse DCF round trips: a solved input fed back into run_three_statement + run_dcf gives the target price."""
+
+import math
+
+import pytest
+
+from app.services.modeling.reverse_dcf import SOLVER_BRACKETS, solve_implied
+
+# Forward value whose price becomes the target, per solved input
+TARGET_INPUTS = {"revenue_growth": 0.09, "operating_margin_target": 0.12, "wacc": 0.10}
+
+
+@pytest.mark.parametrize("solve_for", list(TARGET_INPUTS))
+def test_solved_input_reproduces_target_price(fixture_companies, company_inputs, generated_price, solve_for):
+    companies = [
+        c for c in fixture_companies
+        if generated_price(c, {solve_for: TARGET_INPUTS[solve_for]}) > 0
+    ]
+    assert companies
+    targets = [generated_price(c, {solve_for: TARGET_INPUTS[solve_for]}) for c in companies]
+
+    result = solve_implied([company_inputs(c) for c in companies], targets, solve_for)
+
+    assert result.status == ["solved"] * len(companies)
+    for company, target, value in zip(companies, targets, result.implied_value):
+        assert generated_price(company, {solve_for: float(value)}) == pytest.approx(target, rel=1e-6)
+
+
+@pytest.mark.parametrize("solve_for", ["revenue_growth", "operating_margin_target"])
+def test_target_above_bracket_has_no_solution(fixture_companies, company_inputs, generated_price, solve_for):
+    company = fixture_companies[0]
+    low, high = SOLVER_BRACKETS[solve_for]
+    highest = max(generated_price(company, {solve_for: low + (high - low) * k / 20}) for k in range(21))
+
+    result = solve_implied([company_inputs(company)], [10 * highest], solve_for)
+
+    assert result.status == ["no_solution"]
+    assert math.isnan(result.implied_value[0])
+
+
+def test_target_below_price_at_highest_wacc_has_no_solution(fixture_companies, company_inputs, generated_price):
+    company = fixture_companies[0]
+    lowest = generated_price(company, {"wacc": SOLVER_BRACKETS["wacc"][1]})
+    assert lowest > 0
+
+    result = solve_implied([company_inputs(company)], [lowest / 2], "wacc")
+
+    assert result.status == ["no_solution"]
+    assert math.isnan(result.implied_value[0])
@@ -0,0 +1,43 @@
+"""The scenario table runs the same projection and DCF as /models/generate."""
+
+import pytest
+
+from app.services.modeling.scenario_engine import run_scenarios, scenario_grid
+from app.services.modeling.three_statement_engine import latest_historicals
+
+
+def test_scenario_with_generate_assumptions_equals_generated_model_dcf(
+    fixture_companies, base_assumptions, base_valuation, generated_price
+):
+    for company in fixture_companies:
+        _, latest = latest_historicals(company["model_input"])
+        base = {
+            **base_assumptions,
+            **base_valuation,
+            "shares_outstanding": company["shares_outstanding"],
+            "debt": company["debt"],
+            "cash": company["cash"],
+        }
+        table = run_scenarios(latest, {"base": base, "bear": {**base, "revenue_growth": 0.01, "wacc": 0.11}})
+
+        assert table.loc["base", "implied_share_price"] == pytest.approx(generated_price(company), rel=1e-12)
+
+
+def test_grid_names_keep_full_float_precision():
+    grid = scenario_grid({"tax_rate": 0.21}, {"revenue_growth": [0.0300001, 0.03], "wacc": [0.08]})
+
+    assert list(grid) == ["revenue_growth=0.0300001, wacc=0.08", "revenue_growth=0.03, wacc=0.08"]
+    assert grid["revenue_growth=0.03, wacc=0.08"] == {"tax_rate": 0.21, "revenue_growth": 0.03, "wacc": 0.08}
+
+
+def test_grid_rejects_repeated_axis_values():
+    with pytest.raises(ValueError, match="Duplicate grid scenario"):
+        scenario_grid({}, {"wacc": [0.08, 0.08]})
+
+
+def test_unknown_scenario_inputs_are_rejected(fixture_companies, base_assumptions, base_valuation):
+    _, latest = latest_historicals(fixture_companies[0]["model_input"])
+    base = {**base_assumptions, **base_valuation}
+
+    with pytest.raises(ValueError, match=r"'typo'.*\['ebit_margin', 'revenue_grwoth'\]"):
+        run_scenarios(latest, {"base": base, "typo": {**base, "revenue_grwoth": 0.5, "ebit_margin": 0.4}})
@@ -0,0 +1,134 @@
+"""Keyset cursors page through ScreenerUniverse.query exactly like offset pages, and only for the query that issued them."""
+
+import pytest
+
+from app.services.screener import screener_universe
+from app.services.screener.screener_universe import (
+    SORT_FIELDS,
+    InvalidCursorError,
+    ScreenerUniverse,
+    ScreenerUniverseManager,
+    normalize_screener_payload,
+)
+
+PAGE_SIZE = 3
+
+# Market caps and names repeat (and some names are missing) so every sort key has ties
+COMPANIES = [
+    {"symbol": "MSFT", "companyName": "Microsoft", "sector": "Technology", "industry": "Software", "marketCap": 300},
+    {"symbol": "AAPL", "companyName": "Apple", "sector": "Technology", "industry": "Hardware", "marketCap": 300},
+    {"symbol": "ORCL", "companyName": "", "sector": "technology", "industry": "software", "marketCap": 100},
+    {"symbol": "ADBE", "companyName": "Adobe", "sector": "Technology", "industry": "Software", "marketCap": 100},
+    {"symbol": "CRM", "companyName": "apple", "sector": "TECHNOLOGY", "industry": "Software", "marketCap": 100},
+    {"symbol": "XOM", "sector": "Energy", "industry": "Oil & Gas", "marketCap": 200},
+    {"symbol": "CVX", "companyName": "Chevron", "sector": "Energy", "industry": "Oil & Gas", "marketCap": 200},
+    {"symbol": "F", "companyName": "Ford", "sector": "Consumer Cyclical", "industry": "Autos", "marketCap": 0},
+    {"symbol": "GM", "companyName": "", "sector": "Consumer Cyclical", "industry": "Autos", "marketCap": 0},
+    {"symbol": "JPM", "companyName": "Apple", "sector": "Financial Services", "industry": "Banks", "marketCap": 200},
+]
+
+
+@pytest.fixture(scope="module")
+def universe():
+    return ScreenerUniverse(normalize_screener_payload(COMPANIES))
+
+
+def _symbols(result):
+    return [row["symbol"] for row in result["results"]]
+
+
+def _expected_order(rows, sort, descending):
+    """Reference ordering: sort key in the requested direction, ties by symbol ascending."""
+    key = {
+        "marketCap": lambda r: r["marketCap"],
+        "symbol": lambda r: r["symbol"].upper(),
+        "name": lambda r: (r["name"] or "").lower(),
+    }[sort]
+    by_symbol = sorted(rows, key=lambda r: r["symbol"].upper())
+    return [r["symbol"] for r in sorted(by_symbol, key=key, reverse=descending)]
+
+
+@pytest.mark.parametrize("descending", [True, False])
+@pytest.mark.parametrize("sort", SORT_FIELDS)
+@pytest.mark.parametrize("filters", [{}, {"sector": "technology"}, {"market_cap_min": 100}])
+def test_cursor_pages_match_offset_pages(universe, sort, descending, filters):
+    query = {**filters, "sort": sort, "descending": descending, "page_size": PAGE_SIZE}
+    total = universe.query(**query)["total"]
+    offset_pages = [
+        _symbols(universe.query(**query, page=page)) for page in range((total + PAGE_SIZE - 1) // PAGE_SIZE)
+    ]
+
+    cursor_pages = []
+    result = universe.query(**query)
+    while True:
+        cursor_pages.append(_symbols(result))
+        if result["next_cursor"] is None:
+            break
+        result = universe.query(**query, cursor=result["next_cursor"])
+
+    assert cursor_pages == offset_pages
+    everything = universe.query(**{**query, "page_size": len(COMPANIES)})
+    assert [s for page in cursor_pages for s in page] == _expected_order(everything["results"], sort, descending)
+
+
+@pytest.mark.parametrize("changed", [
+    {"sector": "Energy"},
+    {"industry": "Software"},
+    {"market_cap_min": 150},
+    {"market_cap_max": 250},
+    {"sort": "symbol"},
+    {"descending": False},
+])
+def test_cursor_from_another_query_is_rejected(universe, changed):
+    query = {"sector": "Technology", "sort": "marketCap", "descending": True, "page_size": 2}
+    cursor = universe.query(**query)["next_cursor"]
+    assert cursor is not None
+
+    with pytest.raises(InvalidCursorError):
+        universe.query(**{**query, **changed}, cursor=cursor)
+
+
+def test_malformed_cursor_is_rejected(universe):
+    with pytest.raises(InvalidCursorError):
+        universe.query(cursor="not-a-cursor")
+
+
+def test_sector_and_industry_filters_ignore_case(universe):
+    software = {"ADBE", "CRM", "MSFT", "ORCL"}
+    for sector in ("Technology", "technology", "TECHNOLOGY", " tEcHnOlOgY "):
+        for industry in ("Software", "software", "SOFTWARE"):
+            result = universe.query(sector=sector, industry=industry, page_size=len(COMPANIES))
+            assert set(_symbols(result)) == software
+            assert result["total"] == len(software)
+
+    # Cursors from differently-cased filters are interchangeable
+    cursor = universe.query(sector="Technology", page_size=2)["next_cursor"]
+    assert _symbols(universe.query(sector="TECHNOLOGY", page_size=2, cursor=cursor)) == _symbols(
+        universe.query(sector="technology", page_size=2, page=1)
+    )
+
+
+def test_failed_first_build_backs_off_before_retrying(monkeypatch):
+    attempts = []
+
+    def failing_build():
+        attempts.append(1)
+        raise RuntimeError("FMP unavailable")
+
+    now = [1000.0]
+    monkeypatch.setattr(screener_universe, "build_screener_universe", failing_build)
+    monkeypatch.setattr(screener_universe.time, "monotonic", lambda: now[0])
+    manager = ScreenerUniverseManager(refresh_seconds=0, retry_seconds=60)
+
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            manager.get()
+    assert len(attempts) == 1
+    assert manager.stats()["failed_builds"] == 1
+
+    now[0] += 61
+    monkeypatch.setattr(
+        screener_universe, "build_screener_universe", lambda: ScreenerUniverse(normalize_screener_payload(COMPANIES))
+    )
+    assert manager.get().size == len(COMPANIES)
+    assert manager.stats()["builds"] == 1
@@ -0,0 +1,41 @@
+"""The sensitivity grid runs the same projection and DCF as /models/generate."""
+
+import math
+
+import pytest
+from openpyxl import Workbook
+
+from app.services.modeling.sensitivity import write_sensitivity_grid_sheet
+from app.services.modeling.sensitivity_engine import run_sensitivity_around_base
+
+AXES = [
+    ("wacc", "terminal_growth_rate"),
+    ("revenue_growth", "operating_margin_target"),
+    ("revenue_growth", "wacc"),
+]
+
+
+@pytest.mark.parametrize("row_input, column_input", AXES)
+def test_base_cell_equals_generated_model_dcf(fixture_companies, company_inputs, generated_price, row_input, column_input):
+    for company in fixture_companies:
+        grid = run_sensitivity_around_base(company_inputs(company), row_input, column_input)
+
+        assert grid.metric == "implied_share_price"
+        base_cell = grid.values[grid.base_row, grid.base_column]
+        assert base_cell == pytest.approx(generated_price(company), rel=1e-12)
+
+
+def test_grid_sheet_holds_the_computed_values_at_any_size(fixture_companies, company_inputs):
+    company = fixture_companies[0]
+    inputs = {**company_inputs(company), "terminal_growth_rate": 0.08}  # Some cells have terminal growth >= WACC
+    grid = run_sensitivity_around_base(inputs, rows=7, columns=3)
+    workbook = Workbook()
+
+    write_sensitivity_grid_sheet(workbook, grid, ticker=company["model_input"].ticker)
+    header, *rows = workbook["Sensitivity Grid"].iter_rows(min_row=4, max_row=11, max_col=4, values_only=True)
+
+    assert list(header[1:]) == grid.column_values.tolist()
+    assert [row[0] for row in rows] == grid.row_values.tolist()
+    cells = [value for row in rows for value in row[1:]]
+    assert "N/A" in cells
+    assert cells == ["N/A" if math.isnan(v) else v for v in grid.values.ravel().tolist()]
@@ -0,0 +1,89 @@
+"""Tests for request coalescing."""
+
+import asyncio
+import threading
+import time
+
+from app.core.single_flight import SingleFlight
+
+
+def _slow_fetch(started, release):
+    def fetch():
+        started.set()
+        release.wait(timeout=5)
+        return [{"symbol": "AAPL", "revenue": 100.0}]
+
+    return fetch
+
+
+def _wait_for_coalesced(flight, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while flight.stats()["coalesced"] == 0:
+        assert time.monotonic() < deadline, "follower was never coalesced onto the in-flight call"
+        time.sleep(0.001)
+
+
+def test_concurrent_callers_get_independent_results():
+    flight = SingleFlight("test")
+    started, release = threading.Event(), threading.Event()
+    results = {}
+
+    def leader():
+        results["leader"] = flight.do("AAPL", _slow_fetch(started, release))
+        results["leader"][0]["revenue"] = -1.0  # mutates its own copy only
+
+    def follower():
+        results["follower"] = flight.do("AAPL", lambda: [{"unexpected": True}])
+
+    leader_thread = threading.Thread(target=leader)
+    leader_thread.start()
+    started.wait(timeout=5)
+    follower_thread = threading.Thread(target=follower)
+    follower_thread.start()
+    _wait_for_coalesced(flight)
+    release.set()
+    leader_thread.join(timeout=5)
+    follower_thread.join(timeout=5)
+
+    assert flight.stats()["executions"] == 1
+    assert results["leader"][0]["revenue"] == -1.0
+    assert results["follower"] == [{"symbol": "AAPL", "revenue": 100.0}]
+    assert results["follower"] is not results["leader"]
+
+
+def test_concurrent_coroutines_get_independent_results():
+    flight = SingleFlight("test")
+    started, release = threading.Event(), threading.Event()
+
+    async def run():
+        first = asyncio.create_task(flight.do_async("AAPL", _slow_fetch(started, release)))
+        second = asyncio.create_task(flight.do_async("AAPL", lambda: [{"unexpected": True}]))
+        await asyncio.sleep(0)
+        release.set()
+        return await first, await second
+
+    first, second = asyncio.run(run())
+    first[0]["revenue"] = -1.0
+    assert second == [{"symbol": "AAPL", "revenue": 100.0}]
+    assert flight.stats()["executions"] == 1
+    assert flight.stats()["coalesced"] == 1
+
+
+def test_immutable_results_are_shared_when_copying_is_disabled():
+    flight = SingleFlight("test", copy_results=False)
+    started, release = threading.Event(), threading.Event()
+    payload = b"logo"
+    results = []
+
+    def call():
+        results.append(flight.do("logo", lambda: (started.set(), release.wait(timeout=5), payload)[2]))
+
+    threads = [threading.Thread(target=call) for _ in range(2)]
+    threads[0].start()
+    started.wait(timeout=5)
+    threads[1].start()
+    _wait_for_coalesced(flight)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert results[0] is results[1] is payload
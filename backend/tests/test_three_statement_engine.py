@@ -0,0 +1,112 @@
+"""Parity of the vectorized 3-statement projection with the legacy per-period loop and of the batch with run_three_statement."""
+
+import json
+
+import numpy as np
+import pytest
+
+from app.services.modeling.three_statement import run_three_statement
+from app.services.modeling.three_statement_engine import latest_historicals, run_three_statement_batch
+from app.services.modeling.types import THREE_STATEMENT_LINES, ThreeStatementOutput
+
+ASSUMPTIONS = [
+    {},
+    {"revenue_growth": 0.06, "operating_margin_target": 0.18, "tax_rate": 0.21},
+    {"revenue_growth": -0.03, "operating_margin_target": 0.45, "capex_as_pct_revenue": 0.08},
+]
+# Fields of the dataclass ThreeStatementOutput replaced, in declaration order
+LEGACY_FIELDS = ["periods", *THREE_STATEMENT_LINES]
+
+
+def _legacy_loop(model_input, assumptions, forecast_periods, frequency):
+    """The per-period loop run_three_statement used before the vectorized kernel, verbatim."""
+    latest_year, latest = latest_historicals(model_input)
+    revenue_growth = assumptions.get("revenue_growth", 0.05)
+    operating_margin_target = assumptions.get("operating_margin_target", 0.15)
+    tax_rate = assumptions.get("tax_rate", 0.21)
+    capex_as_pct_revenue = assumptions.get("capex_as_pct_revenue", 0.05)
+    depreciation_as_pct_revenue = assumptions.get("depreciation_as_pct_revenue", 0.03)
+
+    lines = {name: [] for name in LEGACY_FIELDS}
+    cogs_margin = latest["cogs"] / latest["revenue"]
+    opex_margin = latest["operating_expense"] / latest["revenue"]
+    current_revenue = latest["revenue"]
+    for i in range(forecast_periods):
+        if frequency == "annual":
+            next_period = f"{latest_year + i + 1}-12-31"
+        else:
+            quarter = (i % 4) + 1
+            year = latest_year + (i // 4)
+            next_period = f"{year}-{quarter*3:02d}-{30 if quarter in [3, 4] else 31}"
+        lines["periods"].append(next_period)
+
+        current_revenue = current_revenue * (1 + revenue_growth)
+        cogs = current_revenue * cogs_margin
+        gross_profit = current_revenue - cogs
+        target_opex = current_revenue * (1 - operating_margin_target) - cogs
+        if target_opex < 0:
+            opex = current_revenue * opex_margin
+        else:
+            opex = current_revenue * opex_margin * 0.7 + target_opex * 0.3
+        operating_income = gross_profit - opex
+        net_income = operating_income * (1 - tax_rate)
+        capex = current_revenue * capex_as_pct_revenue
+        depreciation = current_revenue * depreciation_as_pct_revenue
+        fcf = net_income + depreciation - capex
+
+        for name, value in zip(THREE_STATEMENT_LINES, (
+            current_revenue, cogs, gross_profit, opex, operating_income, net_income, capex, depreciation, fcf,
+        )):
+            lines[name].append(value)
+    return lines
+
+
+@pytest.mark.parametrize("assumptions", ASSUMPTIONS)
+@pytest.mark.parametrize("forecast_periods, frequency", [(5, "annual"), (8, "quarterly")])
+def test_kernel_matches_legacy_loop(fixture_companies, assumptions, forecast_periods, frequency):
+    for company in fixture_companies:
+        legacy = _legacy_loop(company["model_input"], assumptions, forecast_periods, frequency)
+
+        projected = run_three_statement(company["model_input"], assumptions, forecast_periods, frequency).to_dict()
+
+        assert projected == legacy
+
+
+@pytest.mark.parametrize("assumptions", ASSUMPTIONS)
+@pytest.mark.parametrize("forecast_periods, frequency", [(5, "annual"), (8, "quarterly")])
+def test_batch_matches_scalar_row_by_row(fixture_companies, assumptions, forecast_periods, frequency):
+    model_inputs = [c["model_input"] for c in fixture_companies]
+
+    batch = run_three_statement_batch(model_inputs, assumptions, forecast_periods, frequency)
+
+    assert len(batch) == len(model_inputs)
+    for model_input, batched in zip(model_inputs, batch):
+        scalar = run_three_statement(model_input, assumptions, forecast_periods, frequency)
+        assert batched.periods == scalar.periods
+        np.testing.assert_array_equal(batched.values, scalar.values)
+
+
+def test_batch_accepts_one_assumptions_dict_per_company(fixture_companies):
+    model_inputs = [c["model_input"] for c in fixture_companies]
+    per_company = [ASSUMPTIONS[i % len(ASSUMPTIONS)] for i in range(len(model_inputs))]
+
+    batch = run_three_statement_batch(model_inputs, per_company)
+
+    for model_input, assumptions, batched in zip(model_inputs, per_company, batch):
+        np.testing.assert_array_equal(batched.values, run_three_statement(model_input, assumptions).values)
+
+
+def test_to_dict_round_trips_the_list_of_floats_shape(fixture_companies):
+    output = run_three_statement(fixture_companies[0]["model_input"], ASSUMPTIONS[1])
+
+    as_dict = output.to_dict()
+
+    assert list(as_dict) == LEGACY_FIELDS
+    for name in THREE_STATEMENT_LINES:
+        assert isinstance(as_dict[name], list)
+        assert all(type(value) is float for value in as_dict[name])
+        assert as_dict[name] == getattr(output, name).tolist()
+    restored = ThreeStatementOutput(**json.loads(json.dumps(as_dict)))
+    assert restored.periods == output.periods
+    np.testing.assert_array_equal(restored.values, output.values)
+    assert restored.to_dict() == as_dict
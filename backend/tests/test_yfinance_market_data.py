@@ -0,0 +1,88 @@
+"""Tests for bulk price / share-count lookups (yfinance and the price store stubbed out)."""
+
+from datetime import date
+
+import pytest
+
+from app.core.lru_ttl_cache import LruTtlCache
+from app.services.market_data import yfinance_market_data
+from app.services.market_data.yfinance_market_data import fetch_prices_and_shares_bulk
+
+DOWNLOAD_CLOSES = {"AAA": 10.0, "BBB": None, "CCC": None, "DDD": None}
+INFO = {
+    "AAA": {"shares_outstanding": 100.0, "last_price": 99.0},
+    "BBB": {"shares_outstanding": 200.0, "last_price": 20.0},
+    "CCC": {"shares_outstanding": None, "last_price": None},
+    "DDD": {"shares_outstanding": None, "last_price": None},
+}
+STORED_CLOSES = {"CCC": (date(2024, 1, 2), 30.0)}
+
+
+@pytest.fixture
+def sources(monkeypatch):
+    """Stub every data source with fresh caches; returns the calls made to each."""
+    calls = {"download": [], "info": [], "stored": []}
+
+    def download(tickers):
+        calls["download"].append(list(tickers))
+        return {ticker: DOWNLOAD_CLOSES[ticker] for ticker in tickers}
+
+    def info(ticker):
+        calls["info"].append(ticker)
+        return dict(INFO[ticker])
+
+    def stored(tickers):
+        calls["stored"].append(list(tickers))
+        return {ticker: STORED_CLOSES[ticker] for ticker in tickers if ticker in STORED_CLOSES}
+
+    monkeypatch.setattr(yfinance_market_data, "_download_last_closes", download)
+    monkeypatch.setattr(yfinance_market_data, "_fetch_info_fields", info)
+    monkeypatch.setattr(yfinance_market_data, "get_latest_stored_closes", stored)
+    monkeypatch.setattr(yfinance_market_data, "_price_cache", LruTtlCache(100, 300, name="prices-test"))
+    monkeypatch.setattr(yfinance_market_data, "_shares_cache", LruTtlCache(100, 3600, name="shares-test"))
+    return calls
+
+
+def test_prices_fall_back_from_download_to_info_to_the_price_store(sources):
+    frame = fetch_prices_and_shares_bulk(["aaa", "BBB", "CCC", "DDD", "AAA", ""])
+
+    assert list(frame.index) == ["AAA", "BBB", "CCC", "DDD"]
+    assert frame["last_price"].tolist()[:3] == [10.0, 20.0, 30.0]  # Download, info price, stored close
+    assert frame.loc["DDD"].isna().all()
+    assert frame.loc["AAA", "market_cap"] == 1000.0
+    assert frame.loc["BBB", "market_cap"] == 4000.0
+    assert sources["download"] == [["AAA", "BBB", "CCC", "DDD"]]  # One batched download
+    assert sorted(sources["info"]) == ["AAA", "BBB", "CCC", "DDD"]
+    assert sources["stored"] == [["CCC", "DDD"]]
+
+
+def test_cached_prices_and_share_counts_are_reused(sources):
+    fetch_prices_and_shares_bulk(["AAA", "BBB"])
+    for calls in sources.values():
+        calls.clear()
+
+    frame = fetch_prices_and_shares_bulk(["AAA", "BBB"])
+
+    assert sources == {"download": [], "info": [], "stored": []}
+    assert frame["last_price"].tolist() == [10.0, 20.0]
+    assert frame["shares_outstanding"].tolist() == [100.0, 200.0]
+
+
+def test_missing_share_count_is_not_cached(sources):
+    fetch_prices_and_shares_bulk(["AAA", "CCC"])
+    for calls in sources.values():
+        calls.clear()
+
+    frame = fetch_prices_and_shares_bulk(["AAA", "CCC"])
+
+    assert sources["download"] == []  # Both prices are cached
+    assert sources["info"] == ["CCC"]  # Only the missing share count is looked up again
+    assert frame.loc["CCC", "last_price"] == 30.0
+
+
+def test_no_tickers_returns_an_empty_frame(sources):
+    frame = fetch_prices_and_shares_bulk(["", "  "])
+
+    assert frame.empty
+    assert list(frame.columns) == ["last_price", "shares_outstanding", "market_cap"]
+    assert sources == {"download": [], "info": [], "stored": []}
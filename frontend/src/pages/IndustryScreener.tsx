@@ -21,6 +21,9 @@ import { Alert, AlertDescription } from "@/components/ui/alert";
 import { Skeleton } from "@/components/ui/skeleton";
 import { fetchSectors, fetchIndustries, fetchIndustryScreener, CompanyResult } from "@/lib/api/industryScreener";
 
+// Logos are served from the backend's local logo cache
+const API_BASE_URL = import.meta.env.VITE_API_URL || "http://localhost:8000";
+
 const IndustryScreener = () => {
   const [sectors, setSectors] = useState<string[]>([]);
   const [industries, setIndustries] = useState<string[]>([]);
@@ -267,7 +270,7 @@ const IndustryScreener = () => {
                         <TableCell>
                           {company.logoUrl ? (
                             <img
-                              src={company.logoUrl}
+                              src={`${API_BASE_URL}/branding/logo/${encodeURIComponent(company.symbol)}?size=64`}
                               alt={`${company.name} logo`}
                               className="w-10 h-10 object-contain"
                               onError={(e) => {